@@ -3,16 +3,16 @@ TradeSense AI Platform - Flask Application Factory
 Creates and configures the Flask application with all extensions and blueprints
 """
 
-import logging
 import os
 from typing import Optional
 
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
-from flask_migrate import Migrate
 
 from app.core.config import config_by_name, get_config
 from app.core.database import db, init_db
+from app.core.startup import LazyBlueprints, StartupProfile
 
 
 def create_app(config_name: Optional[str] = None) -> Flask:
@@ -25,6 +25,8 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     Returns:
         Configured Flask application
     """
+    profile = StartupProfile()
+
     # Create Flask app
     app = Flask(__name__)
 
@@ -35,28 +37,49 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     # Initialize configuration
     config.init_app(app)
 
+    # Setup logging (first, so extension startup logs use the pipeline)
+    with profile.phase("logging"):
+        setup_logging(app)
+
     # Initialize extensions
-    init_extensions(app)
+    with profile.phase("extensions"):
+        init_extensions(app)
 
     # Register blueprints
-    register_blueprints(app)
+    with profile.phase("blueprints"):
+        register_blueprints(app)
 
     # Register error handlers
     register_error_handlers(app)
 
-    # Setup logging
-    setup_logging(app)
-
     # Register CLI commands
     register_cli_commands(app)
 
+    app.extensions["startup_profile"] = profile.report()
     app.logger.info(
-        f"TradeSense AI Platform started in {config_name or 'default'} mode"
+        f"TradeSense AI Platform started in {config_name or 'default'} mode "
+        f"in {profile.summary()}"
     )
 
     return app
 
 
+def preload_app(app: Flask) -> None:
+    """
+    Finish the fork-safe part of startup before forking workers
+
+    Imports every lazily registered blueprint so workers share the full
+    URL map copy-on-write instead of each importing it on demand.
+    Connections are still opened per worker, on first use.
+
+    Args:
+        app: Flask application instance
+    """
+    lazy_blueprints = app.extensions.get("lazy_blueprints")
+    if lazy_blueprints is not None:
+        lazy_blueprints.load_all()
+
+
 def init_extensions(app: Flask) -> None:
     """
     Initialize Flask extensions
@@ -64,12 +87,25 @@ def init_extensions(app: Flask) -> None:
     Args:
         app: Flask application instance
     """
+    # JSON encoding (orjson when installed)
+    from app.core.serialization import init_json
+
+    init_json(app)
+
+    # Request timing and latency histograms (first, so it times every hook)
+    from app.middleware.metrics import metrics
+
+    metrics.init_app(app)
+
     # Database
     init_db(app)
 
-    # Migrations
-    migrate = Migrate()
-    migrate.init_app(app, db)
+    # Migrations (alembic is slow to import and only used by "flask db")
+    if not app.config.get("LAZY_EXTENSIONS", True) or os.getenv("FLASK_RUN_FROM_CLI"):
+        from flask_migrate import Migrate
+
+        migrate = Migrate(render_as_batch=True)
+        migrate.init_app(app, db)
 
     # CORS
     CORS(
@@ -84,7 +120,7 @@ def init_extensions(app: Flask) -> None:
     from app.utils.jwt_utils import init_jwt
     init_jwt(app)
 
-    # Cache (Redis)
+    # Cache (Redis; connects on first use with LAZY_EXTENSIONS)
     try:
         from app.core.cache import cache
 
@@ -92,9 +128,35 @@ def init_extensions(app: Flask) -> None:
     except Exception as e:
         app.logger.warning(f"Cache initialization failed: {e}")
 
-    # SocketIO (will be added in real-time milestone)
-    # from flask_socketio import SocketIO
-    # socketio = SocketIO(app)
+    # Rate limiting (Redis GCRA, see app.middleware.rate_limit)
+    from app.middleware.rate_limit import limiter
+
+    limiter.init_app(app)
+
+    # Response compression (gzip/brotli)
+    from app.middleware.compression import compressor
+
+    compressor.init_app(app)
+
+    # ETags, conditional GET and response caching (runs before compression)
+    from app.middleware.http_cache import response_cache
+
+    response_cache.init_app(app)
+
+    # Paper trading engine (orders and fills are persisted asynchronously)
+    if app.config.get("DEFAULT_BROKER") == "paper_trading":
+        from app.risk import risk_feed
+        from app.trading import matching_engine
+
+        matching_engine.init_app(app)
+        # Challenge rules, marked to the quote feed, with equity sampling
+        risk_feed.init_app(app)
+
+    # Real-time gateway (Socket.IO quotes, fills and risk alerts)
+    if app.config.get("REALTIME_ENABLED"):
+        from app.realtime import gateway
+
+        gateway.init_app(app)
 
     app.logger.info("Extensions initialized")
 
@@ -107,8 +169,11 @@ def register_blueprints(app: Flask) -> None:
         app: Flask application instance
     """
 
+    from app.middleware.rate_limit import limiter
+
     # Health check endpoint
     @app.route("/health", methods=["GET"])
+    @limiter.exempt
     def health_check():
         """Health check endpoint"""
         from app.core.database import DatabaseHealthCheck
@@ -133,11 +198,34 @@ def register_blueprints(app: Flask) -> None:
 
         return jsonify(status), 200 if db_healthy else 503
 
+    # Request metrics endpoint
+    from app.middleware.metrics import metrics, register_metrics_endpoint
+
+    if metrics.enabled:
+        register_metrics_endpoint(app)
+
     # API v1 Blueprint
-    from app.api.v1 import api_v1_bp
+    from app.api.v1 import ENDPOINT_BLUEPRINTS, api_v1_bp
 
     app.register_blueprint(api_v1_bp, url_prefix="/api/v1")
 
+    # Endpoint blueprints, nested under api_v1 by name
+    if app.config.get("LAZY_BLUEPRINTS"):
+        lazy_blueprints = LazyBlueprints(app)
+        for import_name, url_prefix in ENDPOINT_BLUEPRINTS:
+            lazy_blueprints.add(
+                import_name, f"/api/v1{url_prefix}", name_prefix=api_v1_bp.name
+            )
+    else:
+        from werkzeug.utils import import_string
+
+        for import_name, url_prefix in ENDPOINT_BLUEPRINTS:
+            app.register_blueprint(
+                import_string(import_name),
+                url_prefix=f"/api/v1{url_prefix}",
+                name_prefix=api_v1_bp.name,
+            )
+
     app.logger.info("Blueprints registered")
 
 
@@ -262,26 +350,15 @@ def setup_logging(app: Flask) -> None:
     """
     Setup application logging
 
+    Records are enqueued by the calling thread and written as JSON by a
+    background listener (see app.core.log_pipeline).
+
     Args:
         app: Flask application instance
     """
-    log_level = app.config.get("LOG_LEVEL", "INFO")
-    log_format = app.config.get(
-        "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    from app.core.log_pipeline import init_logging
 
-    # Configure root logger
-    logging.basicConfig(level=getattr(logging, log_level), format=log_format)
-
-    # Configure app logger
-    app.logger.setLevel(getattr(logging, log_level))
-
-    # Create logs directory if it doesn't exist
-    log_file = app.config.get("LOG_FILE")
-    if log_file:
-        log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
+    init_logging(app)
 
 
 def register_cli_commands(app: Flask) -> None:
@@ -343,6 +420,123 @@ def register_cli_commands(app: Flask) -> None:
 
         print("✅ Database seeded successfully")
 
+    @app.cli.command("provision-users")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option(
+        "--format", "file_format", type=click.Choice(["csv", "jsonl"]),
+        help="Input format (defaults to the file extension)",
+    )
+    @click.option("--batch-size", type=int, help="Rows per batch")
+    @click.option("--workers", type=int, help="Password hashing processes")
+    @click.option(
+        "--report", "report_path", type=click.Path(dir_okay=False),
+        help="Write rejected rows to this JSONL file",
+    )
+    def provision_users_command(path, file_format, batch_size, workers, report_path):
+        """Bulk-create users from a CSV or JSONL file"""
+        from app.services.provisioning_service import (
+            ProvisioningReport,
+            UserProvisioningService,
+        )
+
+        file_format = file_format or path.rsplit(".", 1)[-1].lower()
+        report_file = open(report_path, "w") if report_path else None
+
+        try:
+            report = ProvisioningReport(error_stream=report_file)
+            with open(path, "rb") as stream:
+                UserProvisioningService.provision(
+                    UserProvisioningService.read_rows(stream, file_format),
+                    batch_size=batch_size,
+                    hash_workers=workers,
+                    report=report,
+                    progress=lambda r: print(
+                        f"  processed {r.processed} (created {r.created}, failed {r.failed})"
+                    ),
+                )
+        finally:
+            if report_file:
+                report_file.close()
+
+        print(f"✅ Created {report.created} users, {report.failed} rows rejected")
+        if report.failed and not report_path:
+            for entry in report.errors[:20]:
+                print(f"  row {entry['row']}: {entry['errors']}")
+
+    @app.cli.command("flush-activity")
+    def flush_activity_command():
+        """Flush buffered last-login/last-seen timestamps to the database"""
+        from app.services.activity_service import UserActivityService
+
+        updated = UserActivityService.flush(
+            batch_size=app.config.get("ACTIVITY_FLUSH_BATCH_SIZE", 1000)
+        )
+        print(f"✅ Flushed activity for {updated} users")
+
+    @app.cli.command("ingest-market-data")
+    @click.option("--source", "source_spec", help="Tick source (default MARKET_DATA_SOURCE)")
+    @click.option("--speed", type=float, help="Replay speed for file sources (default: unpaced)")
+    @click.option("--interval", type=float, help="Seconds between quote publishes")
+    @click.option("--duration", type=float, help="Stop after this many seconds")
+    @click.option("--bars/--no-bars", default=True, help="Also record OHLCV bars in the bar store")
+    def ingest_market_data_command(source_spec, speed, interval, duration, bars):
+        """Stream ticks into the latest-quote store until stopped"""
+        import json
+        import signal
+
+        from app.market_data import MarketDataIngestor, create_source
+
+        bar_builder = None
+        if bars:
+            from app.market_data.bars import BarBuilder, bar_store
+
+            bar_store.init_app(app, writable=True)
+            bar_builder = BarBuilder(bar_store)
+
+        spec = source_spec or app.config.get("MARKET_DATA_SOURCE", "synthetic:20")
+        options = {"speed": speed} if speed and spec.startswith("file:") else {}
+        ingestor = MarketDataIngestor(
+            create_source(spec, **options),
+            refresh_interval=interval or app.config.get("MARKET_DATA_REFRESH_INTERVAL", 5),
+            batch_size=app.config.get("MARKET_DATA_BATCH_SIZE", 5000),
+            bar_builder=bar_builder,
+        )
+        signal.signal(signal.SIGTERM, lambda *_: ingestor.stop())
+
+        print(f"📈 Ingesting {spec} (Ctrl+C to stop)")
+        try:
+            stats = ingestor.run(duration=duration)
+        except KeyboardInterrupt:
+            stats = ingestor.stats()
+        if bar_builder is not None:
+            bar_store.flush()
+        print(json.dumps(stats, indent=2))
+
+    @app.cli.command("reconcile-leaderboard")
+    def reconcile_leaderboard_command():
+        """Rebuild the global profit leaderboards from the fills table"""
+        from app.services.leaderboard_service import LeaderboardService
+
+        stats = LeaderboardService.reconcile()
+        if stats.get("skipped"):
+            print(f"⏭️  Skipped: {stats['skipped']}")
+            return
+        print(f"✅ Replayed {stats['fills']} fills")
+        for key, members in stats["boards"].items():
+            print(f"   {key}: {members} users")
+
+    @app.cli.command("compact-equity")
+    def compact_equity_command():
+        """Roll 1m equity buckets up into 1h buckets and apply retention"""
+        from app.trading.equity import equity_recorder
+
+        equity_recorder.init_app(app)
+        stats = equity_recorder.compact()
+        print(
+            f"✅ {stats['inserted']} hourly buckets added, {stats['updated']} updated, "
+            f"{stats['deleted']} minute buckets deleted"
+        )
+
     @app.cli.command("reset-db")
     def reset_db_command():
         """Reset the database (WARNING: deletes all data)"""
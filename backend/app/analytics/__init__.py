@@ -0,0 +1,13 @@
+"""
+TradeSense AI Platform - Analytics
+Performance statistics of closed trades (see app.analytics.metrics)
+
+Importing this package loads NumPy; nothing imports it at app startup.
+"""
+
+from app.analytics.metrics import TradeStats, compute
+
+__all__ = [
+    "TradeStats",
+    "compute",
+]
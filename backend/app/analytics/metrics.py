@@ -0,0 +1,188 @@
+"""
+TradeSense AI Platform - Trade Metrics
+Performance statistics of closed trades, vectorized and incremental
+
+TradeStats keeps running sums rather than the trades themselves:
+
+- counts, gross profit and gross loss
+- the sum of squares and of downside squares
+- cumulative P&L with its peak and deepest drawdown
+- totals per symbol
+
+update() folds a batch of closed trades in with one vectorized pass. The
+running peak is carried over between batches, so drawdowns come out the
+same whether trades arrive one at a time or all at once. A report can
+therefore be extended trade by trade instead of recomputed, and its state
+is small enough to cache.
+
+Sharpe and Sortino ratios are per trade (mean P&L over its standard
+deviation, or over its downside deviation) and not annualized: closed
+trades are not evenly spaced in time.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Per-symbol totals: trades, wins, net P&L, gross profit, gross loss
+SYMBOL_FIELDS = ("trades", "wins", "net", "gross_profit", "gross_loss")
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return numerator / denominator if denominator else None
+
+
+class TradeStats:
+    """Running performance statistics of a sequence of closed trades"""
+
+    def __init__(self, initial_balance: float = 0.0):
+        """
+        Args:
+            initial_balance: Account balance before the first trade; the
+                base of percentage drawdowns
+        """
+        self.initial_balance = float(initial_balance)
+        self.trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0  # positive
+        self.sum_squares = 0.0
+        self.downside_squares = 0.0
+        self.best: Optional[float] = None
+        self.worst: Optional[float] = None
+        # Cumulative P&L, its high-water mark and the deepest fall from it
+        self.net = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+        self.symbols: Dict[str, List[float]] = {}
+
+    def update(self, pnl, symbols=None) -> "TradeStats":
+        """
+        Add closed trades, in the order they were closed
+
+        Args:
+            pnl: Realized P&L per trade
+            symbols: Symbol per trade (optional, for the per-symbol breakdown)
+
+        Returns:
+            Self for method chaining
+        """
+        pnl = np.asarray(pnl, dtype=float)
+        if not len(pnl):
+            return self
+        wins = pnl > 0
+        losses = pnl < 0
+        profits = np.where(wins, pnl, 0.0)
+        losses_abs = np.where(losses, -pnl, 0.0)
+
+        self.trades += len(pnl)
+        self.wins += int(np.count_nonzero(wins))
+        self.losses += int(np.count_nonzero(losses))
+        self.gross_profit += float(profits.sum())
+        self.gross_loss += float(losses_abs.sum())
+        self.sum_squares += float(pnl @ pnl)
+        self.downside_squares += float(losses_abs @ losses_abs)
+        high, low = float(pnl.max()), float(pnl.min())
+        self.best = high if self.best is None else max(self.best, high)
+        self.worst = low if self.worst is None else min(self.worst, low)
+
+        # Drawdown continues from the running peak of earlier batches
+        equity = self.net + np.cumsum(pnl)
+        peaks = np.maximum(np.maximum.accumulate(equity), self.peak)
+        drawdown = peaks - equity
+        base = self.initial_balance + peaks
+        percent = np.divide(drawdown, base, out=np.zeros_like(drawdown), where=base > 0)
+        self.max_drawdown = max(self.max_drawdown, float(drawdown.max()))
+        self.max_drawdown_pct = max(self.max_drawdown_pct, float(percent.max()))
+        self.net = float(equity[-1])
+        self.peak = float(peaks[-1])
+
+        if symbols is not None:
+            names, inverse = np.unique(np.asarray(symbols, dtype=str), return_inverse=True)
+            inverse = inverse.ravel()
+            columns = [
+                np.bincount(inverse, minlength=len(names)),
+                np.bincount(inverse, weights=wins, minlength=len(names)),
+                np.bincount(inverse, weights=pnl, minlength=len(names)),
+                np.bincount(inverse, weights=profits, minlength=len(names)),
+                np.bincount(inverse, weights=losses_abs, minlength=len(names)),
+            ]
+            for name, values in zip(names.tolist(), zip(*(column.tolist() for column in columns))):
+                totals = self.symbols.setdefault(name, [0, 0, 0.0, 0.0, 0.0])
+                for index, value in enumerate(values):
+                    totals[index] += value
+        return self
+
+    def report(self) -> Dict:
+        """
+        Metrics of the trades added so far
+
+        Returns:
+            Dictionary with trades, wins, losses, win_rate, net_pnl,
+            gross_profit, gross_loss, profit_factor, average_win,
+            average_loss, expectancy, best_trade, worst_trade, sharpe,
+            sortino, max_drawdown, max_drawdown_pct and per-symbol
+            breakdowns under "symbols". Ratios without a denominator
+            (no trades, no losses) are None.
+        """
+        count = self.trades
+        mean = _ratio(self.net, count)
+        sharpe = None
+        if count > 1:
+            variance = max(self.sum_squares - count * mean * mean, 0.0) / (count - 1)
+            sharpe = _ratio(mean, math.sqrt(variance))
+        downside = math.sqrt(self.downside_squares / count) if count else 0.0
+
+        return {
+            "trades": count,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": _ratio(self.wins, count),
+            "net_pnl": self.net,
+            "gross_profit": self.gross_profit,
+            "gross_loss": self.gross_loss,
+            "profit_factor": _ratio(self.gross_profit, self.gross_loss),
+            "average_win": _ratio(self.gross_profit, self.wins),
+            "average_loss": _ratio(self.gross_loss, self.losses),
+            "expectancy": mean,
+            "best_trade": self.best,
+            "worst_trade": self.worst,
+            "sharpe": sharpe,
+            "sortino": _ratio(mean, downside) if mean is not None else None,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "symbols": {
+                name: {
+                    "trades": int(trades),
+                    "win_rate": _ratio(wins, trades),
+                    "net_pnl": net,
+                    "profit_factor": _ratio(gross_profit, gross_loss),
+                    "expectancy": _ratio(net, trades),
+                }
+                for name, (trades, wins, net, gross_profit, gross_loss) in sorted(self.symbols.items())
+            },
+        }
+
+
+def compute(pnl, symbols=None, initial_balance: float = 0.0) -> Dict:
+    """
+    Performance report of a sequence of closed trades
+
+    Args:
+        pnl: Realized P&L per trade, in closing order
+        symbols: Symbol per trade (optional)
+        initial_balance: Balance before the first trade
+
+    Returns:
+        TradeStats.report() of the trades
+
+    Usage:
+        compute([120.0, -40.0, 75.5], ["BTCUSD", "ETHUSD", "BTCUSD"], 100000)
+    """
+    return TradeStats(initial_balance).update(pnl, symbols).report()
+
+
+__all__ = ["SYMBOL_FIELDS", "TradeStats", "compute"]
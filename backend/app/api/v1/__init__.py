@@ -7,21 +7,26 @@ from datetime import datetime
 
 from flask import Blueprint, jsonify, request
 
+from app.middleware.http_cache import response_cache
+
 # Create API v1 Blueprint
 api_v1_bp = Blueprint("api_v1", __name__)
 
 
 @api_v1_bp.route("/", methods=["GET"])
+@response_cache.cache_control("public, max-age=60")
+@response_cache.cached(timeout=60)
 def api_root():
     """
     API v1 root endpoint - provides API information
+
+    The body is static so it can be cached; /ping returns the server time.
     """
     return jsonify(
         {
             "success": True,
             "message": "Welcome to TradeSense AI Platform API v1",
             "version": "1.0.0",
-            "timestamp": datetime.utcnow().isoformat(),
             "endpoints": {
                 "health": "/health",
                 "auth": "/api/v1/auth",
@@ -37,6 +42,7 @@ def api_root():
 
 
 @api_v1_bp.route("/ping", methods=["GET"])
+@response_cache.cache_control("no-store")
 def ping():
     """
     Simple ping endpoint to test API availability
@@ -51,6 +57,8 @@ def ping():
 
 
 @api_v1_bp.route("/info", methods=["GET"])
+@response_cache.cache_control("public, max-age=300")
+@response_cache.cached(timeout=300)
 def api_info():
     """
     Get detailed API information
@@ -79,19 +87,21 @@ def api_info():
     ), 200
 
 
-# Import and register auth blueprint
-from app.api.v1.endpoints.auth import auth_bp
-
-api_v1_bp.register_blueprint(auth_bp, url_prefix="/auth")
-
-# Future blueprints will be registered here:
-# from app.api.v1.endpoints.users import users_bp
-# from app.api.v1.endpoints.challenges import challenges_bp
-# from app.api.v1.endpoints.trades import trades_bp
-
-# api_v1_bp.register_blueprint(users_bp, url_prefix="/users")
-# api_v1_bp.register_blueprint(challenges_bp, url_prefix="/challenges")
-# api_v1_bp.register_blueprint(trades_bp, url_prefix="/trades")
-
-
-__all__ = ["api_v1_bp"]
+# Endpoint blueprints mounted under /api/v1, as (import path, url prefix).
+# They are registered by the app factory, either at startup or on the
+# first request to their prefix (LAZY_BLUEPRINTS), with endpoint names
+# nested under this blueprint ("api_v1.auth.login").
+ENDPOINT_BLUEPRINTS = [
+    ("app.api.v1.endpoints.auth:auth_bp", "/auth"),
+    ("app.api.v1.endpoints.users:users_bp", "/users"),
+    ("app.api.v1.endpoints.market_data:market_data_bp", "/market-data"),
+    ("app.api.v1.endpoints.leaderboard:leaderboard_bp", "/leaderboard"),
+    ("app.api.v1.endpoints.equity:equity_bp", "/equity"),
+    ("app.api.v1.endpoints.analytics:analytics_bp", "/analytics"),
+    # Future blueprints will be registered here:
+    # ("app.api.v1.endpoints.challenges:challenges_bp", "/challenges"),
+    # ("app.api.v1.endpoints.trades:trades_bp", "/trades"),
+]
+
+
+__all__ = ["api_v1_bp", "ENDPOINT_BLUEPRINTS"]
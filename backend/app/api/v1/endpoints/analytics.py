@@ -0,0 +1,48 @@
+"""
+TradeSense AI Platform - Analytics Endpoints
+API endpoints for trading performance analytics
+"""
+
+from flask import Blueprint, jsonify
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from app.middleware.http_cache import response_cache
+from app.middleware.rate_limit import limiter
+from app.services.analytics_service import AnalyticsService
+
+# Create analytics blueprint
+analytics_bp = Blueprint('analytics', __name__)
+limiter.limit_blueprint(analytics_bp, '120 per minute')
+
+
+@analytics_bp.route('/report', methods=['GET'])
+@jwt_required()
+@response_cache.cache_control('private, no-cache')
+def get_report():
+    """
+    Get the current user's performance report
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Response:
+        {
+            "success": true,
+            "data": {
+                "trades": 42, "win_rate": 0.57, "profit_factor": 1.8,
+                "expectancy": 31.2, "sharpe": 0.21, "sortino": 0.35,
+                "max_drawdown": 1850.0, "max_drawdown_pct": 0.018, ...,
+                "symbols": {"BTCUSD": {"trades": 30, "win_rate": 0.6, "net_pnl": 1020.5, ...}},
+                "last_fill_id": 91234
+            }
+        }
+    """
+    report = AnalyticsService.get_report(int(get_jwt_identity()))
+
+    return jsonify({
+        'success': True,
+        'data': report
+    }), 200
+
+
+__all__ = ['analytics_bp']
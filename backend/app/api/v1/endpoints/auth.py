@@ -4,44 +4,36 @@ API endpoints for user authentication, registration, and password management
 """
 
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from marshmallow import ValidationError
+from flask_jwt_extended import jwt_required, get_jwt
 
 from app.services.auth_service import AuthService
 from app.api.v1.schemas.auth_schemas import (
     RegisterSchema,
     LoginSchema,
-    RefreshTokenSchema,
     ForgotPasswordSchema,
     ResetPasswordSchema,
     ChangePasswordSchema,
-    UserResponseSchema,
-    AuthResponseSchema,
 )
+from app.middleware.http_cache import response_cache
+from app.middleware.rate_limit import limiter
 from app.utils.jwt_utils import get_current_user
+from app.utils.validation import validate_body
 from app.core.exceptions import (
     AuthenticationError,
     ConflictError,
     NotFoundError,
+    RateLimitError,
     ValidationError as AppValidationError,
 )
 
 # Create auth blueprint
 auth_bp = Blueprint('auth', __name__)
 
-# Initialize schemas
-register_schema = RegisterSchema()
-login_schema = LoginSchema()
-refresh_schema = RefreshTokenSchema()
-forgot_password_schema = ForgotPasswordSchema()
-reset_password_schema = ResetPasswordSchema()
-change_password_schema = ChangePasswordSchema()
-user_response_schema = UserResponseSchema()
-auth_response_schema = AuthResponseSchema()
-
 
 @auth_bp.route('/register', methods=['POST'])
-def register():
+@limiter.limit('10 per hour')
+@validate_body(RegisterSchema)
+def register(data: RegisterSchema):
     """
     Register a new user
 
@@ -67,16 +59,13 @@ def register():
         }
     """
     try:
-        # Validate request data
-        data = register_schema.load(request.get_json())
-
-        # Register user
+        # Register user (body validated by RegisterSchema)
         user, access_token, refresh_token = AuthService.register_user(
-            email=data['email'],
-            username=data['username'],
-            password=data['password'],
-            first_name=data['first_name'],
-            last_name=data['last_name'],
+            email=data.email,
+            username=data.username,
+            password=data.password,
+            first_name=data.first_name,
+            last_name=data.last_name,
         )
 
         # Prepare response
@@ -93,14 +82,6 @@ def register():
             'data': response_data
         }), 201
 
-    except ValidationError as e:
-        return jsonify({
-            'success': False,
-            'error': 'ValidationError',
-            'message': 'Validation failed',
-            'errors': e.messages
-        }), 400
-
     except ConflictError as e:
         return jsonify({
             'success': False,
@@ -125,7 +106,9 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
-def login():
+@limiter.limit('10 per minute')
+@validate_body(LoginSchema)
+def login(data: LoginSchema):
     """
     Login user and return JWT tokens
 
@@ -148,13 +131,11 @@ def login():
         }
     """
     try:
-        # Validate request data
-        data = login_schema.load(request.get_json())
-
         # Authenticate user
         user, access_token, refresh_token = AuthService.login_user(
-            email=data['email'],
-            password=data['password']
+            email=data.email,
+            password=data.password,
+            ip_address=request.remote_addr
         )
 
         # Prepare response
@@ -171,14 +152,6 @@ def login():
             'data': response_data
         }), 200
 
-    except ValidationError as e:
-        return jsonify({
-            'success': False,
-            'error': 'ValidationError',
-            'message': 'Validation failed',
-            'errors': e.messages
-        }), 400
-
     except AuthenticationError as e:
         return jsonify({
             'success': False,
@@ -186,6 +159,13 @@ def login():
             'message': str(e)
         }), 401
 
+    except RateLimitError as e:
+        return jsonify({
+            'success': False,
+            'error': 'RateLimitExceeded',
+            'message': str(e)
+        }), 429
+
     except Exception as e:
         return jsonify({
             'success': False,
@@ -198,7 +178,7 @@ def login():
 @jwt_required()
 def logout():
     """
-    Logout user (client should discard tokens)
+    Logout user and revoke the session's refresh token family
 
     Response:
         {
@@ -206,9 +186,7 @@ def logout():
             "message": "Logout successful"
         }
     """
-    # In a more advanced implementation, you would:
-    # 1. Add token to blacklist/revocation list
-    # 2. Store in Redis with TTL matching token expiry
+    AuthService.logout_user(get_jwt())
 
     return jsonify({
         'success': True,
@@ -217,6 +195,7 @@ def logout():
 
 
 @auth_bp.route('/refresh', methods=['POST'])
+@limiter.limit('30 per minute')
 @jwt_required(refresh=True)
 def refresh():
     """
@@ -237,13 +216,9 @@ def refresh():
         }
     """
     try:
-        # Get user ID from refresh token
-        user_id = get_jwt_identity()
-
-        # Generate new tokens
+        # Rotate the validated refresh token
         access_token, refresh_token = AuthService.refresh_access_token(
-            refresh_token=None,  # We already validated it
-            user_id=user_id
+            refresh_claims=get_jwt()
         )
 
         return jsonify({
@@ -272,7 +247,10 @@ def refresh():
 
 
 @auth_bp.route('/me', methods=['GET'])
+@limiter.limit('120 per minute', key='user')
 @jwt_required()
+@response_cache.cache_control('private, no-cache')
+@response_cache.etag(lambda: get_current_user().cache_version())
 def get_current_user_info():
     """
     Get current authenticated user information
@@ -307,7 +285,9 @@ def get_current_user_info():
 
 
 @auth_bp.route('/forgot-password', methods=['POST'])
-def forgot_password():
+@limiter.limit('5 per hour')
+@validate_body(ForgotPasswordSchema)
+def forgot_password(data: ForgotPasswordSchema):
     """
     Request password reset email
 
@@ -322,29 +302,20 @@ def forgot_password():
             "message": "If this email exists, a password reset link will be sent"
         }
     """
-    try:
-        data = forgot_password_schema.load(request.get_json())
-
-        # Request password reset
-        AuthService.request_password_reset(data['email'])
-
-        # Always return success to prevent email enumeration
-        return jsonify({
-            'success': True,
-            'message': 'If this email exists, a password reset link will be sent'
-        }), 200
+    # Request password reset
+    AuthService.request_password_reset(data.email)
 
-    except ValidationError as e:
-        return jsonify({
-            'success': False,
-            'error': 'ValidationError',
-            'message': 'Validation failed',
-            'errors': e.messages
-        }), 400
+    # Always return success to prevent email enumeration
+    return jsonify({
+        'success': True,
+        'message': 'If this email exists, a password reset link will be sent'
+    }), 200
 
 
 @auth_bp.route('/reset-password', methods=['POST'])
-def reset_password():
+@limiter.limit('10 per hour')
+@validate_body(ResetPasswordSchema)
+def reset_password(data: ResetPasswordSchema):
     """
     Reset password using token
 
@@ -361,12 +332,10 @@ def reset_password():
         }
     """
     try:
-        data = reset_password_schema.load(request.get_json())
-
         # Reset password
         AuthService.reset_password(
-            token=data['token'],
-            new_password=data['password']
+            token=data.token,
+            new_password=data.password
         )
 
         return jsonify({
@@ -374,14 +343,6 @@ def reset_password():
             'message': 'Password reset successful. You can now login with your new password.'
         }), 200
 
-    except ValidationError as e:
-        return jsonify({
-            'success': False,
-            'error': 'ValidationError',
-            'message': 'Validation failed',
-            'errors': e.messages
-        }), 400
-
     except AppValidationError as e:
         return jsonify({
             'success': False,
@@ -391,8 +352,10 @@ def reset_password():
 
 
 @auth_bp.route('/change-password', methods=['POST'])
+@limiter.limit('5 per hour', key='user')
 @jwt_required()
-def change_password():
+@validate_body(ChangePasswordSchema)
+def change_password(data: ChangePasswordSchema):
     """
     Change user password (requires authentication)
 
@@ -413,13 +376,12 @@ def change_password():
     """
     try:
         user = get_current_user()
-        data = change_password_schema.load(request.get_json())
 
         # Change password
         AuthService.change_password(
             user=user,
-            current_password=data['current_password'],
-            new_password=data['new_password']
+            current_password=data.current_password,
+            new_password=data.new_password
         )
 
         return jsonify({
@@ -427,14 +389,6 @@ def change_password():
             'message': 'Password changed successfully'
         }), 200
 
-    except ValidationError as e:
-        return jsonify({
-            'success': False,
-            'error': 'ValidationError',
-            'message': 'Validation failed',
-            'errors': e.messages
-        }), 400
-
     except AuthenticationError as e:
         return jsonify({
             'success': False,
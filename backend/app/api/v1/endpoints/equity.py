@@ -0,0 +1,55 @@
+"""
+TradeSense AI Platform - Equity Endpoints
+API endpoints for account equity curves
+"""
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from app.api.v1.schemas.equity_schemas import EquityCurveQuerySchema
+from app.middleware.http_cache import response_cache
+from app.middleware.rate_limit import limiter
+from app.services.equity_service import EquityService
+from app.utils.validation import validate_data
+
+# Create equity blueprint
+equity_bp = Blueprint('equity', __name__)
+limiter.limit_blueprint(equity_bp, '120 per minute')
+
+
+@equity_bp.route('/curve', methods=['GET'])
+@jwt_required()
+@response_cache.cache_control('private, no-cache')
+def get_equity_curve():
+    """
+    Get the current user's equity curve
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Query Parameters:
+        start: Range start, epoch seconds (default: a day before end)
+        end: Range end, epoch seconds (default: now)
+        max_points: Maximum number of points (default and cap EQUITY_MAX_POINTS)
+
+    Response:
+        {
+            "success": true,
+            "data": {
+                "resolution": "1m",
+                "timestamp": [...], "open": [...], "high": [...], "low": [...], "close": [...]
+            }
+        }
+    """
+    query = validate_data(EquityCurveQuerySchema, request.args.to_dict())
+    curve = EquityService.get_curve(
+        int(get_jwt_identity()), start=query.start, end=query.end, max_points=query.max_points
+    )
+
+    return jsonify({
+        'success': True,
+        'data': curve
+    }), 200
+
+
+__all__ = ['equity_bp']
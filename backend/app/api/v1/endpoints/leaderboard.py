@@ -0,0 +1,98 @@
+"""
+TradeSense AI Platform - Leaderboard Endpoints
+API endpoints for rankings by profit and return
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from app.api.v1.schemas.leaderboard_schemas import BoardQuerySchema, LeaderboardQuerySchema
+from app.middleware.http_cache import response_cache
+from app.middleware.rate_limit import limiter
+from app.services.leaderboard_service import LeaderboardService
+from app.utils.validation import validate_data
+
+# Create leaderboard blueprint
+leaderboard_bp = Blueprint('leaderboard', __name__)
+limiter.limit_blueprint(leaderboard_bp, '120 per minute')
+
+
+def _board(query) -> dict:
+    """board_key() arguments of a validated query"""
+    board = {
+        'metric': query.metric,
+        'period': query.period,
+        'challenge_type': query.challenge_type,
+    }
+    if query.period_id and query.period != 'all':
+        board['period_key'] = f'{query.period}:{query.period_id}'
+    return board
+
+
+@leaderboard_bp.route('', methods=['GET'])
+@response_cache.cache_control('public, max-age=5')
+def get_leaderboard():
+    """
+    Get the top of a leaderboard
+
+    Query Parameters:
+        metric: "profit" (realized P&L, default) or "return" (percent)
+        period: "all" (default), "daily", "weekly" or "monthly"
+        challenge_type: Only accounts of a challenge type (e.g. "100k")
+        period_id: A past period, e.g. "2026-10-18" with period=daily
+        limit: Entries per page (default 10, max LEADERBOARD_MAX_LIMIT)
+        offset: Entries to skip
+
+    Response:
+        {
+            "success": true,
+            "data": {
+                "board": "lb:profit:all:global",
+                "total": 1250,
+                "entries": [{"rank": 1, "user_id": 7, "username": "...", "score": 5230.5}]
+            }
+        }
+    """
+    query = validate_data(LeaderboardQuerySchema, request.args.to_dict())
+    limit = min(query.limit, current_app.config.get('LEADERBOARD_MAX_LIMIT', 100))
+
+    board = LeaderboardService.top(limit=limit, offset=query.offset, **_board(query))
+    usernames = LeaderboardService.usernames([entry['user_id'] for entry in board['entries']])
+    for entry in board['entries']:
+        entry['username'] = usernames.get(entry['user_id'])
+
+    return jsonify({
+        'success': True,
+        'data': board
+    }), 200
+
+
+@leaderboard_bp.route('/me', methods=['GET'])
+@jwt_required()
+@response_cache.cache_control('private, no-cache')
+def get_my_rank():
+    """
+    Get the current user's rank on a leaderboard
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Query Parameters:
+        metric, period, challenge_type, period_id: as for the top list
+
+    Response:
+        {
+            "success": true,
+            "data": {"board": "...", "user_id": 7, "rank": 12, "score": 830.0, "total": 1250}
+        }
+    """
+    query = validate_data(BoardQuerySchema, request.args.to_dict())
+    rank = LeaderboardService.rank(int(get_jwt_identity()), **_board(query))
+
+    return jsonify({
+        'success': True,
+        'data': rank
+    }), 200
+
+
+__all__ = ['leaderboard_bp']
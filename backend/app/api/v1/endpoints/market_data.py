@@ -0,0 +1,129 @@
+"""
+TradeSense AI Platform - Market Data Endpoints
+API endpoints for latest quotes and OHLCV bar history
+"""
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from app.api.v1.schemas.market_data_schemas import BarsQuerySchema
+from app.middleware.http_cache import response_cache
+from app.middleware.rate_limit import limiter
+from app.services.market_data_service import MarketDataService
+from app.utils.validation import validate_data
+
+# Create market data blueprint
+market_data_bp = Blueprint('market_data', __name__)
+limiter.limit_blueprint(market_data_bp, '300 per minute')
+
+BINARY_MIMETYPE = 'application/octet-stream'
+STREAM_CHUNK = 8192  # bars per streamed chunk
+
+
+@market_data_bp.route('/quotes', methods=['GET'])
+@response_cache.cache_control('no-cache')
+def get_quotes():
+    """
+    Get the latest quotes
+
+    Query Parameters:
+        symbols: Comma-separated symbols (default: all published symbols)
+
+    Response:
+        {
+            "success": true,
+            "data": {"BTCUSD": {"bid": ..., "ask": ..., "last": ..., "volume": ..., "timestamp": ...}}
+        }
+    """
+    symbols = request.args.get('symbols')
+    quotes = MarketDataService.get_quotes(
+        [symbol.strip() for symbol in symbols.split(',') if symbol.strip()] if symbols else None
+    )
+    return jsonify({
+        'success': True,
+        'data': quotes
+    }), 200
+
+
+@market_data_bp.route('/bars', methods=['GET'])
+@response_cache.cache_control('no-cache')
+def get_bars():
+    """
+    Get OHLCV bars of a symbol, streamed
+
+    Query Parameters:
+        symbol: Instrument symbol (required)
+        timeframe: 1m, 5m, 15m, 30m, 1h, 4h or 1d (default 1m)
+        start, end: Bar open time range, epoch seconds (inclusive)
+        limit: Most recent bars of the range (capped at MARKET_DATA_MAX_BARS)
+        format: "json" (default) or "binary"; "Accept: application/octet-stream"
+                also selects binary
+
+    Response (json, columnar):
+        {
+            "success": true,
+            "data": {
+                "symbol": "BTCUSD",
+                "timeframe": "1h",
+                "count": 2,
+                "bars": {"timestamp": [...], "open": [...], "high": [...],
+                         "low": [...], "close": [...], "volume": [...]}
+            }
+        }
+
+    Response (binary):
+        The columns back to back, each `count` little-endian values in the
+        order and types given by the X-Bar-Columns header
+        ("timestamp:<i8,open:<f8,..."); X-Bar-Count holds `count`.
+    """
+    query = validate_data(BarsQuerySchema, request.args.to_dict())
+    bars = MarketDataService.get_bars(
+        query.symbol, query.timeframe, start=query.start, end=query.end, limit=query.limit
+    )
+
+    binary = query.format == 'binary' or (
+        query.format is None
+        and request.accept_mimetypes.best_match(['application/json', BINARY_MIMETYPE]) == BINARY_MIMETYPE
+    )
+    if binary:
+        response = Response(
+            stream_with_context(_binary_chunks(bars)), mimetype=BINARY_MIMETYPE
+        )
+        response.headers['X-Bar-Count'] = str(len(bars))
+        response.headers['X-Bar-Columns'] = ','.join(
+            f'{name}:{column.dtype.str}' for name, column in bars.columns()
+        )
+        response.headers['Content-Length'] = str(
+            sum(column.nbytes for _, column in bars.columns())
+        )
+        return response
+
+    return Response(
+        stream_with_context(_json_chunks(bars, current_app.json)), mimetype='application/json'
+    )
+
+
+def _binary_chunks(bars):
+    """Each column in bounded chunks straight from the mapped file"""
+    for _, column in bars.columns():
+        for offset in range(0, len(column), STREAM_CHUNK):
+            yield column[offset:offset + STREAM_CHUNK].tobytes()
+
+
+def _json_chunks(bars, json):
+    """The JSON document column by column, without building it in memory"""
+    head = json.dumps_bytes({
+        'success': True,
+        'data': {'symbol': bars.symbol, 'timeframe': bars.timeframe, 'count': len(bars)},
+    })
+    # Reopen the data object to append the bars
+    yield head[:-2] + b',"bars":{'
+    for index, (name, column) in enumerate(bars.columns()):
+        yield (b',"' if index else b'"') + name.encode() + b'":['
+        for offset in range(0, len(column), STREAM_CHUNK):
+            chunk = json.dumps_bytes(column[offset:offset + STREAM_CHUNK].tolist())
+            yield (b',' if offset else b'') + chunk[1:-1]
+        yield b']'
+    yield b'}}}\n'
+
+
+__all__ = ['market_data_bp']
@@ -0,0 +1,119 @@
+"""
+TradeSense AI Platform - User Administration Endpoints
+API endpoints for administrative user management
+"""
+
+import os
+import uuid
+
+from flask import Blueprint, current_app, jsonify, request, url_for
+
+from app.middleware.rate_limit import limiter
+from app.models.user import UserRole
+from app.services.provisioning_service import UserProvisioningService
+from app.utils.jwt_utils import get_current_user, require_role
+
+# Create users blueprint
+users_bp = Blueprint('users', __name__)
+limiter.limit_blueprint(users_bp, '60 per minute', key='user')
+
+IMPORT_FORMATS = {'csv', 'jsonl'}
+
+
+@users_bp.route('/bulk', methods=['POST'])
+@require_role(UserRole.ADMIN, UserRole.SUPER_ADMIN)
+def bulk_provision():
+    """
+    Start a bulk user import (admin only)
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Form Data:
+        file: CSV or JSONL file with email, username, first_name, last_name
+              and optional password, role, phone_number columns (role may
+              not rank above the caller's role)
+        format: "csv" or "jsonl" (defaults to the file extension)
+
+    Response:
+        {
+            "success": true,
+            "message": "Import started",
+            "data": {
+                "job_id": "...",
+                "status_url": "/api/v1/users/bulk/<job_id>"
+            }
+        }
+    """
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({
+            'success': False,
+            'error': 'ValidationError',
+            'message': 'An import file is required'
+        }), 400
+
+    file_format = (
+        request.form.get('format') or upload.filename.rsplit('.', 1)[-1]
+    ).lower()
+    if file_format not in IMPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'error': 'ValidationError',
+            'message': f"Unsupported import format. Use one of: {', '.join(sorted(IMPORT_FORMATS))}"
+        }), 400
+
+    # The request stream is gone once we return, so spool the upload to disk
+    import_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'imports')
+    os.makedirs(import_dir, exist_ok=True)
+    path = os.path.join(import_dir, f'{uuid.uuid4().hex}.{file_format}')
+    upload.save(path)
+
+    # Rows may not grant a role above the importing admin's own
+    job_id = UserProvisioningService.start_job(
+        path, file_format, max_role=get_current_user().role
+    )
+
+    return jsonify({
+        'success': True,
+        'message': 'Import started',
+        'data': {
+            'job_id': job_id,
+            'status_url': url_for('.bulk_provision_status', job_id=job_id)
+        }
+    }), 202
+
+
+@users_bp.route('/bulk/<job_id>', methods=['GET'])
+@require_role(UserRole.ADMIN, UserRole.SUPER_ADMIN)
+def bulk_provision_status(job_id):
+    """
+    Get the status and error report of a bulk import (admin only)
+
+    Response:
+        {
+            "success": true,
+            "data": {
+                "status": "running" | "completed" | "failed",
+                "processed": 0,
+                "created": 0,
+                "failed": 0,
+                "errors": [{"row": 3, "email": "...", "errors": {...}}]
+            }
+        }
+    """
+    job = UserProvisioningService.get_job(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'NotFound',
+            'message': 'Import job not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'data': job
+    }), 200
+
+
+__all__ = ['users_bp']
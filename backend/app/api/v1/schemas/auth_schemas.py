@@ -3,141 +3,105 @@ TradeSense AI Platform - Authentication Schemas
 Request/response validation schemas for authentication endpoints
 """
 
-from marshmallow import Schema, fields, validate, validates, ValidationError
+from datetime import datetime
+from typing import Optional
 
+from pydantic import BaseModel, Field
 
-class RegisterSchema(Schema):
+from app.utils.validation import (
+    EmailAddress,
+    Password,
+    PersonName,
+    RequestSchema,
+    Token,
+    Username,
+)
+
+
+class RegisterSchema(RequestSchema):
     """Schema for user registration request"""
 
-    email = fields.Email(required=True, error_messages={
-        'required': 'Email is required',
-        'invalid': 'Invalid email format'
-    })
-
-    username = fields.Str(
-        required=True,
-        validate=validate.Length(min=3, max=80),
-        error_messages={'required': 'Username is required'}
-    )
-
-    password = fields.Str(
-        required=True,
-        validate=validate.Length(min=8, max=128),
-        error_messages={'required': 'Password is required'}
-    )
-
-    first_name = fields.Str(
-        required=True,
-        validate=validate.Length(min=1, max=100),
-        error_messages={'required': 'First name is required'}
-    )
-
-    last_name = fields.Str(
-        required=True,
-        validate=validate.Length(min=1, max=100),
-        error_messages={'required': 'Last name is required'}
-    )
-
-
-class LoginSchema(Schema):
+    email: EmailAddress
+    username: Username
+    password: Password
+    first_name: PersonName
+    last_name: PersonName
+
+
+class LoginSchema(RequestSchema):
     """Schema for user login request"""
 
-    email = fields.Email(required=True, error_messages={
-        'required': 'Email is required',
-        'invalid': 'Invalid email format'
-    })
+    email: EmailAddress
+    # Strength rules are not applied to login; only reject absurd sizes
+    password: str = Field(min_length=1, max_length=128)
 
-    password = fields.Str(required=True, error_messages={
-        'required': 'Password is required'
-    })
+    max_body_size = 4 * 1024
 
 
-class RefreshTokenSchema(Schema):
+class RefreshTokenSchema(RequestSchema):
     """Schema for token refresh request"""
 
-    refresh_token = fields.Str(required=True, error_messages={
-        'required': 'Refresh token is required'
-    })
+    refresh_token: Token
 
 
-class ForgotPasswordSchema(Schema):
+class ForgotPasswordSchema(RequestSchema):
     """Schema for forgot password request"""
 
-    email = fields.Email(required=True, error_messages={
-        'required': 'Email is required',
-        'invalid': 'Invalid email format'
-    })
+    email: EmailAddress
 
+    max_body_size = 4 * 1024
 
-class ResetPasswordSchema(Schema):
-    """Schema for reset password request"""
 
-    token = fields.Str(required=True, error_messages={
-        'required': 'Reset token is required'
-    })
+class ResetPasswordSchema(RequestSchema):
+    """Schema for reset password request"""
 
-    password = fields.Str(
-        required=True,
-        validate=validate.Length(min=8, max=128),
-        error_messages={'required': 'Password is required'}
-    )
+    token: Token
+    password: Password
 
 
-class ChangePasswordSchema(Schema):
+class ChangePasswordSchema(RequestSchema):
     """Schema for change password request"""
 
-    current_password = fields.Str(required=True, error_messages={
-        'required': 'Current password is required'
-    })
-
-    new_password = fields.Str(
-        required=True,
-        validate=validate.Length(min=8, max=128),
-        error_messages={'required': 'New password is required'}
-    )
+    current_password: str = Field(min_length=1, max_length=128)
+    new_password: Password
 
 
-class VerifyEmailSchema(Schema):
+class VerifyEmailSchema(RequestSchema):
     """Schema for email verification request"""
 
-    token = fields.Str(required=True, error_messages={
-        'required': 'Verification token is required'
-    })
+    token: Token
 
 
-class ResendVerificationSchema(Schema):
+class ResendVerificationSchema(RequestSchema):
     """Schema for resend verification email request"""
 
-    email = fields.Email(required=True, error_messages={
-        'required': 'Email is required',
-        'invalid': 'Invalid email format'
-    })
+    email: EmailAddress
 
 
 # Response schemas
 
-class UserResponseSchema(Schema):
+class UserResponseSchema(BaseModel):
     """Schema for user response"""
 
-    id = fields.Str()
-    email = fields.Email()
-    username = fields.Str()
-    first_name = fields.Str()
-    last_name = fields.Str()
-    role = fields.Str()
-    is_active = fields.Bool()
-    is_verified = fields.Bool()
-    created_at = fields.DateTime()
-    last_login = fields.Str(allow_none=True)
+    id: int
+    email: str
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: str
+    is_active: bool
+    is_verified: bool
+    created_at: Optional[datetime] = None
+    last_login: Optional[datetime] = None
 
 
-class AuthResponseSchema(Schema):
+class AuthResponseSchema(BaseModel):
     """Schema for authentication response"""
 
-    user = fields.Nested(UserResponseSchema)
-    access_token = fields.Str()
-    refresh_token = fields.Str()
-    token_type = fields.Str(dump_default='Bearer')
+    user: UserResponseSchema
+    access_token: str
+    refresh_token: str
+    token_type: str = 'Bearer'
 
 
 __all__ = [
@@ -0,0 +1,19 @@
+"""
+TradeSense AI Platform - Equity Schemas
+Query validation schemas for equity curve endpoints
+"""
+
+from typing import Optional
+
+from pydantic import Field
+
+from app.utils.validation import RequestSchema
+
+
+class EquityCurveQuerySchema(RequestSchema):
+    """Schema for the equity curve query string"""
+
+    # Epoch seconds (inclusive)
+    start: Optional[int] = Field(default=None, ge=0)
+    end: Optional[int] = Field(default=None, ge=0)
+    max_points: Optional[int] = Field(default=None, ge=1)
@@ -0,0 +1,27 @@
+"""
+TradeSense AI Platform - Leaderboard Schemas
+Query validation schemas for leaderboard endpoints
+"""
+
+from typing import Literal, Optional
+
+from pydantic import Field
+
+from app.utils.validation import RequestSchema
+
+
+class BoardQuerySchema(RequestSchema):
+    """Schema selecting a leaderboard"""
+
+    metric: Literal["profit", "return"] = "profit"
+    period: Literal["all", "daily", "weekly", "monthly"] = "all"
+    challenge_type: Optional[str] = Field(default=None, max_length=20)
+    # Past period of the selected kind, e.g. "2026-10-18" (daily) or "2026-W41" (weekly)
+    period_id: Optional[str] = Field(default=None, pattern=r"^\d{4}-(\d{2}(-\d{2})?|W\d{2})$")
+
+
+class LeaderboardQuerySchema(BoardQuerySchema):
+    """Schema for the top-N query string"""
+
+    limit: int = Field(default=10, ge=1)
+    offset: int = Field(default=0, ge=0, le=100000)
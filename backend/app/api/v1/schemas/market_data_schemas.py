@@ -0,0 +1,24 @@
+"""
+TradeSense AI Platform - Market Data Schemas
+Query validation schemas for market data endpoints
+"""
+
+from typing import Literal, Optional
+
+from pydantic import Field
+
+from app.utils.validation import RequestSchema
+
+Timeframe = Literal["1m", "5m", "15m", "30m", "1h", "4h", "1d"]
+
+
+class BarsQuerySchema(RequestSchema):
+    """Schema for the bar history query string"""
+
+    symbol: str = Field(pattern=r"^[A-Za-z0-9][A-Za-z0-9._-]{0,19}$")
+    timeframe: Timeframe = "1m"
+    # Bar open times, epoch seconds (inclusive)
+    start: Optional[int] = Field(default=None, ge=0)
+    end: Optional[int] = Field(default=None, ge=0)
+    limit: Optional[int] = Field(default=None, ge=1)
+    format: Optional[Literal["json", "binary"]] = None
@@ -0,0 +1,34 @@
+"""
+TradeSense AI Platform - Celery Entry Point
+Worker and beat process setup
+
+The Flask app is created once in the worker's main process; pool
+processes are forked from it and drop the connections they inherit.
+
+Usage:
+    celery -A app.celery_app worker --loglevel=info
+    celery -A app.celery_app worker -Q risk --concurrency=2   # dedicated risk worker
+    celery -A app.celery_app beat --loglevel=info
+"""
+
+import os
+
+from celery.signals import worker_process_init
+
+from app import create_app
+from app.tasks import celery, init_celery
+
+# Flask application the tasks run in
+flask_app = create_app(os.getenv("FLASK_ENV", "production"))
+init_celery(flask_app)
+
+
+@worker_process_init.connect
+def _reset_connections(**kwargs) -> None:
+    """Give each pool process its own database and Redis connections"""
+    from app.core.startup import reset_after_fork
+
+    reset_after_fork(flask_app)
+
+
+__all__ = ["celery", "flask_app"]
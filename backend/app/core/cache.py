@@ -4,19 +4,31 @@ Handles Redis caching, session storage, and distributed locking
 """
 
 import json
+import logging
 import pickle
+import threading
+import time
 from functools import wraps
 from typing import Any, Callable, Optional, Union
 
 import redis
 from flask import Flask, current_app
 
+from app.core.timing import TimedConnection
+
 
 class Cache:
     """Redis cache wrapper with convenience methods"""
 
     def __init__(self, app: Optional[Flask] = None):
-        self.redis_client: Optional[redis.Redis] = None
+        self._client: Optional[redis.Redis] = None
+        self._scripts: dict = {}
+        self._url: Optional[str] = None
+        self._connect_timeout = 1.0
+        self._retry_interval = 30.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
         if app:
             self.init_app(app)
 
@@ -24,33 +36,78 @@ class Cache:
         """
         Initialize cache with Flask application
 
+        With LAZY_EXTENSIONS (the default) nothing is opened here: the
+        client is created and pinged on first use, in the process that
+        uses it. Otherwise Redis is pinged at startup.
+
         Args:
             app: Flask application instance
         """
-        redis_url = app.config.get("REDIS_URL", "redis://localhost:6379/0")
+        self._url = app.config.get("REDIS_URL", "redis://localhost:6379/0")
+        self._connect_timeout = app.config.get("CACHE_CONNECT_TIMEOUT", 1.0)
+        self._retry_interval = app.config.get("CACHE_RETRY_INTERVAL", 30.0)
+        self._logger = app.logger
+        self.reset()
+
+        if not app.config.get("LAZY_EXTENSIONS", True):
+            self._connect()
+
+        # Store cache instance in app extensions
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["cache"] = self
 
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        """Redis client, connected on first access (None when unavailable)"""
+        if self._client is None and self._url and time.monotonic() >= self._retry_at:
+            with self._lock:
+                if self._client is None and time.monotonic() >= self._retry_at:
+                    self._connect()
+        return self._client
+
+    @redis_client.setter
+    def redis_client(self, client: Optional[redis.Redis]) -> None:
+        self._client = client
+        self._scripts = {}
+
+    def reset(self) -> None:
+        """
+        Drop the client so the next access reconnects
+
+        Called after fork: connections inherited from the parent must
+        not be shared between processes.
+        """
+        self._client = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        # Registered scripts are bound to the previous client
+        self._scripts = {}
+
+    def _connect(self) -> None:
         try:
-            self.redis_client = redis.from_url(
-                redis_url,
+            client = redis.from_url(
+                self._url,
                 decode_responses=False,  # We'll handle encoding ourselves
-                socket_connect_timeout=5,
+                socket_connect_timeout=self._connect_timeout,
                 socket_timeout=5,
                 retry_on_timeout=True,
+                connection_class=TimedConnection,  # request Server-Timing
             )
             # Test connection
-            self.redis_client.ping()
-            app.logger.info(f"Redis cache connected: {redis_url}")
+            client.ping()
+            self._client = client
+            self._scripts = {}
+            self._logger.info(f"Redis cache connected: {self._url}")
         except redis.ConnectionError as e:
-            app.logger.warning(f"Redis connection failed: {e}. Caching disabled.")
-            self.redis_client = None
+            self._logger.warning(
+                f"Redis connection failed: {e}. Caching disabled, "
+                f"retrying in {self._retry_interval:.0f}s."
+            )
+            self._retry_at = time.monotonic() + self._retry_interval
         except Exception as e:
-            app.logger.error(f"Redis initialization error: {e}")
-            self.redis_client = None
-
-        # Store cache instance in app extensions
-        if not hasattr(app, "extensions"):
-            app.extensions = {}
-        app.extensions["cache"] = self
+            self._logger.error(f"Redis initialization error: {e}")
+            self._retry_at = time.monotonic() + self._retry_interval
 
     def _is_available(self) -> bool:
         """Check if Redis is available"""
@@ -285,6 +342,28 @@ class Cache:
             current_app.logger.error(f"Cache set_many error: {e}")
             return False
 
+    def script(self, source: str) -> Optional[Callable]:
+        """
+        Get a registered Lua script for atomic multi-key operations
+
+        Scripts are registered once per client and executed with EVALSHA,
+        so each call costs a single round trip.
+
+        Args:
+            source: Lua source code
+
+        Returns:
+            Callable script object, or None if Redis is unavailable
+        """
+        if not self._is_available():
+            return None
+
+        script = self._scripts.get(source)
+        if script is None:
+            script = self.redis_client.register_script(source)
+            self._scripts[source] = script
+        return script
+
     def get_health(self) -> dict:
         """
         Get cache health status
@@ -0,0 +1,56 @@
+"""
+TradeSense AI Platform - Concurrency Mode
+Cooperative (eventlet) deployment support
+
+In the default "sync" mode every request owns a gunicorn worker process.
+In "eventlet" mode each worker multiplexes many requests on green threads:
+sockets (Redis, HTTP) and psycopg2 yield while waiting, and CPU-heavy work
+such as password hashing runs in a native thread pool so it does not
+block the event loop.
+
+Gunicorn's eventlet worker monkey patches the process before the app is
+imported; psycopg2 is made green in post_worker_init (gunicorn.conf.py).
+"""
+
+import sys
+from typing import Any, Callable
+
+SYNC = "sync"
+EVENTLET = "eventlet"
+
+
+def current_mode() -> str:
+    """Mode this process runs in ("eventlet" once monkey patched)"""
+    eventlet = sys.modules.get("eventlet")
+    if eventlet is not None and eventlet.patcher.is_monkey_patched("thread"):
+        return EVENTLET
+    return SYNC
+
+
+def offload(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run CPU-bound work without blocking other requests
+
+    In eventlet mode the call runs in eventlet's native thread pool (the
+    calling green thread yields until it finishes); otherwise it is called
+    directly.
+
+    Usage:
+        self.password_hash = offload(generate_password_hash, password)
+
+    Args:
+        func: Function to call
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The function's return value
+    """
+    if current_mode() == EVENTLET:
+        from eventlet import tpool
+
+        return tpool.execute(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+__all__ = ["EVENTLET", "SYNC", "current_mode", "offload"]
@@ -3,6 +3,8 @@ TradeSense AI Platform - Database Module
 Handles SQLAlchemy initialization, session management, and database utilities
 """
 
+import threading
+import time
 from contextlib import contextmanager
 from typing import Generator
 
@@ -12,6 +14,8 @@ from sqlalchemy import event, pool
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from app.core.timing import add_time
+
 # Initialize SQLAlchemy instance
 db = SQLAlchemy()
 
@@ -28,11 +32,24 @@ def init_db(app: Flask) -> None:
     # Register event listeners
     _register_event_listeners()
 
-    # Create all tables in development (for testing)
-    with app.app_context():
-        if app.config.get("ENV") == "development":
-            db.create_all()
-            app.logger.info("Database tables created")
+    # Create missing tables in development, on the first request rather
+    # than at startup so booting (and CLI commands) never touch the database
+    if app.config.get("DB_CREATE_ALL"):
+        create_all_lock = threading.Lock()
+        state = {"done": False}
+
+        @app.before_request
+        def create_tables_once():
+            if state["done"]:
+                return
+            with create_all_lock:
+                if not state["done"]:
+                    # Import all models so they are registered with SQLAlchemy
+                    from app.models import User  # noqa: F401
+
+                    db.create_all()
+                    state["done"] = True
+                    app.logger.info("Database tables created")
 
 
 def _register_event_listeners() -> None:
@@ -46,13 +63,20 @@ def _register_event_listeners() -> None:
             cursor.execute("PRAGMA foreign_keys=ON")
             cursor.close()
 
-    @event.listens_for(Engine, "before_cursor_execute")
-    def receive_before_cursor_execute(
-        conn, cursor, statement, params, context, executemany
-    ):
-        """Log SQL statements in debug mode"""
-        # This is handled by SQLALCHEMY_ECHO in config
-        pass
+    # Query timing for request Server-Timing / metrics (SQL logging itself
+    # is enabled with LOG_SQL in config). Module-level listeners are
+    # registered once even when several apps are created.
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, params, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, params, context, executemany):
+    add_time("db", time.perf_counter() - conn.info["query_start_time"].pop())
 
 
 @contextmanager
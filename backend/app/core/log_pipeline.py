@@ -0,0 +1,261 @@
+"""
+TradeSense AI Platform - Logging Pipeline
+Non-blocking, structured logging: request threads only enqueue records, a
+background listener formats them as JSON and writes them out
+"""
+
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
+
+from flask import Flask, g, has_request_context, request
+from flask.logging import default_handler
+
+try:
+    from pythonjsonlogger import jsonlogger
+except ImportError:  # pragma: no cover - optional dependency
+    jsonlogger = None
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+JSON_FIELDS = "%(asctime)s %(levelname)s %(name)s %(process)d %(request_id)s %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request ID to every record (None outside requests)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = g.get("request_id") if has_request_context() else None
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG records; other levels always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller
+
+    Records are dropped (and counted) when the bounded queue is full. The
+    number of dropped records is logged once the queue has room again.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here, where args and exc_info
+        # are still valid; formatting itself happens on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported:
+            unreported = self._unreported
+            notice = logging.makeLogRecord({
+                "name": "app.logging",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {unreported} log records (queue full)",
+                "request_id": None,
+            })
+            try:
+                self.queue.put_nowait(notice)
+                self._unreported -= unreported
+            except queue.Full:
+                pass
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+
+class LogPipeline:
+    """Owns the log queue, the enqueuing handler and the writer thread"""
+
+    def __init__(self):
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+        self._queue_size = 10000
+        self._output_handlers: List[logging.Handler] = []
+        self._lock = threading.Lock()
+
+    def configure(self, app: Flask) -> None:
+        """
+        Route all logging through the queue
+
+        Args:
+            app: Flask application instance
+        """
+        config = app.config
+        level = getattr(logging, config.get("LOG_LEVEL", "INFO"))
+
+        with self._lock:
+            self.stop()
+
+            self._queue_size = config.get("LOG_QUEUE_SIZE", 10000)
+            self._output_handlers = self._build_output_handlers(config)
+            self.handler = DroppingQueueHandler(queue.Queue(self._queue_size))
+            self.handler.addFilter(RequestIdFilter())
+            sample_rate = config.get("LOG_DEBUG_SAMPLE_RATE", 1.0)
+            if sample_rate < 1.0:
+                self.handler.addFilter(DebugSamplingFilter(sample_rate))
+
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(self.handler)
+            root.setLevel(level)
+
+            # Flask's stderr handler would write synchronously
+            app.logger.removeHandler(default_handler)
+            app.logger.setLevel(level)
+
+            # SQL statement logging goes through the queue instead of echo
+            logging.getLogger("sqlalchemy.engine").setLevel(
+                logging.INFO if config.get("LOG_SQL") else logging.WARNING
+            )
+
+            self._start_listener()
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and dropped record count for this process"""
+        if self.handler is None:
+            return {"queued": 0, "dropped": 0, "capacity": 0}
+        return {
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "capacity": self._queue_size,
+        }
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _start_listener(self) -> None:
+        self.listener = QueueListener(
+            self.handler.queue, *self._output_handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def _after_fork_in_child(self) -> None:
+        # The writer thread does not survive fork and the queue may have
+        # been copied mid-operation: start over with a fresh queue
+        if self.handler is None:
+            return
+        self._lock = threading.Lock()
+        self.listener = None
+        self.handler.queue = queue.Queue(self._queue_size)
+        self.handler.dropped = 0
+        self.handler._unreported = 0
+        self._start_listener()
+
+    @staticmethod
+    def _build_output_handlers(config) -> List[logging.Handler]:
+        if config.get("LOG_JSON", True) and jsonlogger is not None:
+            formatter = jsonlogger.JsonFormatter(
+                JSON_FIELDS,
+                rename_fields={"asctime": "timestamp", "levelname": "level"},
+            )
+        else:
+            formatter = logging.Formatter(
+                config.get(
+                    "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+                )
+            )
+
+        handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+
+        log_file = config.get("LOG_FILE")
+        if config.get("LOG_TO_FILE") and log_file:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            handlers.append(
+                RotatingFileHandler(
+                    log_file,
+                    maxBytes=config.get("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024),
+                    backupCount=config.get("LOG_FILE_BACKUP_COUNT", 10),
+                )
+            )
+
+        error_file = config.get("LOG_ERROR_FILE")
+        if config.get("LOG_TO_FILE") and error_file:
+            os.makedirs(os.path.dirname(error_file) or ".", exist_ok=True)
+            error_handler = RotatingFileHandler(
+                error_file,
+                maxBytes=config.get("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024),
+                backupCount=config.get("LOG_FILE_BACKUP_COUNT", 10),
+            )
+            error_handler.setLevel(logging.ERROR)
+            handlers.append(error_handler)
+
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        return handlers
+
+
+# Global logging pipeline
+log_pipeline = LogPipeline()
+
+atexit.register(log_pipeline.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=log_pipeline._after_fork_in_child)
+
+
+def init_logging(app: Flask) -> None:
+    """
+    Configure the logging pipeline and request ID propagation
+
+    The request ID comes from the X-Request-ID header when present (so it
+    follows the request through proxies) and is echoed on the response.
+
+    Args:
+        app: Flask application instance
+    """
+    log_pipeline.configure(app)
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        if incoming and incoming.isprintable():
+            g.request_id = incoming[:64]
+        else:
+            g.request_id = uuid.uuid4().hex
+
+    @app.after_request
+    def echo_request_id(response):
+        request_id = g.get("request_id")
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+__all__ = ["log_pipeline", "init_logging", "LogPipeline", "DroppingQueueHandler"]
@@ -0,0 +1,130 @@
+"""
+TradeSense AI Platform - JSON Serialization
+Fast JSON provider for Flask using orjson when installed, stdlib otherwise
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Union
+from uuid import UUID
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def default_encoder(o: Any) -> Any:
+    """
+    Encode types the JSON encoders do not handle natively
+
+    Datetimes are encoded as ISO 8601 strings and decimals as strings to
+    keep their precision. orjson handles datetime, UUID and dataclasses
+    itself and only calls this for the remaining types.
+    """
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (Decimal, UUID)):
+        return str(o)
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "tolist"):
+        # numpy scalars and arrays
+        return o.tolist()
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson with a stdlib fallback
+
+    Both backends produce the same output for the types used by the API:
+    ISO 8601 datetimes, string decimals and UUIDs. Responses are built
+    from bytes directly, skipping the str round trip of the default
+    provider.
+    """
+
+    # Key order follows the dicts built by the endpoints
+    sort_keys = False
+
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        self.backend = "orjson" if orjson is not None else "json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=default_encoder, option=self._options()).decode()
+        kwargs.setdefault("default", default_encoder)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """
+        Serialize to UTF-8 bytes
+
+        Args:
+            obj: Object to serialize
+            indent: Pretty-print with two-space indentation
+
+        Returns:
+            Encoded JSON document
+        """
+        if orjson is not None:
+            option = self._options()
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=default_encoder, option=option)
+
+        return json.dumps(
+            obj,
+            default=default_encoder,
+            ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+        ).encode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
+
+    def _options(self) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+
+def init_json(app: Flask) -> None:
+    """
+    Install the fast JSON provider on the application
+
+    Args:
+        app: Flask application instance
+    """
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+
+
+__all__ = ["FastJSONProvider", "default_encoder", "init_json"]
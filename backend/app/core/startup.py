@@ -0,0 +1,192 @@
+"""
+TradeSense AI Platform - Application Startup
+Boot phase profiling, lazily imported blueprints and post-fork reset
+
+Startup is split in two halves:
+- fork-safe state built by create_app (configuration, URL map, imported
+  modules, JSON provider). Under gunicorn --preload this is built once in
+  the master and shared copy-on-write by every worker.
+- per-process connections (Redis clients, the database pool, the log
+  writer thread) which are opened on first use inside each worker.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from flask import Flask
+from werkzeug.utils import import_string
+
+
+class StartupProfile:
+    """Wall time of each create_app phase"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time one startup phase
+
+        Usage:
+            with profile.phase("extensions"):
+                init_extensions(app)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def report(self) -> Dict:
+        """Phase durations in milliseconds"""
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "phases": {
+                name: round(seconds * 1000, 2) for name, seconds in self.phases.items()
+            },
+        }
+
+    def summary(self) -> str:
+        """One-line summary for the startup log"""
+        phases = ", ".join(
+            f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.phases.items()
+        )
+        return f"{self.total_ms:.0f}ms ({phases})"
+
+
+class LazyBlueprints:
+    """
+    Blueprints imported on the first request to their URL prefix
+
+    Endpoint modules pull in services, schemas and models; deferring them
+    keeps create_app cheap for CLI commands, tests and reloader restarts.
+    The request that triggers an import waits for it; other prefixes are
+    served meanwhile.
+
+    Flask freezes app setup after the first request, so registration
+    briefly reopens it under a lock. Call load_all() before forking
+    workers (gunicorn --preload) to build the full URL map once instead.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.app: Optional[Flask] = None
+        self._pending: List[Tuple[str, str, Dict]] = []
+        self._lock = threading.Lock()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Wrap the WSGI app so pending prefixes are loaded on demand
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        app.wsgi_app = self._wrap(app.wsgi_app)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["lazy_blueprints"] = self
+
+    def add(self, import_name: str, url_prefix: str, **options) -> None:
+        """
+        Declare a blueprint to import on first use
+
+        Args:
+            import_name: Dotted path of the blueprint ("module:attribute")
+            url_prefix: URL prefix the blueprint is mounted at
+            **options: Extra register_blueprint options (e.g. name_prefix
+                       to keep endpoint names of nested blueprints)
+        """
+        self._pending.append((import_name, url_prefix.rstrip("/"), options))
+
+    @property
+    def pending(self) -> List[str]:
+        return [prefix for _, prefix, _ in self._pending]
+
+    def load(self, path: str) -> None:
+        """Import and register the pending blueprints serving a path"""
+        if not any(self._matches(prefix, path) for _, prefix, _ in self._pending):
+            return
+
+        with self._lock:
+            matching = [entry for entry in self._pending if self._matches(entry[1], path)]
+            self._register(matching)
+
+    def load_all(self) -> None:
+        """Import and register every pending blueprint"""
+        with self._lock:
+            self._register(list(self._pending))
+
+    # Internal helpers
+
+    @staticmethod
+    def _matches(prefix: str, path: str) -> bool:
+        return path == prefix or path.startswith(prefix + "/")
+
+    def _register(self, entries: List[Tuple[str, str, Dict]]) -> None:
+        if not entries:
+            return
+
+        # Caller holds the lock. Flask refuses setup methods once a request
+        # was handled; rather than toggling app._got_first_request (which
+        # requests served by other threads set again at any moment), the
+        # check is switched off on this instance while we register.
+        app = self.app
+        app._check_setup_finished = lambda f_name: None
+        try:
+            for entry in entries:
+                import_name, url_prefix, options = entry
+                blueprint = import_string(import_name)
+                app.register_blueprint(blueprint, url_prefix=url_prefix, **options)
+                self._pending.remove(entry)
+                app.logger.debug(f"Loaded blueprint {import_name} at {url_prefix}")
+        finally:
+            del app._check_setup_finished
+
+    def _wrap(self, wsgi_app: Callable) -> Callable:
+        def lazy_wsgi_app(environ, start_response):
+            if self._pending:
+                self.load(environ.get("PATH_INFO", ""))
+            return wsgi_app(environ, start_response)
+
+        return lazy_wsgi_app
+
+
+def reset_after_fork(app: Flask) -> None:
+    """
+    Drop per-process state inherited from a preloading parent
+
+    Call in each worker right after fork (gunicorn post_fork). Pooled
+    database and Redis connections are forgotten without being closed,
+    since the parent still owns the sockets; new ones are opened on
+    first use. The log pipeline restarts its writer thread on its own
+    (os.register_at_fork).
+
+    Args:
+        app: Flask application instance
+    """
+    from app.core.cache import cache
+    from app.core.database import db
+    from app.middleware.metrics import metrics
+    from app.middleware.rate_limit import limiter
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    cache.reset()
+    limiter.reset()
+    metrics.reset()
+
+
+__all__ = ["StartupProfile", "LazyBlueprints", "reset_after_fork"]
@@ -0,0 +1,100 @@
+"""
+TradeSense AI Platform - Request Phase Timing
+Accumulates time spent in the database, cache and password hashing per request
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import redis
+from flask import g, has_app_context
+
+PHASES = ("db", "cache", "hash")
+
+
+class RequestTiming:
+    """Phase durations (seconds) and call counts for one request"""
+
+    __slots__ = ("start", "durations", "calls")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+def start_request_timing() -> RequestTiming:
+    """Begin tracking phases for the current request"""
+    timing = RequestTiming()
+    g._request_timing = timing
+    return timing
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Timing of the current request, or None outside tracked requests"""
+    if not has_app_context():
+        return None
+    return g.get("_request_timing")
+
+
+def add_time(phase: str, seconds: float, calls: int = 1) -> None:
+    """
+    Charge time to a phase of the current request
+
+    No-op outside a tracked request (CLI commands, background threads).
+
+    Args:
+        phase: "db", "cache" or "hash"
+        seconds: Duration to add
+        calls: Number of operations the duration covers
+    """
+    timing = current_timing()
+    if timing is not None:
+        timing.durations[phase] += seconds
+        timing.calls[phase] += calls
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Time a block and charge it to a phase of the current request
+
+    Usage:
+        with timed("hash"):
+            self.password_hash = generate_password_hash(password)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - start)
+
+
+class TimedConnection(redis.Connection):
+    """
+    Redis connection charging server round trips to the "cache" phase
+
+    Only the wait for replies is measured; sending is buffered and cheap.
+    """
+
+    def read_response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().read_response(*args, **kwargs)
+        finally:
+            add_time("cache", time.perf_counter() - start)
+
+
+__all__ = [
+    "PHASES",
+    "RequestTiming",
+    "TimedConnection",
+    "add_time",
+    "current_timing",
+    "start_request_timing",
+    "timed",
+]
@@ -0,0 +1,31 @@
+"""
+TradeSense AI Platform - Market Data
+Tick sources, ingestion and the latest-quote store
+"""
+
+from app.market_data.ingestor import MarketDataIngestor
+from app.market_data.quotes import QUOTES_KEY, UPDATES_CHANNEL, read_quotes, write_quotes
+from app.market_data.records import QuoteBoard, SymbolTable, TickBatch
+from app.market_data.sources import (
+    FileTickSource,
+    SyntheticTickSource,
+    TickSource,
+    create_source,
+    register_source,
+)
+
+__all__ = [
+    "FileTickSource",
+    "MarketDataIngestor",
+    "QUOTES_KEY",
+    "QuoteBoard",
+    "SymbolTable",
+    "SyntheticTickSource",
+    "TickBatch",
+    "TickSource",
+    "UPDATES_CHANNEL",
+    "create_source",
+    "read_quotes",
+    "register_source",
+    "write_quotes",
+]
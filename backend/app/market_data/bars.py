@@ -0,0 +1,501 @@
+"""
+TradeSense AI Platform - OHLCV Bar Store
+Columnar, memory-mapped candle history per symbol and timeframe
+
+Layout under MARKET_DATA_BAR_DIR:
+
+    <symbol>/<timeframe>/header     int64[2]: bar count, capacity
+    <symbol>/<timeframe>/timestamp  int64 bar open time (epoch seconds)
+    <symbol>/<timeframe>/open|high|low|close|volume   float64
+
+Every column is a flat little-endian file mapped with numpy.memmap, so the
+OS page cache is the read cache and is shared by all workers. Files are
+append-only: capacity grows in chunks, new bars are written past the
+count and the count is published last, so readers never see a partial
+bar. Appending a bar with the timestamp of the last stored bar replaces it
+(the bar still forming).
+
+Range reads binary-search the timestamp column and return views of the
+mapped columns (no copy). Only the base timeframes (MARKET_DATA_BAR_TIMEFRAMES)
+are stored; higher timeframes are aggregated from them on read.
+
+One process writes (the ingestion command); any number read.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from flask import Flask
+
+# Timeframe name -> seconds
+TIMEFRAMES: Dict[str, int] = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+}
+
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+GROW_CHUNK = 16384  # bars added to a file's capacity at a time
+# A leading alphanumeric keeps "." and ".." out of store paths
+SYMBOL_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,19}$")
+
+
+class Bars:
+    """A range of bars as column arrays (views into the store when possible)"""
+
+    __slots__ = ("symbol", "timeframe") + COLUMN_NAMES
+
+    def __init__(self, symbol: str, timeframe: str, **columns: np.ndarray):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        for name in COLUMN_NAMES:
+            setattr(self, name, columns[name])
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def columns(self) -> Iterator[Tuple[str, np.ndarray]]:
+        for name in COLUMN_NAMES:
+            yield name, getattr(self, name)
+
+    def to_dict(self) -> Dict:
+        return {name: column.tolist() for name, column in self.columns()}
+
+    @classmethod
+    def empty(cls, symbol: str, timeframe: str) -> "Bars":
+        return cls(
+            symbol, timeframe,
+            **{name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS},
+        )
+
+
+def aggregate(bars: Bars, timeframe: str) -> Bars:
+    """
+    Aggregate bars into a higher timeframe
+
+    Buckets are aligned to multiples of the timeframe since the epoch
+    (UTC midnight for 1d). Vectorized: bucket boundaries are found with
+    one diff and each column reduced with a ufunc reduceat.
+
+    Args:
+        bars: Source bars, ascending
+        timeframe: Target timeframe name
+
+    Returns:
+        Aggregated bars (new arrays)
+    """
+    if not len(bars):
+        return Bars.empty(bars.symbol, timeframe)
+
+    seconds = TIMEFRAMES[timeframe]
+    buckets = bars.timestamp - bars.timestamp % seconds
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    return Bars(
+        bars.symbol,
+        timeframe,
+        timestamp=buckets[starts],
+        open=bars.open[starts],
+        high=np.maximum.reduceat(bars.high, starts),
+        low=np.minimum.reduceat(bars.low, starts),
+        close=bars.close[ends],
+        volume=np.add.reduceat(bars.volume, starts),
+    )
+
+
+class BarSeries:
+    """Memory-mapped columns of one symbol and timeframe"""
+
+    def __init__(self, directory: str, writable: bool = False):
+        self.directory = directory
+        self.writable = writable
+        self._columns: Dict[str, np.memmap] = {}
+        self._mapped = 0
+
+        header_path = os.path.join(directory, "header")
+        if writable and not os.path.exists(header_path):
+            os.makedirs(directory, exist_ok=True)
+            np.zeros(2, dtype="<i8").tofile(header_path)
+            for name, _ in COLUMNS:
+                open(os.path.join(directory, name), "wb").close()
+        self._header = np.memmap(header_path, dtype="<i8", mode="r+" if writable else "r", shape=(2,))
+
+    @property
+    def count(self) -> int:
+        return int(self._header[0])
+
+    @property
+    def capacity(self) -> int:
+        return int(self._header[1])
+
+    def column(self, name: str) -> np.ndarray:
+        """Stored bars of one column (a view of the mapping)"""
+        self._ensure_mapped()
+        return self._columns[name][:self.count]
+
+    def slice(self, start: Optional[int] = None, end: Optional[int] = None, limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Index range of the bars with start <= timestamp <= end
+
+        Args:
+            start: First bar open time (epoch seconds, inclusive)
+            end: Last bar open time (inclusive)
+            limit: Keep only the most recent bars of the range
+
+        Returns:
+            Tuple of (first index, end index exclusive)
+        """
+        timestamps = self.column("timestamp")
+        low = 0 if start is None else int(np.searchsorted(timestamps, start, "left"))
+        high = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, "right"))
+        if limit is not None and high - low > limit:
+            low = high - limit
+        return low, max(low, high)
+
+    def read(self, symbol: str, timeframe: str, start=None, end=None, limit=None) -> Bars:
+        """Bars in a time range as zero-copy views"""
+        low, high = self.slice(start, end, limit)
+        return Bars(
+            symbol, timeframe,
+            **{name: self._columns[name][low:high] for name in COLUMN_NAMES},
+        )
+
+    def append(self, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Append bars (ascending), replacing the last stored bar when the
+        first new bar has its timestamp
+
+        Args:
+            columns: Arrays by column name, all the same length
+
+        Returns:
+            Number of bars written
+
+        Raises:
+            ValueError: If bars are out of order or older than the stored tail
+        """
+        timestamps = np.asarray(columns["timestamp"], dtype="<i8")
+        size = len(timestamps)
+        if not size:
+            return 0
+        if size > 1 and np.any(np.diff(timestamps) <= 0):
+            raise ValueError("Bar timestamps must be strictly ascending")
+
+        count = self.count
+        self._ensure_mapped()
+        position = count
+        if count:
+            last = int(self._columns["timestamp"][count - 1])
+            if timestamps[0] < last:
+                raise ValueError(
+                    f"Bar at {int(timestamps[0])} is older than the stored tail ({last})"
+                )
+            if timestamps[0] == last:
+                position = count - 1
+
+        new_count = position + size
+        if new_count > self.capacity:
+            self._grow(max(new_count, self.capacity * 2, GROW_CHUNK))
+
+        for name, dtype in COLUMNS:
+            self._columns[name][position:new_count] = np.asarray(columns[name], dtype=dtype)
+        # Publish the count only once the data is in place
+        self._header[0] = new_count
+        return size
+
+    def flush(self) -> None:
+        """Write dirty pages to disk (otherwise left to the OS)"""
+        for column in self._columns.values():
+            column.flush()
+        self._header.flush()
+
+    # Internal helpers
+
+    def _ensure_mapped(self) -> None:
+        capacity = self.capacity
+        if capacity > self._mapped or not self._columns:
+            self._map(capacity)
+
+    def _map(self, capacity: int) -> None:
+        mode = "r+" if self.writable else "r"
+        columns = {}
+        for name, dtype in COLUMNS:
+            path = os.path.join(self.directory, name)
+            if capacity:
+                columns[name] = np.memmap(path, dtype=dtype, mode=mode, shape=(capacity,))
+            else:
+                columns[name] = np.empty(0, dtype=dtype)
+        # Views handed out earlier keep the old mappings alive; the files
+        # only ever grow, so those stay valid
+        self._columns = columns
+        self._mapped = capacity
+
+    def _grow(self, capacity: int) -> None:
+        for name, dtype in COLUMNS:
+            with open(os.path.join(self.directory, name), "r+b") as f:
+                f.truncate(capacity * np.dtype(dtype).itemsize)
+        self._header[1] = capacity
+        self._map(capacity)
+
+
+class BarStore:
+    """
+    Bar history for all symbols
+
+    Usage:
+        bar_store.append("BTCUSD", "1m", timestamp=ts, open=o, high=h, low=l, close=c, volume=v)
+        bars = bar_store.read("BTCUSD", "1h", start=1700000000, limit=500)
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.root = "data/bars"
+        self.stored_timeframes: List[str] = ["1m"]
+        self.writable = False
+        self._series: Dict[Tuple[str, str], BarSeries] = {}
+        self._lock = threading.Lock()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask, writable: bool = False) -> None:
+        """
+        Initialize the store with Flask app
+
+        Args:
+            app: Flask application instance
+            writable: Open files for writing (the ingestion process only)
+        """
+        self.root = app.config.get("MARKET_DATA_BAR_DIR", "data/bars")
+        self.stored_timeframes = sorted(
+            app.config.get("MARKET_DATA_BAR_TIMEFRAMES", ["1m"]), key=TIMEFRAMES.__getitem__
+        )
+        self.writable = writable
+        self._series = {}
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["bar_store"] = self
+
+    def symbols(self) -> List[str]:
+        """Symbols with stored history"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        )
+
+    def append(self, symbol: str, timeframe: str, **columns) -> int:
+        """
+        Append bars of a stored timeframe
+
+        Args:
+            symbol: Instrument symbol
+            timeframe: One of the stored timeframes
+            **columns: timestamp, open, high, low, close and volume arrays
+
+        Returns:
+            Number of bars written
+        """
+        if timeframe not in self.stored_timeframes:
+            raise ValueError(f"Timeframe {timeframe} is not stored (aggregated on read)")
+        return self._get_series(symbol, timeframe, create=True).append(columns)
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Bars:
+        """
+        Bars of a symbol in a time range
+
+        Stored timeframes are returned as views of the mapped files;
+        others are aggregated from the largest stored timeframe that
+        divides them.
+
+        Args:
+            symbol: Instrument symbol
+            timeframe: Timeframe name (see TIMEFRAMES)
+            start: Earliest bar open time (epoch seconds, inclusive)
+            end: Latest bar open time (inclusive)
+            limit: Return only the most recent bars of the range
+
+        Returns:
+            Bars (empty when there is no history)
+
+        Raises:
+            ValueError: If the timeframe cannot be served
+        """
+        source = self.source_timeframe(timeframe)
+        series = self._get_series(symbol, source)
+        if series is None:
+            return Bars.empty(symbol, timeframe)
+        if source == timeframe:
+            return series.read(symbol, timeframe, start, end, limit)
+
+        seconds = TIMEFRAMES[timeframe]
+        if start is not None:
+            start -= start % seconds  # the first bucket is read whole
+        if end is not None:
+            end = end - end % seconds + seconds - 1
+        source_limit = None
+        if limit is not None:
+            # Enough source bars for `limit` buckets plus a partial one
+            source_limit = (limit + 1) * (seconds // TIMEFRAMES[source])
+        bars = aggregate(series.read(symbol, source, start, end, source_limit), timeframe)
+        if limit is not None and len(bars) > limit:
+            bars = Bars(
+                symbol, timeframe,
+                **{name: column[-limit:] for name, column in bars.columns()},
+            )
+        return bars
+
+    def source_timeframe(self, timeframe: str) -> str:
+        """Stored timeframe a timeframe is served from"""
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+        seconds = TIMEFRAMES[timeframe]
+        for stored in reversed(self.stored_timeframes):
+            if seconds % TIMEFRAMES[stored] == 0:
+                return stored
+        raise ValueError(f"Timeframe {timeframe} cannot be built from {self.stored_timeframes}")
+
+    def flush(self) -> None:
+        with self._lock:
+            for series in self._series.values():
+                if series.writable:
+                    series.flush()
+
+    # Internal helpers
+
+    def _get_series(self, symbol: str, timeframe: str, create: bool = False) -> Optional[BarSeries]:
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is not None:
+            return series
+
+        if not SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol: {symbol}")
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe: {timeframe}")
+        directory = os.path.join(self.root, symbol, timeframe)
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, os.path.realpath(directory)]) != root:
+            raise ValueError(f"Invalid symbol: {symbol}")
+        if not create and not os.path.exists(os.path.join(directory, "header")):
+            return None
+        if create and not self.writable:
+            raise ValueError("Bar store is read-only in this process")
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = BarSeries(directory, writable=self.writable)
+        return series
+
+
+class BarBuilder:
+    """
+    Rolls ticks into bars of the base timeframe
+
+    Fed with the ingestor's TickBatch; flush() writes completed bars and
+    the bar still forming (replaced on every flush until it completes).
+    """
+
+    def __init__(self, store: BarStore, timeframe: Optional[str] = None):
+        self.store = store
+        self.timeframe = timeframe or store.stored_timeframes[0]
+        self.seconds = TIMEFRAMES[self.timeframe]
+        # Forming bar per symbol id: [bucket, open, high, low, close, volume]
+        self._forming: Dict[int, List[float]] = {}
+        self._completed: Dict[int, List[List[float]]] = {}
+        self._touched: set = set()
+
+    def apply(self, batch) -> None:
+        """Fold a TickBatch (last price and volume) into the forming bars"""
+        seconds = self.seconds
+        forming, completed, touched = self._forming, self._completed, self._touched
+        for symbol_id, timestamp, price, volume in zip(
+            batch.symbol_ids, batch.timestamps, batch.lasts, batch.volumes
+        ):
+            bucket = int(timestamp) - int(timestamp) % seconds
+            bar = forming.get(symbol_id)
+            if bar is None or bucket > bar[0]:
+                if bar is not None:
+                    completed.setdefault(symbol_id, []).append(bar)
+                forming[symbol_id] = [bucket, price, price, price, price, volume]
+            else:
+                # Late ticks are folded into the forming bar
+                if price > bar[2]:
+                    bar[2] = price
+                elif price < bar[3]:
+                    bar[3] = price
+                bar[4] = price
+                bar[5] += volume
+            touched.add(symbol_id)
+
+    def flush(self, names: List[str]) -> int:
+        """
+        Write changed bars to the store
+
+        Args:
+            names: Symbol names by symbol id
+
+        Returns:
+            Number of bars written
+        """
+        written = 0
+        for symbol_id in self._touched:
+            rows = self._completed.pop(symbol_id, [])
+            rows.append(self._forming[symbol_id])
+            table = np.array(rows, dtype="f8")
+            try:
+                written += self.store.append(
+                    names[symbol_id],
+                    self.timeframe,
+                    timestamp=table[:, 0].astype("<i8"),
+                    open=table[:, 1],
+                    high=table[:, 2],
+                    low=table[:, 3],
+                    close=table[:, 4],
+                    volume=table[:, 5],
+                )
+            except ValueError:
+                # History already ahead of this feed (e.g. a replayed file)
+                continue
+        self._touched.clear()
+        return written
+
+
+# Global bar store instance
+bar_store = BarStore()
+
+__all__ = [
+    "BarBuilder",
+    "BarSeries",
+    "BarStore",
+    "Bars",
+    "COLUMNS",
+    "TIMEFRAMES",
+    "aggregate",
+    "bar_store",
+]
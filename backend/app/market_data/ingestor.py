@@ -0,0 +1,236 @@
+"""
+TradeSense AI Platform - Market Data Ingestion
+Streams ticks from a source into the latest-quote store in Redis
+
+The loop reads ticks in batches into a columnar TickBatch, folds them into
+the QuoteBoard (so a symbol that ticks many times within a refresh
+interval produces one update) and, every MARKET_DATA_REFRESH_INTERVAL
+seconds, writes all changed quotes with one pipelined round trip. With a
+BarBuilder attached, the same ticks are rolled into OHLCV bars that are
+appended to the bar store on every publish.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from app.market_data.quotes import write_quotes
+from app.market_data.records import QuoteBoard, SymbolTable, TickBatch
+from app.market_data.sources import TickSource
+
+logger = logging.getLogger(__name__)
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)] * 1000, 3)
+
+    return {
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class MarketDataIngestor:
+    """
+    Ingestion loop for one tick source
+
+    Usage:
+        ingestor = MarketDataIngestor(create_source("file:ticks.csv"), refresh_interval=1.0)
+        stats = ingestor.run(duration=60)
+    """
+
+    def __init__(
+        self,
+        source: TickSource,
+        refresh_interval: float = 5.0,
+        batch_size: int = 5000,
+        client_factory: Optional[Callable] = None,
+        latency_samples: int = 10000,
+        bar_builder=None,
+    ):
+        """
+        Args:
+            source: Tick source
+            refresh_interval: Seconds between quote publishes
+            batch_size: Maximum ticks per source read
+            client_factory: Returns the Redis client (default: the app cache's)
+            latency_samples: Most recent latency samples kept for percentiles
+            bar_builder: Optional BarBuilder that also rolls ticks into stored bars
+        """
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.symbols = SymbolTable()
+        self.board = QuoteBoard()
+        self.bar_builder = bar_builder
+
+        self._batch = TickBatch()
+        self._client_factory = client_factory or self._cache_client
+        self._stop = threading.Event()
+
+        # Counters
+        self.ticks = 0
+        self.coalesced = 0
+        self.publishes = 0
+        self.quotes_published = 0
+        self.publish_failures = 0
+        self.bars_written = 0
+        self._started: Optional[float] = None
+        self._elapsed = 0.0
+        # Newest tick received -> written; oldest pending tick -> written;
+        # pipeline round trip
+        self._latency: Deque[float] = deque(maxlen=latency_samples)
+        self._staleness: Deque[float] = deque(maxlen=latency_samples)
+        self._publish_time: Deque[float] = deque(maxlen=latency_samples)
+
+    @staticmethod
+    def _cache_client():
+        from app.core.cache import cache
+
+        return cache.redis_client
+
+    def run(self, duration: Optional[float] = None) -> Dict:
+        """
+        Ingest until the source is exhausted, stop() or duration elapses
+
+        Args:
+            duration: Maximum seconds to run (None: no limit)
+
+        Returns:
+            Final stats (see stats())
+        """
+        self._stop.clear()
+        self._started = time.monotonic()
+        deadline = self._started + duration if duration is not None else None
+        next_publish = self._started + self.refresh_interval
+
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+
+                wait = max(0.0, next_publish - now)
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                self.ingest(wait)
+
+                now = time.monotonic()
+                if now >= next_publish or self.source.exhausted:
+                    self.publish()
+                    # Skip intervals missed while a slow publish was running
+                    next_publish = max(next_publish + self.refresh_interval, now)
+
+                if self.source.exhausted:
+                    break
+        finally:
+            self.publish()
+            self._elapsed = time.monotonic() - self._started
+            self.source.close()
+
+        return self.stats()
+
+    def stop(self) -> None:
+        """Ask a running loop to publish pending quotes and return"""
+        self._stop.set()
+
+    def ingest(self, timeout: float) -> int:
+        """
+        Read one batch from the source into the quote board
+
+        Args:
+            timeout: Seconds the source may wait for ticks
+
+        Returns:
+            Number of ticks read
+        """
+        batch = self._batch
+        count = self.source.read(batch, self.symbols, self.batch_size, timeout)
+        if count:
+            self.coalesced += self.board.apply(batch, len(self.symbols))
+            if self.bar_builder is not None:
+                self.bar_builder.apply(batch)
+            self.ticks += count
+            batch.clear()
+        return count
+
+    def publish(self) -> int:
+        """
+        Write every pending quote in one pipelined round trip
+
+        Quotes stay pending when Redis is unavailable or the write fails
+        and are retried (with their latest values) on the next publish.
+
+        Returns:
+            Number of quotes written
+        """
+        if self.bar_builder is not None:
+            self.bars_written += self.bar_builder.flush(self.symbols.names)
+
+        board = self.board
+        if not board.dirty:
+            return 0
+
+        client = self._client_factory()
+        if client is None:
+            self.publish_failures += 1
+            return 0
+
+        symbol_ids = board.take_dirty()
+        started = time.perf_counter()
+        try:
+            written = write_quotes(
+                client, self.symbols.names, board.quotes(symbol_ids), time.time()
+            )
+        except Exception as e:
+            board.restore_dirty(symbol_ids)
+            self.publish_failures += 1
+            logger.error(f"Quote publish failed for {len(symbol_ids)} symbols: {e}")
+            return 0
+
+        done = time.time()
+        self._publish_time.append(time.perf_counter() - started)
+        latest_received, pending_since = board.latest_received, board.pending_since
+        for symbol_id in symbol_ids:
+            self._latency.append(done - latest_received[symbol_id])
+            self._staleness.append(done - pending_since[symbol_id])
+
+        self.publishes += 1
+        self.quotes_published += written
+        return written
+
+    def stats(self) -> Dict:
+        """Throughput, coalescing and latency figures so far"""
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = self._elapsed or (time.monotonic() - self._started)
+        return {
+            "source": type(self.source).__name__,
+            "symbols": len(self.symbols),
+            "ticks": self.ticks,
+            "coalesced": self.coalesced,
+            "publishes": self.publishes,
+            "quotes_published": self.quotes_published,
+            "publish_failures": self.publish_failures,
+            "bars_written": self.bars_written,
+            "elapsed_s": round(elapsed, 3),
+            "ticks_per_sec": round(self.ticks / elapsed, 1) if elapsed else 0.0,
+            "coalescing_ratio": round(self.ticks / self.quotes_published, 2)
+            if self.quotes_published else 0.0,
+            "latency": _percentiles(self._latency),
+            "staleness": _percentiles(self._staleness),
+            "publish_time": _percentiles(self._publish_time),
+        }
+
+
+__all__ = ["MarketDataIngestor"]
@@ -0,0 +1,123 @@
+"""
+TradeSense AI Platform - Quote Storage Layout
+Redis keys and compact encoding of the latest quotes
+
+All latest quotes live in one hash (field = symbol, value = packed quote),
+so a publish is a single HSET with many fields and readers fetch any set
+of symbols with one HMGET. Each publish also announces the changed quotes
+on a pub/sub channel for real-time consumers.
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in base requirements
+    orjson = None
+
+from app.market_data.records import Quote
+
+QUOTES_KEY = "md:quotes"
+UPDATES_CHANNEL = "md:quotes:updates"
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def pack_quote(bid: float, ask: float, last: float, volume: float, timestamp: float) -> bytes:
+    """Packed quote: JSON array [bid, ask, last, volume, timestamp]"""
+    return _dumps((bid, ask, last, volume, timestamp))
+
+
+def unpack_quote(symbol: str, raw) -> Dict:
+    bid, ask, last, volume, timestamp = _loads(raw)
+    return {
+        "symbol": symbol,
+        "bid": bid,
+        "ask": ask,
+        "last": last,
+        "volume": volume,
+        "timestamp": timestamp,
+    }
+
+
+def write_quotes(client, names: List[str], quotes: Iterable[Quote], published_at: float) -> int:
+    """
+    Store and announce quotes in one pipelined round trip
+
+    Args:
+        client: Redis client
+        names: Symbol names by symbol id
+        quotes: Quotes to write
+        published_at: Publish timestamp (epoch seconds)
+
+    Returns:
+        Number of quotes written
+    """
+    mapping = {}
+    updates = []
+    for symbol_id, bid, ask, last, volume, timestamp in quotes:
+        symbol = names[symbol_id]
+        mapping[symbol] = pack_quote(bid, ask, last, volume, timestamp)
+        updates.append((symbol, bid, ask, last, volume, timestamp))
+    if not mapping:
+        return 0
+
+    pipeline = client.pipeline(transaction=False)
+    pipeline.hset(QUOTES_KEY, mapping=mapping)
+    pipeline.publish(UPDATES_CHANNEL, _dumps({"t": published_at, "q": updates}))
+    pipeline.execute()
+    return len(mapping)
+
+
+def unpack_updates(raw) -> Tuple[float, List[list]]:
+    """
+    Decode an UPDATES_CHANNEL message
+
+    Returns:
+        Publish timestamp and quotes as [symbol, bid, ask, last, volume, timestamp]
+    """
+    message = _loads(raw)
+    return message["t"], message["q"]
+
+
+def read_quotes(client, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Latest quotes from Redis
+
+    Args:
+        client: Redis client
+        symbols: Symbols to read (None: all)
+
+    Returns:
+        Quotes by symbol; unknown symbols are left out
+    """
+    if symbols is None:
+        raw = client.hgetall(QUOTES_KEY)
+        items = [(key.decode() if isinstance(key, bytes) else key, value) for key, value in raw.items()]
+    else:
+        if not symbols:
+            return {}
+        items = zip(symbols, client.hmget(QUOTES_KEY, symbols))
+    return {symbol: unpack_quote(symbol, value) for symbol, value in items if value is not None}
+
+
+__all__ = [
+    "QUOTES_KEY",
+    "UPDATES_CHANNEL",
+    "pack_quote",
+    "read_quotes",
+    "unpack_quote",
+    "unpack_updates",
+    "write_quotes",
+]
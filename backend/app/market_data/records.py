@@ -0,0 +1,173 @@
+"""
+TradeSense AI Platform - Market Data Records
+Compact, array-backed tick batches and the per-symbol latest quote board
+
+Ticks are never materialized as one object each: sources append their
+fields straight into typed arrays (array module, 8 bytes per float) keyed
+by an interned symbol id, and the QuoteBoard folds a batch into per-symbol
+arrays, so any number of ticks for a symbol within a refresh interval
+collapse into a single pending update.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Set, Tuple
+
+
+class SymbolTable:
+    """Interns symbols to dense integer ids"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, symbol: str) -> int:
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.ids[symbol] = len(self.names)
+            self.names.append(symbol)
+        return symbol_id
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class TickBatch:
+    """
+    Columnar batch of normalized ticks
+
+    Columns: symbol id, source timestamp, receive timestamp (epoch
+    seconds), bid, ask, last and traded volume.
+    """
+
+    __slots__ = ("symbol_ids", "timestamps", "received", "bids", "asks", "lasts", "volumes")
+
+    def __init__(self):
+        self.symbol_ids = array("l")
+        self.timestamps = array("d")
+        self.received = array("d")
+        self.bids = array("d")
+        self.asks = array("d")
+        self.lasts = array("d")
+        self.volumes = array("d")
+
+    def append(
+        self,
+        symbol_id: int,
+        timestamp: float,
+        received: float,
+        bid: float,
+        ask: float,
+        last: float,
+        volume: float,
+    ) -> None:
+        self.symbol_ids.append(symbol_id)
+        self.timestamps.append(timestamp)
+        self.received.append(received)
+        self.bids.append(bid)
+        self.asks.append(ask)
+        self.lasts.append(last)
+        self.volumes.append(volume)
+
+    def clear(self) -> None:
+        for name in self.__slots__:
+            del getattr(self, name)[:]
+
+    def __len__(self) -> int:
+        return len(self.symbol_ids)
+
+    @property
+    def nbytes(self) -> int:
+        columns = [getattr(self, name) for name in self.__slots__]
+        return sum(len(column) * column.itemsize for column in columns)
+
+
+# (symbol id, bid, ask, last, cumulative volume, source timestamp)
+Quote = Tuple[int, float, float, float, float, float]
+
+
+class QuoteBoard:
+    """
+    Latest quote per symbol, coalescing updates between publishes
+
+    apply() overwrites each symbol's slot with its newest tick and marks
+    it dirty; take_dirty() hands the dirty symbols to the publisher once
+    per refresh interval.
+    """
+
+    def __init__(self):
+        self.bids = array("d")
+        self.asks = array("d")
+        self.lasts = array("d")
+        self.volumes = array("d")  # cumulative since ingestion started
+        self.timestamps = array("d")
+        # Receive time of the first and the newest tick of the pending
+        # update, for staleness and end-to-end latency
+        self.pending_since = array("d")
+        self.latest_received = array("d")
+        self.dirty: Set[int] = set()
+
+    def _grow(self, size: int) -> None:
+        missing = size - len(self.bids)
+        if missing > 0:
+            zeros = array("d", bytes(8 * missing))
+            for column in (
+                self.bids, self.asks, self.lasts, self.volumes,
+                self.timestamps, self.pending_since, self.latest_received,
+            ):
+                column.extend(zeros)
+
+    def apply(self, batch: TickBatch, symbol_count: int) -> int:
+        """
+        Fold a batch into the board
+
+        Args:
+            batch: Ticks to apply, in arrival order
+            symbol_count: Number of interned symbols (sizes the arrays)
+
+        Returns:
+            Number of ticks absorbed into an already pending update
+        """
+        self._grow(symbol_count)
+        bids, asks, lasts = self.bids, self.asks, self.lasts
+        volumes, timestamps = self.volumes, self.timestamps
+        pending_since, latest_received = self.pending_since, self.latest_received
+        dirty = self.dirty
+        before = len(dirty)
+
+        for symbol_id, timestamp, received, bid, ask, last, volume in zip(
+            batch.symbol_ids, batch.timestamps, batch.received,
+            batch.bids, batch.asks, batch.lasts, batch.volumes,
+        ):
+            bids[symbol_id] = bid
+            asks[symbol_id] = ask
+            lasts[symbol_id] = last
+            volumes[symbol_id] += volume
+            timestamps[symbol_id] = timestamp
+            latest_received[symbol_id] = received
+            if symbol_id not in dirty:
+                dirty.add(symbol_id)
+                pending_since[symbol_id] = received
+
+        return len(batch) - (len(dirty) - before)
+
+    def take_dirty(self) -> List[int]:
+        """Symbol ids with a pending update (the set is cleared)"""
+        dirty = list(self.dirty)
+        self.dirty.clear()
+        return dirty
+
+    def restore_dirty(self, symbol_ids: List[int]) -> None:
+        """Mark symbols pending again after a failed publish"""
+        self.dirty.update(symbol_ids)
+
+    def quotes(self, symbol_ids: List[int]) -> Iterator[Quote]:
+        bids, asks, lasts = self.bids, self.asks, self.lasts
+        volumes, timestamps = self.volumes, self.timestamps
+        for symbol_id in symbol_ids:
+            yield (
+                symbol_id, bids[symbol_id], asks[symbol_id], lasts[symbol_id],
+                volumes[symbol_id], timestamps[symbol_id],
+            )
+
+
+__all__ = ["Quote", "QuoteBoard", "SymbolTable", "TickBatch"]
@@ -0,0 +1,290 @@
+"""
+TradeSense AI Platform - Market Data Sources
+Pluggable tick feeds for the ingestion pipeline
+
+A source appends normalized ticks to a TickBatch when the ingestor asks
+for them. Sources are created from a spec string ("scheme:argument", see
+MARKET_DATA_SOURCE); new feeds register a factory for their scheme:
+
+    register_source("alpaca", lambda argument, **options: AlpacaSource(argument))
+"""
+
+import csv
+import json
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.market_data.records import SymbolTable, TickBatch
+
+# (symbol, timestamp, bid, ask, last, volume)
+RawTick = Tuple[str, float, float, float, float, float]
+
+
+class TickSource:
+    """Base class of tick feeds"""
+
+    # True once a finite source has delivered its last tick
+    exhausted = False
+
+    def read(self, batch: TickBatch, symbols: SymbolTable, max_ticks: int, timeout: float) -> int:
+        """
+        Append up to max_ticks ticks to a batch
+
+        Args:
+            batch: Batch to append to
+            symbols: Symbol table used to intern symbols
+            max_ticks: Maximum number of ticks to append
+            timeout: Seconds to wait for ticks when none are available
+
+        Returns:
+            Number of ticks appended
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def parse_timestamp(value) -> float:
+    """Epoch seconds from a number or an ISO 8601 string"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+class FileTickSource(TickSource):
+    """
+    Replays ticks recorded in a CSV or JSONL file
+
+    Columns / keys: symbol, timestamp (epoch seconds or ISO 8601), bid,
+    ask and optionally last (default: mid) and volume (default: 0).
+    Ticks are replayed as fast as they are read, or paced by their
+    timestamps with speed (2.0 = twice real time). The same file always
+    produces the same feed, which makes it the source for tests and
+    benchmarks.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = None, loop: bool = False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.exhausted = False
+        self._rows: Optional[Iterator[RawTick]] = None
+        self._file = None
+        self._held: Optional[RawTick] = None  # next tick, not yet due
+        self._clock: Optional[Tuple[float, float]] = None  # (first tick ts, wall start)
+
+    def read(self, batch: TickBatch, symbols: SymbolTable, max_ticks: int, timeout: float) -> int:
+        if self.exhausted:
+            return 0
+        if self._rows is None:
+            self._rows = self._open()
+
+        intern = symbols.intern
+        append = batch.append
+        received = time.time()
+        count = 0
+        while count < max_ticks:
+            row = self._held
+            self._held = None
+            if row is None:
+                row = next(self._rows, None)
+                if row is None:
+                    if not self.loop:
+                        self.exhausted = True
+                        self.close()
+                        break
+                    self.close()
+                    self._rows = self._open()
+                    self._clock = None
+                    continue
+
+            symbol, timestamp, bid, ask, last, volume = row
+            if self.speed:
+                wait = self._due(timestamp) - time.time()
+                if wait > 0:
+                    if count or wait > timeout:
+                        # Deliver what is ready; this tick waits for its turn
+                        self._held = row
+                        if not count:
+                            time.sleep(timeout)
+                        break
+                    time.sleep(wait)
+                    received = time.time()
+
+            append(intern(symbol), timestamp, received, bid, ask, last, volume)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Internal helpers
+
+    def _due(self, timestamp: float) -> float:
+        if self._clock is None:
+            self._clock = (timestamp, time.time())
+        first, started = self._clock
+        return started + (timestamp - first) / self.speed
+
+    def _open(self) -> Iterator[RawTick]:
+        self._file = open(self.path, newline="")
+        if self.path.endswith(".jsonl"):
+            return self._jsonl_rows(self._file)
+        return self._csv_rows(self._file)
+
+    @staticmethod
+    def _csv_rows(handle) -> Iterator[RawTick]:
+        reader = csv.reader(handle)
+        header = [name.strip().lower() for name in next(reader)]
+        index = {name: position for position, name in enumerate(header)}
+        symbol_i, time_i = index["symbol"], index["timestamp"]
+        bid_i, ask_i = index["bid"], index["ask"]
+        last_i, volume_i = index.get("last"), index.get("volume")
+
+        for row in reader:
+            if not row:
+                continue
+            bid = float(row[bid_i])
+            ask = float(row[ask_i])
+            last = float(row[last_i]) if last_i is not None and row[last_i] else (bid + ask) / 2
+            volume = float(row[volume_i]) if volume_i is not None and row[volume_i] else 0.0
+            yield row[symbol_i], parse_timestamp(row[time_i]), bid, ask, last, volume
+
+    @staticmethod
+    def _jsonl_rows(handle) -> Iterator[RawTick]:
+        for line in handle:
+            if not line.strip():
+                continue
+            tick = json.loads(line)
+            bid = float(tick["bid"])
+            ask = float(tick["ask"])
+            last = tick.get("last")
+            yield (
+                tick["symbol"],
+                parse_timestamp(tick["timestamp"]),
+                bid,
+                ask,
+                float(last) if last is not None else (bid + ask) / 2,
+                float(tick.get("volume") or 0.0),
+            )
+
+
+class SyntheticTickSource(TickSource):
+    """
+    Random-walk quotes for development and load tests
+
+    Args:
+        symbols: Symbol names, or a count of generated names (SYM0001...)
+        rate: Ticks per second (None: as fast as possible)
+        count: Total ticks before the source is exhausted (None: endless)
+        seed: Random seed
+    """
+
+    def __init__(self, symbols=20, rate: Optional[float] = 100.0, count: Optional[int] = None, seed: int = 7):
+        if isinstance(symbols, int):
+            symbols = [f"SYM{i:04d}" for i in range(1, symbols + 1)]
+        self.symbols: List[str] = list(symbols)
+        self.rate = rate
+        self.remaining = count
+        self.exhausted = False
+        self._random = random.Random(seed)
+        self._prices = [100.0 + 10 * i for i in range(len(self.symbols))]
+        self._next_at = time.time()
+
+    def read(self, batch: TickBatch, symbols: SymbolTable, max_ticks: int, timeout: float) -> int:
+        if self.exhausted:
+            return 0
+
+        wanted = max_ticks
+        if self.remaining is not None:
+            wanted = min(wanted, self.remaining)
+        if self.rate:
+            now = time.time()
+            if now < self._next_at:
+                time.sleep(min(timeout, self._next_at - now))
+                now = time.time()
+                if now < self._next_at:
+                    return 0
+            # Ticks that came due since the last read
+            wanted = min(wanted, int((now - self._next_at) * self.rate) + 1)
+            self._next_at += wanted / self.rate
+
+        ids = [symbols.intern(symbol) for symbol in self.symbols]
+        prices, uniform, randrange = self._prices, self._random.uniform, self._random.randrange
+        append = batch.append
+        now = time.time()
+        for _ in range(wanted):
+            index = randrange(len(ids))
+            price = prices[index] = max(0.01, prices[index] + uniform(-0.05, 0.05))
+            spread = price * 0.0001
+            append(ids[index], now, now, price - spread, price + spread, price, 1.0)
+
+        if self.remaining is not None:
+            self.remaining -= wanted
+            self.exhausted = self.remaining <= 0
+        return wanted
+
+
+# Source factories by spec scheme
+_factories: Dict[str, Callable[..., TickSource]] = {}
+
+
+def register_source(scheme: str, factory: Callable[..., TickSource]) -> None:
+    """
+    Make a source available to create_source
+
+    Args:
+        scheme: Spec prefix (e.g. "file")
+        factory: Called with the spec argument and options, returns a TickSource
+    """
+    _factories[scheme] = factory
+
+
+def create_source(spec: str, **options) -> TickSource:
+    """
+    Create a source from a spec string
+
+    Usage:
+        create_source("file:data/ticks.csv", speed=10)
+        create_source("synthetic:50", rate=1000)
+
+    Args:
+        spec: "scheme:argument"
+        **options: Passed to the factory
+
+    Returns:
+        The tick source
+
+    Raises:
+        ValueError: If no source is registered for the scheme
+    """
+    scheme, _, argument = spec.partition(":")
+    factory = _factories.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unknown market data source '{scheme}' (known: {', '.join(sorted(_factories))})")
+    return factory(argument, **options)
+
+
+register_source("file", lambda path, **options: FileTickSource(path, **options))
+register_source(
+    "synthetic",
+    lambda argument, **options: SyntheticTickSource(
+        int(argument) if argument.isdigit() else (argument.split(",") if argument else 20),
+        **options,
+    ),
+)
+
+__all__ = [
+    "FileTickSource",
+    "SyntheticTickSource",
+    "TickSource",
+    "create_source",
+    "parse_timestamp",
+    "register_source",
+]
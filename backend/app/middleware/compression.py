@@ -0,0 +1,122 @@
+"""
+TradeSense AI Platform - Response Compression Middleware
+Compresses large responses with brotli or gzip according to Accept-Encoding
+"""
+
+import gzip
+from typing import Optional
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "text/html",
+    "text/plain",
+    "text/csv",
+    "text/css",
+    "application/javascript",
+}
+
+
+class Compressor:
+    """
+    after_request hook compressing responses above a size threshold
+
+    Brotli is preferred when installed and accepted by the client, gzip is
+    used otherwise. Small bodies are sent as-is since compressing them costs
+    more CPU than the bytes saved.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize compression with Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("COMPRESS_ENABLED", True)
+        self.min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        self.gzip_level = app.config.get("COMPRESS_GZIP_LEVEL", 6)
+        self.brotli_quality = app.config.get("COMPRESS_BROTLI_QUALITY", 4)
+
+        if self.enabled:
+            app.after_request(self._compress_response)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["compressor"] = self
+
+    def choose_encoding(self, accept_encoding) -> Optional[str]:
+        """
+        Pick the best supported encoding from an Accept-Encoding header
+
+        Args:
+            accept_encoding: Parsed Accept-Encoding header
+
+        Returns:
+            "br", "gzip" or None
+        """
+        if brotli is not None and accept_encoding["br"] > 0:
+            return "br"
+        if accept_encoding["gzip"] > 0:
+            return "gzip"
+        return None
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        """
+        Compress a body with the given encoding
+
+        Args:
+            data: Raw body
+            encoding: "br" or "gzip"
+
+        Returns:
+            Compressed body
+        """
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def _compress_response(self, response: Response) -> Response:
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+
+        if (response.content_length or 0) < self.min_size:
+            return response
+
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(self.compress(response.get_data(), encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+# Global compressor instance
+compressor = Compressor()
+
+
+__all__ = ["compressor", "Compressor"]
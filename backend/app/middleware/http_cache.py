@@ -0,0 +1,214 @@
+"""
+TradeSense AI Platform - HTTP Response Caching Middleware
+Weak ETags, conditional GET (304), per-route Cache-Control and a server-side
+full-response cache for static-ish endpoints
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Flask, Response, current_app, make_response, request
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def make_etag(version) -> str:
+    """
+    Build an opaque ETag value from a resource version
+
+    Args:
+        version: Any value whose str() changes when the resource changes
+
+    Returns:
+        Hex digest usable as an ETag
+    """
+    return hashlib.blake2b(str(version).encode(), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """
+    Conditional GET support for read endpoints
+
+    Every successful GET gets a weak ETag hashed from its body and is
+    answered with 304 when If-None-Match matches, which saves bandwidth.
+    Views decorated with etag() compute the ETag from a cheap resource
+    version first and skip building the body altogether on a match.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.auto_etag = True
+        self.max_entries = 1024
+        self._store: "OrderedDict[str, Tuple[float, bytes, int, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize response caching with Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("HTTP_CACHE_ENABLED", True)
+        self.auto_etag = app.config.get("HTTP_CACHE_AUTO_ETAG", True)
+        self.max_entries = app.config.get("HTTP_CACHE_MAX_ENTRIES", 1024)
+
+        if self.enabled:
+            app.after_request(self._finalize_response)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["response_cache"] = self
+
+    # Route decorators
+
+    def cache_control(self, value: str) -> Callable:
+        """
+        Decorator setting the Cache-Control header of a view
+
+        Usage:
+            @api_v1_bp.route('/info')
+            @response_cache.cache_control('public, max-age=300')
+            def api_info():
+                ...
+
+        Args:
+            value: Cache-Control header value
+        """
+
+        def decorator(f: Callable) -> Callable:
+            f._cache_control = value
+            return f
+
+        return decorator
+
+    def etag(self, version_func: Callable) -> Callable:
+        """
+        Decorator answering conditional GETs from a resource version
+
+        version_func is called with the view arguments and must return a
+        value that changes whenever the response body would change (e.g.
+        updated_at plus any fields stored outside the row). On a matching
+        If-None-Match the view is not called.
+
+        Args:
+            version_func: Callable returning the resource version
+        """
+
+        def decorator(f: Callable) -> Callable:
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                if not self.enabled or request.method not in CACHEABLE_METHODS:
+                    return f(*args, **kwargs)
+
+                tag = make_etag(version_func(*args, **kwargs))
+                if request.if_none_match.contains_weak(tag):
+                    response = current_app.response_class(status=304)
+                else:
+                    response = make_response(f(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+
+                response.set_etag(tag, weak=True)
+                return response
+
+            return decorated
+
+        return decorator
+
+    def cached(self, timeout: int = 60) -> Callable:
+        """
+        Decorator caching the full response of a view in this process
+
+        Only for responses that do not depend on the caller (no auth, no
+        per-user data). The cache key is the request path and query string.
+
+        Args:
+            timeout: Seconds a cached response stays valid
+        """
+
+        def decorator(f: Callable) -> Callable:
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                if not self.enabled or request.method not in CACHEABLE_METHODS:
+                    return f(*args, **kwargs)
+
+                key = f"{request.endpoint}:{request.full_path}"
+                now = time.monotonic()
+
+                with self._lock:
+                    entry = self._store.get(key)
+                if entry is not None and entry[0] > now:
+                    _, body, status, headers = entry
+                    return current_app.response_class(body, status=status, headers=headers)
+
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    if "ETag" not in response.headers:
+                        response.add_etag(weak=True)
+                    self._put(key, now + timeout, response)
+                return response
+
+            return decorated
+
+        return decorator
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        with self._lock:
+            self._store.clear()
+
+    # Internal helpers
+
+    def _put(self, key: str, expires_at: float, response: Response) -> None:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name in ("Content-Type", "ETag", "Cache-Control")
+        }
+        with self._lock:
+            self._store[key] = (
+                expires_at,
+                response.get_data(),
+                response.status_code,
+                headers,
+            )
+            self._store.move_to_end(key)
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    def _finalize_response(self, response: Response) -> Response:
+        if request.method not in CACHEABLE_METHODS:
+            return response
+
+        view = current_app.view_functions.get(request.endpoint)
+        cache_control = getattr(view, "_cache_control", None)
+        if cache_control and "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = cache_control
+
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.cache_control.no_store
+        ):
+            return response
+
+        if self.auto_etag and "ETag" not in response.headers:
+            response.add_etag(weak=True)
+        if "ETag" in response.headers:
+            response.make_conditional(request)
+        return response
+
+
+# Global response cache instance
+response_cache = ResponseCache()
+
+
+__all__ = ["response_cache", "ResponseCache", "make_etag"]
@@ -0,0 +1,312 @@
+"""
+TradeSense AI Platform - Request Metrics Middleware
+Per-endpoint latency histograms, Server-Timing headers and a /metrics
+endpoint aggregated across gunicorn workers
+"""
+
+import bisect
+import glob
+import ipaddress
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import Flask, Response, jsonify, request
+
+from app.core.timing import PHASES, current_timing, start_request_timing
+
+# Latency bucket upper bounds in milliseconds: 0.1 ms to ~2 min, +25% each
+BUCKET_BOUNDS_MS = tuple(round(0.1 * 1.25 ** i, 4) for i in range(64))
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class EndpointStats:
+    """Latency histogram and phase totals for one endpoint"""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "phase_ms", "phase_calls")
+
+    def __init__(self):
+        # One extra bucket for values above the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.phase_ms = dict.fromkeys(PHASES, 0.0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+
+    def observe(
+        self,
+        duration_ms: float,
+        phase_ms: Dict[str, float],
+        phase_calls: Dict[str, int],
+    ) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        for phase in PHASES:
+            self.phase_ms[phase] += phase_ms[phase]
+            self.phase_calls[phase] += phase_calls[phase]
+
+    def merge(self, data: Dict) -> None:
+        """Add a serialized snapshot (see to_dict) into these stats"""
+        for i, value in enumerate(data["counts"]):
+            self.counts[i] += value
+        self.count += data["count"]
+        self.total_ms += data["total_ms"]
+        self.max_ms = max(self.max_ms, data["max_ms"])
+        for phase in PHASES:
+            self.phase_ms[phase] += data["phase_ms"].get(phase, 0.0)
+            self.phase_calls[phase] += data["phase_calls"].get(phase, 0)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile from the histogram
+
+        Interpolates linearly inside the bucket holding the rank, so the
+        error is bounded by the bucket width (25%).
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max_ms)
+            cumulative += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "counts": list(self.counts),
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "phase_ms": dict(self.phase_ms),
+            "phase_calls": dict(self.phase_calls),
+        }
+
+    def summary(self) -> Dict:
+        """Percentiles and average phase times for reporting"""
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / count, 3),
+            "max_ms": round(self.max_ms, 3),
+            **{f"p{q}_ms": round(self.percentile(q), 3) for q in PERCENTILES},
+            "phases": {
+                phase: {
+                    "mean_ms": round(self.phase_ms[phase] / count, 3),
+                    "calls_per_request": round(self.phase_calls[phase] / count, 2),
+                }
+                for phase in PHASES
+            },
+        }
+
+
+class RequestMetrics:
+    """
+    Request timing middleware
+
+    Each worker keeps its histograms in memory. With METRICS_MULTIPROC_DIR
+    set (gunicorn), workers also write a snapshot file there every
+    METRICS_SYNC_INTERVAL seconds and /metrics merges all snapshot files,
+    so any worker answers with totals for the whole server.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.server_timing = True
+        self.multiproc_dir: Optional[str] = None
+        self.sync_interval = 5.0
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+        self._last_sync = 0.0
+        self._started_at = time.time()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize request metrics with Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        self.server_timing = app.config.get("METRICS_SERVER_TIMING", True)
+        self.multiproc_dir = app.config.get("METRICS_MULTIPROC_DIR")
+        self.sync_interval = app.config.get("METRICS_SYNC_INTERVAL", 5.0)
+
+        if self.enabled:
+            if self.multiproc_dir:
+                os.makedirs(self.multiproc_dir, exist_ok=True)
+            app.before_request(self._start_timer)
+            app.after_request(self._record_request)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["request_metrics"] = self
+
+    # Request hooks
+
+    def _start_timer(self) -> None:
+        start_request_timing()
+
+    def _record_request(self, response: Response) -> Response:
+        timing = current_timing()
+        if timing is None or request.endpoint == "metrics":
+            return response
+
+        duration_ms = timing.elapsed() * 1000
+        phase_ms = {phase: timing.durations[phase] * 1000 for phase in PHASES}
+
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        key = f"{request.method} {rule}"
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.observe(duration_ms, phase_ms, timing.calls)
+
+        if self.server_timing:
+            response.headers["Server-Timing"] = ", ".join(
+                [
+                    f"{phase};dur={phase_ms[phase]:.2f}"
+                    for phase in PHASES
+                    if timing.calls[phase]
+                ]
+                + [f"app;dur={duration_ms:.2f}"]
+            )
+
+        if self.multiproc_dir and time.monotonic() - self._last_sync >= self.sync_interval:
+            self.write_snapshot()
+
+        return response
+
+    # Aggregation
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Serializable copy of this worker's stats"""
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def write_snapshot(self) -> None:
+        """Write this worker's stats to the multiprocess directory"""
+        self._last_sync = time.monotonic()
+        path = os.path.join(self.multiproc_dir, f"worker-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def aggregate(self) -> Dict[str, EndpointStats]:
+        """
+        Merge stats from every worker
+
+        Returns:
+            Stats per endpoint ("METHOD /rule")
+        """
+        snapshots: List[Dict] = []
+        if self.multiproc_dir:
+            # Refresh our own file so the totals include this worker's latest
+            self.write_snapshot()
+            for path in glob.glob(os.path.join(self.multiproc_dir, "worker-*.json")):
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        else:
+            snapshots.append(self.snapshot())
+
+        merged: Dict[str, EndpointStats] = {}
+        for snapshot in snapshots:
+            for key, data in snapshot.items():
+                merged.setdefault(key, EndpointStats()).merge(data)
+        return merged
+
+    def report(self) -> Dict:
+        """Aggregated percentiles per endpoint"""
+        merged = self.aggregate()
+        total = EndpointStats()
+        for stats in merged.values():
+            total.merge(stats.to_dict())
+
+        return {
+            "workers": (
+                len(glob.glob(os.path.join(self.multiproc_dir, "worker-*.json")))
+                if self.multiproc_dir
+                else 1
+            ),
+            "uptime_seconds": round(time.time() - self._started_at),
+            "overall": total.summary(),
+            "endpoints": {key: merged[key].summary() for key in sorted(merged)},
+        }
+
+    def reset(self) -> None:
+        """Drop this worker's stats"""
+        with self._lock:
+            self._stats.clear()
+
+
+# Global metrics instance
+metrics = RequestMetrics()
+
+
+def register_metrics_endpoint(app: Flask) -> None:
+    """
+    Register the /metrics endpoint
+
+    Clients in METRICS_ALLOWED_NETWORKS (the scraper) are served directly;
+    anyone else needs an admin token.
+
+    Args:
+        app: Flask application instance
+    """
+    from app.middleware.http_cache import response_cache
+    from app.middleware.rate_limit import limiter
+    from app.models.user import UserRole
+    from app.utils.jwt_utils import require_role
+
+    networks = [
+        ipaddress.ip_network(network.strip(), strict=False)
+        for network in app.config.get("METRICS_ALLOWED_NETWORKS", ["127.0.0.1/32", "::1/128"])
+        if network.strip()
+    ]
+
+    def report():
+        from app.core.log_pipeline import log_pipeline
+
+        data = metrics.report()
+        data["logging"] = log_pipeline.stats()
+        return jsonify({"success": True, "data": data}), 200
+
+    admin_report = require_role(UserRole.ADMIN, UserRole.SUPER_ADMIN)(report)
+
+    @app.route("/metrics", methods=["GET"], endpoint="metrics")
+    @limiter.exempt
+    @response_cache.cache_control("no-store")
+    def metrics_report():
+        """Aggregated request latency percentiles"""
+        if _in_networks(request.remote_addr, networks):
+            return report()
+        return admin_report()
+
+
+def _in_networks(address: Optional[str], networks: List) -> bool:
+    try:
+        ip = ipaddress.ip_address(address or "")
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+__all__ = ["metrics", "RequestMetrics", "EndpointStats", "register_metrics_endpoint"]
@@ -0,0 +1,400 @@
+"""
+TradeSense AI Platform - Rate Limiting Middleware
+GCRA rate limiting backed by Redis with a per-worker local pre-filter
+"""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import redis
+from flask import Blueprint, Flask, abort, current_app, g, request
+
+from app.core.timing import TimedConnection
+
+# KEYS[1] = limit key
+# ARGV[1] = now (ms), ARGV[2] = emission interval (ms), ARGV[3] = tolerance (ms),
+# ARGV[4] = hits already admitted locally (charged unconditionally)
+# Returns {allowed, remaining, reset (ms), retry_after (ms)}
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tolerance = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+tat = tat + interval * tonumber(ARGV[4])
+
+local allowed = 0
+local retry_after = 0
+if tat - tolerance <= now then
+    allowed = 1
+    tat = tat + interval
+else
+    retry_after = tat - tolerance - now
+end
+
+local reset = tat - now
+if reset > 0 then
+    redis.call('SET', KEYS[1], tat, 'PX', math.ceil(reset))
+end
+local remaining = math.floor((tolerance + interval - reset) / interval)
+if remaining < 0 then
+    remaining = 0
+end
+return {allowed, remaining, math.ceil(reset), math.ceil(retry_after)}
+"""
+
+PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+LIMIT_PATTERN = re.compile(
+    r"^\s*(\d+)\s*(?:per|/)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$"
+)
+
+
+class RateLimit:
+    """A parsed rate limit policy such as "10 per minute" """
+
+    def __init__(self, amount: int, period: int, key: str = "ip", scope: str = ""):
+        self.amount = amount
+        self.period = period
+        self.key = key
+        self.scope = scope
+
+        # GCRA parameters in milliseconds
+        self.interval = period * 1000 / amount
+        self.tolerance = period * 1000 - self.interval
+
+    @classmethod
+    def parse(cls, value: str, key: str = "ip", scope: str = "") -> List["RateLimit"]:
+        """
+        Parse limit strings like "100 per hour" or "5/minute; 100/day"
+
+        Args:
+            value: Limit string (multiple limits separated by ";")
+            key: Client key the limit applies to ("ip", "user" or "global")
+            scope: Name the limit is counted under
+
+        Returns:
+            List of rate limits
+        """
+        limits = []
+        for part in filter(None, (p.strip() for p in value.split(";"))):
+            match = LIMIT_PATTERN.match(part)
+            if not match:
+                raise ValueError(f"Invalid rate limit: '{part}'")
+            amount, multiplier, unit = match.groups()
+            period = PERIODS[unit] * int(multiplier or 1)
+            limits.append(cls(int(amount), period, key=key, scope=scope))
+        return limits
+
+    def __repr__(self) -> str:
+        return f"<RateLimit({self.amount}/{self.period}s, key={self.key})>"
+
+
+class LocalBucket:
+    """Per-worker allowance granted from the last Redis decision"""
+
+    __slots__ = ("allowance", "pending", "remaining", "reset_at", "valid_until")
+
+    def __init__(self):
+        self.allowance = 0
+        self.pending = 0
+        self.remaining = 0
+        self.reset_at = 0.0
+        self.valid_until = 0.0
+
+
+class RateLimiter:
+    """
+    Redis-backed GCRA rate limiter
+
+    Every Redis check is a single EVALSHA. Clients far below their limit are
+    admitted from a local allowance (a fraction of the remaining budget
+    reported by Redis); those hits are charged to Redis on the next check.
+
+    When a check fails, the worker stops asking Redis for
+    RATELIMIT_REDIS_BACKOFF seconds and counts hits in its local buckets
+    against the last budget Redis reported (the full limit for keys it has
+    not seen). After the backoff one request probes Redis again.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.redis_client: Optional[redis.Redis] = None
+        self.enabled = False
+        self.default_limits: List[RateLimit] = []
+        self._blueprint_limits: Dict[str, List[RateLimit]] = {}
+        self._script = None
+        self._local: "OrderedDict[str, LocalBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_retry_at = 0.0  # monotonic; Redis is skipped until then
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize rate limiter with Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("RATELIMIT_ENABLED", True)
+        self.key_prefix = app.config.get("RATELIMIT_KEY_PREFIX", "rl")
+        self.headers_enabled = app.config.get("RATELIMIT_HEADERS_ENABLED", True)
+        self.local_fraction = app.config.get("RATELIMIT_LOCAL_FRACTION", 0.1)
+        self.local_sync_interval = app.config.get("RATELIMIT_LOCAL_SYNC_INTERVAL", 1.0)
+        self.local_max_entries = app.config.get("RATELIMIT_LOCAL_MAX_ENTRIES", 10000)
+        self.redis_backoff = app.config.get("RATELIMIT_REDIS_BACKOFF", 5.0)
+        self.default_limits = RateLimit.parse(
+            app.config.get("RATELIMIT_DEFAULT", ""), scope="default"
+        )
+
+        if self.enabled:
+            storage_url = app.config.get(
+                "RATELIMIT_STORAGE_URL", "redis://localhost:6379/3"
+            )
+            # Connections are opened lazily on the first check
+            self.redis_client = redis.from_url(
+                storage_url,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+                connection_class=TimedConnection,
+            )
+            self._script = self.redis_client.register_script(GCRA_SCRIPT)
+
+            app.before_request(self._check_request)
+            app.after_request(self._inject_headers)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["rate_limiter"] = self
+
+    # Policy declaration
+
+    def limit(self, value: str, key: str = "ip") -> Callable:
+        """
+        Decorator declaring a rate limit on a view
+
+        Usage:
+            @auth_bp.route('/login', methods=['POST'])
+            @limiter.limit("10 per minute")
+            def login():
+                ...
+
+        Args:
+            value: Limit string, e.g. "10 per minute"
+            key: "ip", "user" (JWT identity, falls back to IP) or "global"
+        """
+
+        def decorator(f: Callable) -> Callable:
+            limits = RateLimit.parse(value, key=key, scope=f"{f.__module__}.{f.__name__}")
+            f._rate_limits = getattr(f, "_rate_limits", []) + limits
+            return f
+
+        return decorator
+
+    def limit_blueprint(self, blueprint: Blueprint, value: str, key: str = "ip") -> None:
+        """
+        Declare a rate limit shared by every view of a blueprint
+
+        Args:
+            blueprint: Blueprint to limit
+            value: Limit string
+            key: Client key type
+        """
+        self._blueprint_limits.setdefault(blueprint.name, []).extend(
+            RateLimit.parse(value, key=key, scope=f"bp.{blueprint.name}")
+        )
+
+    def exempt(self, f: Callable) -> Callable:
+        """Decorator exempting a view from all rate limits"""
+        f._rate_limit_exempt = True
+        return f
+
+    # Request hooks
+
+    def _limits_for_request(self) -> List[RateLimit]:
+        """Collect the limits that apply to the current endpoint"""
+        view = current_app.view_functions.get(request.endpoint)
+        if view is None or getattr(view, "_rate_limit_exempt", False):
+            return []
+
+        limits = list(getattr(view, "_rate_limits", []))
+
+        # Nested blueprints are reported as "api_v1.auth", "api_v1"
+        for name in request.blueprints:
+            limits.extend(self._blueprint_limits.get(name.rsplit(".", 1)[-1], []))
+
+        return limits or self.default_limits
+
+    def _client_key(self, limit: RateLimit) -> str:
+        if limit.key == "global":
+            return "global"
+        if limit.key == "user":
+            try:
+                from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+                verify_jwt_in_request(optional=True)
+                identity = get_jwt_identity()
+                if identity is not None:
+                    return f"user:{identity}"
+            except Exception:
+                pass
+        return f"ip:{request.remote_addr or 'unknown'}"
+
+    def _check_request(self):
+        if request.method == "OPTIONS":
+            return None
+
+        limits = self._limits_for_request()
+        if not limits:
+            return None
+
+        tightest = None
+        for limit in limits:
+            key = f"{self.key_prefix}:{limit.scope}:{limit.period}:{self._client_key(limit)}"
+            allowed, remaining, reset, retry_after = self.hit(key, limit)
+
+            state = (limit, remaining, reset, retry_after)
+            if not allowed:
+                g.rate_limit_state = state
+                abort(429)
+            if tightest is None or remaining < tightest[1]:
+                tightest = state
+
+        g.rate_limit_state = tightest
+        return None
+
+    def _inject_headers(self, response):
+        state = g.pop("rate_limit_state", None)
+        if state is None or not self.headers_enabled:
+            return response
+
+        limit, remaining, reset, retry_after = state
+        response.headers["RateLimit-Limit"] = str(limit.amount)
+        response.headers["RateLimit-Remaining"] = str(remaining)
+        response.headers["RateLimit-Reset"] = str(math.ceil(reset))
+        response.headers["RateLimit-Policy"] = f"{limit.amount};w={limit.period}"
+        if response.status_code == 429:
+            response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+
+    # Limit evaluation
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, int, float, float]:
+        """
+        Record a hit against a limit
+
+        Args:
+            key: Fully qualified limit key
+            limit: Limit policy
+
+        Returns:
+            Tuple of (allowed, remaining, reset_seconds, retry_after_seconds)
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._local.get(key)
+            if bucket is not None and bucket.allowance > 0 and now < bucket.valid_until:
+                bucket.allowance -= 1
+                bucket.pending += 1
+                self._local.move_to_end(key)
+                return (
+                    True,
+                    max(bucket.remaining - bucket.pending, 0),
+                    max(bucket.reset_at - now, 0.0),
+                    0.0,
+                )
+            skip_redis = now < self._redis_retry_at
+            if not skip_redis:
+                if self._redis_retry_at:
+                    # Redis failed before: this request probes it, others stay local
+                    self._redis_retry_at = now + self.redis_backoff
+                pending = bucket.pending if bucket is not None else 0
+                if bucket is not None:
+                    bucket.pending = 0
+
+        if skip_redis:
+            return self._hit_local(key, limit, now)
+
+        try:
+            allowed, remaining, reset_ms, retry_ms = self._script(
+                keys=[key],
+                args=[int(time.time() * 1000), limit.interval, limit.tolerance, pending],
+            )
+        except redis.RedisError as e:
+            # An unavailable limiter must not take the API down (nor wait on
+            # every request): limit locally until the backoff is over
+            current_app.logger.warning(
+                f"Rate limit check failed for {key}, limiting locally "
+                f"for {self.redis_backoff}s: {e}"
+            )
+            with self._lock:
+                self._redis_retry_at = time.monotonic() + self.redis_backoff
+                bucket = self._local.get(key)
+                if bucket is not None:
+                    bucket.pending += pending
+            return self._hit_local(key, limit, now)
+
+        reset = reset_ms / 1000
+        with self._lock:
+            self._redis_retry_at = 0.0
+            bucket = self._local.get(key) or LocalBucket()
+            bucket.remaining = remaining
+            bucket.reset_at = now + reset
+            bucket.allowance = (
+                int(remaining * self.local_fraction) if allowed else 0
+            )
+            bucket.valid_until = now + min(self.local_sync_interval, reset)
+            self._remember(key, bucket)
+
+        return bool(allowed), remaining, reset, retry_ms / 1000
+
+    def _hit_local(self, key: str, limit: RateLimit, now: float) -> Tuple[bool, int, float, float]:
+        """Count a hit in the local bucket alone (while Redis is skipped)"""
+        with self._lock:
+            bucket = self._local.get(key)
+            if bucket is None or now >= bucket.reset_at:
+                # No budget from Redis for this window: the full limit
+                bucket = LocalBucket()
+                bucket.remaining = limit.amount
+                bucket.reset_at = now + limit.period
+            self._remember(key, bucket)
+
+            reset = bucket.reset_at - now
+            if bucket.pending >= bucket.remaining:
+                return False, 0, reset, reset
+            bucket.pending += 1
+            return True, bucket.remaining - bucket.pending, reset, 0.0
+
+    def _remember(self, key: str, bucket: LocalBucket) -> None:
+        # Caller holds the lock
+        self._local[key] = bucket
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    def reset(self) -> None:
+        """Drop the local pre-filter state and pooled connections (e.g. after fork)"""
+        self._lock = threading.Lock()
+        self._local.clear()
+        if self.redis_client is not None:
+            # Forget sockets inherited from the parent without closing them
+            self.redis_client.connection_pool.reset()
+
+
+# Global rate limiter instance
+limiter = RateLimiter()
+
+
+__all__ = ["limiter", "RateLimiter", "RateLimit"]
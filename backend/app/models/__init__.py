@@ -4,10 +4,14 @@ Exports all database models for easy importing
 """
 
 from app.models.base import BaseModel
+from app.models.trading import EquityBucket, Fill, Order
 from app.models.user import User, UserRole
 
 __all__ = [
     "BaseModel",
+    "EquityBucket",
+    "Fill",
+    "Order",
     "User",
     "UserRole",
 ]
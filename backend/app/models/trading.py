@@ -0,0 +1,92 @@
+"""
+TradeSense AI Platform - Trading Models
+Orders and fills of the paper trading engine, account equity buckets
+"""
+
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, Numeric, String
+
+from app.models.base import BaseModel
+from app.trading.order_book import OrderStatus, OrderType, Side
+
+
+class Order(BaseModel):
+    """
+    Order placed with a broker
+
+    Paper trading orders keep the id assigned by the matching engine and
+    are written behind by app.trading.persistence.
+    """
+
+    __tablename__ = "orders"
+    __table_args__ = (
+        # Open / recent orders of an account
+        Index("ix_orders_account_id_status", "account_id", "status"),
+    )
+
+    account_id = Column(Integer, nullable=False)
+    broker = Column(String(32), default="paper_trading", nullable=False)
+    symbol = Column(String(20), nullable=False, index=True)
+    side = Column(Enum(*Side.all(), name="order_side"), nullable=False)
+    order_type = Column(Enum(*OrderType.all(), name="order_type"), nullable=False)
+    status = Column(Enum(*OrderStatus.all(), name="order_status"), nullable=False)
+
+    quantity = Column(Numeric(20, 8), nullable=False)
+    filled_quantity = Column(Numeric(20, 8), default=0, nullable=False)
+    price = Column(Numeric(20, 8))
+    stop_price = Column(Numeric(20, 8))
+
+    def __repr__(self) -> str:
+        return f"<Order {self.id} {self.side} {self.symbol} {self.status}>"
+
+
+class Fill(BaseModel):
+    """Execution of (part of) a buy and a sell order against each other"""
+
+    __tablename__ = "fills"
+
+    symbol = Column(String(20), nullable=False, index=True)
+    price = Column(Numeric(20, 8), nullable=False)
+    quantity = Column(Numeric(20, 8), nullable=False)
+
+    buy_order_id = Column(Integer, nullable=False, index=True)
+    sell_order_id = Column(Integer, nullable=False, index=True)
+    buyer_account_id = Column(Integer, nullable=False, index=True)
+    seller_account_id = Column(Integer, nullable=False, index=True)
+    taker_side = Column(String(4), nullable=False)  # "buy" or "sell"
+
+    executed_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<Fill {self.id} {self.symbol} {self.quantity}@{self.price}>"
+
+
+class EquityBucket(BaseModel):
+    """
+    Equity of an account over one time bucket (OHLC of the samples)
+
+    1m buckets are written by app.trading.equity as minutes close; 1h
+    buckets are rolled up from them by compaction.
+    """
+
+    __tablename__ = "equity_buckets"
+    __table_args__ = (
+        # Curve reads: one account, one resolution, a time range
+        Index("ix_equity_buckets_account_resolution_start", "account_id", "resolution", "bucket_start"),
+        # Compaction and retention: one resolution, a time range
+        Index("ix_equity_buckets_resolution_start", "resolution", "bucket_start"),
+        # Compaction: 1m buckets written since the last rolled-up hour
+        Index("ix_equity_buckets_resolution_created", "resolution", "created_at"),
+    )
+
+    account_id = Column(Integer, nullable=False)
+    resolution = Column(String(4), nullable=False)  # "1m" or "1h"
+    bucket_start = Column(DateTime, nullable=False)
+
+    open = Column(Numeric(20, 8), nullable=False)
+    high = Column(Numeric(20, 8), nullable=False)
+    low = Column(Numeric(20, 8), nullable=False)
+    close = Column(Numeric(20, 8), nullable=False)
+    samples = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EquityBucket {self.account_id} {self.resolution} {self.bucket_start}>"
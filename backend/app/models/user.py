@@ -3,12 +3,14 @@ TradeSense AI Platform - User Model
 Defines the User model for authentication and user management
 """
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, Enum, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, Index, Integer, String
 from werkzeug.security import check_password_hash, generate_password_hash
 
+from app.core.concurrency import offload
+from app.core.timing import timed
 from app.models.base import BaseModel
 
 
@@ -23,6 +25,11 @@ class UserRole:
     def all(cls):
         return [cls.USER, cls.ADMIN, cls.SUPER_ADMIN]
 
+    @classmethod
+    def rank(cls, role: str) -> int:
+        """Privilege level of a role (higher grants more)"""
+        return cls.all().index(role)
+
 
 class User(BaseModel):
     """
@@ -30,6 +37,10 @@ class User(BaseModel):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Supports activity queries such as "active users in the last 24h"
+        Index("ix_users_is_active_last_login", "is_active", "last_login"),
+    )
 
     # Basic Information
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -54,12 +65,14 @@ class User(BaseModel):
     email_verified = Column(Boolean, default=False, nullable=False)
 
     # Timestamps
-    last_login = Column(String)
-    verified_at = Column(String)
+    last_login = Column(DateTime, index=True)
+    last_seen_at = Column(DateTime)
+    verified_at = Column(DateTime)
 
     # Security
-    failed_login_attempts = Column(String, default="0")
-    locked_until = Column(String)
+    failed_login_attempts = Column(Integer, default=0, nullable=False)
+    locked_until = Column(DateTime)
+    token_version = Column(Integer, default=0, nullable=False)
 
     def set_password(self, password: str) -> None:
         """
@@ -68,7 +81,8 @@ class User(BaseModel):
         Args:
             password: Plain text password
         """
-        self.password_hash = generate_password_hash(password)
+        with timed("hash"):
+            self.password_hash = offload(generate_password_hash, password)
 
     def check_password(self, password: str) -> bool:
         """
@@ -80,7 +94,8 @@ class User(BaseModel):
         Returns:
             True if password matches, False otherwise
         """
-        return check_password_hash(self.password_hash, password)
+        with timed("hash"):
+            return offload(check_password_hash, self.password_hash, password)
 
     def is_admin(self) -> bool:
         """Check if user has admin role"""
@@ -108,60 +123,78 @@ class User(BaseModel):
         return False
 
     def update_last_login(self) -> None:
-        """Update last login timestamp"""
-        self.last_login = datetime.utcnow().isoformat()
+        """
+        Update last login timestamp immediately
+
+        Logins normally go through UserActivityService, which buffers the
+        timestamp in Redis and flushes it in bulk.
+        """
+        self.last_login = datetime.utcnow()
+        self.last_seen_at = self.last_login
         self.save()
 
     def increment_failed_login(self) -> None:
-        """Increment failed login attempts counter"""
-        try:
-            attempts = int(self.failed_login_attempts or "0")
-            self.failed_login_attempts = str(attempts + 1)
+        """
+        Increment failed login attempts counter
 
-            # Lock account after 5 failed attempts for 15 minutes
-            if attempts + 1 >= 5:
-                from datetime import timedelta
+        Fallback used when Redis is unavailable; normally failures are
+        counted by LoginThrottleService and only lock transitions are written.
+        """
+        self.failed_login_attempts = (self.failed_login_attempts or 0) + 1
+
+        # Lock account after 5 failed attempts for 15 minutes
+        if self.failed_login_attempts >= 5:
+            self.locked_until = datetime.utcnow() + timedelta(minutes=15)
 
-                lock_time = datetime.utcnow() + timedelta(minutes=15)
-                self.locked_until = lock_time.isoformat()
+        self.save()
 
-            self.save()
-        except ValueError:
-            self.failed_login_attempts = "1"
-            self.save()
+    def lock(self, until: datetime, attempts: int) -> None:
+        """
+        Record an account lock transition
+
+        Args:
+            until: Time the lock expires
+            attempts: Failed attempts that triggered the lock
+        """
+        self.failed_login_attempts = attempts
+        self.locked_until = until
+        self.save()
 
     def reset_failed_login(self) -> None:
-        """Reset failed login attempts counter"""
-        self.failed_login_attempts = "0"
+        """Reset failed login attempts counter (writes only on unlock)"""
+        if not self.failed_login_attempts and not self.locked_until:
+            return
+
+        self.failed_login_attempts = 0
         self.locked_until = None
         self.save()
 
     def is_locked(self) -> bool:
-        """Check if account is locked"""
+        """Check if account is locked (read-only, expired locks are ignored)"""
         if not self.locked_until:
             return False
 
-        try:
-            lock_time = datetime.fromisoformat(self.locked_until)
-            if datetime.utcnow() > lock_time:
-                # Lock expired, reset
-                self.reset_failed_login()
-                return False
-            return True
-        except (ValueError, TypeError):
-            return False
+        return datetime.utcnow() <= self.locked_until
 
     def verify_email(self) -> None:
         """Mark email as verified"""
         self.email_verified = True
         self.is_verified = True
-        self.verified_at = datetime.utcnow().isoformat()
+        self.verified_at = datetime.utcnow()
+        self.save()
+
+    def invalidate_sessions(self) -> None:
+        """Bump token version so all outstanding refresh tokens are rejected"""
+        from app.services.token_service import RefreshTokenService
+
+        self.token_version = (self.token_version or 0) + 1
         self.save()
+        RefreshTokenService.publish_token_version(self)
 
     def deactivate(self) -> None:
         """Deactivate user account"""
         self.is_active = False
-        self.save()
+        self.invalidate_sessions()
 
     def activate(self) -> None:
         """Activate user account"""
@@ -191,6 +224,10 @@ class User(BaseModel):
         Returns:
             Dictionary with public user data
         """
+        from app.services.activity_service import UserActivityService
+
+        last_login = UserActivityService.buffered_last_login(self)
+
         return {
             "id": self.id,
             "username": self.username,
@@ -200,10 +237,48 @@ class User(BaseModel):
             "role": self.role,
             "is_active": self.is_active,
             "is_verified": self.is_verified,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_login": self.last_login,
+            # Datetimes are encoded by the app JSON provider
+            "created_at": self.created_at,
+            "last_login": last_login,
         }
 
+    @staticmethod
+    def to_public_dicts(users: List["User"]) -> List[dict]:
+        """
+        Get the public information of many users (e.g. a page of results)
+
+        The buffered last logins of all of them are read in one Redis round
+        trip instead of one per user.
+
+        Args:
+            users: User instances
+
+        Returns:
+            List of to_public_dict results, in order
+        """
+        from app.services.activity_service import UserActivityService
+
+        UserActivityService.load_last_logins(users)
+        return [user.to_public_dict() for user in users]
+
+    def cache_version(self) -> str:
+        """
+        Version of the public representation, used for ETags
+
+        Covers every field of to_public_dict: the row's updated_at plus the
+        buffered last login, which is written outside updated_at.
+
+        Returns:
+            Version string
+        """
+        from app.services.activity_service import UserActivityService
+
+        last_login = UserActivityService.buffered_last_login(self)
+        updated_at = self.updated_at.timestamp() if self.updated_at else 0
+        last_login_at = last_login.timestamp() if last_login else 0
+
+        return f"{self.id}:{updated_at}:{last_login_at}"
+
     @classmethod
     def find_by_email(cls, email: str) -> Optional["User"]:
         """
@@ -230,6 +305,21 @@ class User(BaseModel):
         """
         return cls.query.filter_by(username=username).first()
 
+    @classmethod
+    def count_active_since(cls, since: datetime) -> int:
+        """
+        Count active users who logged in since a point in time
+
+        Args:
+            since: Lower bound for last login
+
+        Returns:
+            Number of matching users
+        """
+        return cls.query.filter(
+            cls.is_active.is_(True), cls.last_login >= since
+        ).count()
+
     @classmethod
     def email_exists(cls, email: str) -> bool:
         """Check if email already exists"""
@@ -0,0 +1,16 @@
+"""
+TradeSense AI Platform - Real-Time
+Socket.IO fan-out of quotes, fills and risk alerts (see app.realtime.gateway)
+"""
+
+from app.realtime.encoding import QUOTE_RECORD, decode_quotes, encode_frame
+from app.realtime.gateway import RealtimeGateway, Session, gateway
+
+__all__ = [
+    "QUOTE_RECORD",
+    "RealtimeGateway",
+    "Session",
+    "decode_quotes",
+    "encode_frame",
+    "gateway",
+]
@@ -0,0 +1,79 @@
+"""
+TradeSense AI Platform - Real-Time Frame Encoding
+Compact frames pushed to WebSocket clients
+
+A frame is one Socket.IO "frame" event carrying everything a client
+missed since its previous frame:
+
+    {"q": [[symbol, bid, ask, last, volume, timestamp], ...],   # JSON clients
+     "b": <bytes>,                                              # binary clients
+     "e": [[kind, data], ...]}                                  # fills, risk alerts
+
+Quotes are positional arrays instead of objects. Binary clients get the
+quotes as packed little-endian records (QUOTE_RECORD) instead: a uint16
+symbol id from the gateway's symbol table (returned by "subscribe"), then
+bid, ask, last, volume and timestamp as float64, 42 bytes per quote.
+Records do not depend on the client, so each quote is packed once per
+frame for all of its subscribers. Socket.IO sends bytes as a binary
+attachment, so nothing is base64 encoded.
+"""
+
+import struct
+from typing import Dict, List, Optional, Sequence
+
+QUOTE_RECORD = struct.Struct("<H5d")
+
+
+def encode_frame(
+    quotes: Sequence[Sequence],
+    events: Sequence[Sequence],
+    symbol_ids: Optional[Dict[str, int]] = None,
+    records: Optional[Dict[str, bytes]] = None,
+) -> Dict:
+    """
+    Build a frame
+
+    Args:
+        quotes: Quotes as (symbol, bid, ask, last, volume, timestamp)
+        events: Events as (kind, data)
+        symbol_ids: Symbol table for binary quotes (None: JSON quotes)
+        records: Packed records by symbol, shared by the frames of one
+            flush (filled in as quotes are packed)
+
+    Returns:
+        Frame payload
+    """
+    frame = {}
+    if quotes:
+        if symbol_ids is None:
+            frame["q"] = quotes
+        else:
+            if records is None:
+                records = {}
+            try:
+                frame["b"] = b"".join([records[quote[0]] for quote in quotes])
+            except KeyError:
+                for quote in quotes:
+                    if quote[0] not in records:
+                        records[quote[0]] = QUOTE_RECORD.pack(symbol_ids[quote[0]], *quote[1:])
+                frame["b"] = b"".join([records[quote[0]] for quote in quotes])
+    if events:
+        frame["e"] = events
+    return frame
+
+
+def decode_quotes(raw: bytes, symbols: Dict[int, str]) -> List[tuple]:
+    """
+    Unpack binary quotes (the inverse of encode_frame for a client)
+
+    Args:
+        raw: The frame's "b" bytes
+        symbols: Symbol by id, from the client's subscription acks
+
+    Returns:
+        Quotes as (symbol, bid, ask, last, volume, timestamp)
+    """
+    return [(symbols[symbol_id], *values) for symbol_id, *values in QUOTE_RECORD.iter_unpack(raw)]
+
+
+__all__ = ["QUOTE_RECORD", "decode_quotes", "encode_frame"]
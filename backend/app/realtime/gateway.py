@@ -0,0 +1,593 @@
+"""
+TradeSense AI Platform - Real-Time Gateway
+Socket.IO push of quotes, fills and risk alerts
+
+Each gateway process indexes its own connections:
+
+- symbol -> sessions subscribed to it
+- account -> sessions of that account (connections with an access token)
+
+Quote batches arrive on the ingestion pipeline's md:quotes:updates
+channel. Fills, order updates and risk alerts are queued by the engine
+listeners and published in batches on REALTIME_EVENTS_CHANNEL of the
+SOCKETIO_MESSAGE_QUEUE Redis. Every gateway process subscribes to both
+channels, so a client gets its updates whichever process it is connected
+to.
+
+Nothing is sent per update. A quote only replaces the latest quote of its
+symbol and marks the symbol as changed. Every REALTIME_FRAME_INTERVAL the
+changed symbols are fanned out to their subscribers, and each session
+with changes gets one frame (see app.realtime.encoding). The frame holds
+the latest quote of every changed symbol, so ten ticks between frames
+cost one fan-out and are sent once. It also holds the session's queued
+events.
+
+Binary quote ids are allocated per symbol while it has subscribers and
+recycled after the last one leaves. Connections without an access token
+may only subscribe to symbols the quote feed has published, and to at most
+REALTIME_MAX_ANONYMOUS_SYMBOLS of them, so anonymous clients cannot fill
+the symbol table with made-up names.
+
+Clients acknowledge frames. A session with REALTIME_MAX_IN_FLIGHT frames
+unacknowledged is skipped until it catches up. A slow client therefore
+holds at most one pending quote per subscribed symbol plus
+REALTIME_CLIENT_QUEUE events (oldest dropped first), never an unbounded
+socket backlog.
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in base requirements
+    orjson = None
+
+from flask import Flask, request
+
+from app.realtime.encoding import encode_frame
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,20}$")
+MAX_SYMBOL_ID = 0xFFFF  # binary quotes carry uint16 symbol ids
+PUBLISH_BATCH_SIZE = 1000  # events per message queue publish
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class Session:
+    """State of one connection"""
+
+    __slots__ = (
+        "sid", "account_id", "binary", "symbols", "changed",
+        "events", "in_flight", "sent_at", "dropped", "skipped",
+    )
+
+    def __init__(self, sid: str, account_id: Optional[int], binary: bool, queue_size: int):
+        self.sid = sid
+        self.account_id = account_id
+        self.binary = binary
+        self.symbols: Set[str] = set()
+        self.changed: Set[str] = set()  # symbols with a quote not sent yet
+        self.events: deque = deque(maxlen=queue_size)
+        self.in_flight = 0  # frames sent and not acknowledged
+        self.sent_at = 0.0
+        self.dropped = 0
+        self.skipped = 0
+
+
+class RealtimeGateway:
+    """Connection indexes and framed fan-out of real-time updates"""
+
+    def __init__(self, app: Optional[Flask] = None, transport: Optional[Callable] = None):
+        """
+        Args:
+            app: Flask application instance
+            transport: Frame sender taking (sid, frame, ack); default emits
+                a Socket.IO "frame" event with ack as its callback
+        """
+        self.app: Optional[Flask] = None
+        self.socketio = None
+        self.transport = transport
+        self.frame_interval = 0.1
+        self.max_symbols = 200
+        self.max_anonymous_symbols = 20
+        self.queue_size = 100
+        self.max_in_flight = 2
+        self.ack_timeout = 5.0
+        self.message_queue: Optional[str] = None
+        self.events_channel = "rt:events"
+        self.counters = {"frames": 0, "updates": 0, "quotes": 0, "events": 0, "skipped": 0, "dropped": 0}
+
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Session] = {}
+        self._subscribers: Dict[str, Set[str]] = {}
+        self._accounts: Dict[int, Set[str]] = {}
+        self._symbol_ids: Dict[str, int] = {}  # binary quote ids of subscribed symbols
+        self._free_ids: List[int] = []  # ids of symbols that lost their last subscriber
+        self._latest: Dict[str, list] = {}
+        self._changed: Set[str] = set()  # symbols quoted since the last frame
+        self._dirty: Set[str] = set()  # sessions with something to send
+        self._outbox: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pid: Optional[int] = None
+        self._publisher_pid: Optional[int] = None
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the gateway with Flask app
+
+        Creates the Socket.IO server (eventlet when the process is monkey
+        patched, threads otherwise). Background tasks start with the first
+        connection, in the worker that serves it.
+
+        Args:
+            app: Flask application instance
+        """
+        from flask_socketio import SocketIO
+
+        from app.core.concurrency import EVENTLET, current_mode
+
+        self.app = app
+        self.frame_interval = app.config.get("REALTIME_FRAME_INTERVAL", 0.1)
+        self.max_symbols = app.config.get("REALTIME_MAX_SYMBOLS", 200)
+        self.max_anonymous_symbols = app.config.get("REALTIME_MAX_ANONYMOUS_SYMBOLS", 20)
+        self.queue_size = app.config.get("REALTIME_CLIENT_QUEUE", 100)
+        self.max_in_flight = app.config.get("REALTIME_MAX_IN_FLIGHT", 2)
+        self.ack_timeout = app.config.get("REALTIME_ACK_TIMEOUT", 5.0)
+        self.events_channel = app.config.get("REALTIME_EVENTS_CHANNEL", "rt:events")
+        self.message_queue = app.config.get("SOCKETIO_MESSAGE_QUEUE")
+
+        self.socketio = SocketIO(
+            app,
+            message_queue=self.message_queue,
+            cors_allowed_origins=app.config.get("SOCKETIO_CORS_ALLOWED_ORIGINS", []),
+            async_mode="eventlet" if current_mode() == EVENTLET else "threading",
+            max_http_buffer_size=64 * 1024,
+        )
+        self.socketio.on_event("connect", self._on_connect)
+        self.socketio.on_event("disconnect", self._on_disconnect)
+        self.socketio.on_event("subscribe", self._on_subscribe)
+        self.socketio.on_event("unsubscribe", self._on_unsubscribe)
+
+        # Fills and order updates of the paper trading engine, and the risk
+        # alerts of the challenge accounts it trades
+        for name in ("matching_engine", "risk_engine"):
+            engine = getattr(app, "extensions", {}).get(name)
+            if engine is not None:
+                engine.unsubscribe(self)
+                engine.subscribe(self)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["realtime_gateway"] = self
+
+    # Sessions
+
+    def open_session(self, sid: str, account_id: Optional[int] = None, binary: bool = False) -> Session:
+        """
+        Register a connection
+
+        Args:
+            sid: Connection ID
+            account_id: Account the connection belongs to (fills, alerts)
+            binary: Send quotes as packed records instead of JSON arrays
+
+        Returns:
+            The new session
+        """
+        session = Session(sid, account_id, binary, self.queue_size)
+        with self._lock:
+            self._sessions[sid] = session
+            if account_id is not None:
+                self._accounts.setdefault(account_id, set()).add(sid)
+        return session
+
+    def close_session(self, sid: str) -> None:
+        """Remove a connection from every index"""
+        with self._lock:
+            session = self._sessions.pop(sid, None)
+            if session is None:
+                return
+            for symbol in session.symbols:
+                self._remove_subscriber(symbol, sid)
+            if session.account_id is not None:
+                self._discard(self._accounts, session.account_id, sid)
+            self._dirty.discard(sid)
+
+    def subscribe(self, sid: str, symbols) -> Dict:
+        """
+        Subscribe a connection to symbols
+
+        The current quote of each new symbol goes out with the next frame.
+        Anonymous connections may only subscribe to symbols with a quote.
+
+        Args:
+            sid: Connection ID
+            symbols: Symbol or list of symbols
+
+        Returns:
+            {"symbols": {symbol: id}} with all of the connection's
+            subscriptions (ids identify binary quotes), or {"error": ...}
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        if not isinstance(symbols, list) or not all(
+            isinstance(symbol, str) and SYMBOL_PATTERN.match(symbol) for symbol in symbols
+        ):
+            return {"error": "symbols must be a list of instrument symbols"}
+
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None:
+                return {"error": "Not connected"}
+            new = [symbol for symbol in dict.fromkeys(symbols) if symbol not in session.symbols]
+            limit = self.max_symbols if session.account_id is not None else self.max_anonymous_symbols
+            if len(session.symbols) + len(new) > limit:
+                return {"error": f"At most {limit} symbols per connection"}
+            if session.account_id is None:
+                unquoted = [symbol for symbol in new if symbol not in self._latest]
+                if unquoted:
+                    return {"error": f"Unknown symbols: {', '.join(unquoted)}"}
+            unknown = [symbol for symbol in new if symbol not in self._symbol_ids]
+            if len(self._symbol_ids) + len(unknown) > MAX_SYMBOL_ID:
+                return {"error": "Symbol table is full"}
+
+            for symbol in unknown:
+                self._symbol_ids[symbol] = (
+                    self._free_ids.pop() if self._free_ids else len(self._symbol_ids)
+                )
+            for symbol in new:
+                session.symbols.add(symbol)
+                self._subscribers.setdefault(symbol, set()).add(sid)
+                if symbol in self._latest:
+                    session.changed.add(symbol)
+            if session.changed:
+                self._dirty.add(sid)
+            return {"symbols": self._table(session)}
+
+    def unsubscribe(self, sid: str, symbols) -> Dict:
+        """
+        Unsubscribe a connection from symbols
+
+        Returns:
+            {"symbols": {symbol: id}} with the remaining subscription table
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None:
+                return {"error": "Not connected"}
+            for symbol in symbols if isinstance(symbols, list) else []:
+                if symbol in session.symbols:
+                    session.symbols.discard(symbol)
+                    self._remove_subscriber(symbol, sid)
+                    session.changed.discard(symbol)
+            return {"symbols": self._table(session)}
+
+    # Updates
+
+    def apply_quotes(self, quotes: Iterable[list]) -> int:
+        """
+        Take a batch of quotes (subscribers get them with the next frame)
+
+        Args:
+            quotes: Quotes as [symbol, bid, ask, last, volume, timestamp]
+
+        Returns:
+            Number of quotes taken
+        """
+        count = 0
+        with self._lock:
+            latest = self._latest
+            changed = self._changed
+            for quote in quotes:
+                latest[quote[0]] = quote
+                changed.add(quote[0])
+                count += 1
+        return count
+
+    def apply_events(self, events: Iterable[list]) -> int:
+        """
+        Queue events for the connections of their accounts
+
+        Args:
+            events: Events as [account_id, kind, data]
+
+        Returns:
+            Number of (event, connection) pairs queued
+        """
+        queued = 0
+        with self._lock:
+            for account_id, kind, data in events:
+                for sid in self._accounts.get(account_id, ()):
+                    session = self._sessions[sid]
+                    if len(session.events) == session.events.maxlen:
+                        session.dropped += 1
+                        self.counters["dropped"] += 1
+                    session.events.append((kind, data))
+                    self._dirty.add(sid)
+                    queued += 1
+        return queued
+
+    def publish(self, account_id: int, kind: str, data: Dict) -> None:
+        """
+        Send an event to every connection of an account, in any process
+
+        Events are queued and published in batches by a background thread.
+
+        Args:
+            account_id: Account ID
+            kind: Event kind ("fill", "order", "risk", ...)
+            data: JSON-serializable payload
+        """
+        if self._publisher_pid != os.getpid():
+            self._start_publisher()
+        self._outbox.put((account_id, kind, data))
+
+    def __call__(self, event) -> None:
+        """
+        Queue a FillEvent, OrderEvent or RiskEvent (engine listener)
+
+        Usage:
+            risk_engine.subscribe(gateway)
+        """
+        if self._publisher_pid != os.getpid():
+            self._start_publisher()
+        self._outbox.put(event)
+
+    def flush_frames(self) -> int:
+        """
+        Send one frame to every session with changes (called every frame)
+
+        Returns:
+            Number of frames sent
+        """
+        now = time.monotonic()
+        frames = []
+        records: Dict[str, bytes] = {}
+        with self._lock:
+            sessions = self._sessions
+            latest = self._latest
+            changed, self._changed = self._changed, set()
+            dirty, self._dirty = self._dirty, set()
+            for symbol in changed:
+                sids = self._subscribers.get(symbol)
+                if sids:
+                    dirty.update(sids)
+                    self.counters["updates"] += len(sids)
+
+            for sid in dirty:
+                session = sessions.get(sid)
+                if session is None:
+                    continue
+                session.changed |= session.symbols & changed
+                if session.in_flight >= self.max_in_flight:
+                    if now - session.sent_at < self.ack_timeout:
+                        # Slow client: keep coalescing until it catches up
+                        session.skipped += 1
+                        self.counters["skipped"] += 1
+                        self._dirty.add(sid)
+                        continue
+                    session.in_flight = 0  # acknowledgements lost
+
+                quotes = [latest[symbol] for symbol in session.changed]
+                events = list(session.events)
+                session.changed = set()
+                session.events.clear()
+                session.in_flight += 1
+                session.sent_at = now
+                if session.binary:
+                    frame = encode_frame(quotes, events, self._symbol_ids, records)
+                else:
+                    frame = encode_frame(quotes, events)
+                frames.append((session, frame))
+                self.counters["quotes"] += len(quotes)
+                self.counters["events"] += len(events)
+
+        for session, frame in frames:
+            self._send(session, frame)
+        self.counters["frames"] += len(frames)
+        return len(frames)
+
+    def stats(self) -> Dict[str, int]:
+        """Connection, subscription and delivery counts of this process"""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "symbols": len(self._subscribers),
+                "subscriptions": sum(len(sids) for sids in self._subscribers.values()),
+                "pending": len(self._dirty),
+                **self.counters,
+            }
+
+    # Socket.IO handlers
+
+    def _on_connect(self, auth=None):
+        auth = auth if isinstance(auth, dict) else {}
+        account_id = None
+        if auth.get("token"):
+            from flask_jwt_extended import decode_token
+
+            try:
+                claims = decode_token(auth["token"])
+            except Exception:
+                return False
+            if claims.get("type") != "access":
+                return False
+            account_id = int(claims["sub"])
+
+        self.open_session(request.sid, account_id, binary=auth.get("encoding") == "binary")
+        self._start()
+        return True
+
+    def _on_disconnect(self):
+        self.close_session(request.sid)
+
+    def _on_subscribe(self, data=None):
+        symbols = data.get("symbols") if isinstance(data, dict) else data
+        return self.subscribe(request.sid, symbols)
+
+    def _on_unsubscribe(self, data=None):
+        symbols = data.get("symbols") if isinstance(data, dict) else data
+        return self.unsubscribe(request.sid, symbols)
+
+    # Internal helpers
+
+    def _table(self, session: Session) -> Dict[str, int]:
+        return {symbol: self._symbol_ids[symbol] for symbol in sorted(session.symbols)}
+
+    def _remove_subscriber(self, symbol: str, sid: str) -> None:
+        self._discard(self._subscribers, symbol, sid)
+        if symbol not in self._subscribers:
+            # Nobody holds the id any more: hand it to the next new symbol
+            self._free_ids.append(self._symbol_ids.pop(symbol))
+
+    @staticmethod
+    def _discard(index: Dict, key, sid: str) -> None:
+        sids = index.get(key)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del index[key]
+
+    def _send(self, session: Session, frame: Dict) -> None:
+        ack = partial(self._acked, session)
+        if self.transport is not None:
+            self.transport(session.sid, frame, ack)
+        else:
+            # The session is connected to this process: skip the message queue
+            self.socketio.emit("frame", frame, to=session.sid, callback=ack, ignore_queue=True)
+
+    def _acked(self, session: Session, *args) -> None:
+        with self._lock:
+            if session.in_flight:
+                session.in_flight -= 1
+
+    def _start(self) -> None:
+        # Also runs after fork: tasks of the parent do not exist in a worker
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        start = self.socketio.start_background_task
+        start(self._run_frames)
+        start(self._listen_quotes)
+        if self.message_queue:
+            start(self._listen_events)
+
+    def _run_frames(self) -> None:
+        while True:
+            self.socketio.sleep(self.frame_interval)
+            try:
+                self.flush_frames()
+            except Exception as e:
+                logger.error(f"Real-time frame flush failed: {e}")
+
+    def _listen_quotes(self) -> None:
+        from app.core.cache import cache
+        from app.market_data.quotes import UPDATES_CHANNEL, unpack_updates
+
+        self._listen(
+            lambda: cache.redis_client,
+            UPDATES_CHANNEL,
+            lambda raw: self.apply_quotes(unpack_updates(raw)[1]),
+        )
+
+    def _listen_events(self) -> None:
+        import redis
+
+        client = redis.Redis.from_url(self.message_queue)
+        self._listen(lambda: client, self.events_channel, lambda raw: self.apply_events(_loads(raw)))
+
+    def _listen(self, get_client: Callable, channel: str, handle: Callable) -> None:
+        while True:
+            client = get_client()
+            if client is None:
+                self.socketio.sleep(1.0)
+                continue
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        handle(message["data"])
+            except Exception as e:
+                logger.error(f"Real-time listener on {channel} failed: {e}")
+                self.socketio.sleep(1.0)
+
+    def _start_publisher(self) -> None:
+        with self._lock:
+            if self._publisher_pid == os.getpid():
+                return
+            self._publisher_pid = os.getpid()
+            self._outbox = queue.SimpleQueue()
+        threading.Thread(target=self._run_publisher, name="realtime-publisher", daemon=True).start()
+
+    def _run_publisher(self) -> None:
+        client = None
+        if self.message_queue:
+            import redis
+
+            client = redis.Redis.from_url(self.message_queue)
+        outbox = self._outbox
+        while True:
+            batch = [outbox.get()]
+            while len(batch) < PUBLISH_BATCH_SIZE:
+                try:
+                    batch.append(outbox.get_nowait())
+                except queue.Empty:
+                    break
+            events: List[list] = []
+            for item in batch:
+                events.extend(self._expand(item))
+            try:
+                if client is not None:
+                    client.publish(self.events_channel, _dumps(events))
+                else:
+                    self.apply_events(events)
+            except Exception as e:
+                logger.error(f"Could not publish {len(events)} real-time events: {e}")
+
+    @staticmethod
+    def _expand(item) -> List[list]:
+        """Engine events and queued tuples as [account_id, kind, data]"""
+        if isinstance(item, tuple):
+            return [list(item)]
+        kind = item.kind
+        data = item.to_dict()
+        if kind == "fill":
+            accounts = dict.fromkeys((item.buyer_account_id, item.seller_account_id))
+            return [[account_id, kind, data] for account_id in accounts]
+        return [[item.account_id, kind, data]]
+
+
+# Global gateway instance
+gateway = RealtimeGateway()
+
+__all__ = ["RealtimeGateway", "Session", "gateway"]
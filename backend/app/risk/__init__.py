@@ -0,0 +1,21 @@
+"""
+TradeSense AI Platform - Risk
+Real-time enforcement of challenge rules (see app.risk.engine)
+
+Importing this package loads NumPy; only the paper trading app (the process
+owning the matching engine) imports it at startup.
+"""
+
+from app.risk.engine import ACTIVE, BREACHED, PASSED, RiskEngine, RiskEvent, risk_engine
+from app.risk.feed import RiskFeed, risk_feed
+
+__all__ = [
+    "ACTIVE",
+    "BREACHED",
+    "PASSED",
+    "RiskEngine",
+    "RiskEvent",
+    "RiskFeed",
+    "risk_engine",
+    "risk_feed",
+]
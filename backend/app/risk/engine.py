@@ -0,0 +1,605 @@
+"""
+TradeSense AI Platform - Challenge Risk Engine
+Per-tick enforcement of prop-challenge rules
+
+Accounts and positions live in NumPy arrays (one row per account, one
+slot per open position) and open positions are indexed by symbol. A price
+update only touches the positions in that symbol: their unrealized P&L
+delta is computed in one vectorized step, added to their accounts, and
+only those accounts are re-checked against their limits.
+
+Each account's limits are folded into a single equity floor,
+max(day start - daily loss limit, peak - drawdown limit), so checking an
+account is one comparison. Breaches (and reached profit targets) are
+published to listeners as RiskEvent objects right after the update that
+caused them; event.to_error() gives the matching ChallengeError.
+
+Like the matching engine, state is process memory: run it in the process
+that receives fills and prices.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import Flask
+
+from app.core.config import Config
+from app.core.exceptions import ChallengeError
+from app.market_data.records import SymbolTable
+
+Listener = Callable[["RiskEvent"], None]
+
+# Account status codes in the status array
+ACTIVE = 0
+BREACHED = 1
+PASSED = 2
+STATUS_NAMES = {ACTIVE: "active", BREACHED: "breached", PASSED: "passed"}
+_UNUSED = -1
+
+# Rule names (keys of CHALLENGE_RULES)
+MAX_DAILY_LOSS = "max_daily_loss"
+MAX_DRAWDOWN = "max_drawdown"
+PROFIT_TARGET = "profit_target"
+
+ACCOUNT_COLUMNS = (
+    ("account_ids", np.int64),
+    ("status", np.int8),
+    ("type_codes", np.int8),  # index into CHALLENGE_TYPES
+    ("phase_codes", np.int8),  # index into CHALLENGE_PHASES
+    ("initial", np.float64),
+    ("balance", np.float64),  # starting balance plus realized P&L
+    ("unrealized", np.float64),
+    ("day_start", np.float64),
+    ("peak", np.float64),
+    ("daily_limit", np.float64),  # amounts, from the phase rules
+    ("drawdown_limit", np.float64),
+    ("target", np.float64),  # equity completing the phase (inf: none)
+    ("floor", np.float64),  # equity at or below which the account breaches
+)
+POSITION_COLUMNS = (
+    ("position_rows", np.int64),  # account row, -1 for free slots
+    ("position_symbols", np.int64),
+    ("quantity", np.float64),  # signed: negative is short
+    ("average_price", np.float64),
+    ("mark", np.float64),  # price the unrealized P&L was last computed at
+)
+
+# Quantities closer to zero than this close the position
+_EPSILON = 1e-9
+
+
+class RiskEvent:
+    """A breached limit or a reached profit target"""
+
+    __slots__ = ("account_id", "rule", "status", "equity", "threshold", "challenge_type", "phase", "timestamp")
+
+    kind = "risk"
+
+    def __init__(self, account_id, rule, status, equity, threshold, challenge_type, phase, timestamp):
+        self.account_id = account_id
+        self.rule = rule
+        self.status = status
+        self.equity = equity
+        self.threshold = threshold
+        self.challenge_type = challenge_type
+        self.phase = phase
+        self.timestamp = timestamp
+
+    @property
+    def breached(self) -> bool:
+        return self.status == STATUS_NAMES[BREACHED]
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_error(self) -> ChallengeError:
+        if self.breached:
+            message = f"Challenge failed: {self.rule.replace('_', ' ')} limit breached"
+        else:
+            message = "Challenge phase completed: profit target reached"
+        return ChallengeError(message, payload=self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"<RiskEvent(account={self.account_id}, rule={self.rule}, equity={self.equity:.2f})>"
+
+
+class RiskEngine:
+    """
+    Challenge accounts, their positions and rule checks
+
+    Usage:
+        risk_engine.subscribe(on_risk_event)
+        risk_engine.open_account(42, "100k", "phase1")
+        risk_engine.apply_fill(42, "BTCUSD", 0.5, 43000.0)
+        events = risk_engine.update_prices(["BTCUSD"], [42000.0])
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.challenge_types: List[str] = list(Config.CHALLENGE_TYPES)
+        self.phases: List[str] = list(Config.CHALLENGE_PHASES)
+        self.balances: Dict[str, float] = dict(Config.CHALLENGE_BALANCES)
+        self.rules: Dict[str, Dict] = dict(Config.CHALLENGE_RULES)
+        self.day_start_hour = Config.RISK_DAY_START_HOUR
+        self._listeners: List[Listener] = []
+        self._lock = threading.RLock()
+        self.reset()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the engine with Flask app
+
+        Args:
+            app: Flask application instance
+        """
+        self.challenge_types = list(app.config.get("CHALLENGE_TYPES", self.challenge_types))
+        self.phases = list(app.config.get("CHALLENGE_PHASES", self.phases))
+        self.balances = dict(app.config.get("CHALLENGE_BALANCES", {}))
+        self.rules = dict(app.config.get("CHALLENGE_RULES", {}))
+        self.day_start_hour = app.config.get("RISK_DAY_START_HOUR", 0)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["risk_engine"] = self
+
+    def reset(self) -> None:
+        """Drop every account and position"""
+        with self._lock:
+            self._rows: Dict[int, int] = {}
+            self._free_rows: List[int] = []
+            self._row_count = 0
+            self._allocate(ACCOUNT_COLUMNS, 1024, fill={"status": _UNUSED}, keep=False)
+
+            self._slots: Dict[Tuple[int, int], int] = {}
+            self._free_slots: List[int] = []
+            self._slot_count = 0
+            self._allocate(POSITION_COLUMNS, 4096, fill={"position_rows": -1}, keep=False)
+
+            self.symbols = SymbolTable()
+            self._by_symbol: List[List[int]] = []
+            self._index: Dict[int, np.ndarray] = {}  # symbol id -> slots, rebuilt when stale
+            self._day: Optional[int] = None
+
+            self.price_updates = 0
+            self.fills = 0
+            self.events = 0
+
+    # Events
+
+    def subscribe(self, listener: Listener) -> None:
+        """
+        Receive every RiskEvent
+
+        Listeners are called right after the update that produced the
+        events, outside the engine lock.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # Accounts
+
+    def open_account(
+        self,
+        account_id: int,
+        challenge_type: str,
+        phase: str,
+        balance: Optional[float] = None,
+    ) -> None:
+        """
+        Start enforcing a challenge account
+
+        Args:
+            account_id: Account ID
+            challenge_type: One of CHALLENGE_TYPES
+            phase: One of CHALLENGE_PHASES
+            balance: Current balance (default: the type's starting balance)
+
+        Raises:
+            ChallengeError: For unknown types or phases, or a tracked account
+        """
+        if challenge_type not in self.challenge_types:
+            raise ChallengeError(
+                f"Unknown challenge type: {challenge_type}", {"challenge_type": challenge_type}
+            )
+        if phase not in self.phases or phase not in self.rules:
+            raise ChallengeError(f"Unknown challenge phase: {phase}", {"phase": phase})
+        initial = self.balances.get(challenge_type)
+        if initial is None:
+            raise ChallengeError(
+                f"No starting balance configured for {challenge_type}", {"challenge_type": challenge_type}
+            )
+        rules = self.rules[phase]
+
+        with self._lock:
+            if account_id in self._rows:
+                raise ChallengeError("Account is already tracked", {"account_id": account_id})
+            row = self._free_rows.pop() if self._free_rows else self._next_row()
+            self._rows[account_id] = row
+
+            current = initial if balance is None else balance
+            self.account_ids[row] = account_id
+            self.status[row] = ACTIVE
+            self.type_codes[row] = self.challenge_types.index(challenge_type)
+            self.phase_codes[row] = self.phases.index(phase)
+            self.initial[row] = initial
+            self.balance[row] = current
+            self.unrealized[row] = 0.0
+            self.day_start[row] = current
+            self.peak[row] = max(initial, current)
+            self.daily_limit[row] = rules[MAX_DAILY_LOSS] * initial
+            self.drawdown_limit[row] = rules[MAX_DRAWDOWN] * initial
+            target = rules.get(PROFIT_TARGET)
+            self.target[row] = initial * (1 + target) if target is not None else np.inf
+            self._update_floor(row)
+
+    def close_account(self, account_id: int) -> None:
+        """Stop tracking an account and drop its positions"""
+        with self._lock:
+            row = self._rows.pop(account_id, None)
+            if row is None:
+                return
+            for key in [key for key in self._slots if key[0] == row]:
+                self._free_slot(self._slots.pop(key))
+            self.status[row] = _UNUSED
+            self._free_rows.append(row)
+
+    def check(self, account_id: int) -> None:
+        """
+        Make sure an account may still trade
+
+        Raises:
+            ChallengeError: If the account is not tracked or no longer active
+        """
+        row = self._rows.get(account_id)
+        if row is None:
+            raise ChallengeError("Account is not enrolled in a challenge", {"account_id": account_id})
+        status = int(self.status[row])
+        if status != ACTIVE:
+            raise ChallengeError(
+                f"Challenge is {STATUS_NAMES[status]}; trading is closed",
+                {"account_id": account_id, "status": STATUS_NAMES[status]},
+            )
+
+    def get_account(self, account_id: int) -> Optional[Dict]:
+        """Equity, limits and positions of an account"""
+        with self._lock:
+            row = self._rows.get(account_id)
+            if row is None:
+                return None
+            equity = float(self.balance[row] + self.unrealized[row])
+            positions = {
+                self.symbols.names[symbol_id]: {
+                    "quantity": float(self.quantity[slot]),
+                    "average_price": float(self.average_price[slot]),
+                    "mark": float(self.mark[slot]),
+                }
+                for (position_row, symbol_id), slot in self._slots.items()
+                if position_row == row
+            }
+            return {
+                "account_id": account_id,
+                "status": STATUS_NAMES[int(self.status[row])],
+                "challenge_type": self.challenge_types[self.type_codes[row]],
+                "phase": self.phases[self.phase_codes[row]],
+                "balance": float(self.balance[row]),
+                "equity": equity,
+                "peak": float(self.peak[row]),
+                "day_start": float(self.day_start[row]),
+                "floor": float(self.floor[row]),
+                "target": float(self.target[row]) if np.isfinite(self.target[row]) else None,
+                "daily_loss": float(max(self.day_start[row] - equity, 0.0) / self.initial[row]),
+                "drawdown": float(max(self.peak[row] - equity, 0.0) / self.initial[row]),
+                "positions": positions,
+            }
+
+    def challenge_types_of(self, account_ids: Iterable[int]) -> Dict[int, str]:
+        """Challenge type of each tracked account (untracked ones are left out)"""
+        with self._lock:
+            rows = self._rows
+            return {
+                account_id: self.challenge_types[self.type_codes[rows[account_id]]]
+                for account_id in account_ids
+                if account_id in rows
+            }
+
+    def equity(self, active_only: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Equity and drawdown of all accounts, vectorized
+
+        Returns:
+            Arrays "account_id", "equity", "drawdown" and "daily_loss" (the
+            last two as fractions of the starting balance)
+        """
+        with self._lock:
+            count = self._row_count
+            used = self.status[:count] == ACTIVE if active_only else self.status[:count] != _UNUSED
+            equity = self.balance[:count][used] + self.unrealized[:count][used]
+            initial = self.initial[:count][used]
+            return {
+                "account_id": self.account_ids[:count][used].copy(),
+                "equity": equity,
+                "drawdown": np.maximum(self.peak[:count][used] - equity, 0.0) / initial,
+                "daily_loss": np.maximum(self.day_start[:count][used] - equity, 0.0) / initial,
+            }
+
+    # Updates
+
+    def apply_fill(
+        self,
+        account_id: int,
+        symbol: str,
+        quantity: float,
+        price: float,
+        timestamp: Optional[float] = None,
+    ) -> List[RiskEvent]:
+        """
+        Record an execution for an account
+
+        Args:
+            account_id: Account ID (untracked accounts are ignored)
+            symbol: Instrument symbol
+            quantity: Signed quantity (positive buys, negative sells)
+            price: Execution price
+            timestamp: Execution time (default: now)
+
+        Returns:
+            Events raised by the account's new equity
+        """
+        timestamp = timestamp or time.time()
+        with self._lock:
+            row = self._rows.get(account_id)
+            if row is None:
+                return []
+            symbol_id = self.symbols.intern(symbol)
+            key = (row, symbol_id)
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = self._new_slot(row, symbol_id, price)
+
+            held = self.quantity[slot]
+            average = self.average_price[slot]
+            previous_unrealized = held * (self.mark[slot] - average)
+
+            realized = 0.0
+            remaining = held + quantity
+            if held == 0.0 or (held > 0) == (quantity > 0):
+                average = (held * average + quantity * price) / remaining
+            else:
+                closed = min(abs(quantity), abs(held)) * (1.0 if held > 0 else -1.0)
+                realized = closed * (price - average)
+                if abs(remaining) > _EPSILON and (remaining > 0) != (held > 0):
+                    average = price  # flipped: the rest opens at this price
+
+            self.balance[row] += realized
+            self.fills += 1
+            if abs(remaining) <= _EPSILON:
+                self.unrealized[row] -= previous_unrealized
+                del self._slots[key]
+                self._free_slot(slot)
+            else:
+                self.quantity[slot] = remaining
+                self.average_price[slot] = average
+                self.mark[slot] = price
+                self.unrealized[row] += remaining * (price - average) - previous_unrealized
+
+            events = self._evaluate(np.array([row]), timestamp)
+        self._emit(events)
+        return events
+
+    def __call__(self, event) -> None:
+        """Matching engine listener: apply fills to both tracked sides"""
+        if getattr(event, "kind", None) != "fill":
+            return
+        quantity, price = event.quantity, event.price
+        self.apply_fill(event.buyer_account_id, event.symbol, quantity, price, event.timestamp)
+        self.apply_fill(event.seller_account_id, event.symbol, -quantity, price, event.timestamp)
+
+    def update_prices(
+        self,
+        symbols: Sequence[str],
+        prices: Iterable[float],
+        timestamp: Optional[float] = None,
+    ) -> List[RiskEvent]:
+        """
+        Mark positions to new prices and check the accounts exposed to them
+
+        Args:
+            symbols: Symbols that ticked
+            prices: Their new prices
+            timestamp: Time of the update (default: now)
+
+        Returns:
+            Events raised by the update
+        """
+        timestamp = timestamp or time.time()
+        prices = np.asarray(prices, dtype=np.float64)
+        with self._lock:
+            self.price_updates += len(prices)
+            lookup = self.symbols.ids.get
+            # A symbol quoted twice in a batch is marked once, at its last price
+            latest: Dict[int, float] = {}
+            for symbol, price in zip(symbols, prices):
+                symbol_id = lookup(symbol)
+                if symbol_id is not None:
+                    latest[symbol_id] = price
+            parts, part_prices, sizes = [], [], []
+            for symbol_id, price in latest.items():
+                slots = self._symbol_slots(symbol_id)
+                if len(slots):
+                    parts.append(slots)
+                    part_prices.append(price)
+                    sizes.append(len(slots))
+
+            if len(parts) == 1:
+                # An account holds one position per symbol: rows are unique
+                slots = parts[0]
+                rows = self.position_rows[slots]
+                self.unrealized[rows] += self.quantity[slots] * (part_prices[0] - self.mark[slots])
+                self.mark[slots] = part_prices[0]
+            elif parts:
+                slots = np.concatenate(parts)
+                marks = np.repeat(part_prices, sizes)
+                rows = self.position_rows[slots]
+                np.add.at(self.unrealized, rows, self.quantity[slots] * (marks - self.mark[slots]))
+                self.mark[slots] = marks
+                touched = np.zeros(self._row_count, dtype=bool)
+                touched[rows] = True
+                rows = np.flatnonzero(touched)
+            else:
+                rows = None
+            events = self._evaluate(rows, timestamp)
+        self._emit(events)
+        return events
+
+    def roll_day(self, timestamp: Optional[float] = None) -> None:
+        """Start a new trading day: daily loss is measured from current equity"""
+        with self._lock:
+            count = self._row_count
+            active = np.flatnonzero(self.status[:count] == ACTIVE)
+            self.day_start[active] = self.balance[active] + self.unrealized[active]
+            self._update_floor(active)
+            self._day = self._day_of(timestamp or time.time())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._row_count
+            status = self.status[:count]
+            return {
+                "accounts": len(self._rows),
+                "active": int(np.count_nonzero(status == ACTIVE)),
+                "breached": int(np.count_nonzero(status == BREACHED)),
+                "passed": int(np.count_nonzero(status == PASSED)),
+                "positions": len(self._slots),
+                "symbols": len(self.symbols),
+                "price_updates": self.price_updates,
+                "fills": self.fills,
+                "events": self.events,
+            }
+
+    # Internal helpers
+
+    def _evaluate(self, rows: Optional[np.ndarray], timestamp: float) -> List[RiskEvent]:
+        """Check accounts against their floor and target after an update"""
+        day = self._day_of(timestamp)
+        if day != self._day:
+            if self._day is not None:
+                self.roll_day(timestamp)
+            self._day = day
+        if rows is None or not len(rows):
+            return []
+
+        rows = rows[self.status[rows] == ACTIVE]
+        equity = self.balance[rows] + self.unrealized[rows]
+
+        higher = equity > self.peak[rows]
+        if higher.any():
+            raised = rows[higher]
+            self.peak[raised] = equity[higher]
+            self._update_floor(raised)
+
+        breached = equity <= self.floor[rows]
+        passed = ~breached & (equity >= self.target[rows])
+        if not breached.any() and not passed.any():
+            return []
+
+        events = []
+        daily_floor = self.day_start - self.daily_limit
+        for index in np.flatnonzero(breached | passed):
+            row = rows[index]
+            value = float(equity[index])
+            if breached[index]:
+                self.status[row] = BREACHED
+                rule = MAX_DAILY_LOSS if value <= daily_floor[row] else MAX_DRAWDOWN
+                threshold = float(daily_floor[row] if rule == MAX_DAILY_LOSS else self.peak[row] - self.drawdown_limit[row])
+            else:
+                self.status[row] = PASSED
+                rule = PROFIT_TARGET
+                threshold = float(self.target[row])
+            events.append(RiskEvent(
+                int(self.account_ids[row]), rule, STATUS_NAMES[int(self.status[row])], value, threshold,
+                self.challenge_types[self.type_codes[row]], self.phases[self.phase_codes[row]], timestamp,
+            ))
+        self.events += len(events)
+        return events
+
+    def _update_floor(self, rows) -> None:
+        self.floor[rows] = np.maximum(
+            self.day_start[rows] - self.daily_limit[rows], self.peak[rows] - self.drawdown_limit[rows]
+        )
+
+    def _day_of(self, timestamp: float) -> int:
+        return int((timestamp - self.day_start_hour * 3600) // 86400)
+
+    def _symbol_slots(self, symbol_id: int) -> np.ndarray:
+        slots = self._index.get(symbol_id)
+        if slots is None:
+            slots = self._index[symbol_id] = np.array(self._by_symbol[symbol_id], dtype=np.int64)
+        return slots
+
+    def _new_slot(self, row: int, symbol_id: int, price: float) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._slot_count == len(self.quantity):
+                self._allocate(POSITION_COLUMNS, 2 * len(self.quantity), fill={"position_rows": -1})
+            slot = self._slot_count
+            self._slot_count += 1
+        self.position_rows[slot] = row
+        self.position_symbols[slot] = symbol_id
+        self.quantity[slot] = 0.0
+        self.average_price[slot] = price
+        self.mark[slot] = price
+
+        while len(self._by_symbol) <= symbol_id:
+            self._by_symbol.append([])
+        self._by_symbol[symbol_id].append(slot)
+        self._index.pop(symbol_id, None)
+        return slot
+
+    def _free_slot(self, slot: int) -> None:
+        symbol_id = int(self.position_symbols[slot])
+        self._by_symbol[symbol_id].remove(slot)
+        self._index.pop(symbol_id, None)
+        self.position_rows[slot] = -1
+        self.quantity[slot] = 0.0
+        self._free_slots.append(slot)
+
+    def _next_row(self) -> int:
+        if self._row_count == len(self.balance):
+            self._allocate(ACCOUNT_COLUMNS, 2 * len(self.balance), fill={"status": _UNUSED})
+        row = self._row_count
+        self._row_count += 1
+        return row
+
+    def _allocate(self, columns, capacity: int, fill: Dict, keep: bool = True) -> None:
+        """Create or grow a set of column arrays"""
+        for name, dtype in columns:
+            grown = np.full(capacity, fill.get(name, 0), dtype=dtype)
+            if keep:
+                current = getattr(self, name)
+                grown[:len(current)] = current
+            setattr(self, name, grown)
+
+    def _emit(self, events: List[RiskEvent]) -> None:
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+
+
+# Global risk engine instance
+risk_engine = RiskEngine()
+
+__all__ = [
+    "ACTIVE",
+    "BREACHED",
+    "PASSED",
+    "RiskEngine",
+    "RiskEvent",
+    "risk_engine",
+]
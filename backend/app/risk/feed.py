@@ -0,0 +1,169 @@
+"""
+TradeSense AI Platform - Risk Feed
+Runs the risk engine inside the paper trading process
+
+The process that owns the matching engine also owns the risk engine and
+feeds it:
+
+- paper fills update positions (the risk engine listens to the matching
+  engine)
+- quote batches from the ingestion pipeline (md:quotes:updates) mark the
+  positions to market at their last price
+- risk events are queued on risk.notify_events; the real-time gateway,
+  when enabled, pushes them to the account's connections
+- the equity recorder samples the engine every EQUITY_SAMPLE_INTERVAL,
+  which fills the equity curves and the return leaderboards
+
+Both threads start with the first challenge account opened in a process
+(after fork, in the worker that trades).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from flask import Flask
+
+from app.risk.engine import RiskEngine, RiskEvent, risk_engine
+
+logger = logging.getLogger(__name__)
+
+
+class RiskFeed:
+    """Feeds fills, quotes and equity sampling to a risk engine"""
+
+    def __init__(self, app: Optional[Flask] = None, engine: Optional[RiskEngine] = None):
+        self.app: Optional[Flask] = None
+        self.engine = engine or risk_engine
+        self.threads = True
+        self.price_updates = 0
+
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the feed with Flask app
+
+        Call after the matching engine is initialized.
+
+        Args:
+            app: Flask application instance
+        """
+        from app.trading.equity import equity_recorder
+
+        self.app = app
+        self.threads = app.config.get("RISK_FEED_ENABLED", True)
+        self.engine.init_app(app)
+        equity_recorder.init_app(app)
+
+        matching_engine = getattr(app, "extensions", {}).get("matching_engine")
+        if matching_engine is not None:
+            matching_engine.unsubscribe(self.engine)
+            matching_engine.subscribe(self.engine)
+        self.engine.unsubscribe(self._notify)
+        self.engine.subscribe(self._notify)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["risk_feed"] = self
+
+    def open_account(
+        self,
+        account_id: int,
+        challenge_type: str,
+        phase: str,
+        balance: Optional[float] = None,
+    ) -> None:
+        """
+        Open a challenge account in the matching and risk engines
+
+        Args:
+            account_id: Account ID
+            challenge_type: One of CHALLENGE_TYPES
+            phase: One of CHALLENGE_PHASES
+            balance: Starting balance (default: the challenge type's)
+
+        Raises:
+            ChallengeError: For unknown types or phases, or a tracked account
+        """
+        from app.trading import matching_engine
+
+        self.engine.open_account(account_id, challenge_type, phase, balance)
+        matching_engine.open_account(account_id, cash=balance or self.engine.balances[challenge_type])
+        self._start()
+
+    def apply_quotes(self, quotes) -> int:
+        """
+        Mark positions to a batch of quotes
+
+        Args:
+            quotes: Quotes as [symbol, bid, ask, last, volume, timestamp]
+
+        Returns:
+            Number of risk events raised
+        """
+        if not quotes:
+            return 0
+        self.price_updates += len(quotes)
+        events = self.engine.update_prices(
+            [quote[0] for quote in quotes], [quote[3] for quote in quotes]
+        )
+        return len(events)
+
+    # Internal helpers
+
+    def _notify(self, event: RiskEvent) -> None:
+        """Risk engine listener: email the account owner"""
+        from app.tasks import notify_risk_events
+
+        try:
+            with self.app.app_context():
+                notify_risk_events.add(event.to_dict())
+        except Exception as e:
+            logger.error(f"Could not queue risk event for account {event.account_id}: {e}")
+
+    def _start(self) -> None:
+        # Also runs after fork: threads of the parent do not exist in a worker
+        if not self.threads or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+
+        from app.trading.equity import equity_recorder
+
+        threading.Thread(target=self._listen_quotes, name="risk-quotes", daemon=True).start()
+        equity_recorder.start(self.engine)
+
+    def _listen_quotes(self) -> None:
+        from app.core.cache import cache
+        from app.market_data.quotes import UPDATES_CHANNEL, unpack_updates
+
+        while True:
+            client = cache.redis_client
+            if client is None:
+                time.sleep(1.0)
+                continue
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(UPDATES_CHANNEL)
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self.apply_quotes(unpack_updates(message["data"])[1])
+            except Exception as e:
+                logger.error(f"Risk quote listener failed: {e}")
+                time.sleep(1.0)
+
+
+# Global feed instance
+risk_feed = RiskFeed()
+
+__all__ = ["RiskFeed", "risk_feed"]
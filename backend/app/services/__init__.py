@@ -3,6 +3,24 @@ TradeSense AI Platform - Services
 Business logic services
 """
 
+from app.services.activity_service import UserActivityService
+from app.services.analytics_service import AnalyticsService
 from app.services.auth_service import AuthService
+from app.services.equity_service import EquityService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.login_throttle_service import LoginThrottleService
+from app.services.market_data_service import MarketDataService
+from app.services.provisioning_service import UserProvisioningService
+from app.services.token_service import RefreshTokenService
 
-__all__ = ['AuthService']
+__all__ = [
+    'AnalyticsService',
+    'AuthService',
+    'EquityService',
+    'LeaderboardService',
+    'LoginThrottleService',
+    'MarketDataService',
+    'RefreshTokenService',
+    'UserActivityService',
+    'UserProvisioningService',
+]
@@ -0,0 +1,191 @@
+"""
+TradeSense AI Platform - User Activity Service
+Buffers last-login and last-seen timestamps in Redis and flushes them in bulk
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from app.core.cache import cache
+from app.core.database import bulk_update
+from app.models.user import User
+
+# One Redis hash per tracked column: field = user id, value = epoch seconds
+BUFFER_KEY = "activity:buf:{column}"
+FLUSHING_KEY = "activity:flushing:{column}"
+TRACKED_COLUMNS = ("last_login", "last_seen_at")
+
+# KEYS[1] = buffer, KEYS[2] = flushing
+# Leftovers from an interrupted flush are processed before new entries.
+TAKE_BUFFER_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 and redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+
+class UserActivityService:
+    """Service class for buffered user activity timestamps"""
+
+    @staticmethod
+    def record_login(user: User) -> None:
+        """
+        Record a successful login without writing the users row
+
+        Args:
+            user: Authenticated user
+        """
+        now = time.time()
+        if not UserActivityService._buffer(
+            user.id, {"last_login": now, "last_seen_at": now}
+        ):
+            user.update_last_login()
+            return
+
+        # Lets this request's response show the new value without a lookup
+        user._buffered_last_login = datetime.utcfromtimestamp(now)
+
+    @staticmethod
+    def record_seen(user_id) -> None:
+        """
+        Record session activity (e.g. token refresh) for a user
+
+        Args:
+            user_id: User ID
+        """
+        UserActivityService._buffer(user_id, {"last_seen_at": time.time()})
+
+    @staticmethod
+    def buffered_last_login(user: User) -> Optional[datetime]:
+        """
+        Get the most recent last login, including values not yet flushed
+
+        Args:
+            user: User instance
+
+        Returns:
+            Last login timestamp or None
+        """
+        if getattr(user, "_buffered_last_login", None) is None:
+            UserActivityService.load_last_logins([user])
+        buffered = getattr(user, "_buffered_last_login", None)
+
+        if not buffered:
+            return user.last_login
+        if user.last_login is None:
+            return buffered
+        return max(user.last_login, buffered)
+
+    @staticmethod
+    def load_last_logins(users: List[User]) -> None:
+        """
+        Read the unflushed last logins of many users in one round trip
+
+        The values are kept on the instances, so buffered_last_login (and
+        to_public_dict) of these users does not go back to Redis.
+
+        Args:
+            users: User instances, e.g. a page of results
+
+        Usage:
+            UserActivityService.load_last_logins(users)
+            data = [user.to_public_dict() for user in users]
+        """
+        users = [
+            user for user in users if getattr(user, "_buffered_last_login", None) is None
+        ]
+        if not users or not cache._is_available():
+            return
+
+        ids = [user.id for user in users]
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            pipeline.hmget(BUFFER_KEY.format(column="last_login"), ids)
+            pipeline.hmget(FLUSHING_KEY.format(column="last_login"), ids)
+            buffered, flushing = pipeline.execute()
+        except Exception as e:
+            current_app.logger.error(f"Activity buffer read failed: {e}")
+            return
+
+        for user, value, flushing_value in zip(users, buffered, flushing):
+            if value is None:
+                value = flushing_value
+            # Remember the lookup (False = nothing buffered) for this instance
+            user._buffered_last_login = (
+                datetime.utcfromtimestamp(float(value)) if value is not None else False
+            )
+
+    @staticmethod
+    def flush(batch_size: int = 1000) -> int:
+        """
+        Write buffered timestamps to the users table in bulk
+
+        Args:
+            batch_size: Rows per bulk update
+
+        Returns:
+            Number of users updated
+        """
+        if not cache._is_available():
+            return 0
+
+        updates: Dict[int, dict] = {}
+        for column in TRACKED_COLUMNS:
+            entries = cache.script(TAKE_BUFFER_SCRIPT)(
+                keys=[
+                    BUFFER_KEY.format(column=column),
+                    FLUSHING_KEY.format(column=column),
+                ]
+            )
+            for user_id, value in zip(entries[::2], entries[1::2]):
+                row = updates.setdefault(int(user_id), {"id": int(user_id)})
+                row[column] = datetime.utcfromtimestamp(float(value))
+
+        if not updates:
+            return 0
+
+        # Skip users deleted since the timestamp was buffered
+        known_ids = set()
+        ids = list(updates)
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            known_ids.update(
+                row[0]
+                for row in User.query.with_entities(User.id)
+                .filter(User.id.in_(chunk))
+                .all()
+            )
+
+        rows = [updates[user_id] for user_id in ids if user_id in known_ids]
+        for start in range(0, len(rows), batch_size):
+            bulk_update(User, rows[start:start + batch_size])
+
+        cache.redis_client.delete(
+            *[FLUSHING_KEY.format(column=column) for column in TRACKED_COLUMNS]
+        )
+        return len(rows)
+
+    # Internal helpers
+
+    @staticmethod
+    def _buffer(user_id, values: Dict[str, float]) -> bool:
+        """Write timestamps to the buffer in one round trip"""
+        if not cache._is_available():
+            return False
+
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            for column, value in values.items():
+                pipeline.hset(BUFFER_KEY.format(column=column), user_id, value)
+            pipeline.execute()
+            return True
+        except Exception as e:
+            current_app.logger.error(f"Activity buffer write failed: {e}")
+            return False
+
+
+__all__ = ["UserActivityService"]
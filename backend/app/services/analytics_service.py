@@ -0,0 +1,159 @@
+"""
+TradeSense AI Platform - Analytics Service
+Per-account performance reports, cached and extended fill by fill
+
+Two cache entries per account:
+
+    analytics:state:<account_id>   TradeStats, open positions (average
+                                   cost) and the id of the last fill applied
+    analytics:report:<account_id>  the rendered report
+
+A report request returns the cached report if there is one. Otherwise it
+loads the state, applies only the fills written since its last fill id
+and caches both again. A report is never recomputed from the first trade
+while its state is cached. The execution writer drops the report entries
+of the accounts in every batch of fills it writes, so new trades show up
+on the next request.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import or_
+
+from app.core.cache import cache
+from app.models.trading import Fill
+from app.services.leaderboard_service import RealizedPnL
+
+STATE_KEY = "analytics:state:{account_id}"
+REPORT_KEY = "analytics:report:{account_id}"
+
+
+class AnalyticsService:
+    """Service class for trading performance analytics"""
+
+    @staticmethod
+    def get_report(account_id: int) -> Dict:
+        """
+        Get the performance report of an account
+
+        Args:
+            account_id: Account ID
+
+        Returns:
+            TradeStats.report() of the account's closed trades, plus
+            "last_fill_id" (the newest fill included)
+        """
+        report = cache.get(REPORT_KEY.format(account_id=account_id))
+        if report is not None:
+            return report
+
+        state = cache.get(STATE_KEY.format(account_id=account_id))
+        if state is None:
+            state = AnalyticsService._new_state()
+        AnalyticsService._catch_up(account_id, state)
+
+        report = {**state["stats"].report(), "last_fill_id": state["last_fill_id"]}
+        config = current_app.config
+        cache.set(
+            STATE_KEY.format(account_id=account_id),
+            state,
+            timeout=config.get("ANALYTICS_STATE_TIMEOUT", 7 * 24 * 3600),
+        )
+        cache.set(
+            REPORT_KEY.format(account_id=account_id),
+            report,
+            timeout=config.get("ANALYTICS_REPORT_TIMEOUT", 300),
+        )
+        return report
+
+    @staticmethod
+    def invalidate(account_ids: Iterable[int]) -> int:
+        """
+        Drop the cached reports of accounts with new trades
+
+        The cached state stays; the next report request extends it with the
+        new fills.
+
+        Args:
+            account_ids: Account IDs
+
+        Returns:
+            Number of reports dropped
+        """
+        if not cache._is_available():
+            return 0
+
+        keys = [REPORT_KEY.format(account_id=account_id) for account_id in set(account_ids)]
+        if not keys:
+            return 0
+        try:
+            return cache.redis_client.delete(*keys)
+        except Exception as e:
+            current_app.logger.error(f"Analytics invalidation failed: {e}")
+            return 0
+
+    @staticmethod
+    def reset(account_id: int) -> None:
+        """Drop the cached state and report of an account (full rebuild on next request)"""
+        cache.delete(STATE_KEY.format(account_id=account_id))
+        cache.delete(REPORT_KEY.format(account_id=account_id))
+
+    # Internal helpers
+
+    @staticmethod
+    def _new_state() -> Dict:
+        # numpy is only loaded once a report is first requested
+        from app.analytics import TradeStats
+
+        balance = current_app.config.get("PAPER_STARTING_BALANCE", 100000.0)
+        return {"stats": TradeStats(balance), "positions": RealizedPnL(), "last_fill_id": 0}
+
+    @staticmethod
+    def _catch_up(account_id: int, state: Dict, batch_size: Optional[int] = None) -> int:
+        """Apply the account's fills newer than the state's last fill id"""
+        batch_size = batch_size or current_app.config.get("ANALYTICS_BATCH_SIZE", 5000)
+        positions = state["positions"].positions
+        applied = 0
+        while True:
+            fills = (
+                Fill.query.with_entities(
+                    Fill.id,
+                    Fill.symbol,
+                    Fill.price,
+                    Fill.quantity,
+                    Fill.buyer_account_id,
+                    Fill.seller_account_id,
+                )
+                .filter(
+                    Fill.id > state["last_fill_id"],
+                    or_(Fill.buyer_account_id == account_id, Fill.seller_account_id == account_id),
+                )
+                .order_by(Fill.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not fills:
+                return applied
+
+            pnl, symbols = [], []
+            for fill_id, symbol, price, quantity, buyer, seller in fills:
+                quantity, price = float(quantity), float(price)
+                for side_account, signed in ((buyer, quantity), (seller, -quantity)):
+                    if side_account != account_id:
+                        continue
+                    held = positions.get((account_id, symbol), (0.0,))[0]
+                    realized = state["positions"].apply(account_id, symbol, signed, price)
+                    # A fill against the position closes (part of) a trade
+                    if held and (held > 0) != (signed > 0):
+                        pnl.append(realized)
+                        symbols.append(symbol)
+                state["last_fill_id"] = fill_id
+
+            state["stats"].update(pnl, symbols)
+            applied += len(fills)
+            if len(fills) < batch_size:
+                return applied
+
+
+__all__ = ["AnalyticsService"]
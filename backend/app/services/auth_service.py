@@ -15,7 +15,9 @@ from app.core.exceptions import (
     ConflictError,
     NotFoundError,
 )
-from app.utils.jwt_utils import generate_tokens
+from app.services.activity_service import UserActivityService
+from app.services.login_throttle_service import LoginThrottleService
+from app.services.token_service import RefreshTokenService
 
 
 class AuthService:
@@ -32,6 +34,8 @@ class AuthService:
         """
         Register a new user
 
+        Input is expected to be validated by RegisterSchema.
+
         Args:
             email: User's email address
             username: Desired username
@@ -43,14 +47,8 @@ class AuthService:
             Tuple of (user, access_token, refresh_token)
 
         Raises:
-            ValidationError: If input validation fails
             ConflictError: If email or username already exists
         """
-        # Validate input
-        AuthService._validate_registration_input(
-            email, username, password, first_name, last_name
-        )
-
         # Check if email already exists
         if User.email_exists(email):
             raise ConflictError(f"Email '{email}' is already registered")
@@ -77,30 +75,40 @@ class AuthService:
         # Save user to database
         user.save()
 
-        # Generate JWT tokens
-        access_token, refresh_token = generate_tokens(user)
+        # Generate JWT tokens (starts a new refresh token family)
+        access_token, refresh_token = RefreshTokenService.issue_tokens(user)
 
         return user, access_token, refresh_token
 
     @staticmethod
-    def login_user(email: str, password: str) -> Tuple[User, str, str]:
+    def login_user(
+        email: str, password: str, ip_address: Optional[str] = None
+    ) -> Tuple[User, str, str]:
         """
         Authenticate user and generate tokens
 
         Args:
             email: User's email address
             password: User's password
+            ip_address: Client IP address (used for throttling)
 
         Returns:
             Tuple of (user, access_token, refresh_token)
 
         Raises:
-            AuthenticationError: If credentials are invalid
+            AuthenticationError: If credentials are invalid or account is locked
+            RateLimitError: If the client IP is throttled
         """
+        email = email.lower().strip()
+
+        # Reject locked accounts and throttled IPs before any database work
+        LoginThrottleService.check(email, ip_address)
+
         # Find user by email
-        user = User.find_by_email(email.lower().strip())
+        user = User.find_by_email(email)
 
         if not user:
+            LoginThrottleService.record_failure(email, ip_address=ip_address)
             raise AuthenticationError("Invalid email or password")
 
         # Check if account is locked
@@ -112,8 +120,8 @@ class AuthService:
 
         # Verify password
         if not user.check_password(password):
-            # Increment failed login attempts
-            user.increment_failed_login()
+            # Count failed attempt (row is only written on lock)
+            LoginThrottleService.record_failure(email, user, ip_address)
             raise AuthenticationError("Invalid email or password")
 
         # Check if account is active
@@ -121,44 +129,42 @@ class AuthService:
             raise AuthenticationError("Account is deactivated")
 
         # Reset failed login attempts on successful login
-        user.reset_failed_login()
+        LoginThrottleService.record_success(email, user)
 
-        # Update last login timestamp
-        user.update_last_login()
+        # Buffer last login timestamp (flushed to the database in bulk)
+        UserActivityService.record_login(user)
 
-        # Generate JWT tokens
-        access_token, refresh_token = generate_tokens(user)
+        # Generate JWT tokens (starts a new refresh token family)
+        access_token, refresh_token = RefreshTokenService.issue_tokens(user)
 
         return user, access_token, refresh_token
 
     @staticmethod
-    def refresh_access_token(refresh_token: str, user_id: str) -> Tuple[str, str]:
+    def refresh_access_token(refresh_claims: Dict) -> Tuple[str, str]:
         """
-        Generate new access token using refresh token
+        Rotate refresh token and generate new access token
 
         Args:
-            refresh_token: Valid refresh token
-            user_id: User ID from refresh token
+            refresh_claims: Decoded claims of the validated refresh token
 
         Returns:
             Tuple of (new_access_token, new_refresh_token)
 
         Raises:
-            AuthenticationError: If refresh token is invalid or user not found
+            AuthenticationError: If refresh token was revoked or reused,
+                or user not found
         """
-        # Find user
-        user = User.find_by_id(user_id)
+        return RefreshTokenService.rotate(refresh_claims)
 
-        if not user:
-            raise AuthenticationError("User not found")
-
-        if not user.is_active:
-            raise AuthenticationError("Account is deactivated")
-
-        # Generate new tokens
-        access_token, refresh_token = generate_tokens(user)
+    @staticmethod
+    def logout_user(token_claims: Dict) -> None:
+        """
+        Revoke the refresh token family of the current session
 
-        return access_token, refresh_token
+        Args:
+            token_claims: Decoded claims of the access token
+        """
+        RefreshTokenService.revoke_family(token_claims.get("fam"))
 
     @staticmethod
     def request_password_reset(email: str) -> str:
@@ -202,11 +208,10 @@ class AuthService:
             True if password was reset successfully
 
         Raises:
-            ValidationError: If token is invalid or password is weak
+            ValidationError: If token is invalid
         """
         # TODO: Validate token from database
-        # For now, just validate password strength
-        AuthService._validate_password(new_password)
+        # (password strength is enforced by ResetPasswordSchema)
 
         # TODO: Find user by reset token
         # TODO: Check if token is expired
@@ -252,86 +257,22 @@ class AuthService:
 
         Raises:
             AuthenticationError: If current password is incorrect
-            ValidationError: If new password is weak
+            ValidationError: If new password matches the current one
         """
         # Verify current password
         if not user.check_password(current_password):
             raise AuthenticationError("Current password is incorrect")
 
-        # Validate new password
-        AuthService._validate_password(new_password)
-
-        # Check if new password is same as current
+        # Check if new password is same as current (strength is enforced
+        # by ChangePasswordSchema)
         if user.check_password(new_password):
             raise ValidationError("New password must be different from current password")
 
-        # Update password
+        # Update password and revoke existing sessions
         user.set_password(new_password)
-        user.save()
+        user.invalidate_sessions()
 
         return True
 
-    # Validation helpers
-
-    @staticmethod
-    def _validate_registration_input(
-        email: str, username: str, password: str, first_name: str, last_name: str
-    ) -> None:
-        """Validate registration input"""
-        errors = {}
-
-        # Email validation
-        if not email or not email.strip():
-            errors['email'] = 'Email is required'
-        elif '@' not in email or '.' not in email:
-            errors['email'] = 'Invalid email format'
-
-        # Username validation
-        if not username or not username.strip():
-            errors['username'] = 'Username is required'
-        elif len(username.strip()) < 3:
-            errors['username'] = 'Username must be at least 3 characters'
-        elif len(username.strip()) > 80:
-            errors['username'] = 'Username must be less than 80 characters'
-
-        # Password validation
-        try:
-            AuthService._validate_password(password)
-        except ValidationError as e:
-            errors['password'] = str(e)
-
-        # First name validation
-        if not first_name or not first_name.strip():
-            errors['first_name'] = 'First name is required'
-
-        # Last name validation
-        if not last_name or not last_name.strip():
-            errors['last_name'] = 'Last name is required'
-
-        if errors:
-            raise ValidationError("Validation failed", payload={'errors': errors})
-
-    @staticmethod
-    def _validate_password(password: str) -> None:
-        """Validate password strength"""
-        if not password:
-            raise ValidationError("Password is required")
-
-        if len(password) < 8:
-            raise ValidationError("Password must be at least 8 characters long")
-
-        if len(password) > 128:
-            raise ValidationError("Password must be less than 128 characters")
-
-        # Check for at least one letter and one number
-        has_letter = any(c.isalpha() for c in password)
-        has_number = any(c.isdigit() for c in password)
-
-        if not has_letter:
-            raise ValidationError("Password must contain at least one letter")
-
-        if not has_number:
-            raise ValidationError("Password must contain at least one number")
-
 
 __all__ = ['AuthService']
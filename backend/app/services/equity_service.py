@@ -0,0 +1,59 @@
+"""
+TradeSense AI Platform - Equity Service
+Account equity curves served from the equity buckets
+"""
+
+from typing import Dict, Optional
+
+from flask import current_app
+
+from app.core.exceptions import ValidationError
+
+
+class EquityService:
+    """Service class for reading account equity curves"""
+
+    @staticmethod
+    def get_curve(
+        account_id: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        max_points: Optional[int] = None,
+    ) -> Dict:
+        """
+        Get the equity curve of an account
+
+        The finest stored resolution (1s, 1m or 1h) that covers the range
+        within max_points is used; longer ranges are merged further, so at
+        most EQUITY_MAX_POINTS points are returned.
+
+        Args:
+            account_id: Account ID
+            start: Range start, epoch seconds (default: a day before end)
+            end: Range end (default: now)
+            max_points: Maximum number of points
+
+        Returns:
+            Dictionary with "resolution" and the columns "timestamp",
+            "open", "high", "low" and "close" as lists
+
+        Raises:
+            ValidationError: If the range is empty
+        """
+        # numpy is only loaded once a curve is first requested
+        from app.trading.equity import equity_recorder
+
+        if current_app.extensions.get("equity_recorder") is not equity_recorder:
+            equity_recorder.init_app(current_app)
+
+        try:
+            curve = equity_recorder.curve(account_id, start=start, end=end, max_points=max_points)
+        except ValueError as e:
+            raise ValidationError(str(e), payload={"errors": {"end": str(e)}})
+        return {
+            name: values.tolist() if hasattr(values, "tolist") else values
+            for name, values in curve.items()
+        }
+
+
+__all__ = ["EquityService"]
@@ -0,0 +1,469 @@
+"""
+TradeSense AI Platform - Leaderboard Service
+Rankings kept incrementally in Redis sorted sets
+
+Every board is one sorted set (member = user id, score = metric):
+
+    lb:<metric>:<period>:<scope>
+        metric:  "profit" (realized P&L, ZINCRBY per closed trade) or
+                 "return" (percent return over the period, ZADD per
+                 equity snapshot)
+        period:  "all", "daily:2026-10-19", "weekly:2026-W42", "monthly:2026-10"
+        scope:   "global" or "type:100k"
+
+A score update writes every board it belongs to in one pipeline; top-N
+and rank queries are single O(log N) sorted set reads. Period boards are
+keyed by period, so a new period starts with a fresh key on its first
+write (no rollover job, no downtime); finished periods stay readable
+until they expire (LEADERBOARD_RETENTION_DAYS).
+
+reconcile() rebuilds the global profit boards from the fills table into
+temporary keys and swaps them in with RENAME, so readers never see a
+partially built board. Increments must neither be lost by the swap nor
+counted twice, so while the reconcile lock is held record_trades() refuses
+trades (the fills.record_trades task puts them back and retries), and the
+swap stores the highest fill id it replayed per rebuilt board. Trades of
+fills up to that id are already in the rebuilt board and are skipped
+there. Fills are assumed to be committed in id order; one that is not is
+corrected by the next reconcile.
+"""
+
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+
+from app.core.cache import cache
+from app.core.database import db
+from app.models.trading import Fill
+from app.models.user import User
+
+BOARD_KEY = "lb:{metric}:{period}:{scope}"
+RECONCILE_LOCK_KEY = "lb:reconcile:lock"
+# Highest fill id replayed into each rebuilt board, field = board key
+WATERMARKS_KEY = "lb:reconcile:watermarks"
+# Equity at the first snapshot of each period (return boards), field = user id
+BASE_KEY = "lb:base:{period}"
+
+METRICS = ("profit", "return")
+PERIODS = ("all", "daily", "weekly", "monthly")
+GLOBAL_SCOPE = "global"
+
+# KEYS[1] = reconcile lock, KEYS[2] = watermarks, KEYS[3..] = boards;
+# ARGV = [member, pnl, fill id (0 = none), expire at] per board. Returns -1
+# without writing while a reconcile runs.
+RECORD_TRADES_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return -1
+end
+local marks = {}
+for i = 3, #KEYS do
+    local j = (i - 3) * 4
+    local board = KEYS[i]
+    if marks[board] == nil then
+        marks[board] = tonumber(redis.call('HGET', KEYS[2], board) or '0')
+    end
+    local fill_id = tonumber(ARGV[j + 3])
+    if fill_id == 0 or fill_id > marks[board] then
+        redis.call('ZINCRBY', board, ARGV[j + 2], ARGV[j + 1])
+    end
+    local expire_at = tonumber(ARGV[j + 4])
+    if expire_at > 0 then
+        redis.call('EXPIREAT', board, expire_at)
+    end
+end
+return #KEYS - 2
+"""
+
+# KEYS = [board, base] per update, ARGV = [member, equity, expire at] per
+# update. The first equity of a period becomes its base; the score is the
+# percent change from it.
+RECORD_RETURN_SCRIPT = """
+for i = 1, #KEYS / 2 do
+    local board, base_key = KEYS[i * 2 - 1], KEYS[i * 2]
+    local member, equity = ARGV[i * 3 - 2], tonumber(ARGV[i * 3 - 1])
+    local expire_at = tonumber(ARGV[i * 3])
+    redis.call('HSETNX', base_key, member, equity)
+    local base = tonumber(redis.call('HGET', base_key, member))
+    if base and base > 0 then
+        redis.call('ZADD', board, (equity - base) / base * 100, member)
+    end
+    if expire_at > 0 then
+        redis.call('EXPIREAT', board, expire_at)
+        redis.call('EXPIREAT', base_key, expire_at)
+    end
+end
+return #KEYS / 2
+"""
+
+
+def period_id(period: str, at: Optional[float] = None) -> str:
+    """
+    Key segment of the period containing a time
+
+    Args:
+        period: One of PERIODS
+        at: Epoch seconds (default: now)
+
+    Returns:
+        "all", "daily:YYYY-MM-DD", "weekly:YYYY-Www" or "monthly:YYYY-MM"
+    """
+    if period == "all":
+        return "all"
+    moment = datetime.utcfromtimestamp(at if at is not None else time.time())
+    if period == "daily":
+        return f"daily:{moment:%Y-%m-%d}"
+    if period == "weekly":
+        year, week, _ = moment.isocalendar()
+        return f"weekly:{year}-W{week:02d}"
+    if period == "monthly":
+        return f"monthly:{moment:%Y-%m}"
+    raise ValueError(f"Unknown leaderboard period: {period}")
+
+
+def period_end(period: str, at: float) -> Optional[float]:
+    """End of the period containing a time (None for "all")"""
+    moment = datetime.utcfromtimestamp(at)
+    day = datetime(moment.year, moment.month, moment.day)
+    if period == "daily":
+        end = day + timedelta(days=1)
+    elif period == "weekly":
+        end = day + timedelta(days=7 - day.weekday())
+    elif period == "monthly":
+        end = datetime(moment.year + moment.month // 12, moment.month % 12 + 1, 1)
+    else:
+        return None
+    return (end - datetime(1970, 1, 1)).total_seconds()
+
+
+def board_key(
+    metric: str = "profit",
+    period: str = "all",
+    challenge_type: Optional[str] = None,
+    at: Optional[float] = None,
+    period_key: Optional[str] = None,
+) -> str:
+    """
+    Key of one board
+
+    Args:
+        metric: "profit" or "return"
+        period: One of PERIODS
+        challenge_type: Scope to a challenge type
+        at: Time selecting the period (default: now)
+        period_key: Explicit period segment (e.g. "daily:2026-10-18")
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+    scope = f"type:{challenge_type}" if challenge_type else GLOBAL_SCOPE
+    return BOARD_KEY.format(metric=metric, period=period_key or period_id(period, at), scope=scope)
+
+
+class RealizedPnL:
+    """Average-cost realized P&L from a sequence of executions"""
+
+    def __init__(self):
+        # (account, symbol) -> [signed quantity, average price]
+        self.positions: Dict[Tuple[int, str], List[float]] = {}
+
+    def apply(self, account_id: int, symbol: str, quantity: float, price: float) -> float:
+        """Record an execution (signed quantity) and return the P&L it realized"""
+        position = self.positions.setdefault((account_id, symbol), [0.0, 0.0])
+        held, average = position
+        remaining = held + quantity
+        realized = 0.0
+        if held == 0 or (held > 0) == (quantity > 0):
+            position[1] = (held * average + quantity * price) / remaining
+        else:
+            closed = min(abs(quantity), abs(held)) * (1.0 if held > 0 else -1.0)
+            realized = closed * (price - average)
+            if remaining and (remaining > 0) != (held > 0):
+                position[1] = price
+        position[0] = remaining
+        return realized
+
+
+class LeaderboardService:
+    """Service class for leaderboard updates and queries"""
+
+    @staticmethod
+    def record_trades(trades: Iterable[Dict]) -> Optional[int]:
+        """
+        Add closed-trade P&L to every profit board the users belong to
+
+        All updates are applied in one script call, after checking the
+        reconcile lock (see the module docstring).
+
+        Args:
+            trades: Dicts with user_id, pnl and optionally challenge_type,
+                closed_at (epoch seconds, default now) and fill_id (skips
+                boards a reconcile already rebuilt from that fill)
+
+        Returns:
+            Number of trades recorded (0 when Redis is unavailable), or
+            None if a reconcile is running and nothing was written
+        """
+        if not cache._is_available():
+            return 0
+
+        retention = LeaderboardService._retention()
+        keys: List[str] = [RECONCILE_LOCK_KEY, WATERMARKS_KEY]
+        args: List = []
+        count = 0
+        for trade in trades:
+            member = trade["user_id"]
+            pnl = float(trade["pnl"])
+            fill_id = int(trade.get("fill_id") or 0)
+            for key, _, expire_at in LeaderboardService._boards("profit", trade, retention):
+                keys.append(key)
+                args.extend((member, pnl, fill_id, int(expire_at or 0)))
+            count += 1
+        if not args:
+            return 0
+
+        try:
+            written = cache.script(RECORD_TRADES_SCRIPT)(keys=keys, args=args)
+        except Exception as e:
+            current_app.logger.error(f"Leaderboard trade update failed: {e}")
+            return 0
+        return None if written == -1 else count
+
+    @staticmethod
+    def record_equity(snapshots: Iterable[Dict]) -> int:
+        """
+        Update return boards from equity snapshots
+
+        The first snapshot of a user in a period is the base the period
+        return is measured from.
+
+        Args:
+            snapshots: Dicts with user_id, equity and optionally
+                challenge_type and timestamp (default now)
+
+        Returns:
+            Number of snapshots recorded (0 when Redis is unavailable)
+        """
+        if not cache._is_available():
+            return 0
+
+        retention = LeaderboardService._retention()
+        keys: List[str] = []
+        args: List = []
+        count = 0
+        for snapshot in snapshots:
+            for key, segment, expire_at in LeaderboardService._boards("return", snapshot, retention):
+                keys.extend((key, BASE_KEY.format(period=segment)))
+                args.extend((snapshot["user_id"], float(snapshot["equity"]), int(expire_at or 0)))
+            count += 1
+        if not keys:
+            return 0
+
+        try:
+            cache.script(RECORD_RETURN_SCRIPT)(keys=keys, args=args)
+        except Exception as e:
+            current_app.logger.error(f"Leaderboard equity update failed: {e}")
+            return 0
+        return count
+
+    @staticmethod
+    def top(limit: int = 10, offset: int = 0, **board) -> Dict:
+        """
+        Highest scores of a board
+
+        Args:
+            limit: Number of entries
+            offset: Entries to skip (pagination)
+            **board: board_key() arguments
+
+        Returns:
+            {"board": key, "total": size, "entries": [{"rank", "user_id", "score"}]}
+        """
+        key = board_key(**board)
+        if not cache._is_available():
+            return {"board": key, "total": 0, "entries": []}
+
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            pipeline.zrevrange(key, offset, offset + limit - 1, withscores=True)
+            pipeline.zcard(key)
+            members, total = pipeline.execute()
+        except Exception as e:
+            current_app.logger.error(f"Leaderboard read failed: {e}")
+            return {"board": key, "total": 0, "entries": []}
+
+        return {
+            "board": key,
+            "total": total,
+            "entries": [
+                {"rank": offset + index + 1, "user_id": int(member), "score": round(score, 8)}
+                for index, (member, score) in enumerate(members)
+            ],
+        }
+
+    @staticmethod
+    def rank(user_id: int, **board) -> Dict:
+        """
+        Rank and score of a user on a board
+
+        Returns:
+            {"board", "user_id", "rank" (1-based, None if unranked), "score", "total"}
+        """
+        key = board_key(**board)
+        result = {"board": key, "user_id": user_id, "rank": None, "score": None, "total": 0}
+        if not cache._is_available():
+            return result
+
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            pipeline.zrevrank(key, user_id)
+            pipeline.zscore(key, user_id)
+            pipeline.zcard(key)
+            rank, score, total = pipeline.execute()
+        except Exception as e:
+            current_app.logger.error(f"Leaderboard rank read failed: {e}")
+            return result
+
+        result["total"] = total
+        if rank is not None:
+            result["rank"] = rank + 1
+            result["score"] = round(score, 8)
+        return result
+
+    @staticmethod
+    def usernames(user_ids: List[int]) -> Dict[int, str]:
+        """Usernames of ranked users in one query"""
+        if not user_ids:
+            return {}
+        rows = (
+            User.query.with_entities(User.id, User.username)
+            .filter(User.id.in_(user_ids))
+            .all()
+        )
+        return {user_id: username for user_id, username in rows}
+
+    @staticmethod
+    def reconcile(batch_size: int = 5000, now: Optional[float] = None) -> Dict:
+        """
+        Rebuild the global profit boards from the fills table
+
+        Realized P&L is replayed from every fill (average cost per account
+        and symbol) and bucketed into the all-time board and the current
+        daily, weekly and monthly boards. Each board is written to a
+        temporary key, and all of them are renamed over the live ones in
+        one transaction that also records the last fill id replayed.
+        Challenge type boards are left to incremental updates: fills do
+        not carry the type.
+
+        Args:
+            batch_size: Fills read per database round trip
+            now: Time selecting the current periods (default: now)
+
+        Returns:
+            Stats with fills replayed and members per rebuilt board
+        """
+        if not cache._is_available():
+            return {"fills": 0, "boards": {}}
+        client = cache.redis_client
+        if not client.set(RECONCILE_LOCK_KEY, 1, nx=True, ex=600):
+            return {"fills": 0, "boards": {}, "skipped": "reconcile already running"}
+
+        try:
+            now = now if now is not None else time.time()
+            starts = {
+                period: LeaderboardService._period_start(period, now)
+                for period in PERIODS
+            }
+            totals: Dict[str, Dict[int, float]] = {period: defaultdict(float) for period in PERIODS}
+            pnl = RealizedPnL()
+            fills = 0
+            last_fill_id = 0
+
+            query = (
+                db.session.query(
+                    Fill.id, Fill.buyer_account_id, Fill.seller_account_id, Fill.symbol,
+                    Fill.quantity, Fill.price, Fill.executed_at,
+                )
+                .order_by(Fill.executed_at, Fill.id)
+                .yield_per(batch_size)
+            )
+            for fill_id, buyer, seller, symbol, quantity, price, executed_at in query:
+                last_fill_id = max(last_fill_id, fill_id)
+                quantity, price = float(quantity), float(price)
+                executed = (executed_at - datetime(1970, 1, 1)).total_seconds()
+                for account_id, signed in ((buyer, quantity), (seller, -quantity)):
+                    realized = pnl.apply(account_id, symbol, signed, price)
+                    if realized:
+                        for period, start in starts.items():
+                            if executed >= start:
+                                totals[period][account_id] += realized
+                fills += 1
+
+            retention = LeaderboardService._retention()
+            boards = {}
+            swap = client.pipeline(transaction=True)
+            for period, scores in totals.items():
+                key = board_key("profit", period, at=now)
+                temporary = f"{key}:rebuild"
+                pipeline = client.pipeline(transaction=False)
+                pipeline.delete(temporary)
+                items = list(scores.items())
+                for start in range(0, len(items), batch_size):
+                    pipeline.zadd(temporary, dict(items[start:start + batch_size]))
+                pipeline.execute()
+
+                if items:
+                    swap.rename(temporary, key)
+                    end = period_end(period, now)
+                    if end is not None:
+                        swap.expireat(key, int(end + retention[period]))
+                else:
+                    swap.delete(key)
+                boards[key] = len(items)
+
+            swap.delete(WATERMARKS_KEY)
+            swap.hset(WATERMARKS_KEY, mapping={key: last_fill_id for key in boards})
+            swap.execute()
+
+            return {"fills": fills, "last_fill_id": last_fill_id, "boards": boards}
+        finally:
+            client.delete(RECONCILE_LOCK_KEY)
+
+    # Internal helpers
+
+    @staticmethod
+    def _retention() -> Dict[str, float]:
+        days = current_app.config.get(
+            "LEADERBOARD_RETENTION_DAYS", {"daily": 7, "weekly": 35, "monthly": 400}
+        )
+        return {period: value * 86400 for period, value in days.items()}
+
+    @staticmethod
+    def _boards(metric: str, entry: Dict, retention: Dict[str, float]):
+        """(key, period segment, expire at) of every board an entry is scored on"""
+        at = entry.get("closed_at") or entry.get("timestamp") or time.time()
+        scopes = [{}]
+        if entry.get("challenge_type"):
+            scopes.append({"challenge_type": entry["challenge_type"]})
+        for period in PERIODS:
+            end = period_end(period, at)
+            expire_at = end + retention.get(period, 0) if end is not None else None
+            segment = period_id(period, at)
+            for scope in scopes:
+                yield board_key(metric, period_key=segment, **scope), segment, expire_at
+
+    @staticmethod
+    def _period_start(period: str, at: float) -> float:
+        if period == "all":
+            return float("-inf")
+        moment = datetime.utcfromtimestamp(at)
+        start = datetime(moment.year, moment.month, moment.day)
+        if period == "weekly":
+            start -= timedelta(days=start.weekday())
+        elif period == "monthly":
+            start = start.replace(day=1)
+        return (start - datetime(1970, 1, 1)).total_seconds()
+
+
+__all__ = ["LeaderboardService", "RealizedPnL", "board_key", "period_id"]
@@ -0,0 +1,178 @@
+"""
+TradeSense AI Platform - Login Throttle Service
+Account lockout and per-IP throttling with sliding-window counters in Redis
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from flask import current_app
+
+from app.core.cache import cache
+from app.core.exceptions import AuthenticationError, RateLimitError
+from app.models.user import User
+
+# Redis key layout
+ACCOUNT_FAILURES_KEY = "auth:fail:acct:{email}"
+IP_FAILURES_KEY = "auth:fail:ip:{ip}"
+ACCOUNT_LOCK_KEY = "auth:lock:{email}"
+
+# KEYS[1] = account lock, KEYS[2] = IP failures
+# ARGV[1] = now (ms), ARGV[2] = window (ms)
+CHECK_SCRIPT = """
+local lock_ttl = redis.call('PTTL', KEYS[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+return {lock_ttl, redis.call('ZCARD', KEYS[2])}
+"""
+
+# KEYS[1] = account failures, KEYS[2] = IP failures, KEYS[3] = account lock
+# ARGV[1] = now (ms), ARGV[2] = window (ms), ARGV[3] = unique member,
+# ARGV[4] = account limit, ARGV[5] = lock duration (ms)
+FAILURE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cutoff = now - tonumber(ARGV[2])
+local counts = {}
+for i = 1, 2 do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', cutoff)
+    redis.call('ZADD', KEYS[i], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[i], ARGV[2])
+    counts[i] = redis.call('ZCARD', KEYS[i])
+end
+local locked = 0
+if counts[1] >= tonumber(ARGV[4]) then
+    if redis.call('SET', KEYS[3], now, 'PX', ARGV[5], 'NX') then
+        locked = 1
+        redis.call('DEL', KEYS[1])
+    end
+end
+return {counts[1], counts[2], locked}
+"""
+
+
+class LoginThrottleService:
+    """Service class for login throttling and account lockout"""
+
+    @staticmethod
+    def check(email: str, ip_address: Optional[str] = None) -> None:
+        """
+        Reject the attempt early if the account is locked or the IP is throttled
+
+        Runs before the user lookup and password hash, so bursts against
+        locked accounts cost one Redis call and no database work.
+
+        Args:
+            email: Normalized email address
+            ip_address: Client IP address
+
+        Raises:
+            AuthenticationError: If the account is locked
+            RateLimitError: If the IP exceeded its failure budget
+        """
+        if not cache._is_available():
+            return
+
+        try:
+            lock_ttl, ip_failures = cache.script(CHECK_SCRIPT)(
+                keys=[
+                    ACCOUNT_LOCK_KEY.format(email=email),
+                    IP_FAILURES_KEY.format(ip=ip_address or "unknown"),
+                ],
+                args=[LoginThrottleService._now_ms(), LoginThrottleService._window_ms()],
+            )
+        except Exception as e:
+            current_app.logger.error(f"Login throttle check failed: {e}")
+            return
+
+        if lock_ttl > 0:
+            raise AuthenticationError(
+                "Account is locked due to too many failed login attempts. "
+                "Please try again later."
+            )
+
+        if ip_failures >= current_app.config["LOGIN_IP_MAX_FAILED_ATTEMPTS"]:
+            raise RateLimitError(
+                "Too many failed login attempts. Please try again later."
+            )
+
+    @staticmethod
+    def record_failure(
+        email: str, user: Optional[User] = None, ip_address: Optional[str] = None
+    ) -> None:
+        """
+        Count a failed attempt and lock the account once the limit is reached
+
+        The user row is only written on the lock transition.
+
+        Args:
+            email: Normalized email address
+            user: Matching user, if the email exists
+            ip_address: Client IP address
+        """
+        if not cache._is_available():
+            if user:
+                user.increment_failed_login()
+            return
+
+        lock_seconds = current_app.config["LOGIN_LOCKOUT_DURATION"]
+
+        try:
+            account_failures, _, locked = cache.script(FAILURE_SCRIPT)(
+                keys=[
+                    ACCOUNT_FAILURES_KEY.format(email=email),
+                    IP_FAILURES_KEY.format(ip=ip_address or "unknown"),
+                    ACCOUNT_LOCK_KEY.format(email=email),
+                ],
+                args=[
+                    LoginThrottleService._now_ms(),
+                    LoginThrottleService._window_ms(),
+                    uuid.uuid4().hex,
+                    current_app.config["LOGIN_MAX_FAILED_ATTEMPTS"],
+                    lock_seconds * 1000,
+                ],
+            )
+        except Exception as e:
+            current_app.logger.error(f"Login failure tracking failed: {e}")
+            return
+
+        if locked and user:
+            user.lock(
+                until=datetime.utcnow() + timedelta(seconds=lock_seconds),
+                attempts=account_failures,
+            )
+            current_app.logger.warning(f"Account locked after failed logins: {email}")
+
+    @staticmethod
+    def record_success(email: str, user: User) -> None:
+        """
+        Clear failure state after a successful login
+
+        Args:
+            email: Normalized email address
+            user: Authenticated user
+        """
+        if cache._is_available():
+            try:
+                cache.redis_client.delete(
+                    ACCOUNT_FAILURES_KEY.format(email=email),
+                    ACCOUNT_LOCK_KEY.format(email=email),
+                )
+            except Exception as e:
+                current_app.logger.error(f"Login failure reset failed: {e}")
+
+        # Unlock transition (no-op when the row holds no lock state)
+        user.reset_failed_login()
+
+    # Internal helpers
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def _window_ms() -> int:
+        return current_app.config["LOGIN_FAILURE_WINDOW"] * 1000
+
+
+__all__ = ["LoginThrottleService"]
@@ -0,0 +1,93 @@
+"""
+TradeSense AI Platform - Market Data Service
+Latest quotes as published by the ingestion pipeline, and bar history
+"""
+
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from app.core.cache import cache
+from app.core.exceptions import ValidationError
+from app.market_data.quotes import read_quotes
+
+
+class MarketDataService:
+    """Service class for reading market data"""
+
+    @staticmethod
+    def get_quote(symbol: str) -> Optional[Dict]:
+        """
+        Get the latest quote of a symbol
+
+        Args:
+            symbol: Instrument symbol
+
+        Returns:
+            Quote dictionary (bid, ask, last, volume, timestamp) or None
+        """
+        return MarketDataService.get_quotes([symbol]).get(symbol)
+
+    @staticmethod
+    def get_quotes(symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Get the latest quotes of several symbols in one round trip
+
+        Args:
+            symbols: Symbols to read (None: every published symbol)
+
+        Returns:
+            Quotes by symbol; symbols without a quote are left out
+        """
+        if not cache._is_available():
+            return {}
+
+        try:
+            return read_quotes(cache.redis_client, symbols)
+        except Exception as e:
+            current_app.logger.error(f"Quote read failed: {e}")
+            return {}
+
+    @staticmethod
+    def get_bars(
+        symbol: str,
+        timeframe: str = "1m",
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+    ):
+        """
+        Get OHLCV bars of a symbol from the bar store
+
+        At most MARKET_DATA_MAX_BARS bars are returned (the most recent of
+        the range). Stored timeframes are zero-copy views of the mapped
+        files; higher timeframes are aggregated on the fly.
+
+        Args:
+            symbol: Instrument symbol
+            timeframe: Timeframe name ("1m" ... "1d")
+            start: Earliest bar open time (epoch seconds, inclusive)
+            end: Latest bar open time (inclusive)
+            limit: Maximum number of bars
+
+        Returns:
+            app.market_data.bars.Bars (empty when there is no history)
+
+        Raises:
+            ValidationError: If the timeframe cannot be served
+        """
+        # numpy is only loaded once bars are first requested
+        from app.market_data.bars import bar_store
+
+        if current_app.extensions.get("bar_store") is not bar_store:
+            bar_store.init_app(current_app)
+
+        max_bars = current_app.config.get("MARKET_DATA_MAX_BARS", 5000)
+        limit = min(limit or max_bars, max_bars)
+        try:
+            return bar_store.read(symbol, timeframe, start=start, end=end, limit=limit)
+        except ValueError as e:
+            raise ValidationError(str(e), payload={"errors": {"timeframe": str(e)}})
+
+
+__all__ = ["MarketDataService"]
@@ -0,0 +1,393 @@
+"""
+TradeSense AI Platform - User Provisioning Service
+Bulk user imports from CSV/JSONL with batched checks and parallel hashing
+
+Imports started from the API run as the analytics.provision_users task on
+a Celery worker, which reads the upload from the shared UPLOAD_FOLDER.
+"""
+
+import csv
+import io
+import json
+import os
+import secrets
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import current_process
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from flask import current_app
+from pydantic import ConfigDict, Field, field_validator
+from pydantic_core import PydanticCustomError
+from werkzeug.security import generate_password_hash
+
+from app.core.cache import cache
+from app.core.database import bulk_insert, db
+from app.core.exceptions import ValidationError
+from app.models.user import User, UserRole
+from app.utils.validation import (
+    EmailAddress,
+    Password,
+    PersonName,
+    RequestSchema,
+    Username,
+    validate_data,
+)
+
+JOB_KEY = "jobs:provision:{job_id}"
+JOB_TTL = 7 * 24 * 3600  # seconds
+
+# Job state for this process when Redis is unavailable
+_local_jobs: Dict[str, Dict] = {}
+
+
+class ProvisionedUserSchema(RequestSchema):
+    """One row of a bulk import (unknown columns are ignored)"""
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    email: EmailAddress
+    username: Username
+    first_name: PersonName
+    last_name: PersonName
+    password: Optional[Password] = None
+    role: str = UserRole.USER
+    phone_number: Optional[str] = Field(default=None, max_length=20)
+
+    @field_validator("role")
+    @classmethod
+    def _known_role(cls, value: str) -> str:
+        value = value.strip()
+        if value not in UserRole.all():
+            raise PydanticCustomError("role", "Invalid role '{role}'", {"role": value})
+        return value
+
+
+class ProvisioningReport:
+    """Outcome of a bulk import with a per-row error report"""
+
+    def __init__(self, error_stream: Optional[IO] = None, max_errors: int = 1000):
+        self.created = 0
+        self.failed = 0
+        self.processed = 0
+        self.errors: List[Dict] = []
+        self.error_stream = error_stream
+        self.max_errors = max_errors
+
+    def add_error(self, row_number: int, row: Dict, errors: Dict) -> None:
+        """Record a rejected row"""
+        self.failed += 1
+        entry = {
+            "row": row_number,
+            "email": row.get("email"),
+            "username": row.get("username"),
+            "errors": errors,
+        }
+        if self.error_stream is not None:
+            self.error_stream.write(json.dumps(entry) + "\n")
+        if len(self.errors) < self.max_errors:
+            self.errors.append(entry)
+
+    def to_dict(self) -> Dict:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class UserProvisioningService:
+    """Service class for bulk user provisioning"""
+
+    @staticmethod
+    def read_rows(stream: IO, file_format: str) -> Iterator[Tuple[int, Dict]]:
+        """
+        Stream rows from a CSV or JSONL file without loading it into memory
+
+        Args:
+            stream: Text or binary file object
+            file_format: "csv" or "jsonl"
+
+        Yields:
+            Tuples of (row_number, row_dict)
+        """
+        if isinstance(stream.read(0), bytes):
+            stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+        if file_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(stream), start=1):
+                yield row_number, row
+        elif file_format == "jsonl":
+            for row_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = {"_invalid": "Malformed JSON line"}
+                if not isinstance(row, dict):
+                    row = {"_invalid": "Expected a JSON object"}
+                yield row_number, row
+        else:
+            raise ValidationError(f"Unsupported import format: {file_format}")
+
+    @staticmethod
+    def provision(
+        rows: Iterator[Tuple[int, Dict]],
+        batch_size: Optional[int] = None,
+        hash_workers: Optional[int] = None,
+        report: Optional[ProvisioningReport] = None,
+        progress=None,
+        max_role: Optional[str] = None,
+    ) -> ProvisioningReport:
+        """
+        Create users in batches
+
+        Each batch is validated, checked for existing emails/usernames with
+        one query per column, hashed across a process pool and inserted with
+        a single bulk insert.
+
+        Args:
+            rows: Iterator of (row_number, row_dict)
+            batch_size: Rows per batch
+            hash_workers: Password hashing processes (None = CPU count)
+            report: Report to fill (a new one is created if omitted)
+            progress: Optional callable receiving the report after each batch
+            max_role: Highest role rows may assign (the importing user's
+                role); None allows any role
+
+        Returns:
+            Provisioning report
+        """
+        config = current_app.config
+        batch_size = batch_size or config.get("PROVISIONING_BATCH_SIZE", 1000)
+        hash_workers = (
+            hash_workers or config.get("PROVISIONING_HASH_WORKERS") or os.cpu_count() or 1
+        )
+        report = report or ProvisioningReport()
+        hash_chunksize = max(1, batch_size // (hash_workers * 4))
+
+        # Emails/usernames accepted earlier in this import
+        seen_emails = set()
+        seen_usernames = set()
+
+        # Celery pool processes are daemonic and cannot fork a process pool.
+        # Password hashing releases the GIL, so threads use every core there.
+        executor = ThreadPoolExecutor if current_process().daemon else ProcessPoolExecutor
+
+        with executor(max_workers=hash_workers) as pool:
+            batch = []
+            for row_number, row in rows:
+                batch.append((row_number, row))
+                if len(batch) >= batch_size:
+                    UserProvisioningService._process_batch(
+                        batch, pool, hash_chunksize, report, seen_emails, seen_usernames,
+                        max_role,
+                    )
+                    batch = []
+                    if progress:
+                        progress(report)
+
+            if batch:
+                UserProvisioningService._process_batch(
+                    batch, pool, hash_chunksize, report, seen_emails, seen_usernames,
+                    max_role,
+                )
+                if progress:
+                    progress(report)
+
+        return report
+
+    @staticmethod
+    def start_job(path: str, file_format: str, max_role: Optional[str] = None) -> str:
+        """
+        Queue an import from a file on the analytics queue
+
+        Args:
+            path: Path of the uploaded file (readable by the workers)
+            file_format: "csv" or "jsonl"
+            max_role: Highest role rows may assign (see provision)
+
+        Returns:
+            Job ID for status polling
+        """
+        from app.tasks import provision_users
+
+        job_id = uuid.uuid4().hex
+        UserProvisioningService._save_job(job_id, {"status": "queued"})
+        provision_users.delay(job_id, path, file_format, max_role)
+        return job_id
+
+    @staticmethod
+    def get_job(job_id: str) -> Optional[Dict]:
+        """
+        Get the status of an import job
+
+        Args:
+            job_id: Job ID returned by start_job
+
+        Returns:
+            Job status dictionary or None if unknown
+        """
+        return cache.get(JOB_KEY.format(job_id=job_id), _local_jobs.get(job_id))
+
+    # Internal helpers
+
+    @staticmethod
+    def run_job(
+        job_id: str, path: str, file_format: str, max_role: Optional[str] = None
+    ) -> Dict:
+        """
+        Run a queued import (body of the analytics.provision_users task)
+
+        The uploaded file is removed afterwards, whatever the outcome.
+
+        Returns:
+            Final job status
+        """
+        UserProvisioningService._save_job(job_id, {"status": "running"})
+        try:
+            with open(path, "rb") as stream:
+                report = UserProvisioningService.provision(
+                    UserProvisioningService.read_rows(stream, file_format),
+                    progress=lambda r: UserProvisioningService._save_job(
+                        job_id, {"status": "running", **r.to_dict()}
+                    ),
+                    max_role=max_role,
+                )
+            state = {"status": "completed", **report.to_dict()}
+        except Exception as e:
+            current_app.logger.error(f"Provisioning job {job_id} failed: {e}")
+            state = {"status": "failed", "message": str(e)}
+        finally:
+            db.session.remove()
+            os.remove(path)
+
+        UserProvisioningService._save_job(job_id, state)
+        return state
+
+    @staticmethod
+    def _save_job(job_id: str, state: Dict) -> None:
+        if not cache.set(JOB_KEY.format(job_id=job_id), state, timeout=JOB_TTL):
+            _local_jobs[job_id] = state
+
+    @staticmethod
+    def _process_batch(
+        batch: List[Tuple[int, Dict]],
+        pool: Executor,
+        hash_chunksize: int,
+        report: ProvisioningReport,
+        seen_emails: set,
+        seen_usernames: set,
+        max_role: Optional[str] = None,
+    ) -> None:
+        """Validate, deduplicate, hash and insert one batch"""
+        report.processed += len(batch)
+
+        candidates = []
+        for row_number, row in batch:
+            errors, normalized = UserProvisioningService._validate_row(row)
+            if errors:
+                report.add_error(row_number, row, errors)
+                continue
+
+            if max_role is not None and UserRole.rank(normalized["role"]) > UserRole.rank(max_role):
+                report.add_error(
+                    row_number, row, {"role": f"Not allowed to assign role '{normalized['role']}'"}
+                )
+                continue
+
+            if normalized["email"] in seen_emails:
+                report.add_error(row_number, row, {"email": "Duplicate email in import"})
+                continue
+            if normalized["username"] in seen_usernames:
+                report.add_error(
+                    row_number, row, {"username": "Duplicate username in import"}
+                )
+                continue
+
+            seen_emails.add(normalized["email"])
+            seen_usernames.add(normalized["username"])
+            candidates.append((row_number, row, normalized))
+
+        if not candidates:
+            return
+
+        # One query per column for the whole batch
+        existing_emails = {
+            value
+            for (value,) in db.session.query(User.email).filter(
+                User.email.in_([c[2]["email"] for c in candidates])
+            )
+        }
+        existing_usernames = {
+            value
+            for (value,) in db.session.query(User.username).filter(
+                User.username.in_([c[2]["username"] for c in candidates])
+            )
+        }
+
+        accepted = []
+        for row_number, row, normalized in candidates:
+            if normalized["email"] in existing_emails:
+                report.add_error(
+                    row_number, row, {"email": "Email is already registered"}
+                )
+            elif normalized["username"] in existing_usernames:
+                report.add_error(
+                    row_number, row, {"username": "Username is already taken"}
+                )
+            else:
+                accepted.append((row_number, row, normalized))
+
+        if not accepted:
+            return
+
+        passwords = [normalized.pop("password") for _, _, normalized in accepted]
+        hashes = pool.map(generate_password_hash, passwords, chunksize=hash_chunksize)
+        for (_, _, normalized), password_hash in zip(accepted, hashes):
+            normalized["password_hash"] = password_hash
+
+        try:
+            report.created += bulk_insert(User, [n for _, _, n in accepted])
+        except Exception:
+            # A concurrent writer took some values; insert rows one by one
+            for row_number, row, normalized in accepted:
+                try:
+                    bulk_insert(User, [normalized])
+                    report.created += 1
+                except Exception as e:
+                    report.add_error(row_number, row, {"row": f"Insert failed: {e}"})
+
+    @staticmethod
+    def _validate_row(row: Dict) -> Tuple[Dict, Dict]:
+        """Validate and normalize a row, returning (errors, user_fields)"""
+        if "_invalid" in row:
+            return {"row": row["_invalid"]}, {}
+
+        # Blank CSV cells count as missing
+        values = {key: value for key, value in row.items() if value not in (None, "")}
+
+        try:
+            user = validate_data(ProvisionedUserSchema, values)
+        except ValidationError as e:
+            return e.payload.get("errors", {"row": e.message}), {}
+
+        return {}, {
+            "email": user.email,
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "phone_number": (user.phone_number or "").strip() or None,
+            "role": user.role,
+            "is_active": True,
+            "is_verified": False,
+            "email_verified": False,
+            # Imported users without a password must reset it before logging in
+            "password": user.password or f"{secrets.token_urlsafe(24)}1a",
+        }
+
+
+__all__ = ["UserProvisioningService", "ProvisioningReport", "ProvisionedUserSchema"]
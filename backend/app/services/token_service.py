@@ -0,0 +1,237 @@
+"""
+TradeSense AI Platform - Refresh Token Service
+Refresh token rotation with reuse detection, tracked per token family in Redis
+"""
+
+import uuid
+from typing import Dict, Optional, Tuple
+
+from flask import current_app
+
+from app.core.cache import cache
+from app.core.exceptions import AuthenticationError
+from app.models.user import User
+from app.services.activity_service import UserActivityService
+from app.utils.jwt_utils import create_token_pair, generate_tokens
+
+# Redis key layout. One small hash per family (u=user id, g=generation,
+# v=token version) instead of one record per issued token.
+FAMILY_KEY = "auth:rtf:{family_id}"
+USER_VERSION_KEY = "auth:utv:{user_id}"
+
+# Claims copied from the presented refresh token into the rotated pair
+CARRIED_CLAIMS = ("email", "username", "role", "is_verified")
+
+# Rotation result codes returned by the Lua script
+ROTATED = 1
+NEEDS_USER = 0
+REUSED = -1
+REVOKED = -2
+
+# KEYS[1] = family hash, KEYS[2] = user token version
+# ARGV[1] = presented generation, ARGV[2] = family TTL in seconds
+ROTATE_SCRIPT = """
+local rec = redis.call('HMGET', KEYS[1], 'g', 'v')
+if not rec[1] then
+    return {-2}
+end
+local gen = tonumber(rec[1])
+if tonumber(ARGV[1]) ~= gen then
+    redis.call('DEL', KEYS[1])
+    return {-1}
+end
+local current = redis.call('GET', KEYS[2])
+if not current or tonumber(current) ~= tonumber(rec[2]) then
+    return {0}
+end
+gen = gen + 1
+redis.call('HSET', KEYS[1], 'g', gen)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[2]))
+return {1, gen}
+"""
+
+
+class RefreshTokenService:
+    """Service class for refresh token families"""
+
+    @staticmethod
+    def issue_tokens(user: User) -> Tuple[str, str]:
+        """
+        Start a new refresh token family and issue its first token pair
+
+        Args:
+            user: Authenticated user
+
+        Returns:
+            Tuple of (access_token, refresh_token)
+        """
+        if not cache._is_available():
+            current_app.logger.warning(
+                "Redis unavailable - issuing refresh token without rotation tracking"
+            )
+            return generate_tokens(user)
+
+        family_id = uuid.uuid4().hex
+        token_version = user.token_version or 0
+        ttl = RefreshTokenService._family_ttl()
+
+        try:
+            pipeline = cache.redis_client.pipeline()
+            pipeline.hset(
+                FAMILY_KEY.format(family_id=family_id),
+                mapping={"u": user.id, "g": 0, "v": token_version},
+            )
+            pipeline.expire(FAMILY_KEY.format(family_id=family_id), ttl)
+            pipeline.set(
+                USER_VERSION_KEY.format(user_id=user.id), token_version, ex=ttl
+            )
+            pipeline.execute()
+        except Exception as e:
+            current_app.logger.error(f"Refresh token family creation failed: {e}")
+            return generate_tokens(user)
+
+        return generate_tokens(user, family_id=family_id, generation=0)
+
+    @staticmethod
+    def rotate(claims: Dict) -> Tuple[str, str]:
+        """
+        Rotate a refresh token, detecting reuse of superseded tokens
+
+        The fast path validates the family and token version in one Lua call
+        and re-issues tokens from the refresh token claims. The user row is
+        only loaded when the cached token version is missing or stale.
+
+        Args:
+            claims: Decoded claims of the presented refresh token
+
+        Returns:
+            Tuple of (new_access_token, new_refresh_token)
+
+        Raises:
+            AuthenticationError: If the token was revoked or reused
+        """
+        user_id = claims["sub"]
+        family_id = claims.get("fam")
+
+        # Tokens issued without rotation tracking (Redis was unavailable)
+        if not family_id or not cache._is_available():
+            return RefreshTokenService._tokens_for_user(user_id)
+
+        result = RefreshTokenService._run_rotate(claims)
+
+        if result[0] == NEEDS_USER:
+            user = RefreshTokenService._load_active_user(user_id, family_id)
+            if (user.token_version or 0) != claims.get("tv", 0):
+                RefreshTokenService.revoke_family(family_id)
+                raise AuthenticationError("Session has been revoked")
+
+            RefreshTokenService.publish_token_version(user)
+            result = RefreshTokenService._run_rotate(claims)
+
+        if result[0] == REUSED:
+            current_app.logger.warning(
+                f"Refresh token reuse detected for user {user_id}, "
+                f"family {family_id} revoked"
+            )
+            raise AuthenticationError("Refresh token has already been used")
+
+        if result[0] != ROTATED:
+            raise AuthenticationError("Session has been revoked")
+
+        UserActivityService.record_seen(user_id)
+
+        user_claims = {key: claims.get(key) for key in CARRIED_CLAIMS}
+        return create_token_pair(
+            identity=user_id,
+            claims=user_claims,
+            family_id=family_id,
+            generation=int(result[1]),
+            token_version=claims.get("tv", 0),
+        )
+
+    @staticmethod
+    def revoke_family(family_id: Optional[str]) -> bool:
+        """
+        Revoke a refresh token family (e.g. on logout)
+
+        Args:
+            family_id: Family ID from the token "fam" claim
+
+        Returns:
+            True if a family was revoked
+        """
+        if not family_id:
+            return False
+        return cache.delete(FAMILY_KEY.format(family_id=family_id))
+
+    @staticmethod
+    def publish_token_version(user: User) -> None:
+        """
+        Store the user's current token version for the rotation fast path
+
+        Args:
+            user: User whose token version changed or was loaded
+        """
+        if not cache._is_available():
+            return
+
+        try:
+            cache.redis_client.set(
+                USER_VERSION_KEY.format(user_id=user.id),
+                user.token_version or 0,
+                ex=RefreshTokenService._family_ttl(),
+            )
+        except Exception as e:
+            current_app.logger.error(
+                f"Token version publish failed for user {user.id}: {e}"
+            )
+            cache.delete(USER_VERSION_KEY.format(user_id=user.id))
+
+    # Internal helpers
+
+    @staticmethod
+    def _run_rotate(claims: Dict) -> list:
+        """Execute the rotation script for the presented token"""
+        script = cache.script(ROTATE_SCRIPT)
+        try:
+            return script(
+                keys=[
+                    FAMILY_KEY.format(family_id=claims["fam"]),
+                    USER_VERSION_KEY.format(user_id=claims["sub"]),
+                ],
+                args=[claims.get("gen", 0), RefreshTokenService._family_ttl()],
+            )
+        except Exception as e:
+            current_app.logger.error(f"Refresh token rotation failed: {e}")
+            raise AuthenticationError("Unable to refresh session")
+
+    @staticmethod
+    def _load_active_user(user_id, family_id: Optional[str] = None) -> User:
+        """Load user and reject missing or deactivated accounts"""
+        user = User.find_by_id(user_id)
+
+        if not user:
+            RefreshTokenService.revoke_family(family_id)
+            raise AuthenticationError("User not found")
+
+        if not user.is_active:
+            RefreshTokenService.revoke_family(family_id)
+            raise AuthenticationError("Account is deactivated")
+
+        return user
+
+    @staticmethod
+    def _tokens_for_user(user_id) -> Tuple[str, str]:
+        """Issue a fresh token family after loading the user"""
+        user = RefreshTokenService._load_active_user(user_id)
+        return RefreshTokenService.issue_tokens(user)
+
+    @staticmethod
+    def _family_ttl() -> int:
+        """Family lifetime in seconds, matching refresh token expiry"""
+        expires = current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
+        return int(expires.total_seconds())
+
+
+__all__ = ["RefreshTokenService"]
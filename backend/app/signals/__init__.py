@@ -0,0 +1,38 @@
+"""
+TradeSense AI Platform - Trading Signals
+Technical indicators computed from the market data bar store
+
+- app.signals.indicators: vectorized batch functions over NumPy arrays
+- app.signals.streaming:  incremental O(1)-per-update state
+- app.signals.engine:     cached computation over stored bars
+
+Importing this package loads NumPy; nothing imports it at app startup.
+"""
+
+from app.signals.engine import INDICATORS, Indicator, IndicatorEngine, get_indicator, indicator_engine
+from app.signals.indicators import atr, bollinger, ema, macd, rsi, sma, smooth, true_range, vwap
+from app.signals.streaming import ATR, EMA, MACD, RSI, SMA, VWAP, Bollinger
+
+__all__ = [
+    "ATR",
+    "Bollinger",
+    "EMA",
+    "INDICATORS",
+    "Indicator",
+    "IndicatorEngine",
+    "MACD",
+    "RSI",
+    "SMA",
+    "VWAP",
+    "atr",
+    "bollinger",
+    "ema",
+    "get_indicator",
+    "indicator_engine",
+    "macd",
+    "rsi",
+    "sma",
+    "smooth",
+    "true_range",
+    "vwap",
+]
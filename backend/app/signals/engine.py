@@ -0,0 +1,358 @@
+"""
+TradeSense AI Platform - Indicator Engine
+Indicators over the bar store, cached per symbol, timeframe and parameters
+
+Two modes:
+
+- series():  whole indicator series computed in batch from stored bars.
+             compute_many() stacks symbols with the same history length
+             into one (symbols, bars) array and computes them in one call.
+- latest():  current value kept by streaming state, advanced only by the
+             bars completed since the last call (O(1) per new bar).
+
+Results are cached in-process (LRU, SIGNALS_CACHE_SIZE entries) under
+(symbol, timeframe, indicator, params). A cached series is reused while
+the bars it was computed from are unchanged; the forming bar is part of
+that check, so an upserted bar invalidates it.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from flask import Flask
+
+from app.market_data.bars import TIMEFRAMES, Bars, BarStore
+from app.signals import indicators, streaming
+
+
+class Indicator:
+    """Batch function, streaming class and defaults of one indicator"""
+
+    __slots__ = ("name", "batch", "stream", "inputs", "defaults", "outputs", "lookback")
+
+    def __init__(
+        self,
+        name: str,
+        batch: Callable,
+        stream: type,
+        inputs: Tuple[str, ...],
+        defaults: Dict,
+        outputs: Tuple[str, ...] = ("value",),
+        lookback: Optional[Callable[[Dict, int], int]] = None,
+    ):
+        self.name = name
+        self.batch = batch
+        self.stream = stream
+        self.inputs = inputs
+        self.defaults = defaults
+        self.outputs = outputs
+        # Bars (of a timeframe in seconds) streaming state is warmed up on
+        # before its values match a full-history series
+        self.lookback = lookback or (lambda params, seconds: 25 * max(
+            (value for value in params.values() if isinstance(value, int)), default=1
+        ))
+
+    def resolve(self, params: Dict) -> Dict:
+        """Defaults overridden by params; unknown names raise ValueError"""
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"Unknown {self.name} parameters: {', '.join(sorted(unknown))}")
+        resolved = dict(self.defaults)
+        resolved.update({name: value for name, value in params.items() if value is not None})
+        return resolved
+
+    def compute(self, columns: Dict[str, np.ndarray], params: Dict) -> Dict[str, np.ndarray]:
+        """Run the batch function on bar columns"""
+        args = [columns[name] for name in self.inputs]
+        result = self.batch(*args, **params)
+        if len(self.outputs) == 1:
+            result = (result,)
+        return dict(zip(self.outputs, result))
+
+
+INDICATORS: Dict[str, Indicator] = {
+    "sma": Indicator("sma", indicators.sma, streaming.SMA, ("close",), {"period": 20}),
+    "ema": Indicator("ema", indicators.ema, streaming.EMA, ("close",), {"period": 20}),
+    "rsi": Indicator("rsi", indicators.rsi, streaming.RSI, ("close",), {"period": 14}),
+    "macd": Indicator(
+        "macd", indicators.macd, streaming.MACD, ("close",),
+        {"fast": 12, "slow": 26, "signal": 9}, ("macd", "signal", "histogram"),
+    ),
+    "bollinger": Indicator(
+        "bollinger", indicators.bollinger, streaming.Bollinger, ("close",),
+        {"period": 20, "k": 2.0}, ("middle", "upper", "lower"),
+        lookback=lambda params, seconds: params["period"],
+    ),
+    "atr": Indicator("atr", indicators.atr, streaming.ATR, ("high", "low", "close"), {"period": 14}),
+    "vwap": Indicator(
+        "vwap", indicators.vwap, streaming.VWAP, ("high", "low", "close", "volume", "timestamp"),
+        {"session": 86400},
+        # One session (the average restarts at its boundary)
+        lookback=lambda params, seconds: params["session"] // seconds if params["session"] else 100000,
+    ),
+}
+
+
+def get_indicator(name: str) -> Indicator:
+    indicator = INDICATORS.get(name)
+    if indicator is None:
+        raise ValueError(f"Unknown indicator '{name}' (known: {', '.join(sorted(INDICATORS))})")
+    return indicator
+
+
+def _stamp(bars: Bars) -> Tuple:
+    """Identifies the bars a result was computed from"""
+    if not len(bars):
+        return (0,)
+    return (len(bars), int(bars.timestamp[0]), int(bars.timestamp[-1]),
+            float(bars.close[-1]), float(bars.high[-1]), float(bars.low[-1]),
+            float(bars.volume[-1]))
+
+
+class _Stream:
+    """Streaming state of one key and the last bar fed to it"""
+
+    __slots__ = ("state", "timestamp", "bars")
+
+    def __init__(self, state):
+        self.state = state
+        self.timestamp: Optional[int] = None
+        self.bars = 0
+
+
+class IndicatorEngine:
+    """
+    Cached indicator computation over stored bars
+
+    Usage:
+        result = indicator_engine.series("BTCUSD", "1h", "rsi", period=14, limit=500)
+        results = indicator_engine.compute_many(symbols, "1m", "macd")
+        value = indicator_engine.latest("BTCUSD", "1m", "bollinger", period=20)
+    """
+
+    def __init__(self, app: Optional[Flask] = None, store: Optional[BarStore] = None):
+        self.store = store
+        self.max_entries = 4096
+        self.default_limit = 1000
+        self._cache: "OrderedDict[Tuple, Tuple[Tuple, Dict[str, np.ndarray]]]" = OrderedDict()
+        self._streams: Dict[Tuple, _Stream] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the engine with Flask app
+
+        Args:
+            app: Flask application instance
+        """
+        self.max_entries = app.config.get("SIGNALS_CACHE_SIZE", 4096)
+        self.default_limit = app.config.get("SIGNALS_DEFAULT_BARS", 1000)
+        if self.store is None:
+            from app.market_data.bars import bar_store
+
+            if app.extensions.get("bar_store") is not bar_store:
+                bar_store.init_app(app)
+            self.store = bar_store
+        self.clear()
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["indicator_engine"] = self
+
+    def series(
+        self,
+        symbol: str,
+        timeframe: str,
+        name: str,
+        limit: Optional[int] = None,
+        **params,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Indicator series over the most recent bars of a symbol
+
+        Args:
+            symbol: Instrument symbol
+            timeframe: Timeframe name
+            name: Indicator name (see INDICATORS)
+            limit: Bars to compute over (default SIGNALS_DEFAULT_BARS)
+            **params: Indicator parameters (e.g. period=14)
+
+        Returns:
+            Output arrays by name plus "timestamp" (do not modify; shared with the cache)
+
+        Raises:
+            ValueError: For unknown indicators, parameters or timeframes
+        """
+        return self.compute_many([symbol], timeframe, name, limit, **params)[symbol]
+
+    def compute_many(
+        self,
+        symbols: Iterable[str],
+        timeframe: str,
+        name: str,
+        limit: Optional[int] = None,
+        **params,
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Indicator series of many symbols, computed in as few batch calls as possible
+
+        Symbols whose cached result is still current are served from the
+        cache; the rest are grouped by history length, stacked and
+        computed one group per call.
+
+        Returns:
+            Results by symbol (see series())
+        """
+        indicator = get_indicator(name)
+        params = indicator.resolve(params)
+        limit = limit or self.default_limit
+        param_key = tuple(sorted(params.items()))
+
+        results: Dict[str, Dict[str, np.ndarray]] = {}
+        pending: Dict[int, List[Tuple[str, Tuple, Tuple, Bars]]] = {}
+        for symbol in symbols:
+            bars = self.store.read(symbol, timeframe, limit=limit)
+            key = (symbol, timeframe, name, param_key, limit)
+            stamp = _stamp(bars)
+            cached = self._get(key, stamp)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                pending.setdefault(len(bars), []).append((symbol, key, stamp, bars))
+
+        for group in pending.values():
+            columns = {
+                column: np.stack([getattr(bars, column) for *_, bars in group])
+                for column in indicator.inputs if column != "timestamp"
+            }
+            if "timestamp" in indicator.inputs:
+                # Shared along the time axis; only aligned when the stamps
+                # match, otherwise compute row by row
+                if len({stamp[1:3] for _, _, stamp, _ in group}) > 1:
+                    for entry in group:
+                        results.update(self._compute_one(indicator, params, *entry))
+                    continue
+                columns["timestamp"] = group[0][3].timestamp
+
+            computed = indicator.compute(columns, params)
+            for row, (symbol, key, stamp, bars) in enumerate(group):
+                result = {output: values[row] for output, values in computed.items()}
+                result["timestamp"] = bars.timestamp
+                self._put(key, stamp, result)
+                results[symbol] = result
+        return results
+
+    def latest(self, symbol: str, timeframe: str, name: str, **params) -> Dict:
+        """
+        Indicator value as of the last completed bar, updated incrementally
+
+        The first call warms streaming state up on recent history; later
+        calls feed it only the bars completed since. The newest stored bar
+        is treated as still forming and is not fed.
+
+        Returns:
+            Output values by name plus "timestamp" of the last bar fed
+            (None before any bar has completed)
+        """
+        indicator = get_indicator(name)
+        params = indicator.resolve(params)
+        key = (symbol, timeframe, name, tuple(sorted(params.items())))
+
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _Stream(indicator.stream(**params))
+
+            if stream.timestamp is None:
+                lookback = indicator.lookback(params, TIMEFRAMES[timeframe])
+                bars = self.store.read(symbol, timeframe, limit=lookback + 1)
+            else:
+                bars = self.store.read(symbol, timeframe, start=stream.timestamp + 1)
+
+            completed = len(bars) - 1
+            if completed > 0:
+                update = stream.state.update
+                columns = [getattr(bars, column)[:completed].tolist() for column in indicator.inputs]
+                for values in zip(*columns):
+                    update(*values)
+                stream.timestamp = int(bars.timestamp[completed - 1])
+                stream.bars += completed
+
+            value = stream.state.value
+            timestamp = stream.timestamp
+
+        if len(indicator.outputs) == 1:
+            value = (value,)
+        result = dict(zip(indicator.outputs, value))
+        result["timestamp"] = timestamp
+        return result
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop cached results and streaming state (of one symbol or all)"""
+        with self._lock:
+            if symbol is None:
+                self._cache.clear()
+                self._streams.clear()
+                return
+            for key in [key for key in self._cache if key[0] == symbol]:
+                del self._cache[key]
+            for key in [key for key in self._streams if key[0] == symbol]:
+                del self._streams[key]
+
+    def clear(self) -> None:
+        self.invalidate()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "streams": len(self._streams),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    # Internal helpers
+
+    def _compute_one(self, indicator, params, symbol, key, stamp, bars) -> Dict:
+        columns = {column: getattr(bars, column) for column in indicator.inputs}
+        result = indicator.compute(columns, params)
+        result["timestamp"] = bars.timestamp
+        self._put(key, stamp, result)
+        return {symbol: result}
+
+    def _get(self, key: Tuple, stamp: Tuple) -> Optional[Dict[str, np.ndarray]]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def _put(self, key: Tuple, stamp: Tuple, result: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._cache[key] = (stamp, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+# Global indicator engine instance
+indicator_engine = IndicatorEngine()
+
+__all__ = [
+    "INDICATORS",
+    "Indicator",
+    "IndicatorEngine",
+    "get_indicator",
+    "indicator_engine",
+]
@@ -0,0 +1,240 @@
+"""
+TradeSense AI Platform - Technical Indicators
+Vectorized indicators over NumPy arrays
+
+Every function works along the last axis, so the same call computes one
+series (shape (bars,)) or thousands of symbols at once (shape
+(symbols, bars)). Outputs have the input's shape; positions before an
+indicator has enough history are NaN.
+
+Recursive indicators (EMA, Wilder smoothing in RSI and ATR) are seeded
+with the simple average of their first `period` values, then computed
+block-wise with a scaled cumulative sum instead of a Python loop per bar.
+The streaming classes in app.signals.streaming use the same seeding, so
+batch and incremental results agree.
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Largest factor a block of the EMA recurrence is scaled by (keeps the
+# scaled cumulative sum well inside float64 precision)
+_MAX_SCALE_LOG = math.log(1e8)
+
+
+def _as_float(x) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def _nan_like(x: np.ndarray) -> np.ndarray:
+    return np.full(x.shape, np.nan)
+
+
+def _recurse(seed: np.ndarray, x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    y[t] = y[t-1] + alpha * (x[t] - y[t-1]) with y[-1] = seed
+
+    Within a block, y[t] = d^t * (d * y[-1] + alpha * sum(d^-k * x[k]))
+    with d = 1 - alpha, so each block is one cumulative sum. Blocks are
+    short enough that d^-k stays below 1e8.
+    """
+    out = np.empty_like(x)
+    n = x.shape[-1]
+    decay = 1.0 - alpha
+    if n == 0:
+        return out
+    if decay <= 0.0:
+        out[...] = x
+        return out
+
+    block = max(1, min(n, int(_MAX_SCALE_LOG / -math.log(decay))))
+    k = np.arange(block)
+    grow = decay ** -k
+    shrink = decay ** k
+
+    previous = seed
+    for start in range(0, n, block):
+        chunk = x[..., start:start + block]
+        size = chunk.shape[-1]
+        acc = np.cumsum(chunk * grow[:size], axis=-1)
+        acc *= alpha
+        acc += (decay * previous)[..., None]
+        acc *= shrink[:size]
+        out[..., start:start + size] = acc
+        previous = acc[..., -1]
+    return out
+
+
+def smooth(x, period: int, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the mean of the first `period` values
+
+    Args:
+        x: Input values (last axis is time)
+        period: Seed length; the first period - 1 outputs are NaN
+        alpha: Smoothing factor (2 / (period + 1) for EMA, 1 / period for Wilder)
+
+    Returns:
+        Smoothed values
+    """
+    x = _as_float(x)
+    out = _nan_like(x)
+    if x.shape[-1] < period:
+        return out
+    seed = x[..., :period].mean(axis=-1)
+    out[..., period - 1] = seed
+    out[..., period:] = _recurse(seed, x[..., period:], alpha)
+    return out
+
+
+def _window_sums(x: np.ndarray, period: int) -> np.ndarray:
+    """Sums of every `period`-long window (n - period + 1 values)"""
+    c = np.cumsum(x, axis=-1)
+    sums = c[..., period - 1:].copy()
+    sums[..., 1:] -= c[..., :-period]
+    return sums
+
+
+def sma(close, period: int = 20) -> np.ndarray:
+    """Simple moving average"""
+    x = _as_float(close)
+    out = _nan_like(x)
+    if x.shape[-1] < period:
+        return out
+    # Shift by the first value so long cumulative sums keep their precision
+    base = x[..., :1]
+    out[..., period - 1:] = _window_sums(x - base, period) / period + base
+    return out
+
+
+def ema(close, period: int = 20) -> np.ndarray:
+    """Exponential moving average (alpha = 2 / (period + 1))"""
+    return smooth(close, period, 2.0 / (period + 1))
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """
+    Relative strength index with Wilder smoothing
+
+    The first valid value is at index `period` (it needs `period` changes).
+    """
+    x = _as_float(close)
+    out = _nan_like(x)
+    delta = np.diff(x, axis=-1)
+    gain = smooth(np.maximum(delta, 0.0), period, 1.0 / period)
+    loss = smooth(np.maximum(-delta, 0.0), period, 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    value = np.where(loss == 0.0, np.where(gain == 0.0, 50.0, 100.0), value)
+    value[np.isnan(gain)] = np.nan
+    out[..., 1:] = value
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving average convergence divergence
+
+    Returns:
+        Tuple of (macd line, signal line, histogram)
+    """
+    x = _as_float(close)
+    line = ema(x, fast) - ema(x, slow)
+    signal_line = _nan_like(x)
+    start = max(fast, slow) - 1
+    if x.shape[-1] > start:
+        signal_line[..., start:] = ema(line[..., start:], signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, period: int = 20, k: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger bands (population standard deviation)
+
+    Returns:
+        Tuple of (middle, upper, lower)
+    """
+    x = _as_float(close)
+    middle, upper, lower = _nan_like(x), _nan_like(x), _nan_like(x)
+    if x.shape[-1] < period:
+        return middle, upper, lower
+
+    shifted = x - x[..., :1]
+    mean = _window_sums(shifted, period) / period
+    variance = np.maximum(_window_sums(shifted * shifted, period) / period - mean * mean, 0.0)
+    width = k * np.sqrt(variance)
+    middle[..., period - 1:] = mean + x[..., :1]
+    upper[..., period - 1:] = middle[..., period - 1:] + width
+    lower[..., period - 1:] = middle[..., period - 1:] - width
+    return middle, upper, lower
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first bar uses high - low"""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    tr = high - low
+    previous = close[..., :-1]
+    tr[..., 1:] = np.maximum(
+        tr[..., 1:],
+        np.maximum(np.abs(high[..., 1:] - previous), np.abs(low[..., 1:] - previous)),
+    )
+    return tr
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average true range with Wilder smoothing"""
+    return smooth(true_range(high, low, close), period, 1.0 / period)
+
+
+def vwap(high, low, close, volume, timestamp=None, session: Optional[int] = 86400) -> np.ndarray:
+    """
+    Volume-weighted average price of the typical price (high + low + close) / 3
+
+    Args:
+        high, low, close, volume: Bar columns
+        timestamp: Bar open times (epoch seconds, shape (bars,)); with
+            session, the average restarts at every session boundary
+        session: Session length in seconds (None: never restart)
+
+    Returns:
+        VWAP (NaN while the session has no volume)
+    """
+    volume = _as_float(volume)
+    pv = (_as_float(high) + _as_float(low) + _as_float(close)) / 3.0 * volume
+    cum_pv = np.cumsum(pv, axis=-1)
+    cum_volume = np.cumsum(volume, axis=-1)
+
+    if timestamp is not None and session and cum_pv.shape[-1]:
+        sessions = np.asarray(timestamp) // session
+        starts = np.flatnonzero(np.diff(sessions)) + 1
+        if len(starts):
+            # Totals before each session start, broadcast over its bars
+            segment = np.zeros(sessions.shape[-1], dtype=np.intp)
+            segment[starts] = 1
+            segment = np.cumsum(segment)
+            before_pv = np.concatenate(
+                (np.zeros(cum_pv.shape[:-1] + (1,)), cum_pv[..., starts - 1]), axis=-1
+            )
+            before_volume = np.concatenate(
+                (np.zeros(cum_volume.shape[:-1] + (1,)), cum_volume[..., starts - 1]), axis=-1
+            )
+            cum_pv = cum_pv - before_pv[..., segment]
+            cum_volume = cum_volume - before_volume[..., segment]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_volume > 0, cum_pv / cum_volume, np.nan)
+
+
+__all__ = [
+    "atr",
+    "bollinger",
+    "ema",
+    "macd",
+    "rsi",
+    "sma",
+    "smooth",
+    "true_range",
+    "vwap",
+]
@@ -0,0 +1,213 @@
+"""
+TradeSense AI Platform - Streaming Indicators
+Incremental indicator state, O(1) per update
+
+Each class keeps just enough state to produce the next value from one new
+bar (or tick): running sums over a ring buffer for windowed indicators,
+the previous value for recursive ones. Seeding matches the batch
+functions in app.signals.indicators, so feeding a series bar by bar gives
+the same values as computing it in one call.
+
+Usage:
+    rsi = RSI(14)
+    for close in closes:
+        value = rsi.update(close)
+"""
+
+import math
+from typing import Optional, Tuple
+
+NAN = float("nan")
+
+
+class EMA:
+    """Exponential smoothing seeded with the mean of the first `period` values"""
+
+    __slots__ = ("period", "alpha", "count", "value", "_seed")
+    inputs = ("close",)
+
+    def __init__(self, period: int = 20, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.count = 0
+        self.value = NAN
+        self._seed = 0.0
+
+    def update(self, x: float) -> float:
+        count = self.count = self.count + 1
+        if count > self.period:
+            self.value += self.alpha * (x - self.value)
+        elif count == self.period:
+            self.value = (self._seed + x) / self.period
+        else:
+            self._seed += x
+        return self.value
+
+
+class SMA:
+    """Simple moving average"""
+
+    __slots__ = ("period", "value", "_window", "_index", "_count", "_sum", "_base")
+    inputs = ("close",)
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.value = NAN
+        self._window = [0.0] * period
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._base: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self._base is None:
+            self._base = x
+        # Values are kept relative to the first one (as the batch version)
+        x -= self._base
+        index = self._index
+        self._sum += x - self._window[index]
+        self._window[index] = x
+        self._index = (index + 1) % self.period
+        if self._count < self.period:
+            self._count += 1
+            if self._count < self.period:
+                return NAN
+        self.value = self._sum / self.period + self._base
+        return self.value
+
+
+class RSI:
+    """Relative strength index with Wilder smoothing"""
+
+    __slots__ = ("value", "_previous", "_gain", "_loss")
+    inputs = ("close",)
+
+    def __init__(self, period: int = 14):
+        self.value = NAN
+        self._previous: Optional[float] = None
+        self._gain = EMA(period, 1.0 / period)
+        self._loss = EMA(period, 1.0 / period)
+
+    def update(self, close: float) -> float:
+        previous, self._previous = self._previous, close
+        if previous is None:
+            return NAN
+        delta = close - previous
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-delta if delta < 0 else 0.0)
+        if math.isnan(gain):
+            return NAN
+        if loss == 0.0:
+            self.value = 50.0 if gain == 0.0 else 100.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+        return self.value
+
+
+class MACD:
+    """Moving average convergence divergence: (macd, signal, histogram)"""
+
+    __slots__ = ("value", "_fast", "_slow", "_signal")
+    inputs = ("close",)
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.value: Tuple[float, float, float] = (NAN, NAN, NAN)
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        line = self._fast.update(close) - self._slow.update(close)
+        if math.isnan(line):
+            return self.value
+        signal = self._signal.update(line)
+        self.value = (line, signal, line - signal)
+        return self.value
+
+
+class Bollinger:
+    """Bollinger bands: (middle, upper, lower)"""
+
+    __slots__ = ("period", "k", "value", "_window", "_index", "_count", "_sum", "_squares", "_base")
+    inputs = ("close",)
+
+    def __init__(self, period: int = 20, k: float = 2.0):
+        self.period = period
+        self.k = k
+        self.value: Tuple[float, float, float] = (NAN, NAN, NAN)
+        self._window = [0.0] * period
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._squares = 0.0
+        self._base: Optional[float] = None
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        if self._base is None:
+            self._base = close
+        x = close - self._base
+        index = self._index
+        old = self._window[index]
+        self._sum += x - old
+        self._squares += x * x - old * old
+        self._window[index] = x
+        self._index = (index + 1) % self.period
+        if self._count < self.period:
+            self._count += 1
+            if self._count < self.period:
+                return self.value
+
+        mean = self._sum / self.period
+        width = self.k * math.sqrt(max(self._squares / self.period - mean * mean, 0.0))
+        middle = mean + self._base
+        self.value = (middle, middle + width, middle - width)
+        return self.value
+
+
+class ATR:
+    """Average true range with Wilder smoothing"""
+
+    __slots__ = ("value", "_previous", "_average")
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 14):
+        self.value = NAN
+        self._previous: Optional[float] = None
+        self._average = EMA(period, 1.0 / period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        previous = self._previous
+        if previous is not None:
+            tr = max(tr, abs(high - previous), abs(low - previous))
+        self._previous = close
+        self.value = self._average.update(tr)
+        return self.value
+
+
+class VWAP:
+    """Volume-weighted average price, restarting every `session` seconds"""
+
+    __slots__ = ("session", "value", "_current", "_pv", "_volume")
+    inputs = ("high", "low", "close", "volume", "timestamp")
+
+    def __init__(self, session: Optional[int] = 86400):
+        self.session = session
+        self.value = NAN
+        self._current: Optional[int] = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float, timestamp: Optional[float] = None) -> float:
+        if self.session and timestamp is not None:
+            current = int(timestamp) // self.session
+            if current != self._current:
+                self._current = current
+                self._pv = self._volume = 0.0
+        self._pv += (high + low + close) / 3.0 * volume
+        self._volume += volume
+        self.value = self._pv / self._volume if self._volume > 0 else NAN
+        return self.value
+
+
+__all__ = ["ATR", "Bollinger", "EMA", "MACD", "RSI", "SMA", "VWAP"]
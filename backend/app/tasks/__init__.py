@@ -0,0 +1,29 @@
+"""
+TradeSense AI Platform - Background Tasks
+Celery tasks by priority queue (see app.tasks.queue)
+
+Workers start from app.celery_app; other processes import tasks from here
+when they first send one.
+"""
+
+from app.tasks.emails import send_email
+from app.tasks.fills import record_trades
+from app.tasks.maintenance import compact_equity, flush_activity, reconcile_leaderboard
+from app.tasks.queue import QUEUES, AppTask, BatchTask, celery, init_celery
+from app.tasks.risk import notify_risk_events
+from app.tasks.users import provision_users
+
+__all__ = [
+    "QUEUES",
+    "AppTask",
+    "BatchTask",
+    "celery",
+    "compact_equity",
+    "flush_activity",
+    "init_celery",
+    "notify_risk_events",
+    "provision_users",
+    "reconcile_leaderboard",
+    "record_trades",
+    "send_email",
+]
@@ -0,0 +1,57 @@
+"""
+TradeSense AI Platform - Email Tasks
+Outgoing mail on the emails queue
+"""
+
+import smtplib
+from email.message import EmailMessage
+
+from flask import current_app
+
+from app.tasks.queue import celery
+
+
+@celery.task(
+    name="emails.send",
+    autoretry_for=(smtplib.SMTPException, OSError),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_email(to: str, subject: str, body: str) -> bool:
+    """
+    Send a plain text email through MAIL_SERVER
+
+    Without MAIL_USERNAME (local setups) the email is logged instead.
+    Connection and SMTP errors are retried with exponential backoff.
+
+    Args:
+        to: Recipient address
+        subject: Subject line
+        body: Plain text body
+
+    Returns:
+        True if the email was handed to the SMTP server
+
+    Usage:
+        send_email.delay(user.email, "Welcome", "...")
+    """
+    config = current_app.config
+    if not config.get("MAIL_USERNAME"):
+        current_app.logger.info(f"Email to {to} not sent (MAIL_USERNAME unset): {subject}")
+        return False
+
+    message = EmailMessage()
+    message["From"] = config.get("MAIL_DEFAULT_SENDER")
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+
+    with smtplib.SMTP(config.get("MAIL_SERVER"), config.get("MAIL_PORT", 587), timeout=30) as smtp:
+        if config.get("MAIL_USE_TLS", True):
+            smtp.starttls()
+        smtp.login(config.get("MAIL_USERNAME"), config.get("MAIL_PASSWORD"))
+        smtp.send_message(message)
+    return True
+
+
+__all__ = ["send_email"]
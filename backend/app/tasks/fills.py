@@ -0,0 +1,41 @@
+"""
+TradeSense AI Platform - Fill Tasks
+Post-trade updates on the fills queue
+"""
+
+from typing import Dict, List
+
+from celery.exceptions import Ignore
+
+from app.services.leaderboard_service import LeaderboardService
+from app.tasks.queue import BatchTask, celery
+
+
+@celery.task(base=BatchTask, name="fills.record_trades", batch_interval=1.0)
+def record_trades(trades: List[Dict]) -> int:
+    """
+    Add closed trades to the profit leaderboards
+
+    All trades added within a batch interval go out in one Redis script
+    call. While a leaderboard reconcile runs the batch is put back and
+    retried after the batch interval. The execution writer adds the
+    trades of every fill that realized P&L.
+
+    Args:
+        trades: Dicts with user_id, pnl and optionally challenge_type,
+            closed_at and fill_id (see LeaderboardService.record_trades)
+
+    Returns:
+        Number of trades recorded
+
+    Usage:
+        record_trades.add({"user_id": 7, "pnl": 120.5, "closed_at": time.time()})
+    """
+    recorded = LeaderboardService.record_trades(trades)
+    if recorded is None:
+        # BatchTask requeues the chunk on any exception; Ignore logs nothing
+        raise Ignore()
+    return recorded
+
+
+__all__ = ["record_trades"]
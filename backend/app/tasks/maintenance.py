@@ -0,0 +1,45 @@
+"""
+TradeSense AI Platform - Maintenance Tasks
+Periodic bulk jobs on the analytics (lowest priority) queue
+
+Each run drains work that piled up since the previous one: buffered
+activity timestamps, 1m equity buckets, the fills behind the profit
+leaderboards. celery beat schedules them (see beat_schedule); the
+matching flask CLI commands run the same code by hand.
+"""
+
+from typing import Dict
+
+from flask import current_app
+
+from app.services.activity_service import UserActivityService
+from app.services.leaderboard_service import LeaderboardService
+from app.tasks.queue import celery
+
+
+@celery.task(name="analytics.flush_activity")
+def flush_activity() -> int:
+    """Write buffered last-login/last-seen timestamps in bulk (flask flush-activity)"""
+    return UserActivityService.flush(
+        batch_size=current_app.config.get("ACTIVITY_FLUSH_BATCH_SIZE", 1000)
+    )
+
+
+@celery.task(name="analytics.compact_equity")
+def compact_equity() -> Dict[str, int]:
+    """Roll 1m equity buckets up into 1h buckets (flask compact-equity)"""
+    # numpy is only loaded by the worker that runs the compaction
+    from app.trading.equity import equity_recorder
+
+    if current_app.extensions.get("equity_recorder") is not equity_recorder:
+        equity_recorder.init_app(current_app)
+    return equity_recorder.compact()
+
+
+@celery.task(name="analytics.reconcile_leaderboard")
+def reconcile_leaderboard() -> Dict:
+    """Rebuild the global profit leaderboards from fills (flask reconcile-leaderboard)"""
+    return LeaderboardService.reconcile()
+
+
+__all__ = ["compact_equity", "flush_activity", "reconcile_leaderboard"]
@@ -0,0 +1,304 @@
+"""
+TradeSense AI Platform - Task Queue
+Celery application, priority queues and batched tasks
+
+Tasks are routed by the prefix of their name into one queue per priority
+tier. From highest to lowest:
+
+    risk       breach and profit target handling
+    fills      post-trade updates (leaderboards)
+    emails     outgoing mail
+    analytics  periodic bulk work (activity flush, equity compaction,
+               leaderboard reconcile)
+
+Workers read the queues in that order (Redis "priority" queue order
+strategy) and prefetch one message at a time, so a backlog of analytics
+jobs never delays a risk task already waiting. A dedicated worker can
+still be pinned to a tier with -Q.
+
+Tasks are fire-and-forget: results are not stored unless a task opts in
+with ignore_result=False. CELERY_TASK_ALWAYS_EAGER runs tasks inline in
+the calling process, without a broker or worker.
+
+BatchTask collects small jobs in a Redis list. The first add() of an
+interval schedules one run after batch_interval seconds, and that run
+handles everything added until then in chunks of CELERY_BATCH_SIZE.
+Each chunk is moved to a processing list of its own and only deleted once
+the task function returned. A failed chunk goes back to the head of the
+batch list, and a chunk left behind by a killed worker is requeued by a
+later run once it is CELERY_VISIBILITY_TIMEOUT old.
+"""
+
+import json
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from celery import Celery, Task
+from flask import Flask, current_app, has_app_context
+from kombu import Queue
+
+from app.core.cache import cache
+from app.core.serialization import default_encoder
+
+logger = logging.getLogger(__name__)
+
+# Priority tiers, highest first
+QUEUES = ("risk", "fills", "emails", "analytics")
+
+BATCH_KEY = "tasks:batch:{name}"
+SCHEDULED_KEY = "tasks:batch:{name}:scheduled"
+PROCESSING_KEY = "tasks:batch:{name}:processing:{run}"
+RUNS_KEY = "tasks:batch:{name}:runs"  # processing lists by start time
+
+# KEYS[1] = batch list, KEYS[2] = processing list, KEYS[3] = runs;
+# ARGV[1] = count, ARGV[2] = now. Moves up to count items in one step.
+TAKE_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items == 0 then
+    return items
+end
+redis.call('LTRIM', KEYS[1], #items, -1)
+for i = 1, #items, 1000 do
+    redis.call('RPUSH', KEYS[2], unpack(items, i, math.min(i + 999, #items)))
+end
+redis.call('ZADD', KEYS[3], ARGV[2], KEYS[2])
+return items
+"""
+
+# KEYS[1] = batch list, KEYS[2] = processing list, KEYS[3] = runs.
+# Puts the items back at the head of the batch list, in order.
+REQUEUE_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[2], 0, -1)
+for i = #items, 1, -1 do
+    redis.call('LPUSH', KEYS[1], items[i])
+end
+redis.call('DEL', KEYS[2])
+redis.call('ZREM', KEYS[3], KEYS[2])
+return #items
+"""
+
+
+class AppTask(Task):
+    """Task running inside the Flask application context"""
+
+    def __call__(self, *args, **kwargs):
+        app = celery.flask_app
+        if has_app_context() and current_app._get_current_object() is app:
+            return self.call(*args, **kwargs)
+        with app.app_context():
+            return self.call(*args, **kwargs)
+
+    def call(self, *args, **kwargs):
+        """Run the task (inside the app context)"""
+        return super().__call__(*args, **kwargs)
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        # Producers configure Celery on first use, not at app startup
+        if celery.flask_app is None:
+            init_celery(current_app._get_current_object())
+        return super().apply_async(args, kwargs, **options)
+
+
+class BatchTask(AppTask):
+    """
+    Task handling many small jobs per run
+
+    The task function takes a list of items (JSON-serializable).
+
+    Usage:
+        @celery.task(base=BatchTask, name="fills.record_trades", batch_interval=2.0)
+        def record_trades(items):
+            ...
+
+        record_trades.add({"user_id": 7, "pnl": 120.5})
+    """
+
+    batch_interval = 1.0  # seconds between the first add() and the run
+    typing = False  # a scheduled run is sent without items
+
+    def add(self, *items) -> None:
+        """
+        Queue items for the next run
+
+        Without Redis the items are sent as a task of their own.
+
+        Args:
+            items: Items to handle
+        """
+        if not items:
+            return
+        if not cache._is_available():
+            self.apply_async(args=(list(items),))
+            return
+
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            pipeline.rpush(
+                BATCH_KEY.format(name=self.name),
+                *[json.dumps(item, default=default_encoder) for item in items],
+            )
+            pipeline.set(
+                SCHEDULED_KEY.format(name=self.name),
+                1,
+                nx=True,
+                px=max(int(self.batch_interval * 1000), 1),
+            )
+            _, scheduled = pipeline.execute()
+        except Exception as e:
+            logger.error(f"Could not queue {len(items)} items for {self.name}: {e}")
+            self.apply_async(args=(list(items),))
+            return
+
+        if scheduled:
+            self.apply_async(countdown=self.batch_interval)
+
+    def call(self, items: Optional[List] = None):
+        if items is not None:
+            return super().call(items)
+
+        # Adds from now on schedule the next run
+        cache.delete(SCHEDULED_KEY.format(name=self.name))
+        self._recover(current_app.config.get("CELERY_VISIBILITY_TIMEOUT", 3600))
+        batch_size = current_app.config.get("CELERY_BATCH_SIZE", 1000)
+        handled = 0
+        while True:
+            processing = PROCESSING_KEY.format(name=self.name, run=uuid.uuid4().hex)
+            items = self._take(processing, batch_size)
+            if not items:
+                return handled
+            try:
+                super().call(items)
+            except Exception:
+                self._requeue(processing)
+                raise
+            self._ack(processing)
+            handled += len(items)
+
+    def _take(self, processing: str, count: int) -> List:
+        """Move up to count items to a processing list in one round trip"""
+        take = cache.script(TAKE_SCRIPT)
+        if take is None:
+            return []
+        raw = take(
+            keys=[BATCH_KEY.format(name=self.name), processing, RUNS_KEY.format(name=self.name)],
+            args=[count, time.time()],
+        )
+        return [json.loads(item) for item in raw]
+
+    def _ack(self, processing: str) -> None:
+        """Delete a handled chunk"""
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            pipeline.delete(processing)
+            pipeline.zrem(RUNS_KEY.format(name=self.name), processing)
+            pipeline.execute()
+        except Exception as e:
+            # The chunk is requeued after the visibility timeout: handled twice
+            logger.error(f"Could not acknowledge a chunk of {self.name}: {e}")
+
+    def _requeue(self, processing: str) -> None:
+        """Put a failed chunk back and schedule a run for it"""
+        requeue = cache.script(REQUEUE_SCRIPT)
+        if requeue is None:
+            return
+        try:
+            requeue(
+                keys=[BATCH_KEY.format(name=self.name), processing, RUNS_KEY.format(name=self.name)]
+            )
+        except Exception as e:
+            logger.error(f"Could not requeue a chunk of {self.name}: {e}")
+            return
+        if self.app.conf.task_always_eager:
+            return  # a run now would fail again: the next add() schedules one
+        scheduled = cache.redis_client.set(
+            SCHEDULED_KEY.format(name=self.name),
+            1,
+            nx=True,
+            px=max(int(self.batch_interval * 1000), 1),
+        )
+        if scheduled:
+            self.apply_async(countdown=self.batch_interval)
+
+    def _recover(self, timeout: float) -> None:
+        """Requeue chunks of runs that died (older than the visibility timeout)"""
+        if not cache._is_available():
+            return
+        requeue = cache.script(REQUEUE_SCRIPT)
+        runs = RUNS_KEY.format(name=self.name)
+        try:
+            for processing in cache.redis_client.zrangebyscore(runs, 0, time.time() - timeout):
+                if isinstance(processing, bytes):
+                    processing = processing.decode()
+                requeue(keys=[BATCH_KEY.format(name=self.name), processing, runs])
+        except Exception as e:
+            logger.error(f"Could not recover stale chunks of {self.name}: {e}")
+
+
+celery = Celery("tradesense", task_cls=AppTask)
+celery.flask_app = None
+
+
+def init_celery(app: Flask) -> Celery:
+    """
+    Configure Celery from the Flask app's config
+
+    Called by the worker entry point (app.celery_app) and, on the first
+    task sent, by any other process.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        The configured Celery application
+    """
+    config = app.config
+    celery.conf.update(
+        broker_url=config.get("CELERY_BROKER_URL"),
+        result_backend=config.get("CELERY_RESULT_BACKEND"),
+        task_always_eager=config.get("CELERY_TASK_ALWAYS_EAGER", False),
+        task_eager_propagates=True,
+        task_ignore_result=True,
+        task_serializer="json",
+        result_serializer="json",
+        accept_content=["json"],
+        task_queues=[Queue(name, routing_key=name) for name in QUEUES],
+        task_default_queue=QUEUES[-1],
+        task_routes={f"{name}.*": {"queue": name} for name in QUEUES},
+        broker_transport_options={
+            "queue_order_strategy": "priority",
+            "visibility_timeout": config.get("CELERY_VISIBILITY_TIMEOUT", 3600),
+        },
+        worker_prefetch_multiplier=1,
+        worker_hijack_root_logger=False,
+        timezone="UTC",
+        beat_schedule=beat_schedule(config),
+    )
+    celery.flask_app = app
+
+    if not hasattr(app, "extensions"):
+        app.extensions = {}
+    app.extensions["celery"] = celery
+    return celery
+
+
+def beat_schedule(config) -> Dict[str, Dict]:
+    """Periodic tasks, run by celery beat"""
+    return {
+        "flush-activity": {
+            "task": "analytics.flush_activity",
+            "schedule": config.get("ACTIVITY_FLUSH_INTERVAL", 60),
+        },
+        "compact-equity": {
+            "task": "analytics.compact_equity",
+            "schedule": config.get("EQUITY_COMPACT_INTERVAL", 3600),
+        },
+        "reconcile-leaderboard": {
+            "task": "analytics.reconcile_leaderboard",
+            "schedule": config.get("LEADERBOARD_RECONCILE_INTERVAL", 3600),
+        },
+    }
+
+
+__all__ = ["QUEUES", "AppTask", "BatchTask", "beat_schedule", "celery", "init_celery"]
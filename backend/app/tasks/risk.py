@@ -0,0 +1,55 @@
+"""
+TradeSense AI Platform - Risk Tasks
+Challenge breach and profit target handling on the risk queue
+"""
+
+from typing import Dict, List
+
+from app.models.user import User
+from app.tasks.emails import send_email
+from app.tasks.queue import BatchTask, celery
+
+
+def _describe(event: Dict) -> str:
+    if event["status"] == "breached":
+        return f"Challenge failed: {event['rule'].replace('_', ' ')} limit breached"
+    return "Challenge phase completed: profit target reached"
+
+
+@celery.task(base=BatchTask, name="risk.notify_events", batch_interval=0.5)
+def notify_risk_events(events: List[Dict]) -> int:
+    """
+    Email account owners about breached limits and reached targets
+
+    The events of a batch are grouped per account, so an account gets one
+    email however many of its rules triggered, and repeated events are
+    sent once.
+
+    Args:
+        events: RiskEvent.to_dict() of each event
+
+    Returns:
+        Number of emails queued
+
+    Usage:
+        events = risk_engine.update_prices(symbols, prices)
+        notify_risk_events.add(*[event.to_dict() for event in events])
+    """
+    lines: Dict[int, Dict[str, None]] = {}
+    for event in events:
+        lines.setdefault(int(event["account_id"]), {})[_describe(event)] = None
+    if not lines:
+        return 0
+
+    users = (
+        User.query.with_entities(User.id, User.email)
+        .filter(User.id.in_(list(lines)))
+        .all()
+    )
+    for user_id, email in users:
+        messages = list(lines[user_id])
+        send_email.delay(email, messages[0], "\n".join(messages))
+    return len(users)
+
+
+__all__ = ["notify_risk_events"]
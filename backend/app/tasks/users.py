@@ -0,0 +1,28 @@
+"""
+TradeSense AI Platform - User Tasks
+Bulk user imports on the analytics queue
+"""
+
+from typing import Dict, Optional
+
+from app.services.provisioning_service import UserProvisioningService
+from app.tasks.queue import celery
+
+
+@celery.task(name="analytics.provision_users")
+def provision_users(
+    job_id: str, path: str, file_format: str, max_role: Optional[str] = None
+) -> Dict:
+    """
+    Import users from an uploaded file (POST /api/v1/users/bulk)
+
+    Progress and the error report are stored under the job ID, for
+    GET /api/v1/users/bulk/<job_id>.
+
+    Usage:
+        provision_users.delay(job_id, path, "csv", max_role=user.role)
+    """
+    return UserProvisioningService.run_job(job_id, path, file_format, max_role)
+
+
+__all__ = ["provision_users"]
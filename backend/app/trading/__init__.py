@@ -0,0 +1,51 @@
+"""
+TradeSense AI Platform - Trading
+Broker selection and the paper trading matching engine
+"""
+
+from typing import Optional
+
+from flask import current_app
+
+from app.core.exceptions import TradingError
+from app.trading.engine import FillEvent, MatchingEngine, OrderEvent, PaperAccount, matching_engine
+from app.trading.order_book import BookOrder, OrderBook, OrderStatus, OrderType, Side
+
+PAPER_TRADING = "paper_trading"
+
+
+def get_broker(name: Optional[str] = None) -> MatchingEngine:
+    """
+    Get the broker that executes orders
+
+    Args:
+        name: Broker name (default DEFAULT_BROKER)
+
+    Returns:
+        The broker's engine
+
+    Raises:
+        TradingError: If the broker is not supported or not available
+    """
+    name = name or current_app.config.get("DEFAULT_BROKER", PAPER_TRADING)
+    if name not in current_app.config.get("SUPPORTED_BROKERS", [PAPER_TRADING]):
+        raise TradingError(f"Unsupported broker: {name}", {"broker": name})
+    if name != PAPER_TRADING:
+        raise TradingError(f"Broker {name} is not available yet", {"broker": name})
+    return matching_engine
+
+
+__all__ = [
+    "BookOrder",
+    "FillEvent",
+    "MatchingEngine",
+    "OrderBook",
+    "OrderEvent",
+    "OrderStatus",
+    "OrderType",
+    "PAPER_TRADING",
+    "PaperAccount",
+    "Side",
+    "get_broker",
+    "matching_engine",
+]
@@ -0,0 +1,641 @@
+"""
+TradeSense AI Platform - Paper Trading Matching Engine
+In-memory order matching for the "paper_trading" broker
+
+The engine owns one OrderBook per symbol, the paper accounts (cash and
+positions) and order ids. Every state change is published to listeners as
+FillEvent / OrderEvent objects; persistence is one such listener
+(ExecutionWriter), which queues events and writes them from a background
+thread, so matching never waits on the database.
+
+Books live in process memory: run the engine in a single process (one
+worker, or the task worker that owns order entry). Resting orders are not
+reloaded after a restart. Order ids are reserved in blocks from a Redis
+counter when executions are persisted, so ids stay unique across
+processes and restarts. The writer thread fetches the next block while
+the current one is in use, and ids are taken outside the engine lock.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from flask import Flask
+
+from app.core.exceptions import InsufficientFundsError, TradingError
+from app.trading.order_book import BookOrder, OrderBook, OrderStatus, OrderType, Side
+
+Listener = Callable[[object], None]
+
+SIDES = frozenset(Side.all())
+ORDER_TYPES = frozenset(OrderType.all())
+PRICED_TYPES = frozenset((OrderType.LIMIT, OrderType.IOC))
+ORDER_ID_BLOCK = 1000  # ids reserved per round trip to the shared counter
+
+
+class FillEvent:
+    """
+    A trade between an incoming (taker) and a resting (maker) order
+
+    Holds integer ticks and lots; price and quantity are converted when
+    read, so publishing an event costs no float formatting.
+    """
+
+    __slots__ = (
+        "sequence",
+        "symbol",
+        "price_ticks",
+        "lots",
+        "buy_order_id",
+        "sell_order_id",
+        "buyer_account_id",
+        "seller_account_id",
+        "taker_side",
+        "timestamp",
+        "units",
+    )
+
+    kind = "fill"
+    FIELDS = (
+        "sequence", "symbol", "price", "quantity", "buy_order_id", "sell_order_id",
+        "buyer_account_id", "seller_account_id", "taker_side", "timestamp",
+    )
+
+    def __init__(self, sequence, symbol, price_ticks, lots, buy_order, sell_order, taker_side, timestamp, units):
+        self.sequence = sequence
+        self.symbol = symbol
+        self.price_ticks = price_ticks
+        self.lots = lots
+        self.buy_order_id = buy_order.id
+        self.sell_order_id = sell_order.id
+        self.buyer_account_id = buy_order.account_id
+        self.seller_account_id = sell_order.account_id
+        self.taker_side = taker_side
+        self.timestamp = timestamp
+        self.units = units  # (tick size, lot size)
+
+    @property
+    def price(self) -> float:
+        return round(self.price_ticks * self.units[0], 10)
+
+    @property
+    def quantity(self) -> float:
+        return round(self.lots * self.units[1], 10)
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class OrderEvent:
+    """Snapshot of an order after it was accepted or changed"""
+
+    __slots__ = (
+        "order_id",
+        "account_id",
+        "symbol",
+        "side",
+        "order_type",
+        "status",
+        "price_ticks",
+        "stop_ticks",
+        "lots",
+        "filled_lots",
+        "is_new",
+        "timestamp",
+        "units",
+    )
+
+    kind = "order"
+    FIELDS = (
+        "order_id", "account_id", "symbol", "side", "order_type", "status", "price",
+        "stop_price", "quantity", "filled_quantity", "is_new", "timestamp",
+    )
+
+    def __init__(self, order: BookOrder, is_new: bool, timestamp: float, units):
+        self.order_id = order.id
+        self.account_id = order.account_id
+        self.symbol = order.symbol
+        self.side = order.side
+        self.order_type = order.order_type
+        self.status = order.status
+        self.price_ticks = order.price
+        self.stop_ticks = order.stop_price
+        self.lots = order.quantity
+        self.filled_lots = order.quantity - order.remaining
+        self.is_new = is_new
+        self.timestamp = timestamp
+        self.units = units
+
+    @property
+    def price(self) -> Optional[float]:
+        return None if self.price_ticks is None else round(self.price_ticks * self.units[0], 10)
+
+    @property
+    def stop_price(self) -> Optional[float]:
+        return None if self.stop_ticks is None else round(self.stop_ticks * self.units[0], 10)
+
+    @property
+    def quantity(self) -> float:
+        return round(self.lots * self.units[1], 10)
+
+    @property
+    def filled_quantity(self) -> float:
+        return round(self.filled_lots * self.units[1], 10)
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class PaperAccount:
+    """
+    Cash and positions of a paper trading account
+
+    Buy orders reserve cash at their limit price (or the cost of the
+    liquidity they take, for market orders) and sell orders reserve the
+    position they sell, so resting orders can never overdraw the account.
+    Positions are long only.
+    """
+
+    __slots__ = ("id", "cash", "reserved_cash", "positions", "reserved_positions")
+
+    def __init__(self, account_id: int, cash: float, positions: Optional[Dict[str, int]] = None):
+        self.id = account_id
+        self.cash = cash
+        self.reserved_cash = 0.0
+        self.positions: Dict[str, int] = dict(positions or {})  # symbol -> lots
+        self.reserved_positions: Dict[str, int] = {}
+
+    @property
+    def available_cash(self) -> float:
+        return self.cash - self.reserved_cash
+
+    def available_position(self, symbol: str) -> int:
+        return self.positions.get(symbol, 0) - self.reserved_positions.get(symbol, 0)
+
+
+class MatchingEngine:
+    """
+    Paper trading engine: order entry, matching and paper accounts
+
+    Usage:
+        matching_engine.open_account(user.id, cash=100000)
+        order = matching_engine.submit(user.id, "BTCUSD", "buy", "limit", 0.5, price=64000)
+        matching_engine.cancel(order.id, account_id=user.id)
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.tick_size = 0.01
+        self.lot_size = 0.0001
+        self.starting_balance = 100000.0
+        self._units = (self.tick_size, self.lot_size)
+        self.books: Dict[str, OrderBook] = {}
+        self.accounts: Dict[int, PaperAccount] = {}
+        self.fill_count = 0
+
+        self._orders: Dict[int, BookOrder] = {}  # live orders, incl. pending stops
+        self._listeners: List[Listener] = []
+        self._next_id = 1
+        self._id_source: Optional[Callable[[int], range]] = None
+        self._id_block: Iterator[int] = iter(())
+        self._id_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the engine with Flask app
+
+        Args:
+            app: Flask application instance
+        """
+        self.tick_size = app.config.get("PAPER_TICK_SIZE", 0.01)
+        self.lot_size = app.config.get("PAPER_LOT_SIZE", 0.0001)
+        self.starting_balance = app.config.get("PAPER_STARTING_BALANCE", 100000.0)
+        self._units = (self.tick_size, self.lot_size)
+
+        if app.config.get("PAPER_PERSIST_ENABLED", True):
+            from app.trading.persistence import execution_writer
+
+            execution_writer.init_app(app)
+            self._id_source = execution_writer.allocate_order_ids
+            self._id_block = iter(())
+            if execution_writer not in self._listeners:
+                self.subscribe(execution_writer)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["matching_engine"] = self
+
+    # Events
+
+    def subscribe(self, listener: Listener) -> None:
+        """
+        Receive every FillEvent and OrderEvent
+
+        Listeners run synchronously while the engine lock is held and must
+        only hand events off (queue them), never do I/O.
+
+        Args:
+            listener: Callable taking one event
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # Accounts
+
+    def open_account(
+        self,
+        account_id: int,
+        cash: Optional[float] = None,
+        positions: Optional[Dict[str, float]] = None,
+    ) -> PaperAccount:
+        """
+        Create (or reset) a paper account
+
+        Args:
+            account_id: Account ID (user or challenge account)
+            cash: Starting cash (default PAPER_STARTING_BALANCE)
+            positions: Starting positions as {symbol: quantity}
+
+        Returns:
+            The account
+        """
+        lots = {symbol: self._to_lots(quantity) for symbol, quantity in (positions or {}).items()}
+        with self._lock:
+            account = PaperAccount(
+                account_id, self.starting_balance if cash is None else cash, lots
+            )
+            self.accounts[account_id] = account
+            return account
+
+    def get_account(self, account_id: int) -> PaperAccount:
+        account = self.accounts.get(account_id)
+        if account is None:
+            raise TradingError(
+                "Paper trading account not found", {"account_id": account_id}
+            )
+        return account
+
+    # Order entry
+
+    def submit(
+        self,
+        account_id: int,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> BookOrder:
+        """
+        Submit an order and match it immediately
+
+        Args:
+            account_id: Paper account placing the order
+            symbol: Instrument symbol
+            side: "buy" or "sell"
+            order_type: "market", "limit", "ioc" or "stop"
+            quantity: Quantity (a multiple of PAPER_LOT_SIZE)
+            price: Limit price; required for limit and IOC orders, optional
+                   for stop orders (stop-limit)
+            stop_price: Trigger price of stop orders
+
+        Returns:
+            The order, with its status after matching
+
+        Raises:
+            TradingError: If the order is invalid
+            InsufficientFundsError: If the account cannot cover the order
+        """
+        if side not in SIDES:
+            raise TradingError("Invalid order side", {"side": side})
+        if order_type not in ORDER_TYPES:
+            raise TradingError("Invalid order type", {"order_type": order_type})
+        if price is None:
+            if order_type in PRICED_TYPES:
+                raise TradingError(f"A price is required for {order_type} orders")
+            ticks = None
+        else:
+            if order_type == OrderType.MARKET:
+                raise TradingError("Market orders cannot have a price")
+            ticks = self._to_ticks(price)
+        if stop_price is None:
+            if order_type == OrderType.STOP:
+                raise TradingError("A stop price is required for stop orders")
+            stop_ticks = None
+        else:
+            stop_ticks = self._to_ticks(stop_price)
+        lots = self._to_lots(quantity)
+        # Before the lock: a block refill must not stall other symbols
+        order_id = self._new_order_id()
+
+        with self._lock:
+            account = self.get_account(account_id)
+            now = time.time()
+            book = self.books.get(symbol)
+            if book is None:
+                book = self.books[symbol] = OrderBook(symbol)
+
+            order = BookOrder(
+                order_id, account_id, symbol, side, order_type,
+                lots, ticks, stop_ticks, now,
+            )
+
+            if order_type == OrderType.STOP:
+                self._park_stop(book, order, account, now)
+            else:
+                self._reserve(book, order, account)
+                self._execute(book, order, account, now, is_new=True)
+
+            if book._buy_stops or book._sell_stops:
+                self._run_stops(book, now)
+            return order
+
+    def cancel(self, order_id: int, account_id: Optional[int] = None) -> BookOrder:
+        """
+        Cancel a resting or pending stop order
+
+        Args:
+            order_id: Order ID
+            account_id: If given, the order must belong to this account
+
+        Returns:
+            The cancelled order
+
+        Raises:
+            TradingError: If the order is not open
+        """
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None or (account_id is not None and order.account_id != account_id):
+                raise TradingError("Open order not found", {"order_id": order_id})
+
+            if order.status != OrderStatus.PENDING:
+                self.books[order.symbol].cancel(order_id)
+            # Pending stops stay in the trigger heap and are skipped there
+            order.status = OrderStatus.CANCELLED
+            del self._orders[order_id]
+            self._release(order, self.accounts[order.account_id])
+            if self._listeners:
+                self._emit(OrderEvent(order, False, time.time(), self._units))
+            return order
+
+    def get_order(self, order_id: int) -> Optional[BookOrder]:
+        """Open order by ID (filled and cancelled orders are not kept)"""
+        return self._orders.get(order_id)
+
+    # Market state
+
+    def depth(self, symbol: str, levels: int = 10) -> Dict:
+        """
+        Best price levels of a book, in prices and quantities
+
+        Args:
+            symbol: Instrument symbol
+            levels: Number of levels per side
+
+        Returns:
+            {"symbol", "bids": [[price, quantity], ...], "asks": [...], "last_price"}
+        """
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None:
+                return {"symbol": symbol, "bids": [], "asks": [], "last_price": None}
+            depth = book.depth(levels)
+            return {
+                "symbol": symbol,
+                "bids": [[self.to_price(p), self.to_quantity(q)] for p, q in depth["bids"]],
+                "asks": [[self.to_price(p), self.to_quantity(q)] for p, q in depth["asks"]],
+                "last_price": self.to_price(book.last_price),
+            }
+
+    def stats(self) -> Dict[str, int]:
+        """Book, order, account and fill counts for this process"""
+        return {
+            "books": len(self.books),
+            "open_orders": len(self._orders),
+            "accounts": len(self.accounts),
+            "fills": self.fill_count,
+        }
+
+    def reset(self) -> None:
+        """Drop all books, orders and accounts (tests and benchmarks)"""
+        with self._lock:
+            self.books.clear()
+            self.accounts.clear()
+            self._orders.clear()
+            self.fill_count = 0
+
+    # Unit conversion
+
+    def to_price(self, ticks: Optional[int]) -> Optional[float]:
+        return None if ticks is None else round(ticks * self.tick_size, 10)
+
+    def to_quantity(self, lots: int) -> float:
+        return round(lots * self.lot_size, 10)
+
+    def _to_ticks(self, price: float) -> int:
+        ticks = round(price / self.tick_size)
+        if ticks <= 0 or abs(ticks * self.tick_size - price) > self.tick_size * 1e-6:
+            raise TradingError(
+                "Price must be a positive multiple of the tick size",
+                {"price": price, "tick_size": self.tick_size},
+            )
+        return ticks
+
+    def _to_lots(self, quantity: float) -> int:
+        lots = round(quantity / self.lot_size)
+        if lots <= 0 or abs(lots * self.lot_size - quantity) > self.lot_size * 1e-6:
+            raise TradingError(
+                "Quantity must be a positive multiple of the lot size",
+                {"quantity": quantity, "lot_size": self.lot_size},
+            )
+        return lots
+
+    # Internal helpers
+
+    def _new_order_id(self) -> int:
+        with self._id_lock:
+            if self._id_source is not None:
+                # Shared counter: blocks of ORDER_ID_BLOCK, usually prefetched
+                order_id = next(self._id_block, None)
+                if order_id is None:
+                    self._id_block = iter(self._id_source(ORDER_ID_BLOCK))
+                    order_id = next(self._id_block)
+                return order_id
+            order_id = self._next_id
+            self._next_id += 1
+            return order_id
+
+    def _reserve(self, book: OrderBook, order: BookOrder, account: PaperAccount) -> None:
+        """Reserve the cash or position an order needs, or raise"""
+        scale = self.tick_size * self.lot_size
+        if order.side == Side.BUY:
+            if order.price is None:
+                # Market buy: the cost of the liquidity it can take now
+                _, notional = book.available(Side.BUY, order.remaining)
+                cost = notional * scale
+            else:
+                cost = order.price * order.remaining * scale
+            if cost > account.cash - account.reserved_cash + 1e-9:
+                raise InsufficientFundsError(
+                    "Insufficient funds for this order",
+                    {"required": round(cost, 2), "available": round(account.available_cash, 2)},
+                )
+            account.reserved_cash += cost
+            order.reserved = cost
+        else:
+            symbol = order.symbol
+            available = account.positions.get(symbol, 0) - account.reserved_positions.get(symbol, 0)
+            if order.remaining > available:
+                raise InsufficientFundsError(
+                    "Insufficient position for this order",
+                    {
+                        "symbol": symbol,
+                        "required": self.to_quantity(order.remaining),
+                        "available": self.to_quantity(max(available, 0)),
+                    },
+                )
+            account.reserved_positions[symbol] = (
+                account.reserved_positions.get(symbol, 0) + order.remaining
+            )
+            order.reserved = order.remaining
+
+    def _release(self, order: BookOrder, account: PaperAccount) -> None:
+        """Return whatever an order still has reserved"""
+        reserved = order.reserved
+        if not reserved:
+            return
+        order.reserved = 0
+        if order.side == Side.BUY:
+            account.reserved_cash -= reserved
+            if account.reserved_cash < 1e-9:
+                account.reserved_cash = 0.0
+        else:
+            account.reserved_positions[order.symbol] -= reserved
+
+    def _execute(
+        self,
+        book: OrderBook,
+        order: BookOrder,
+        account: PaperAccount,
+        now: float,
+        is_new: bool,
+    ) -> None:
+        """Match a (reserved) order, then rest or cancel the remainder"""
+        limit = order.price
+        matches = book.match(order, limit)
+        if matches:
+            self._settle(book, order, matches, now)
+
+        if order.remaining == 0:
+            order.status = OrderStatus.FILLED
+            self._release(order, account)
+        elif limit is not None and order.order_type != OrderType.IOC:
+            # Limit (and triggered stop-limit) orders rest
+            order.status = OrderStatus.PARTIALLY_FILLED if matches else OrderStatus.NEW
+            book.rest(order)
+            self._orders[order.id] = order
+        else:
+            # Market and IOC remainders are cancelled
+            order.status = OrderStatus.CANCELLED
+            self._release(order, account)
+
+        if self._listeners:
+            self._emit(OrderEvent(order, is_new, now, self._units))
+
+    def _settle(self, book: OrderBook, taker: BookOrder, matches, now: float) -> None:
+        """Move cash and positions for each match and publish the fills"""
+        scale = self.tick_size * self.lot_size
+        accounts = self.accounts
+        taker_account = accounts[taker.account_id]
+        symbol = taker.symbol
+        taker_buys = taker.side == Side.BUY
+        listeners = self._listeners
+        units = self._units
+
+        for maker, quantity, price in matches:
+            maker_account = accounts[maker.account_id]
+            notional = price * quantity * scale
+            if taker_buys:
+                buy, buyer, sell, seller = taker, taker_account, maker, maker_account
+            else:
+                buy, buyer, sell, seller = maker, maker_account, taker, taker_account
+
+            # Buyer: pay, and consume cash reserved at the order's limit
+            # price (market buys reserved the exact cost)
+            used = (buy.price * quantity * scale) if buy.price is not None else notional
+            buyer.cash -= notional
+            buyer.reserved_cash -= used
+            buy.reserved -= used
+            buyer.positions[symbol] = buyer.positions.get(symbol, 0) + quantity
+
+            # Seller: deliver the reserved position and get paid
+            seller.cash += notional
+            seller.positions[symbol] -= quantity
+            seller.reserved_positions[symbol] -= quantity
+            sell.reserved -= quantity
+
+            if not maker.remaining:
+                del self._orders[maker.id]
+                self._release(maker, maker_account)
+
+            self.fill_count += 1
+            if listeners:
+                self._emit(
+                    FillEvent(
+                        self.fill_count, symbol, price, quantity, buy, sell,
+                        taker.side, now, units,
+                    )
+                )
+                self._emit(OrderEvent(maker, False, now, units))
+
+    def _park_stop(self, book: OrderBook, order: BookOrder, account: PaperAccount, now: float) -> None:
+        """Accept a stop order; sells reserve their position right away"""
+        if order.side == Side.SELL:
+            self._reserve(book, order, account)
+        order.status = OrderStatus.PENDING
+        book.add_stop(order)
+        self._orders[order.id] = order
+        if self._listeners:
+            self._emit(OrderEvent(order, True, now, self._units))
+
+    def _run_stops(self, book: OrderBook, now: float) -> None:
+        """Execute stop orders triggered by trades, including cascades"""
+        triggered = book.triggered_stops()
+        while triggered:
+            for order in triggered:
+                account = self.accounts[order.account_id]
+                del self._orders[order.id]
+                if order.side == Side.BUY:
+                    try:
+                        self._reserve(book, order, account)
+                    except InsufficientFundsError:
+                        order.status = OrderStatus.REJECTED
+                        if self._listeners:
+                            self._emit(OrderEvent(order, False, now, self._units))
+                        continue
+                self._execute(book, order, account, now, is_new=False)
+            triggered = book.triggered_stops()
+
+    def _emit(self, event) -> None:
+        for listener in self._listeners:
+            listener(event)
+
+
+# Global engine instance
+matching_engine = MatchingEngine()
+
+__all__ = [
+    "FillEvent",
+    "MatchingEngine",
+    "OrderEvent",
+    "PaperAccount",
+    "matching_engine",
+]
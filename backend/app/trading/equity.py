@@ -0,0 +1,664 @@
+"""
+TradeSense AI Platform - Equity Curves
+Buffered account equity snapshots, downsampled into time buckets
+
+Samples (typically risk_engine.equity() once a second) are never written
+one by one. EquityRecorder keeps, per account:
+
+- 1s:  the last EQUITY_LIVE_SECONDS samples, in memory only
+- 1m:  the open minute as an OHLC bucket; closed minutes are queued and
+       written with bulk_insert every EQUITY_FLUSH_INTERVAL seconds
+- 1h:  rolled up from the 1m rows by compact(), which then deletes 1m
+       rows older than EQUITY_RETENTION_DAYS
+
+so the database sees one row per account per minute, plus one per hour.
+
+curve() picks the finest resolution that covers a range in at most
+max_points buckets, and merges neighbouring buckets when even 1h is too
+fine, so a curve is bounded whatever the range. The 1s history and the
+open minute only exist in the recording process; other processes serve
+curves from the database (up to the last flush).
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from flask import Flask, has_app_context
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {"1s": 1, "1m": 60, "1h": 3600}
+FIELDS = ("open", "high", "low", "close")
+EPOCH = datetime(1970, 1, 1)
+
+
+def empty() -> Dict[str, np.ndarray]:
+    """Curve columns without points"""
+    return {"timestamp": np.empty(0, dtype=np.int64), **{name: np.empty(0) for name in FIELDS}}
+
+
+def _merge(columns: Dict[str, np.ndarray], starts: np.ndarray) -> Dict[str, np.ndarray]:
+    """One bucket per run of buckets, runs beginning at `starts`"""
+    last = np.append(starts[1:], len(columns["timestamp"])) - 1
+    return {
+        "timestamp": columns["timestamp"][starts],
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": columns["close"][last],
+    }
+
+
+def rollup(columns: Dict[str, np.ndarray], width: int) -> Dict[str, np.ndarray]:
+    """
+    Aggregate time-ordered buckets into buckets of `width` seconds
+
+    Args:
+        columns: "timestamp" (bucket starts, ascending) and OHLC arrays
+        width: Target bucket width in seconds
+
+    Returns:
+        Columns with one bucket per `width` seconds that has data
+    """
+    timestamp = columns["timestamp"]
+    if not len(timestamp):
+        return columns
+    bucket = timestamp - timestamp % width
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    merged = _merge(columns, starts)
+    merged["timestamp"] = bucket[starts]
+    return merged
+
+
+def downsample(columns: Dict[str, np.ndarray], max_points: int) -> Dict[str, np.ndarray]:
+    """Merge runs of consecutive buckets until at most max_points remain"""
+    count = len(columns["timestamp"])
+    if count <= max_points:
+        return columns
+    return _merge(columns, np.arange(0, count, math.ceil(count / max_points)))
+
+
+def _concat(parts: Iterable[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    parts = [part for part in parts if len(part["timestamp"])]
+    if not parts:
+        return empty()
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in ("timestamp",) + FIELDS}
+    # Stable: of two rows for the same bucket the later written one stays last
+    order = np.argsort(columns["timestamp"], kind="stable")
+    return {name: values[order] for name, values in columns.items()}
+
+
+class EquityRecorder:
+    """Buffers equity samples in memory and serves bounded equity curves"""
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.app: Optional[Flask] = None
+        self.sample_interval = 1.0
+        self.flush_interval = 10.0
+        self.live_seconds = 120
+        self.retention = {"1m": 7 * 86400.0}
+        self.max_points = 1000
+        self.batch_size = 1000
+        self.leaderboard = True
+        # Closed buckets kept while the database is unavailable
+        self.max_pending = 1_000_000
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.engine = None  # last risk engine sampled
+
+        self._lock = threading.RLock()
+        self._slots: Dict[int, int] = {}
+        self._count = 0
+        # Snapshots usually list the same accounts in the same order
+        self._last_ids = np.empty(0, dtype=np.int64)
+        self._last_slots = np.empty(0, dtype=np.int64)
+        self._account_ids = np.empty(0, dtype=np.int64)
+        self._minute = np.empty(0, dtype=np.int64)  # open 1m bucket per slot, -1 for none
+        self._buckets = np.empty((len(FIELDS), 0))
+        self._samples = np.empty(0, dtype=np.int64)
+        self._ring = np.empty((0, self.live_seconds))  # 1s samples, column = second % live_seconds
+        self._ring_seconds = np.full(self.live_seconds, -1, dtype=np.int64)
+        self._closed: List[Dict[str, np.ndarray]] = []
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the recorder with Flask app
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.sample_interval = app.config.get("EQUITY_SAMPLE_INTERVAL", 1.0)
+        self.flush_interval = app.config.get("EQUITY_FLUSH_INTERVAL", 10)
+        self.max_points = app.config.get("EQUITY_MAX_POINTS", 1000)
+        self.batch_size = app.config.get("PAPER_PERSIST_BATCH_SIZE", 1000)
+        self.leaderboard = app.config.get("EQUITY_LEADERBOARD_ENABLED", True)
+        days = app.config.get("EQUITY_RETENTION_DAYS", {"1m": 7})
+        self.retention = {name: value * 86400.0 for name, value in days.items() if value}
+
+        live_seconds = app.config.get("EQUITY_LIVE_SECONDS", 120)
+        with self._lock:
+            if live_seconds != self.live_seconds:
+                self.live_seconds = live_seconds
+                self._ring = np.full((len(self._account_ids), live_seconds), np.nan)
+                self._ring_seconds = np.full(live_seconds, -1, dtype=np.int64)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["equity_recorder"] = self
+
+    # Recording
+
+    def record(self, account_ids, equity, timestamp: Optional[float] = None) -> int:
+        """
+        Add one equity sample per account
+
+        The last sample within a second is that second's 1s point; samples
+        older than an account's open minute are ignored.
+
+        Args:
+            account_ids: Account IDs (unique)
+            equity: Equity per account
+            timestamp: Sample time, epoch seconds (default: now)
+
+        Returns:
+            Number of samples recorded
+        """
+        ids = np.asarray(account_ids, dtype=np.int64)
+        values = np.asarray(equity, dtype=float)
+        second = int(time.time() if timestamp is None else timestamp)
+        minute = second - second % 60
+
+        with self._lock:
+            slots = self._resolve(ids)
+            current = self._minute[slots]
+            late = current > minute
+            if late.any():
+                slots, values, current = slots[~late], values[~late], current[~late]
+
+            opening = current != minute
+            closing = slots[opening & (current >= 0)]
+            if len(closing):
+                self._close(closing)
+            if opening.any():
+                fresh = slots[opening]
+                self._minute[fresh] = minute
+                self._buckets[:, fresh] = values[opening]
+                self._samples[fresh] = 0
+
+            buckets = self._buckets
+            buckets[1, slots] = np.maximum(buckets[1, slots], values)
+            buckets[2, slots] = np.minimum(buckets[2, slots], values)
+            buckets[3, slots] = values
+            self._samples[slots] += 1
+
+            if self.live_seconds:
+                column = second % self.live_seconds
+                if self._ring_seconds[column] < second:
+                    self._ring[:, column] = np.nan
+                    self._ring_seconds[column] = second
+                if self._ring_seconds[column] == second:
+                    self._ring[slots, column] = values
+
+            self.recorded += len(slots)
+            return len(slots)
+
+    def sample(self, engine=None, timestamp: Optional[float] = None) -> int:
+        """
+        Record the equity of every active account of a risk engine
+
+        Closed buckets are flushed once EQUITY_FLUSH_INTERVAL has passed.
+
+        Args:
+            engine: RiskEngine (default: the global risk_engine)
+            timestamp: Sample time (default: now)
+
+        Returns:
+            Number of samples recorded
+        """
+        if engine is None:
+            from app.risk import risk_engine as engine
+
+        self.engine = engine  # challenge types of published snapshots
+        snapshot = engine.equity()
+        recorded = self.record(snapshot["account_id"], snapshot["equity"], timestamp)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return recorded
+
+    def start(self, engine=None) -> None:
+        """
+        Sample a risk engine every EQUITY_SAMPLE_INTERVAL seconds
+
+        Runs in a daemon thread of the process that owns the engine.
+
+        Args:
+            engine: RiskEngine (default: the global risk_engine)
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(engine,), name="equity-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """
+        Stop sampling, close the open minutes and write everything buffered
+
+        Returns:
+            Number of buckets written
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            open_slots = np.flatnonzero(self._minute[: self._count] >= 0)
+            if len(open_slots):
+                self._close(open_slots)
+        return self.flush()
+
+    # Writing
+
+    def flush(self) -> int:
+        """
+        Write the closed 1m buckets to the database in bulk
+
+        Buckets that could not be written stay queued for the next flush.
+
+        Returns:
+            Number of buckets written
+        """
+        with self._lock:
+            chunks, self._closed = self._closed, []
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        if not chunks:
+            return 0
+
+        from app.core.database import bulk_insert
+        from app.models.trading import EquityBucket
+
+        columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+        total = len(columns["account_id"])
+        written = 0
+        try:
+            with nullcontext() if has_app_context() else self.app.app_context():
+                for start in range(0, total, self.batch_size):
+                    written += bulk_insert(EquityBucket, self._rows(columns, start, start + self.batch_size))
+                if self.leaderboard:
+                    self._publish(columns)
+        except Exception as e:
+            logger.error(f"Could not write {total - written} equity buckets: {e}")
+            with self._lock:
+                self._closed.insert(0, {name: values[written:] for name, values in columns.items()})
+                self._pending += total - written
+        self.written += written
+        return written
+
+    def compact(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Roll closed hours of 1m buckets up into 1h buckets, then delete 1m
+        buckets past their retention
+
+        Resumes at the earliest minute among the 1m rows written since the
+        last rolled-up hour began, so a minute flushed late into an hour
+        that was already rolled up gets that hour recomputed (existing 1h
+        rows are updated). Only 1m rows of hours that have been rolled up
+        are ever deleted.
+
+        Args:
+            now: Current time, epoch seconds (default: now)
+
+        Returns:
+            Counts of 1h buckets inserted and updated and 1m buckets deleted
+        """
+        from sqlalchemy import func
+
+        from app.core.database import bulk_insert, bulk_update, db
+        from app.models.trading import EquityBucket
+
+        now = time.time() if now is None else now
+        hour_end = datetime.utcfromtimestamp(now - now % 3600)
+        stats = {"inserted": 0, "updated": 0, "deleted": 0}
+
+        # Every 1m row written before the last rolled-up hour began was
+        # rolled up by an earlier run; the hour itself is a margin for rows
+        # flushed while that run was going on
+        rolled = (
+            db.session.query(func.max(EquityBucket.bucket_start))
+            .filter(EquityBucket.resolution == "1h")
+            .scalar()
+        )
+        unrolled = db.session.query(func.min(EquityBucket.bucket_start)).filter(
+            EquityBucket.resolution == "1m"
+        )
+        if rolled is not None:
+            unrolled = unrolled.filter(EquityBucket.created_at >= rolled)
+        start = unrolled.scalar()
+        if start is not None and start < hour_end:
+            start = start.replace(minute=0, second=0, microsecond=0)
+            hours = self._rollup_hours(start, hour_end)
+            existing = {
+                (account_id, bucket_start): bucket_id
+                for bucket_id, account_id, bucket_start in db.session.query(
+                    EquityBucket.id, EquityBucket.account_id, EquityBucket.bucket_start
+                ).filter(
+                    EquityBucket.resolution == "1h",
+                    EquityBucket.bucket_start >= start,
+                    EquityBucket.bucket_start < hour_end,
+                )
+            }
+
+            inserts, updates = [], []
+            for key, (open_, high, low, close, samples) in hours.items():
+                row = {"open": open_, "high": high, "low": low, "close": close, "samples": samples}
+                if key in existing:
+                    updates.append({"id": existing[key], **row})
+                else:
+                    inserts.append({"account_id": key[0], "resolution": "1h", "bucket_start": key[1], **row})
+            for offset in range(0, len(inserts), self.batch_size):
+                stats["inserted"] += bulk_insert(EquityBucket, inserts[offset:offset + self.batch_size])
+            for offset in range(0, len(updates), self.batch_size):
+                stats["updated"] += bulk_update(EquityBucket, updates[offset:offset + self.batch_size])
+
+        if "1m" in self.retention:
+            cutoff = min(hour_end, datetime.utcfromtimestamp(now - self.retention["1m"]))
+            stats["deleted"] = (
+                EquityBucket.query.filter(
+                    EquityBucket.resolution == "1m", EquityBucket.bucket_start < cutoff
+                ).delete(synchronize_session=False)
+            )
+            db.session.commit()
+        return stats
+
+    # Queries
+
+    def curve(
+        self,
+        account_id: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ) -> Dict:
+        """
+        Equity curve of an account with a bounded number of points
+
+        Args:
+            account_id: Account ID
+            start: Range start, epoch seconds (default: a day before end)
+            end: Range end (default: now)
+            max_points: Maximum number of points (capped at EQUITY_MAX_POINTS)
+
+        Returns:
+            "resolution" of the buckets and the columns "timestamp" (bucket
+            starts), "open", "high", "low" and "close" as arrays
+
+        Raises:
+            ValueError: If the range is empty
+        """
+        now = time.time()
+        end = now if end is None else float(end)
+        start = end - 86400 if start is None else float(start)
+        if end <= start:
+            raise ValueError("end must be after start")
+        max_points = max(1, min(max_points or self.max_points, self.max_points))
+
+        resolution = self._resolution(account_id, start, end, max_points, now)
+        if resolution == "1s":
+            columns = self._live(account_id, start, end)
+        else:
+            columns = self._stored(account_id, resolution, start, end)
+        return {"resolution": resolution, **downsample(columns, max_points)}
+
+    def stats(self) -> Dict[str, int]:
+        """Tracked accounts and recorded, queued, written and dropped counts"""
+        return {
+            "accounts": self._count,
+            "recorded": self.recorded,
+            "pending": self._pending,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    # Internal helpers
+
+    def _run(self, engine) -> None:
+        while not self._stop.wait(self.sample_interval):
+            try:
+                self.sample(engine)
+            except Exception as e:
+                logger.error(f"Equity sample failed: {e}")
+
+    def _resolve(self, account_ids: np.ndarray) -> np.ndarray:
+        if np.array_equal(account_ids, self._last_ids):
+            return self._last_slots
+        slots = self._slots
+        new = [account_id for account_id in dict.fromkeys(account_ids.tolist()) if account_id not in slots]
+        if new:
+            self._grow(self._count + len(new))
+            for account_id in new:
+                slots[account_id] = self._count
+                self._account_ids[self._count] = account_id
+                self._count += 1
+        self._last_ids = account_ids.copy()
+        self._last_slots = np.fromiter(
+            (slots[account_id] for account_id in account_ids.tolist()), np.int64, len(account_ids)
+        )
+        return self._last_slots
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self._account_ids)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        grow = capacity - len(self._account_ids)
+        self._account_ids = np.concatenate([self._account_ids, np.zeros(grow, dtype=np.int64)])
+        self._minute = np.concatenate([self._minute, np.full(grow, -1, dtype=np.int64)])
+        self._buckets = np.concatenate([self._buckets, np.zeros((len(FIELDS), grow))], axis=1)
+        self._samples = np.concatenate([self._samples, np.zeros(grow, dtype=np.int64)])
+        self._ring = np.concatenate([self._ring, np.full((grow, self.live_seconds), np.nan)])
+
+    def _close(self, slots: np.ndarray) -> None:
+        self._closed.append({
+            "account_id": self._account_ids[slots],
+            "timestamp": self._minute[slots],
+            **{name: self._buckets[index, slots] for index, name in enumerate(FIELDS)},
+            "samples": self._samples[slots],
+        })
+        self._minute[slots] = -1
+        self._pending += len(slots)
+        while self._pending > self.max_pending and len(self._closed) > 1:
+            dropped = len(self._closed.pop(0)["account_id"])
+            self._pending -= dropped
+            self.dropped += dropped
+            logger.warning(f"Equity buffer full, dropped {dropped} buckets")
+
+    @staticmethod
+    def _rows(columns: Dict[str, np.ndarray], start: int, stop: int) -> List[dict]:
+        return [
+            {
+                "account_id": account_id,
+                "resolution": "1m",
+                "bucket_start": datetime.utcfromtimestamp(timestamp),
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "samples": samples,
+            }
+            for account_id, timestamp, open_, high, low, close, samples in zip(
+                *(columns[name][start:stop].tolist() for name in ("account_id", "timestamp") + FIELDS + ("samples",))
+            )
+        ]
+
+    def _publish(self, columns: Dict[str, np.ndarray]) -> None:
+        """Feed the latest closed minute of each account to the return leaderboards"""
+        from app.services.leaderboard_service import LeaderboardService
+
+        latest = {
+            account_id: (close, timestamp + 60)
+            for account_id, close, timestamp in zip(
+                columns["account_id"].tolist(), columns["close"].tolist(), columns["timestamp"].tolist()
+            )
+        }
+        challenge_types = (
+            self.engine.challenge_types_of(latest) if self.engine is not None else {}
+        )
+        LeaderboardService.record_equity(
+            {
+                "user_id": account_id,
+                "equity": close,
+                "timestamp": timestamp,
+                "challenge_type": challenge_types.get(account_id),
+            }
+            for account_id, (close, timestamp) in latest.items()
+        )
+
+    def _rollup_hours(self, start: datetime, end: datetime) -> Dict[tuple, list]:
+        from app.core.database import db
+        from app.models.trading import EquityBucket
+
+        query = (
+            db.session.query(
+                EquityBucket.account_id,
+                EquityBucket.bucket_start,
+                EquityBucket.open,
+                EquityBucket.high,
+                EquityBucket.low,
+                EquityBucket.close,
+                EquityBucket.samples,
+            )
+            .filter(
+                EquityBucket.resolution == "1m",
+                EquityBucket.bucket_start >= start,
+                EquityBucket.bucket_start < end,
+            )
+            .order_by(EquityBucket.bucket_start, EquityBucket.id)
+            .yield_per(self.batch_size)
+        )
+        hours: Dict[tuple, list] = {}
+        for account_id, bucket_start, open_, high, low, close, samples in query:
+            key = (account_id, bucket_start.replace(minute=0, second=0, microsecond=0))
+            bucket = hours.get(key)
+            if bucket is None:
+                hours[key] = [open_, high, low, close, samples]
+            else:
+                bucket[1] = max(bucket[1], high)
+                bucket[2] = min(bucket[2], low)
+                bucket[3] = close
+                bucket[4] += samples
+        return hours
+
+    def _resolution(self, account_id: int, start: float, end: float, max_points: int, now: float) -> str:
+        for name, width in RESOLUTIONS.items():
+            if (end - start) / width > max_points:
+                continue
+            if name == "1s" and (start < now - self.live_seconds or account_id not in self._slots):
+                continue
+            if name in self.retention and start < now - self.retention[name]:
+                continue
+            return name
+        return "1h"
+
+    def _live(self, account_id: int, start: float, end: float) -> Dict[str, np.ndarray]:
+        with self._lock:
+            seconds = self._ring_seconds.copy()
+            values = self._ring[self._slots[account_id]].copy()
+        used = (seconds >= start) & (seconds <= end) & ~np.isnan(values)
+        order = np.argsort(seconds[used])
+        values = values[used][order]
+        return {"timestamp": seconds[used][order], **{name: values for name in FIELDS}}
+
+    def _stored(self, account_id: int, resolution: str, start: float, end: float) -> Dict[str, np.ndarray]:
+        from sqlalchemy import func
+
+        from app.core.database import db
+        from app.models.trading import EquityBucket
+
+        width = RESOLUTIONS[resolution]
+        lower = int(start - start % width)
+        parts = [self._query(account_id, resolution, lower, end)]
+        if resolution == "1h":
+            # Hours not rolled up yet are aggregated from their minutes
+            rolled = (
+                db.session.query(func.max(EquityBucket.bucket_start))
+                .filter(EquityBucket.account_id == account_id, EquityBucket.resolution == "1h")
+                .scalar()
+            )
+            after = max(lower, self._epoch(rolled) + width) if rolled is not None else lower
+            parts.append(self._query(account_id, "1m", after, end))
+        parts.append(self._buffered(account_id, lower, end))
+        return rollup(_concat(parts), width)
+
+    def _query(self, account_id: int, resolution: str, start: float, end: float) -> Dict[str, np.ndarray]:
+        from app.models.trading import EquityBucket
+
+        rows = (
+            EquityBucket.query.with_entities(
+                EquityBucket.bucket_start,
+                EquityBucket.open,
+                EquityBucket.high,
+                EquityBucket.low,
+                EquityBucket.close,
+            )
+            .filter(
+                EquityBucket.account_id == account_id,
+                EquityBucket.resolution == resolution,
+                EquityBucket.bucket_start >= datetime.utcfromtimestamp(start),
+                EquityBucket.bucket_start <= datetime.utcfromtimestamp(end),
+            )
+            .order_by(EquityBucket.bucket_start, EquityBucket.id)
+            .all()
+        )
+        if not rows:
+            return empty()
+        return {
+            "timestamp": np.fromiter((self._epoch(row[0]) for row in rows), np.int64, len(rows)),
+            **{
+                name: np.fromiter((float(row[index]) for row in rows), float, len(rows))
+                for index, name in enumerate(FIELDS, start=1)
+            },
+        }
+
+    def _buffered(self, account_id: int, start: float, end: float) -> Dict[str, np.ndarray]:
+        """Closed minutes not written yet and the open minute of an account"""
+        parts = []
+        with self._lock:
+            for chunk in self._closed:
+                used = (chunk["account_id"] == account_id) & (chunk["timestamp"] >= start) & (chunk["timestamp"] <= end)
+                if used.any():
+                    parts.append({name: chunk[name][used] for name in ("timestamp",) + FIELDS})
+            slot = self._slots.get(account_id)
+            if slot is not None and start <= self._minute[slot] <= end:
+                parts.append({
+                    "timestamp": self._minute[slot:slot + 1].copy(),
+                    **{name: self._buckets[index, slot:slot + 1].copy() for index, name in enumerate(FIELDS)},
+                })
+        return _concat(parts)
+
+    @staticmethod
+    def _epoch(value: datetime) -> int:
+        return int((value - EPOCH).total_seconds())
+
+
+# Global recorder instance
+equity_recorder = EquityRecorder()
+
+__all__ = ["EquityRecorder", "downsample", "equity_recorder", "rollup"]
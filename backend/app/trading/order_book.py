@@ -0,0 +1,427 @@
+"""
+TradeSense AI Platform - Order Book
+Per-symbol limit order book with price-time priority
+
+Prices and quantities are integers (ticks and lots, see MatchingEngine) so
+matching never compares floats. Each side keeps:
+
+- a dict of price -> PriceLevel for O(1) level lookup
+- a sorted list of prices, best price last, so the best level is read and
+  removed at the end of the list (bids ascending, asks stored negated)
+
+Orders at a level form an intrusive doubly linked FIFO queue (the order
+objects carry their own prev/next pointers), so appending, filling the
+head and cancelling from the middle are all O(1) without extra nodes.
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+
+class Side:
+    """Order sides"""
+
+    BUY = "buy"
+    SELL = "sell"
+
+    @classmethod
+    def all(cls):
+        return [cls.BUY, cls.SELL]
+
+
+class OrderType:
+    """Supported order types"""
+
+    MARKET = "market"  # fill what is available now, cancel the rest
+    LIMIT = "limit"  # fill up to the limit price, rest the remainder
+    IOC = "ioc"  # immediate-or-cancel limit order
+    STOP = "stop"  # market (or limit, with a price) order once triggered
+
+    @classmethod
+    def all(cls):
+        return [cls.MARKET, cls.LIMIT, cls.IOC, cls.STOP]
+
+
+class OrderStatus:
+    """Order lifecycle states"""
+
+    PENDING = "pending"  # stop order waiting for its trigger
+    NEW = "new"
+    PARTIALLY_FILLED = "partially_filled"
+    FILLED = "filled"
+    CANCELLED = "cancelled"
+    REJECTED = "rejected"
+
+    @classmethod
+    def all(cls):
+        return [
+            cls.PENDING,
+            cls.NEW,
+            cls.PARTIALLY_FILLED,
+            cls.FILLED,
+            cls.CANCELLED,
+            cls.REJECTED,
+        ]
+
+    @classmethod
+    def is_final(cls, status: str) -> bool:
+        return status in (cls.FILLED, cls.CANCELLED, cls.REJECTED)
+
+
+class BookOrder:
+    """
+    An order as seen by the matching engine
+
+    Doubles as the node of its price level's FIFO queue (prev/next/level).
+    """
+
+    __slots__ = (
+        "id",
+        "account_id",
+        "symbol",
+        "side",
+        "order_type",
+        "price",
+        "stop_price",
+        "quantity",
+        "remaining",
+        "reserved",
+        "status",
+        "timestamp",
+        "prev",
+        "next",
+        "level",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        account_id: int,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: int,
+        price: Optional[int] = None,
+        stop_price: Optional[int] = None,
+        timestamp: float = 0.0,
+    ):
+        self.id = order_id
+        self.account_id = account_id
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.price = price
+        self.stop_price = stop_price
+        self.quantity = quantity
+        self.remaining = quantity
+        self.reserved = 0  # cash (buys) or lots (sells) held by the engine
+        self.status = OrderStatus.NEW
+        self.timestamp = timestamp
+        self.prev: Optional["BookOrder"] = None
+        self.next: Optional["BookOrder"] = None
+        self.level: Optional["PriceLevel"] = None
+
+    @property
+    def filled(self) -> int:
+        return self.quantity - self.remaining
+
+    def __repr__(self) -> str:
+        return (
+            f"<BookOrder {self.id} {self.side} {self.order_type} {self.symbol} "
+            f"{self.remaining}/{self.quantity}@{self.price} {self.status}>"
+        )
+
+
+class PriceLevel:
+    """FIFO queue of resting orders at one price"""
+
+    __slots__ = ("price", "head", "tail", "quantity", "count")
+
+    def __init__(self, price: int):
+        self.price = price
+        self.head: Optional[BookOrder] = None
+        self.tail: Optional[BookOrder] = None
+        self.quantity = 0
+        self.count = 0
+
+    def append(self, order: BookOrder) -> None:
+        order.level = self
+        order.next = None
+        order.prev = self.tail
+        if self.tail is None:
+            self.head = order
+        else:
+            self.tail.next = order
+        self.tail = order
+        self.quantity += order.remaining
+        self.count += 1
+
+    def remove(self, order: BookOrder) -> None:
+        if order.prev is None:
+            self.head = order.next
+        else:
+            order.prev.next = order.next
+        if order.next is None:
+            self.tail = order.prev
+        else:
+            order.next.prev = order.prev
+        self.quantity -= order.remaining
+        self.count -= 1
+        order.prev = order.next = order.level = None
+
+
+# (resting order, quantity, price) for each match of an incoming order
+Match = Tuple[BookOrder, int, int]
+
+
+class OrderBook:
+    """
+    Limit order book for one symbol
+
+    Only manages resting liquidity and matching; balances, ids and events
+    belong to the MatchingEngine.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.orders: Dict[int, BookOrder] = {}
+        self.last_price: Optional[int] = None
+
+        self._bid_levels: Dict[int, PriceLevel] = {}
+        self._ask_levels: Dict[int, PriceLevel] = {}
+        # Best price last: bids ascending, asks as negated prices ascending
+        self._bid_prices: List[int] = []
+        self._ask_prices: List[int] = []
+
+        # Untriggered stop orders: buy stops fire when the last price rises
+        # to the stop, sell stops when it falls to it
+        self._buy_stops: List[Tuple[int, int, BookOrder]] = []
+        self._sell_stops: List[Tuple[int, int, BookOrder]] = []
+
+    # Queries
+
+    @property
+    def best_bid(self) -> Optional[int]:
+        return self._bid_prices[-1] if self._bid_prices else None
+
+    @property
+    def best_ask(self) -> Optional[int]:
+        return -self._ask_prices[-1] if self._ask_prices else None
+
+    def depth(self, levels: int = 10) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Aggregated quantity of the best price levels
+
+        Args:
+            levels: Number of levels per side
+
+        Returns:
+            {"bids": [(price, quantity), ...], "asks": [...]}, best first
+        """
+        bids = [
+            (price, self._bid_levels[price].quantity)
+            for price in reversed(self._bid_prices[-levels:])
+        ]
+        asks = [
+            (-price, self._ask_levels[-price].quantity)
+            for price in reversed(self._ask_prices[-levels:])
+        ]
+        return {"bids": bids, "asks": asks}
+
+    def available(self, side: str, quantity: int, limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Liquidity an incoming order could take without changing the book
+
+        Args:
+            side: Side of the incoming order
+            quantity: Quantity wanted
+            limit: Worst acceptable price (None for market orders)
+
+        Returns:
+            Tuple of (fillable quantity, total price * quantity in ticks)
+        """
+        if side == Side.BUY:
+            prices, levels, sign = self._ask_prices, self._ask_levels, -1
+        else:
+            prices, levels, sign = self._bid_prices, self._bid_levels, 1
+
+        filled = notional = 0
+        for index in range(len(prices) - 1, -1, -1):
+            price = sign * prices[index]
+            if limit is not None and (price > limit if side == Side.BUY else price < limit):
+                break
+            take = min(quantity - filled, levels[price].quantity)
+            filled += take
+            notional += take * price
+            if filled == quantity:
+                break
+        return filled, notional
+
+    # Matching
+
+    def match(self, order: BookOrder, limit: Optional[int]) -> List[Match]:
+        """
+        Fill an incoming order against the opposite side
+
+        Resting orders are taken best price first, oldest first within a
+        price. Fully filled resting orders are removed from the book and
+        marked FILLED; the incoming order's remaining quantity is reduced
+        but it is not added to the book (see rest()).
+
+        Args:
+            order: Incoming order
+            limit: Worst acceptable price (None for market orders)
+
+        Returns:
+            List of (resting order, quantity, price) matches
+        """
+        matches: List[Match] = []
+        remaining = order.remaining
+        if order.side == Side.BUY:
+            prices, levels, sign = self._ask_prices, self._ask_levels, -1
+        else:
+            prices, levels, sign = self._bid_prices, self._bid_levels, 1
+        orders = self.orders
+        filled_status = OrderStatus.FILLED
+        partial_status = OrderStatus.PARTIALLY_FILLED
+
+        while remaining and prices:
+            price = sign * prices[-1]
+            if limit is not None and (price > limit if sign == -1 else price < limit):
+                break
+
+            level = levels[price]
+            maker = level.head
+            while maker is not None and remaining:
+                take = maker.remaining if maker.remaining < remaining else remaining
+                remaining -= take
+                maker.remaining -= take
+                level.quantity -= take
+                matches.append((maker, take, price))
+
+                if maker.remaining:
+                    maker.status = partial_status
+                    break
+
+                # Fully filled: unlink the queue head
+                maker.status = filled_status
+                following = maker.next
+                level.head = following
+                if following is None:
+                    level.tail = None
+                else:
+                    following.prev = None
+                level.count -= 1
+                maker.next = maker.level = None
+                del orders[maker.id]
+                maker = following
+
+            if level.head is None:
+                prices.pop()
+                del levels[price]
+
+        if matches:
+            self.last_price = matches[-1][2]
+        order.remaining = remaining
+        return matches
+
+    def rest(self, order: BookOrder) -> None:
+        """Add the unfilled part of a limit order to its price level"""
+        price = order.price
+        if order.side == Side.BUY:
+            levels, prices, key = self._bid_levels, self._bid_prices, price
+        else:
+            levels, prices, key = self._ask_levels, self._ask_prices, -price
+
+        level = levels.get(price)
+        if level is None:
+            level = levels[price] = PriceLevel(price)
+            # New levels are usually near the top of the book, i.e. near
+            # the end of the list, which keeps the insert cheap
+            prices.insert(bisect_left(prices, key), key)
+        level.append(order)
+        self.orders[order.id] = order
+
+    def cancel(self, order_id: int) -> Optional[BookOrder]:
+        """
+        Remove a resting order
+
+        Args:
+            order_id: ID of the order
+
+        Returns:
+            The removed order, or None if it is not resting in this book
+        """
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return None
+
+        level = order.level
+        level.remove(order)
+        if level.head is None:
+            if order.side == Side.BUY:
+                del self._bid_levels[level.price]
+                self._remove_price(self._bid_prices, level.price)
+            else:
+                del self._ask_levels[level.price]
+                self._remove_price(self._ask_prices, -level.price)
+        return order
+
+    # Stop orders
+
+    def add_stop(self, order: BookOrder) -> None:
+        """Park a stop order until the last trade price reaches its stop"""
+        if order.side == Side.BUY:
+            heapq.heappush(self._buy_stops, (order.stop_price, order.id, order))
+        else:
+            heapq.heappush(self._sell_stops, (-order.stop_price, order.id, order))
+
+    def triggered_stops(self) -> List[BookOrder]:
+        """
+        Pop the stop orders triggered by the last trade price
+
+        Cancelled stops are discarded lazily here.
+
+        Returns:
+            Triggered orders, in trigger order
+        """
+        last = self.last_price
+        if last is None:
+            return []
+
+        triggered = []
+        buy_stops, sell_stops = self._buy_stops, self._sell_stops
+        while buy_stops and buy_stops[0][0] <= last:
+            order = heapq.heappop(buy_stops)[2]
+            if order.status == OrderStatus.PENDING:
+                triggered.append(order)
+        while sell_stops and -sell_stops[0][0] >= last:
+            order = heapq.heappop(sell_stops)[2]
+            if order.status == OrderStatus.PENDING:
+                triggered.append(order)
+        return triggered
+
+    # Internal helpers
+
+    @staticmethod
+    def _remove_price(prices: List[int], key: int) -> None:
+        if prices and prices[-1] == key:
+            prices.pop()
+            return
+        index = bisect_left(prices, key)
+        if index < len(prices) and prices[index] == key:
+            del prices[index]
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+
+__all__ = [
+    "BookOrder",
+    "OrderBook",
+    "OrderStatus",
+    "OrderType",
+    "PriceLevel",
+    "Side",
+]
@@ -0,0 +1,417 @@
+"""
+TradeSense AI Platform - Execution Persistence
+Write-behind storage of matching engine events
+
+ExecutionWriter subscribes to the MatchingEngine and only appends events to
+an in-memory queue. A background thread drains the queue in batches,
+coalesces the order updates of a batch (last state wins) and writes orders
+and fills with bulk statements in one transaction per batch, so the
+database never sits on the matching path and a failed batch can be
+retried as a whole.
+
+Once a batch is committed, the P&L its fills realized (average cost per
+account and symbol, as LeaderboardService.reconcile computes it) is sent
+to the fills.record_trades task. A position first seen by this process is
+replayed from the fills already stored.
+
+The writer also hands out the engine's order id blocks. Each block handed
+out queues the allocation of the next one on the writer thread, so order
+entry only waits on Redis for the first block of a process. The database
+floor of the counter is read once per process.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3  # per batch, before it is logged and dropped
+EPOCH = datetime(1970, 1, 1)
+
+ORDER_ID_KEY = "paper:order_id"
+PREFETCH_IDS = object()  # queue marker: allocate the next order id block
+
+# KEYS[1] = counter, ARGV[1] = block size, ARGV[2] = highest persisted id.
+# The counter never falls behind the database (e.g. after a Redis flush).
+ALLOCATE_IDS_SCRIPT = """
+local floor = tonumber(ARGV[2])
+if tonumber(redis.call('GET', KEYS[1]) or '0') < floor then
+    redis.call('SET', KEYS[1], floor)
+end
+return redis.call('INCRBY', KEYS[1], ARGV[1])
+"""
+
+
+class ExecutionWriter:
+    """Batches engine events into bulk inserts and updates"""
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.app: Optional[Flask] = None
+        self.batch_size = 1000
+        self.flush_interval = 0.25  # seconds
+        self.written = {"orders": 0, "fills": 0}
+        self.failed = 0
+        self.positions = None  # RealizedPnL of the accounts this process wrote fills for
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._id_lock = threading.Lock()
+        self._next_ids: Optional[range] = None  # prefetched order id block
+        self._prefetch_count = 0
+        self._id_floor: Optional[int] = None  # highest persisted order id
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Initialize the writer with Flask app
+
+        The thread starts with the first event, so it is created in the
+        process (worker) that does the matching.
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.batch_size = app.config.get("PAPER_PERSIST_BATCH_SIZE", 1000)
+        self.flush_interval = app.config.get("PAPER_PERSIST_INTERVAL", 0.25)
+
+        if not hasattr(app, "extensions"):
+            app.extensions = {}
+        app.extensions["execution_writer"] = self
+
+    def __call__(self, event) -> None:
+        """Queue an engine event (MatchingEngine listener)"""
+        if self._pid != os.getpid():
+            self._start()
+        with self._idle:
+            self._pending += 1
+        self._queue.put(event)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until every queued event is written
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            True if the queue drained in time
+        """
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Queued, written and failed counts for this process"""
+        return {"queued": self._pending, "failed": self.failed, **self.written}
+
+    def allocate_order_ids(self, count: int) -> range:
+        """
+        Reserve a block of order ids shared by every process
+
+        Ids come from one Redis counter, so engines in several workers never
+        hand out the same id. The block prefetched by the writer thread is
+        returned when there is one, and the next block is queued.
+
+        Args:
+            count: Number of ids
+
+        Returns:
+            The reserved ids
+
+        Raises:
+            TradingError: If Redis is unavailable
+        """
+        if self._pid != os.getpid():
+            self._start()
+        with self._id_lock:
+            block, self._next_ids = self._next_ids, None
+        if block is None or len(block) != count:
+            block = self._allocate_ids(count)
+        self._prefetch_count = count
+        self._queue.put(PREFETCH_IDS)
+        return block
+
+    def last_order_id(self) -> Optional[int]:
+        """Highest persisted order id (None if it cannot be read)"""
+        from sqlalchemy import func
+
+        from app.core.database import db
+        from app.models.trading import Order
+
+        try:
+            with self.app.app_context():
+                return db.session.query(func.max(Order.id)).scalar() or 0
+        except Exception as e:
+            logger.error(f"Could not read the last order id: {e}")
+            return None
+
+    # Internal helpers
+
+    def _start(self) -> None:
+        # Also runs after fork: the parent's thread and queue are not ours
+        from app.services.leaderboard_service import RealizedPnL
+
+        self._pid = os.getpid()
+        self.positions = RealizedPnL()
+        # A block prefetched by the parent is the parent's (and its siblings')
+        self._next_ids = None
+        self._id_floor = None
+        self._queue = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="execution-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        events_queue = self._queue
+        while True:
+            batch = [events_queue.get()]
+            # Give a burst time to accumulate, then take up to a batch
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(events_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            events = [event for event in batch if event is not PREFETCH_IDS]
+            if len(events) < len(batch):
+                self._prefetch_ids()
+            if events:
+                self._write_with_retry(events)
+            with self._idle:
+                self._pending -= len(events)
+                self._idle.notify_all()
+
+    def _allocate_ids(self, count: int) -> range:
+        from app.core.cache import cache
+        from app.core.exceptions import TradingError
+
+        if self._id_floor is None:
+            # Keeps the counter ahead of the table (e.g. after a Redis flush)
+            self._id_floor = self.last_order_id()
+        allocate = cache.script(ALLOCATE_IDS_SCRIPT)
+        if allocate is None:
+            raise TradingError("Order entry is unavailable: order ids cannot be allocated")
+        try:
+            end = int(allocate(keys=[ORDER_ID_KEY], args=[count, self._id_floor or 0]))
+        except Exception as e:
+            logger.error(f"Order id allocation failed: {e}")
+            raise TradingError("Order entry is unavailable: order ids cannot be allocated")
+        return range(end - count + 1, end + 1)
+
+    def _prefetch_ids(self) -> None:
+        """Allocate the next order id block ahead of need (writer thread)"""
+        from app.core.exceptions import TradingError
+
+        if self._next_ids is not None:
+            return
+        try:
+            block = self._allocate_ids(self._prefetch_count)
+        except TradingError:
+            return  # allocated on demand instead
+        with self._id_lock:
+            if self._next_ids is None:
+                self._next_ids = block
+
+    def _write_with_retry(self, batch: List) -> None:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                with self.app.app_context():
+                    fills = self._write(batch)
+                break
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS:
+                    self.failed += len(batch)
+                    logger.error(
+                        f"Dropped {len(batch)} execution events after {attempt} attempts: {e}"
+                    )
+                    return
+                time.sleep(0.5 * attempt)
+
+        # The batch is committed: follow-up work is not part of the retry
+        if fills:
+            try:
+                with self.app.app_context():
+                    self._invalidate_reports(fills)
+                    self._record_trades(fills)
+            except Exception as e:
+                logger.error(f"Post-fill updates failed for {len(fills)} fills: {e}")
+
+    def _write(self, batch: List) -> List[dict]:
+        """
+        Write a batch in one transaction
+
+        Either every order, order update and fill of the batch is committed
+        or none is, so a failed batch can be retried as a whole.
+
+        Returns:
+            The fills written
+        """
+        from app.core.database import db
+        from app.models.trading import Fill, Order
+
+        new_orders: Dict[int, dict] = {}
+        changed_orders: Dict[int, dict] = {}
+        fills: List[dict] = []
+
+        for event in batch:
+            if event.kind == "fill":
+                fills.append({
+                    "symbol": event.symbol,
+                    "price": event.price,
+                    "quantity": event.quantity,
+                    "buy_order_id": event.buy_order_id,
+                    "sell_order_id": event.sell_order_id,
+                    "buyer_account_id": event.buyer_account_id,
+                    "seller_account_id": event.seller_account_id,
+                    "taker_side": event.taker_side,
+                    "executed_at": datetime.utcfromtimestamp(event.timestamp),
+                })
+                continue
+
+            if event.is_new or event.order_id in new_orders:
+                new_orders[event.order_id] = {
+                    "id": event.order_id,
+                    "account_id": event.account_id,
+                    "symbol": event.symbol,
+                    "side": event.side,
+                    "order_type": event.order_type,
+                    "status": event.status,
+                    "price": event.price,
+                    "stop_price": event.stop_price,
+                    "quantity": event.quantity,
+                    "filled_quantity": event.filled_quantity,
+                }
+            else:
+                changed_orders[event.order_id] = {
+                    "id": event.order_id,
+                    "status": event.status,
+                    "filled_quantity": event.filled_quantity,
+                }
+
+        session = db.session
+        try:
+            if new_orders:
+                session.bulk_insert_mappings(Order, list(new_orders.values()))
+            if changed_orders:
+                session.bulk_update_mappings(Order, list(changed_orders.values()))
+            if fills:
+                # Ids are read back: trades carry them for leaderboard reconcile
+                session.bulk_insert_mappings(Fill, fills, return_defaults=True)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        self.written["orders"] += len(new_orders) + len(changed_orders)
+        self.written["fills"] += len(fills)
+        return fills
+
+    def _record_trades(self, fills: List[dict]) -> None:
+        """Send the P&L realized by committed fills to the leaderboards"""
+        from app.risk import risk_engine
+        from app.tasks.fills import record_trades
+
+        self._load_positions(fills)
+        # Scores the challenge type boards too (accounts the risk engine tracks)
+        challenge_types = risk_engine.challenge_types_of(
+            {fill["buyer_account_id"] for fill in fills}
+            | {fill["seller_account_id"] for fill in fills}
+        )
+        trades = []
+        for fill in fills:
+            quantity, price = float(fill["quantity"]), float(fill["price"])
+            closed_at = (fill["executed_at"] - EPOCH).total_seconds()
+            for account_id, signed in (
+                (fill["buyer_account_id"], quantity),
+                (fill["seller_account_id"], -quantity),
+            ):
+                realized = self.positions.apply(account_id, fill["symbol"], signed, price)
+                if realized:
+                    trades.append({
+                        "user_id": account_id,
+                        "pnl": realized,
+                        "challenge_type": challenge_types.get(account_id),
+                        "closed_at": closed_at,
+                        "fill_id": fill["id"],
+                    })
+        if trades:
+            record_trades.add(*trades)
+
+    def _load_positions(self, fills: List[dict]) -> None:
+        """Replay the stored fills of positions this process has not seen"""
+        from sqlalchemy import or_
+
+        from app.core.database import db
+        from app.models.trading import Fill
+
+        known = self.positions.positions
+        pairs = set()
+        for fill in fills:
+            for account_id in (fill["buyer_account_id"], fill["seller_account_id"]):
+                if (account_id, fill["symbol"]) not in known:
+                    pairs.add((account_id, fill["symbol"]))
+        if not pairs:
+            return
+
+        accounts = {account_id for account_id, _ in pairs}
+        query = (
+            db.session.query(
+                Fill.buyer_account_id, Fill.seller_account_id, Fill.symbol,
+                Fill.quantity, Fill.price,
+            )
+            .filter(
+                Fill.id < min(fill["id"] for fill in fills),
+                Fill.symbol.in_({symbol for _, symbol in pairs}),
+                or_(Fill.buyer_account_id.in_(accounts), Fill.seller_account_id.in_(accounts)),
+            )
+            .order_by(Fill.executed_at, Fill.id)
+        )
+        for buyer, seller, symbol, quantity, price in query:
+            quantity, price = float(quantity), float(price)
+            for account_id, signed in ((buyer, quantity), (seller, -quantity)):
+                if (account_id, symbol) in pairs:
+                    self.positions.apply(account_id, symbol, signed, price)
+        for pair in pairs:
+            known.setdefault(pair, [0.0, 0.0])
+
+    @staticmethod
+    def _invalidate_reports(fills: List[dict]) -> None:
+        # Cached analytics reports of the accounts that traded are stale
+        from app.services.analytics_service import AnalyticsService
+
+        accounts = set()
+        for fill in fills:
+            accounts.add(fill["buyer_account_id"])
+            accounts.add(fill["seller_account_id"])
+        AnalyticsService.invalidate(accounts)
+
+
+# Global writer instance
+execution_writer = ExecutionWriter()
+
+__all__ = ["ExecutionWriter", "execution_writer"]
@@ -89,12 +89,16 @@ def register_jwt_callbacks(app):
         }), 401
 
 
-def generate_tokens(user: User) -> Tuple[str, str]:
+def generate_tokens(
+    user: User, family_id: Optional[str] = None, generation: int = 0
+) -> Tuple[str, str]:
     """
     Generate access and refresh tokens for user
 
     Args:
         user: User model instance
+        family_id: Refresh token family the pair belongs to (optional)
+        generation: Position of the refresh token within its family
 
     Returns:
         Tuple of (access_token, refresh_token)
@@ -107,14 +111,56 @@ def generate_tokens(user: User) -> Tuple[str, str]:
         "is_verified": user.is_verified,
     }
 
+    return create_token_pair(
+        identity=user.id,
+        claims=additional_claims,
+        family_id=family_id,
+        generation=generation,
+        token_version=user.token_version or 0,
+    )
+
+
+def create_token_pair(
+    identity,
+    claims: Dict,
+    family_id: Optional[str] = None,
+    generation: int = 0,
+    token_version: int = 0,
+) -> Tuple[str, str]:
+    """
+    Create an access/refresh token pair from identity and claims
+
+    The refresh token carries the user claims so a rotation can mint a new
+    access token without loading the user from the database.
+
+    Args:
+        identity: User ID
+        claims: User claims embedded in both tokens
+        family_id: Refresh token family ID (None disables rotation claims)
+        generation: Refresh token generation within the family
+        token_version: User token version the family was issued under
+
+    Returns:
+        Tuple of (access_token, refresh_token)
+    """
+    access_claims = dict(claims)
+    refresh_claims = dict(claims)
+
+    if family_id:
+        access_claims["fam"] = family_id
+        refresh_claims.update(
+            {"fam": family_id, "gen": generation, "tv": token_version}
+        )
+
     # Create tokens
     access_token = create_access_token(
-        identity=user.id,
-        additional_claims=additional_claims
+        identity=identity,
+        additional_claims=access_claims
     )
 
     refresh_token = create_refresh_token(
-        identity=user.id
+        identity=identity,
+        additional_claims=refresh_claims
     )
 
     return access_token, refresh_token
@@ -261,6 +307,7 @@ __all__ = [
     'jwt_manager',
     'init_jwt',
     'generate_tokens',
+    'create_token_pair',
     'get_current_user',
     'require_auth',
     'require_role',
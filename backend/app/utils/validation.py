@@ -0,0 +1,214 @@
+"""
+TradeSense AI Platform - Request Validation
+Precompiled pydantic request schemas applied to views by decorator
+"""
+
+import re
+from functools import wraps
+from typing import Annotated, Any, Callable, ClassVar, Dict, Optional, Type, TypeVar
+
+from flask import current_app, jsonify, request
+from pydantic import AfterValidator, BaseModel, ConfigDict, StringConstraints
+from pydantic import ValidationError as PydanticValidationError
+from pydantic_core import PydanticCustomError
+
+from app.core.exceptions import ValidationError
+
+SchemaT = TypeVar("SchemaT", bound="RequestSchema")
+
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+_LETTER = re.compile(r"[^\W\d_]")
+_DIGIT = re.compile(r"\d")
+
+
+def _password_strength(value: str) -> str:
+    """Require at least one letter and one number"""
+    if not _LETTER.search(value):
+        raise PydanticCustomError(
+            "password_strength", "Password must contain at least one letter"
+        )
+    if not _DIGIT.search(value):
+        raise PydanticCustomError(
+            "password_strength", "Password must contain at least one number"
+        )
+    return value
+
+
+# Reusable field types
+
+EmailAddress = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True, to_lower=True, max_length=255, pattern=EMAIL_PATTERN
+    ),
+]
+Username = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=3, max_length=80)
+]
+PersonName = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)
+]
+Password = Annotated[
+    str,
+    StringConstraints(min_length=8, max_length=128),
+    AfterValidator(_password_strength),
+]
+Token = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=2048)
+]
+
+
+class RequestSchema(BaseModel):
+    """
+    Base class for request body schemas
+
+    Validators are compiled once per class by pydantic-core; bodies are
+    parsed and validated in a single pass with model_validate_json.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    # Largest accepted body in bytes (None = MAX_JSON_BODY_SIZE)
+    max_body_size: ClassVar[Optional[int]] = None
+
+
+def format_errors(error: PydanticValidationError) -> Dict[str, str]:
+    """
+    Convert pydantic errors to {field: message}
+
+    Args:
+        error: Pydantic validation error
+
+    Returns:
+        One message per field
+    """
+    errors = {}
+    for item in error.errors(include_url=False, include_input=False):
+        field = ".".join(str(part) for part in item["loc"]) or "body"
+        if field not in errors:
+            errors[field] = _error_message(field, item)
+    return errors
+
+
+def _error_message(field: str, item: Dict[str, Any]) -> str:
+    label = field.rsplit(".", 1)[-1].replace("_", " ").capitalize()
+    kind = item["type"]
+    ctx = item.get("ctx") or {}
+
+    if kind == "missing":
+        return f"{label} is required"
+    if kind == "string_too_short":
+        if ctx.get("min_length") == 1:
+            return f"{label} is required"
+        return f"{label} must be at least {ctx['min_length']} characters"
+    if kind == "string_too_long":
+        return f"{label} must be at most {ctx['max_length']} characters"
+    if kind == "string_pattern_mismatch":
+        return f"Invalid {label.lower()} format"
+    if kind == "string_type":
+        return f"{label} must be a string"
+    if kind == "extra_forbidden":
+        return "Unknown field"
+    if kind == "json_invalid":
+        return "Malformed JSON body"
+    if kind in ("model_type", "model_attributes_type"):
+        return "Request body must be a JSON object"
+    return item["msg"]
+
+
+def validate_data(schema: Type[SchemaT], data: Any) -> SchemaT:
+    """
+    Validate already-parsed data against a schema
+
+    Args:
+        schema: Request schema class
+        data: Mapping to validate
+
+    Returns:
+        Schema instance
+
+    Raises:
+        ValidationError: With {"errors": {field: message}} payload
+    """
+    try:
+        return schema.model_validate(data)
+    except PydanticValidationError as e:
+        raise ValidationError("Validation failed", payload={"errors": format_errors(e)})
+
+
+def _error_response(status_code: int, error: str, message: str, errors=None):
+    body = {"success": False, "error": error, "message": message}
+    if errors is not None:
+        body["errors"] = errors
+    return jsonify(body), status_code
+
+
+def validate_body(schema: Type[RequestSchema], arg: str = "data") -> Callable:
+    """
+    Decorator validating the JSON request body against a schema
+
+    Oversized bodies are rejected from Content-Length before anything is
+    read, and at most max_body_size + 1 bytes are read from the stream.
+    The validated schema instance is passed to the view as ``arg``.
+
+    Usage:
+        @auth_bp.route('/login', methods=['POST'])
+        @validate_body(LoginSchema)
+        def login(data: LoginSchema):
+            ...
+
+    Args:
+        schema: Request schema class
+        arg: Keyword argument receiving the validated body
+    """
+
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            limit = schema.max_body_size or current_app.config.get(
+                "MAX_JSON_BODY_SIZE", 64 * 1024
+            )
+
+            length = request.content_length
+            if length is not None and length > limit:
+                return _error_response(
+                    413, "PayloadTooLarge", f"Request body exceeds {limit} bytes"
+                )
+
+            if not request.is_json:
+                return _error_response(
+                    415, "UnsupportedMediaType", "Request body must be JSON"
+                )
+
+            body = request.stream.read(limit + 1)
+            if len(body) > limit:
+                return _error_response(
+                    413, "PayloadTooLarge", f"Request body exceeds {limit} bytes"
+                )
+
+            try:
+                kwargs[arg] = schema.model_validate_json(body)
+            except PydanticValidationError as e:
+                return _error_response(
+                    400, "ValidationError", "Validation failed", format_errors(e)
+                )
+
+            return f(*args, **kwargs)
+
+        return decorated
+
+    return decorator
+
+
+__all__ = [
+    "RequestSchema",
+    "EmailAddress",
+    "Username",
+    "PersonName",
+    "Password",
+    "Token",
+    "format_errors",
+    "validate_data",
+    "validate_body",
+]
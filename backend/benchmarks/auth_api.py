@@ -0,0 +1,311 @@
+"""
+TradeSense AI Platform - Auth API Benchmark Suite
+Offline, reproducible benchmarks for the auth endpoints and their hot paths
+
+Runs the app in-process on in-memory SQLite with fakeredis standing in for
+Redis, so no services are needed. Reports throughput and p50/p95/p99
+latency per scenario and writes the results as JSON; --compare diffs them
+against an earlier run (e.g. from the previous commit).
+
+Usage:
+    pip install -r requirements/dev.txt   # fakeredis[lua]
+    python benchmarks/auth_api.py
+    python benchmarks/auth_api.py --output before.json
+    python benchmarks/auth_api.py --compare before.json --max-regression 0.2
+    python benchmarks/auth_api.py --only me health cache_get
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-jwt-secret-key")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+# Iterations per scenario; password hashing scenarios are ~1000x slower
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "2000"))
+HASH_ITERATIONS = int(os.getenv("BENCH_HASH_ITERATIONS", "30"))
+WARMUP = 20
+
+PASSWORD = "b3nchmark-pass"
+
+
+class Scenario:
+    """One benchmarked operation"""
+
+    def __init__(self, name: str, kind: str, run: Callable[[int], None], iterations: int):
+        self.name = name
+        self.kind = kind  # "endpoint" or "micro"
+        self.run = run  # called with the iteration index
+        self.iterations = iterations
+
+
+def measure(scenario: Scenario) -> Dict:
+    """
+    Time every call of a scenario
+
+    Returns:
+        Throughput and latency percentiles in milliseconds
+    """
+    for i in range(min(WARMUP, scenario.iterations)):
+        scenario.run(-1 - i)
+
+    samples: List[float] = []
+    run = scenario.run
+    started = time.perf_counter()
+    for i in range(scenario.iterations):
+        start = time.perf_counter()
+        run(i)
+        samples.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+
+    def percentile(q: float) -> float:
+        return samples[min(int(q / 100 * len(samples)), len(samples) - 1)] * 1000
+
+    return {
+        "kind": scenario.kind,
+        "iterations": scenario.iterations,
+        "ops_per_sec": round(scenario.iterations / elapsed, 1),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 4),
+        "p50_ms": round(percentile(50), 4),
+        "p95_ms": round(percentile(95), 4),
+        "p99_ms": round(percentile(99), 4),
+        "max_ms": round(samples[-1] * 1000, 4),
+    }
+
+
+def build_app():
+    """Testing app on in-memory SQLite with fakeredis behind cache and limiter"""
+    import fakeredis
+
+    from app import create_app
+    from app.core.cache import cache
+    from app.core.database import db
+    from app.middleware.rate_limit import limiter
+
+    app = create_app("testing")
+    server = fakeredis.FakeServer()
+    cache.redis_client = fakeredis.FakeRedis(server=server)
+    limiter.redis_client = fakeredis.FakeRedis(server=server)
+
+    ctx = app.app_context()
+    ctx.push()
+    db.create_all()
+    return app
+
+
+def expect(response, status: int) -> None:
+    if response.status_code != status:
+        raise RuntimeError(
+            f"{response.request.method} {response.request.path}: expected {status}, "
+            f"got {response.status_code} {response.get_data(as_text=True)[:200]}"
+        )
+
+
+def build_scenarios(app) -> List[Scenario]:
+    from app.api.v1.schemas.auth_schemas import RegisterSchema
+    from app.core.cache import cache
+    from app.models.user import User
+    from app.utils.jwt_utils import generate_tokens
+
+    client = app.test_client()
+
+    def register_body(tag) -> Dict:
+        return {
+            "email": f"bench{tag}@example.com",
+            "username": f"bench_{tag}",
+            "password": PASSWORD,
+            "first_name": "Bench",
+            "last_name": "Mark",
+        }
+
+    # Account used by login / refresh / me
+    response = client.post("/api/v1/auth/register", json=register_body("main"))
+    expect(response, 201)
+    tokens = response.get_json()["data"]
+    access_header = {"Authorization": f"Bearer {tokens['access_token']}"}
+    state = {"refresh_token": tokens["refresh_token"]}
+    user = User.query.filter_by(email="benchmain@example.com").first()
+
+    def register(i):
+        expect(client.post("/api/v1/auth/register", json=register_body(f"r{i}")), 201)
+
+    def login(i):
+        expect(
+            client.post(
+                "/api/v1/auth/login",
+                json={"email": "benchmain@example.com", "password": PASSWORD},
+            ),
+            200,
+        )
+
+    def refresh(i):
+        response = client.post(
+            "/api/v1/auth/refresh",
+            headers={"Authorization": f"Bearer {state['refresh_token']}"},
+        )
+        expect(response, 200)
+        state["refresh_token"] = response.get_json()["data"]["refresh_token"]
+
+    def me(i):
+        expect(client.get("/api/v1/auth/me", headers=access_header), 200)
+
+    def me_not_modified(i):
+        # The ETag changes with every login, so take it after the login runs
+        if "me_etag" not in state:
+            state["me_etag"] = client.get("/api/v1/auth/me", headers=access_header).headers["ETag"]
+        expect(
+            client.get(
+                "/api/v1/auth/me",
+                headers={**access_header, "If-None-Match": state["me_etag"]},
+            ),
+            304,
+        )
+
+    def health(i):
+        expect(client.get("/health"), 200)
+
+    valid_body = json.dumps(register_body("valid")).encode()
+    invalid_body = json.dumps({"email": "nope", "username": "x", "password": "short"}).encode()
+    cached_value = {"id": 1, "symbols": ["EURUSD", "BTCUSD"], "equity": 100000.0}
+    cache.set("bench:key", cached_value)
+
+    def validate_valid(i):
+        RegisterSchema.model_validate_json(valid_body)
+
+    def validate_invalid(i):
+        try:
+            RegisterSchema.model_validate_json(invalid_body)
+        except Exception:
+            pass
+
+    return [
+        Scenario("register", "endpoint", register, HASH_ITERATIONS),
+        Scenario("login", "endpoint", login, HASH_ITERATIONS),
+        Scenario("refresh", "endpoint", refresh, ITERATIONS),
+        Scenario("me", "endpoint", me, ITERATIONS),
+        Scenario("me_not_modified", "endpoint", me_not_modified, ITERATIONS),
+        Scenario("health", "endpoint", health, ITERATIONS),
+        Scenario("to_public_dict", "micro", lambda i: user.to_public_dict(), ITERATIONS * 5),
+        Scenario("generate_tokens", "micro", lambda i: generate_tokens(user), ITERATIONS),
+        Scenario("cache_get", "micro", lambda i: cache.get("bench:key"), ITERATIONS * 5),
+        Scenario(
+            "cache_set", "micro", lambda i: cache.set("bench:key", cached_value, 60),
+            ITERATIONS * 5,
+        ),
+        Scenario("validate_register", "micro", validate_valid, ITERATIONS * 5),
+        Scenario("validate_register_invalid", "micro", validate_invalid, ITERATIONS * 5),
+    ]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict, current: Dict, max_regression: Optional[float]) -> int:
+    """
+    Print p50 and throughput changes against a baseline run
+
+    Returns:
+        Number of scenarios whose p50 regressed beyond max_regression
+    """
+    print(
+        f"\nCompared with {baseline['meta'].get('revision') or 'baseline'} "
+        f"({baseline['meta'].get('timestamp', '?')})"
+    )
+    print(f"{'scenario':<28}{'p50 before':>12}{'p50 now':>12}{'change':>9}")
+
+    regressions = 0
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<28}{'-':>12}{result['p50_ms']:>10.3f}ms{'new':>9}")
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        flag = ""
+        if max_regression is not None and change > max_regression:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{name:<28}{before['p50_ms']:>10.3f}ms{result['p50_ms']:>10.3f}ms"
+            f"{change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/auth_api-<rev>.json)")
+    parser.add_argument("--compare", help="Earlier results file to diff against")
+    parser.add_argument(
+        "--max-regression", type=float, default=None,
+        help="Exit 1 when a p50 is this fraction slower than --compare (e.g. 0.2)",
+    )
+    parser.add_argument("--only", nargs="+", help="Run only these scenarios")
+    args = parser.parse_args()
+
+    app = build_app()
+    scenarios = build_scenarios(app)
+    if args.only:
+        scenarios = [s for s in scenarios if s.name in args.only]
+
+    print(f"{'scenario':<28}{'ops/s':>12}{'p50':>11}{'p95':>11}{'p99':>11}")
+    results = {}
+    for scenario in scenarios:
+        result = results[scenario.name] = measure(scenario)
+        print(
+            f"{scenario.name:<28}{result['ops_per_sec']:>12.1f}"
+            f"{result['p50_ms']:>9.3f}ms{result['p95_ms']:>9.3f}ms{result['p99_ms']:>9.3f}ms"
+        )
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "suite": "auth_api",
+            "revision": revision,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": app.config["SQLALCHEMY_DATABASE_URI"],
+            "redis": "fakeredis",
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"auth_api-{revision or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
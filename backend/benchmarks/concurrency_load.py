@@ -0,0 +1,226 @@
+"""
+TradeSense AI Platform - Concurrent Connection Load Test
+Compares sync and eventlet gunicorn workers while slow clients hold
+connections open
+
+For each worker mode a real gunicorn server is started (gunicorn.conf.py,
+SQLite, 2 workers). Then, for an increasing number of slow clients (each
+sends half a request and stalls, like a slow mobile connection or a stuck
+upstream), concurrent probe clients hit /api/v1/ping and the auth login
+endpoint. Sync workers are pinned by the first two slow clients; eventlet
+workers keep serving.
+
+Usage:
+    pip install -r requirements/base.txt   # gunicorn, eventlet
+    python benchmarks/concurrency_load.py
+    python benchmarks/concurrency_load.py --slow-clients 0 16 256 --duration 5
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ("sync", "eventlet")
+WORKERS = 2
+PROBE_TIMEOUT = 3.0  # seconds before a probe request counts as failed
+
+LOGIN_BODY = json.dumps({"email": "load@example.com", "password": "l0adtest-pass"})
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode: str, port: int, db_path: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "ASYNC_MODE": mode,
+        "WORKERS": str(WORKERS),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "FLASK_ENV": "production",
+        "SECRET_KEY": "load-test-secret-key",
+        "JWT_SECRET_KEY": "load-test-jwt-secret-key",
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "REDIS_URL": os.getenv("REDIS_URL", "redis://127.0.0.1:1/0"),
+        "LOG_LEVEL": "ERROR",
+        "GUNICORN_MAX_REQUESTS": "0",
+    })
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "wsgi:app"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if request(port, "GET", "/api/v1/ping")[0] == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def seed_user(db_path: str) -> None:
+    """Create the login user directly in the SQLite database"""
+    env = dict(
+        os.environ,
+        SECRET_KEY="load-test-secret-key",
+        DATABASE_URL=f"sqlite:///{db_path}",
+        LOG_LEVEL="ERROR",
+    )
+    subprocess.run(
+        [
+            sys.executable, "-c",
+            "from app import create_app\n"
+            "from app.core.database import db\n"
+            "from app.models import User\n"
+            "app = create_app('production')\n"
+            "with app.app_context():\n"
+            "    db.create_all()\n"
+            "    user = User(email='load@example.com', username='loadtest',\n"
+            "                first_name='Load', last_name='Test', is_active=True)\n"
+            "    user.set_password('l0adtest-pass')\n"
+            "    user.save()\n",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+
+def request(port: int, method: str, path: str, body: str = None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=PROBE_TIMEOUT)
+    try:
+        headers = {"Content-Type": "application/json"} if body else {}
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status, None
+    finally:
+        conn.close()
+
+
+def open_slow_clients(port: int, count: int) -> list:
+    """Connections that send an incomplete request and then stall"""
+    sockets = []
+    for _ in range(count):
+        s = socket.create_connection(("127.0.0.1", port), timeout=PROBE_TIMEOUT)
+        s.sendall(b"GET /api/v1/ping HTTP/1.1\r\nHost: localhost\r\n")
+        sockets.append(s)
+    return sockets
+
+
+def run_probes(port: int, method: str, path: str, body, concurrency: int, duration: float):
+    latencies, failures = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                status, _ = request(port, method, path, body)
+                ok = status < 500
+            except OSError:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    failures[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+
+    def pct(q):
+        if not latencies:
+            return float("nan")
+        return latencies[min(int(q / 100 * len(latencies)), len(latencies) - 1)]
+
+    return {
+        "rps": len(latencies) / duration,
+        "p50_ms": pct(50),
+        "p99_ms": pct(99),
+        "failed": failures[0],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--slow-clients", type=int, nargs="+", default=[0, 2, 16, 128])
+    parser.add_argument("--concurrency", type=int, default=16, help="Probe clients")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per scenario")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("ping", "GET", "/api/v1/ping", None),
+        ("login", "POST", "/api/v1/auth/login", LOGIN_BODY),
+    ]
+
+    print(
+        f"{WORKERS} workers, {args.concurrency} probe clients, "
+        f"{args.duration:.0f}s per scenario, probe timeout {PROBE_TIMEOUT:.0f}s"
+    )
+    print(f"{'mode':<10}{'slow':>6}{'endpoint':>10}{'req/s':>10}{'p50':>10}{'p99':>10}{'failed':>8}")
+
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "load.db")
+            seed_user(db_path)
+            port = free_port()
+            try:
+                server = start_server(mode, port, db_path)
+            except RuntimeError as e:
+                print(f"{mode:<10}skipped: {e}")
+                continue
+
+            try:
+                for slow in args.slow_clients:
+                    slow_sockets = open_slow_clients(port, slow)
+                    try:
+                        for name, method, path, body in scenarios:
+                            result = run_probes(
+                                port, method, path, body, args.concurrency, args.duration
+                            )
+                            print(
+                                f"{mode:<10}{slow:>6}{name:>10}{result['rps']:>10.0f}"
+                                f"{result['p50_ms']:>8.1f}ms{result['p99_ms']:>8.1f}ms"
+                                f"{result['failed']:>8}"
+                            )
+                    finally:
+                        for s in slow_sockets:
+                            s.close()
+            finally:
+                # SIGINT: quick shutdown, without waiting for stalled clients
+                server.send_signal(signal.SIGINT)
+                server.wait(timeout=30)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
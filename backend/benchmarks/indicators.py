@@ -0,0 +1,158 @@
+"""
+TradeSense AI Platform - Indicator Engine Benchmark
+Batch vs incremental indicator computation
+
+For every indicator in app.signals.INDICATORS:
+
+- batch:        one vectorized call over a (symbols, bars) array
+- incremental:  streaming state updated bar by bar (the live-data path),
+                timed over a subset of symbols and reported per update
+- agreement:    largest difference between the two on the same series
+
+plus the engine's compute_many() over a bar store, cold and cached.
+
+Usage:
+    python benchmarks/indicators.py
+    python benchmarks/indicators.py --symbols 5000 --bars 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+
+
+def generate(symbols: int, bars: int, seed: int = 5) -> dict:
+    """Random-walk OHLCV columns of shape (symbols, bars)"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.5, (symbols, bars)), axis=1)
+    spread = rng.random((symbols, bars))
+    start = 1_700_000_000 - 1_700_000_000 % 60
+    return {
+        "timestamp": start + np.arange(bars, dtype=np.int64) * 60,
+        "open": close - rng.normal(0.0, 0.2, (symbols, bars)),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.random((symbols, bars)) * 100.0,
+    }
+
+
+def row_inputs(indicator, columns: dict, row: int) -> list:
+    return [
+        (columns[name] if name == "timestamp" else columns[name][row]).tolist()
+        for name in indicator.inputs
+    ]
+
+
+def bench_indicator(indicator, columns: dict, stream_symbols: int) -> dict:
+    symbols, bars = columns["close"].shape
+    params = indicator.defaults
+
+    started = time.perf_counter()
+    result = indicator.compute(columns, params)
+    batch_s = time.perf_counter() - started
+
+    updates = 0
+    error = 0.0
+    started = time.perf_counter()
+    for row in range(stream_symbols):
+        state = indicator.stream(**params)
+        update = state.update
+        values = [update(*bar) for bar in zip(*row_inputs(indicator, columns, row))]
+        updates += len(values)
+        if row == 0:
+            streamed = np.array(values, dtype=float).reshape(bars, -1)
+    stream_s = time.perf_counter() - started
+
+    for index, output in enumerate(indicator.outputs):
+        difference = np.abs(result[output][0] - streamed[:, index])
+        if np.any(~np.isnan(difference)):
+            error = max(error, float(np.nanmax(difference)))
+
+    return {
+        "batch_ms": batch_s * 1000,
+        "batch_bars_per_sec": symbols * bars / batch_s,
+        "stream_us": stream_s / updates * 1e6,
+        "stream_bars_per_sec": updates / stream_s,
+        "max_error": error,
+    }
+
+
+def bench_engine(columns: dict, symbols: int, limit: int) -> dict:
+    from app.market_data.bars import BarStore
+    from app.signals import IndicatorEngine
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore()
+        store.root = root
+        store.writable = True
+        names = [f"SYM{i:05d}" for i in range(symbols)]
+        for row, symbol in enumerate(names):
+            store.append(
+                symbol, "1m", timestamp=columns["timestamp"],
+                **{name: columns[name][row] for name in ("open", "high", "low", "close", "volume")},
+            )
+
+        engine = IndicatorEngine(store=store)
+        timings = {}
+        for label in ("cold", "cached"):
+            started = time.perf_counter()
+            engine.compute_many(names, "1m", "macd", limit=limit)
+            timings[label] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for symbol in names:
+            engine.latest(symbol, "1m", "rsi")
+        timings["latest_warmup"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        for symbol in names:
+            engine.latest(symbol, "1m", "rsi")
+        timings["latest"] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--stream-symbols", type=int, default=20, help="Symbols timed bar by bar")
+    parser.add_argument("--engine-symbols", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.signals import INDICATORS
+
+    columns = generate(args.symbols, args.bars)
+    print(f"{args.symbols} symbols x {args.bars} bars\n")
+    print(
+        f"{'indicator':<11}{'batch':>10}{'batch bars/s':>15}"
+        f"{'per update':>12}{'stream bars/s':>15}{'speedup':>9}{'max diff':>11}"
+    )
+    for name, indicator in INDICATORS.items():
+        stats = bench_indicator(indicator, columns, min(args.stream_symbols, args.symbols))
+        print(
+            f"{name:<11}{stats['batch_ms']:>8.1f}ms{stats['batch_bars_per_sec']:>15,.0f}"
+            f"{stats['stream_us']:>10.2f}us{stats['stream_bars_per_sec']:>15,.0f}"
+            f"{stats['batch_bars_per_sec'] / stats['stream_bars_per_sec']:>8.0f}x"
+            f"{stats['max_error']:>11.1e}"
+        )
+
+    symbols = min(args.engine_symbols, args.symbols)
+    engine = bench_engine(columns, symbols, args.bars)
+    print(f"\nengine, {symbols} symbols from the bar store:")
+    print(f"  compute_many(macd)  cold {engine['cold']:.1f}ms  cached {engine['cached']:.1f}ms")
+    print(
+        f"  latest(rsi)         warm-up {engine['latest_warmup']:.1f}ms  "
+        f"no new bars {engine['latest']:.1f}ms ({engine['latest'] / symbols * 1000:.1f}us per symbol)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+TradeSense AI Platform - JSON Serialization Benchmark
+Compares response serialization of a 1,000-row user list with the stdlib
+provider, the fast provider and response compression
+
+Usage:
+    python benchmarks/json_serialization.py
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROWS = int(os.getenv("BENCH_ROWS", "1000"))
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "200"))
+
+
+def build_rows(count: int) -> list:
+    """Rows shaped like User.to_public_dict()"""
+    now = datetime.utcnow()
+    return [
+        {
+            "id": i,
+            "username": f"trader_{i}",
+            "email": f"trader_{i}@example.com",
+            "first_name": "Jane",
+            "last_name": f"Doe {i}",
+            "role": "user",
+            "is_active": True,
+            "is_verified": i % 3 == 0,
+            "created_at": now - timedelta(days=i),
+            "last_login": now - timedelta(minutes=i) if i % 4 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def isoformat_rows(rows: list) -> list:
+    """The previous to_public_dict output: datetimes pre-formatted per row"""
+    return [
+        {
+            **row,
+            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+            "last_login": row["last_login"].isoformat() if row["last_login"] else None,
+        }
+        for row in rows
+    ]
+
+
+def measure(fn, iterations: int) -> float:
+    """Average milliseconds per call"""
+    for _ in range(10):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main() -> None:
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+
+    from app.core.serialization import FastJSONProvider
+    from app.middleware.compression import Compressor, brotli
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    rows = build_rows(ROWS)
+
+    with app.app_context():
+        baseline = measure(
+            lambda: stdlib.response({"success": True, "data": isoformat_rows(rows)}),
+            ITERATIONS,
+        )
+        provider = measure(
+            lambda: fast.response({"success": True, "data": rows}), ITERATIONS
+        )
+
+    body = fast.dumps_bytes({"success": True, "data": rows})
+    compressor = Compressor()
+
+    print(f"rows:                      {ROWS}")
+    print(f"fast provider backend:     {fast.backend}")
+    print(f"stdlib + isoformat:        {baseline:8.2f} ms/response")
+    print(f"fast provider:             {provider:8.2f} ms/response ({baseline / provider:.1f}x)")
+    print(f"body size:                 {len(body):8d} bytes")
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        elapsed = measure(lambda: compressor.compress(body, encoding), ITERATIONS)
+        size = len(compressor.compress(body, encoding))
+        print(
+            f"{encoding + ' compression:':<27}{elapsed:8.2f} ms "
+            f"-> {size} bytes ({size / len(body):.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
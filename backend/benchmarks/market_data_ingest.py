@@ -0,0 +1,142 @@
+"""
+TradeSense AI Platform - Market Data Ingestion Benchmark
+Throughput and end-to-end latency of the tick ingestion pipeline
+
+Generates a tick file (random walks over many symbols) and replays it
+through MarketDataIngestor:
+
+- unpaced:  as fast as the file can be read, for several publish intervals
+            (more coalescing per write as the interval grows)
+- paced:    at a fixed tick rate, reporting receive -> Redis latency
+- per-tick: baseline writing every tick with its own HSET round trip
+
+Redis is fakeredis unless --redis-url points at a server (a real server
+adds network round trips, which the per-tick baseline pays per tick and
+the pipeline once per publish).
+
+Usage:
+    python benchmarks/market_data_ingest.py
+    python benchmarks/market_data_ingest.py --ticks 1000000 --symbols 2000 --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def write_tick_file(path: str, ticks: int, symbols: int, rate: float, seed: int = 3) -> None:
+    """CSV ticks, `rate` per second of feed time, random symbol per tick"""
+    rng = random.Random(seed)
+    prices = [100.0 + i for i in range(symbols)]
+    start = 1_700_000_000.0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "symbol", "bid", "ask", "last", "volume"])
+        for i in range(ticks):
+            index = rng.randrange(symbols)
+            price = prices[index] = max(0.01, prices[index] + rng.uniform(-0.05, 0.05))
+            writer.writerow([
+                f"{start + i / rate:.6f}", f"SYM{index:05d}",
+                f"{price - 0.01:.4f}", f"{price + 0.01:.4f}", f"{price:.4f}", rng.randint(1, 100),
+            ])
+
+
+def redis_client(url):
+    if url:
+        import redis
+
+        client = redis.Redis.from_url(url)
+        client.flushdb()
+        return client
+
+    import fakeredis
+
+    return fakeredis.FakeRedis()
+
+
+def run(path: str, client, interval: float, speed=None, duration=None) -> dict:
+    from app.market_data import FileTickSource, MarketDataIngestor
+
+    ingestor = MarketDataIngestor(
+        FileTickSource(path, speed=speed),
+        refresh_interval=interval,
+        client_factory=lambda: client,
+    )
+    return ingestor.run(duration=duration)
+
+
+def run_per_tick(path: str, client, limit: int) -> dict:
+    """Baseline: parse and write each tick with its own command"""
+    from app.market_data.quotes import QUOTES_KEY, pack_quote
+    from app.market_data.sources import FileTickSource
+
+    rows = FileTickSource._csv_rows(open(path, newline=""))
+    started = time.perf_counter()
+    count = 0
+    for symbol, timestamp, bid, ask, last, volume in rows:
+        client.hset(QUOTES_KEY, symbol, pack_quote(bid, ask, last, volume, timestamp))
+        count += 1
+        if count >= limit:
+            break
+    elapsed = time.perf_counter() - started
+    return {"ticks": count, "ticks_per_sec": round(count / elapsed, 1), "commands": count}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=300000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.01, 0.1, 1.0])
+    parser.add_argument("--paced-rate", type=float, default=20000, help="Ticks/s of the paced run")
+    parser.add_argument("--paced-seconds", type=float, default=3.0)
+    parser.add_argument("--redis-url", help="Real Redis to write to (default: fakeredis)")
+    args = parser.parse_args()
+
+    client = redis_client(args.redis_url)
+    backend = args.redis_url or "fakeredis"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.csv")
+        write_tick_file(path, args.ticks, args.symbols, args.paced_rate)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"{args.ticks} ticks, {args.symbols} symbols ({size_mb:.1f} MB CSV), Redis: {backend}\n")
+
+        print(
+            f"{'run':<22}{'ticks/s':>11}{'writes':>9}{'coalesce':>10}"
+            f"{'lat p50':>10}{'lat p99':>10}{'pub p99':>10}"
+        )
+        for interval in args.intervals:
+            stats = run(path, client, interval)
+            print(
+                f"{f'unpaced {interval:g}s':<22}{stats['ticks_per_sec']:>11,.0f}"
+                f"{stats['publishes']:>9}{stats['coalescing_ratio']:>9.1f}x"
+                f"{stats['latency']['p50_ms']:>8.1f}ms{stats['latency']['p99_ms']:>8.1f}ms"
+                f"{stats['publish_time']['p99_ms']:>8.1f}ms"
+            )
+
+        interval = min(args.intervals)
+        stats = run(path, client, interval, speed=1.0, duration=args.paced_seconds)
+        print(
+            f"{f'paced {args.paced_rate:g}/s {interval:g}s':<22}{stats['ticks_per_sec']:>11,.0f}"
+            f"{stats['publishes']:>9}{stats['coalescing_ratio']:>9.1f}x"
+            f"{stats['latency']['p50_ms']:>8.1f}ms{stats['latency']['p99_ms']:>8.1f}ms"
+            f"{stats['publish_time']['p99_ms']:>8.1f}ms"
+        )
+
+        baseline = run_per_tick(path, client, min(args.ticks, 50000))
+        print(
+            f"{'per-tick HSET':<22}{baseline['ticks_per_sec']:>11,.0f}"
+            f"{baseline['commands']:>9}{1.0:>9.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
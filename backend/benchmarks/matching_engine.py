@@ -0,0 +1,201 @@
+"""
+TradeSense AI Platform - Matching Engine Benchmark
+Throughput and latency of the paper trading engine on one core
+
+Replays a pre-generated, seeded order flow (limit orders around a drifting
+mid price, market, IOC and stop orders, and cancels) through:
+
+- book:    OrderBook matching alone (no accounts, ids or events)
+- engine:  MatchingEngine.submit / cancel with paper accounts
+- events:  as engine, with a listener queueing every event the way the
+           write-behind ExecutionWriter does
+
+Usage:
+    python benchmarks/matching_engine.py
+    python benchmarks/matching_engine.py --orders 1000000 --min-rate 200000
+"""
+
+import argparse
+import os
+import queue
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SYMBOL = "BTCUSD"
+ACCOUNTS = 100
+LATENCY_SAMPLE_EVERY = 50
+
+# (action, account, side, order_type, quantity, price, stop_price)
+Action = Tuple[str, int, str, str, float, float, float]
+
+
+def generate_flow(count: int, seed: int) -> List[Action]:
+    """Seeded order flow: 65% limit, 15% cancel, 8% market, 8% IOC, 4% stop"""
+    rng = random.Random(seed)
+    mid = 50000.0
+    flow: List[Action] = []
+    for _ in range(count):
+        mid = max(1000.0, mid + rng.choice((-0.5, 0.0, 0.5)))
+        account = rng.randrange(ACCOUNTS)
+        side = "buy" if rng.random() < 0.5 else "sell"
+        quantity = rng.randint(1, 50) / 100
+        roll = rng.random()
+        if roll < 0.65:
+            offset = rng.randint(0, 40) * 0.5
+            price = mid - offset if side == "buy" else mid + offset
+            flow.append(("submit", account, side, "limit", quantity, round(price, 2), None))
+        elif roll < 0.80:
+            flow.append(("cancel", account, None, None, None, None, None))
+        elif roll < 0.88:
+            flow.append(("submit", account, side, "market", quantity, None, None))
+        elif roll < 0.96:
+            offset = rng.randint(0, 10) * 0.5
+            price = mid + offset if side == "buy" else mid - offset
+            flow.append(("submit", account, side, "ioc", quantity, round(price, 2), None))
+        else:
+            offset = rng.randint(5, 40) * 0.5
+            stop = mid + offset if side == "buy" else mid - offset
+            flow.append(("submit", account, side, "stop", quantity, None, round(stop, 2)))
+    return flow
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    samples.sort()
+
+    def pct(q: float) -> float:
+        return samples[min(int(q / 100 * len(samples)), len(samples) - 1)] * 1e6
+
+    return {"p50_us": pct(50), "p99_us": pct(99), "max_us": samples[-1] * 1e6}
+
+
+def run_book(flow: List[Action]) -> Dict:
+    """Raw OrderBook: limit/market/IOC matching and cancels, integer units"""
+    from app.trading.order_book import BookOrder, OrderBook
+
+    book = OrderBook(SYMBOL)
+    open_ids: List[int] = []
+    prepared = []
+    for action, account, side, order_type, quantity, price, _ in flow:
+        if action == "cancel" or order_type == "stop":
+            prepared.append(None)
+        else:
+            ticks = round(price * 100) if price is not None else None
+            prepared.append((account, side, order_type, round(quantity * 10000), ticks))
+
+    rng = random.Random(1)
+    samples: List[float] = []
+    next_id = 0
+    started = time.perf_counter()
+    for i, item in enumerate(prepared):
+        sample = i % LATENCY_SAMPLE_EVERY == 0
+        if sample:
+            t0 = time.perf_counter()
+        if item is None:
+            if open_ids:
+                index = rng.randrange(len(open_ids))
+                open_ids[index], open_ids[-1] = open_ids[-1], open_ids[index]
+                book.cancel(open_ids.pop())
+        else:
+            account, side, order_type, lots, ticks = item
+            next_id += 1
+            order = BookOrder(next_id, account, SYMBOL, side, order_type, lots, ticks)
+            book.match(order, ticks)
+            if order.remaining and order_type == "limit":
+                book.rest(order)
+                open_ids.append(next_id)
+        if sample:
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "samples": samples, "resting": len(book)}
+
+
+def run_engine(flow: List[Action], with_events: bool) -> Dict:
+    """Full MatchingEngine path, optionally with a queueing listener"""
+    from app.core.exceptions import TradingError
+    from app.trading.engine import MatchingEngine
+
+    engine = MatchingEngine()
+    for account in range(ACCOUNTS):
+        engine.open_account(account, cash=1e12, positions={SYMBOL: 1e6})
+
+    events: "queue.SimpleQueue" = queue.SimpleQueue()
+    if with_events:
+        engine.subscribe(events.put)
+
+    rng = random.Random(1)
+    open_ids: List[int] = []
+    samples: List[float] = []
+    rejected = 0
+    submit, cancel = engine.submit, engine.cancel
+    started = time.perf_counter()
+    for i, (action, account, side, order_type, quantity, price, stop) in enumerate(flow):
+        sample = i % LATENCY_SAMPLE_EVERY == 0
+        if sample:
+            t0 = time.perf_counter()
+        try:
+            if action == "cancel":
+                if open_ids:
+                    index = rng.randrange(len(open_ids))
+                    open_ids[index], open_ids[-1] = open_ids[-1], open_ids[index]
+                    cancel(open_ids.pop())
+            else:
+                order = submit(account, SYMBOL, side, order_type, quantity, price, stop)
+                if order.status in ("new", "partially_filled", "pending"):
+                    open_ids.append(order.id)
+        except TradingError:
+            # Cancels of orders that filled meanwhile
+            rejected += 1
+        if sample:
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed": elapsed,
+        "samples": samples,
+        "fills": engine.fill_count,
+        "events": events.qsize(),
+        "rejected": rejected,
+        "resting": engine.stats()["open_orders"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--orders", type=int, default=300000, help="Actions per run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--min-rate", type=float, default=None,
+        help="Exit 1 when the engine run is slower than this many actions/s",
+    )
+    args = parser.parse_args()
+
+    flow = generate_flow(args.orders, args.seed)
+    print(f"{args.orders} actions, seed {args.seed}, Python {sys.version.split()[0]}")
+    print(f"{'run':<8}{'actions/s':>12}{'p50':>10}{'p99':>10}{'max':>10}{'fills':>9}{'resting':>9}")
+
+    results = {
+        "book": run_book(flow),
+        "engine": run_engine(flow, with_events=False),
+        "events": run_engine(flow, with_events=True),
+    }
+    for name, result in results.items():
+        rate = args.orders / result["elapsed"]
+        latency = percentiles(result["samples"])
+        print(
+            f"{name:<8}{rate:>12,.0f}{latency['p50_us']:>8.1f}us{latency['p99_us']:>8.1f}us"
+            f"{latency['max_us']:>8.0f}us{result.get('fills', '-'):>9}{result['resting']:>9}"
+        )
+
+    engine_rate = args.orders / results["engine"]["elapsed"]
+    if args.min_rate is not None and engine_rate < args.min_rate:
+        print(f"\nFAIL: engine ran {engine_rate:,.0f} actions/s, below {args.min_rate:,.0f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
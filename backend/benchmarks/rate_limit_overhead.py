@@ -0,0 +1,74 @@
+"""
+TradeSense AI Platform - Rate Limiter Overhead Benchmark
+Measures per-request cost of the rate limiter against a live Redis, or
+offline against fakeredis when RATELIMIT_STORAGE_URL is not set
+
+Usage:
+    RATELIMIT_STORAGE_URL=redis://localhost:6379/3 python benchmarks/rate_limit_overhead.py
+    python benchmarks/rate_limit_overhead.py   # fakeredis (no network round trips)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "5000"))
+
+
+def measure(app, path: str, requests: int) -> float:
+    """Average microseconds per request through the test client"""
+    client = app.test_client()
+    for _ in range(100):
+        client.get(path)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    from app import create_app
+    from app.core.config import TestingConfig
+    from app.middleware.rate_limit import limiter
+
+    TestingConfig.RATELIMIT_ENABLED = False
+    baseline = measure(create_app("testing"), "/api/v1/ping", REQUESTS)
+
+    TestingConfig.RATELIMIT_ENABLED = True
+    TestingConfig.RATELIMIT_DEFAULT = "1000000 per hour"
+    if os.getenv("RATELIMIT_STORAGE_URL"):
+        TestingConfig.RATELIMIT_STORAGE_URL = os.environ["RATELIMIT_STORAGE_URL"]
+    app = create_app("testing")
+    if not os.getenv("RATELIMIT_STORAGE_URL"):
+        import fakeredis
+
+        from app.middleware.rate_limit import GCRA_SCRIPT
+
+        limiter.redis_client = fakeredis.FakeRedis()
+        limiter._script = limiter.redis_client.register_script(GCRA_SCRIPT)
+    limiter.redis_client.flushdb()
+
+    # Count Redis round trips to report how often the local pre-filter answers
+    calls = {"redis": 0}
+    script = limiter._script
+
+    def counting_script(*args, **kwargs):
+        calls["redis"] += 1
+        return script(*args, **kwargs)
+
+    limiter._script = counting_script
+    limited = measure(app, "/api/v1/ping", REQUESTS)
+
+    print(f"redis:               {os.getenv('RATELIMIT_STORAGE_URL', 'fakeredis')}")
+    print(f"requests:            {REQUESTS}")
+    print(f"baseline:            {baseline:8.1f} us/request")
+    print(f"with rate limiter:   {limited:8.1f} us/request")
+    print(f"overhead:            {limited - baseline:8.1f} us/request")
+    print(f"redis round trips:   {calls['redis']} ({calls['redis'] / (REQUESTS + 100):.1%} of checks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+TradeSense AI Platform - Real-Time Gateway Load Test
+Quote fan-out throughput and latency of app.realtime.gateway, in-process
+
+Opens --clients sessions, each subscribed to --subscriptions random
+symbols out of --symbols, and a --binary fraction of them using binary
+frames. Then it replays --rate random quotes per second for --duration
+seconds in real time. Quotes are injected in --batches batches per frame
+interval (as the ingestion pipeline publishes them), and frames are
+flushed every --frame-interval like the gateway's frame task.
+
+Frames go to an in-memory transport instead of sockets, so the numbers
+are the gateway's own cost, without network or client parsing. Clients
+acknowledge each frame at once, except a --slow fraction that never
+acknowledges and shows the bounded backlog (skipped frames).
+
+Reports:
+- frames/s:      socket messages sent
+- quotes/s:      quotes delivered inside them
+- coalescing:    per-tick emits (every quote to every subscriber) per
+                 quote actually delivered
+- latency:       quote injection to frame send, over a sample of clients
+- flush:         time of one flush_frames() pass (the frame task's CPU cost)
+
+Usage:
+    python benchmarks/realtime_gateway.py
+    python benchmarks/realtime_gateway.py --clients 10000 --rate 50000 --duration 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.realtime import QUOTE_RECORD, RealtimeGateway  # noqa: E402
+
+SAMPLED_CLIENTS = 200  # clients whose frames are kept for the latency distribution
+
+
+def percentiles(samples) -> dict:
+    values = sorted(samples)
+    if not values:
+        return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    def at(fraction):
+        return values[min(int(fraction * len(values)), len(values) - 1)] * 1000
+
+    return {"p50_ms": at(0.50), "p99_ms": at(0.99), "max_ms": values[-1] * 1000}
+
+
+class Transport:
+    """Records frames; fast clients acknowledge immediately"""
+
+    def __init__(self, slow: set, sampled: set):
+        self.slow = slow
+        self.sampled = sampled
+        self.frames = 0
+        self.bytes = 0
+        self.kept = []  # (send time, frame) of sampled clients
+
+    def __call__(self, sid, frame, ack):
+        self.frames += 1
+        if "b" in frame:
+            self.bytes += len(frame["b"])
+        if sid in self.sampled:
+            self.kept.append((time.perf_counter(), frame))
+        if sid not in self.slow:
+            ack()
+
+
+def latencies(kept) -> list:
+    """Send time minus injection time of every sampled quote"""
+    samples = []
+    for sent, frame in kept:
+        if "q" in frame:
+            samples.extend(sent - quote[5] for quote in frame["q"])
+        elif "b" in frame:
+            samples.extend(sent - values[5] for values in QUOTE_RECORD.iter_unpack(frame["b"]))
+    return samples
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    names = [f"SYM{i:04d}" for i in range(args.symbols)]
+    sids = [f"client-{i}" for i in range(args.clients)]
+    slow = set(rng.sample(sids, int(args.clients * args.slow)))
+    sampled = set(sid for sid in sids[:SAMPLED_CLIENTS] if sid not in slow)
+    transport = Transport(slow, sampled)
+
+    gateway = RealtimeGateway(transport=transport)
+    gateway.frame_interval = args.frame_interval
+    gateway.max_symbols = max(args.subscriptions, gateway.max_symbols)
+    for index, sid in enumerate(sids):
+        # Signed-in clients: anonymous ones may only subscribe to quoted symbols
+        gateway.open_session(sid, account_id=index, binary=index % 100 < args.binary * 100)
+        gateway.subscribe(sid, rng.sample(names, args.subscriptions))
+    fanout = {symbol: len(sids) for symbol, sids in gateway._subscribers.items()}
+
+    per_batch = max(int(args.rate * args.frame_interval / args.batches), 1)
+    pause = args.frame_interval / args.batches
+    marked = injected = 0
+    flush_times = []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    frame_start = started
+    while time.perf_counter() < deadline:
+        # Fixed schedule: a slow flush delays the next batches, not the rate
+        for batch in range(args.batches):
+            now = time.perf_counter()
+            quotes = []
+            for symbol in rng.choices(names, k=per_batch):
+                price = rng.uniform(20.0, 500.0)
+                quotes.append([symbol, price - 0.01, price + 0.01, price, 1.0, now])
+                marked += fanout.get(symbol, 0)
+            injected += gateway.apply_quotes(quotes)
+            remaining = frame_start + pause * (batch + 1) - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        flush_start = time.perf_counter()
+        gateway.flush_frames()
+        flush_times.append(time.perf_counter() - flush_start)
+        frame_start += args.frame_interval
+    elapsed = time.perf_counter() - started
+
+    stats = gateway.stats()
+    return {
+        "elapsed": elapsed,
+        "ticks_per_sec": injected / elapsed,
+        "frames_per_sec": transport.frames / elapsed,
+        "quotes_per_sec": stats["quotes"] / elapsed,
+        "coalescing": marked / stats["quotes"] if stats["quotes"] else 0.0,
+        "binary_bytes_per_sec": transport.bytes / elapsed,
+        "latency": percentiles(latencies(transport.kept)),
+        "flush": percentiles(flush_times),
+        "stats": stats,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--subscriptions", type=int, default=20, help="Symbols per client")
+    parser.add_argument("--rate", type=int, default=20000, help="Quotes per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds")
+    parser.add_argument("--frame-interval", type=float, default=0.1, help="Seconds")
+    parser.add_argument("--batches", type=int, default=4, help="Quote batches per frame interval")
+    parser.add_argument("--binary", type=float, default=0.5, help="Fraction of binary clients")
+    parser.add_argument("--slow", type=float, default=0.05, help="Fraction of clients that never ack")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    result = run(args)
+    print(
+        f"{args.clients} clients x {args.subscriptions} of {args.symbols} symbols, "
+        f"{result['ticks_per_sec']:,.0f} quotes/s in, frame every {args.frame_interval * 1000:.0f}ms\n"
+    )
+    print(f"frames/s      {result['frames_per_sec']:>12,.0f}")
+    print(f"quotes/s      {result['quotes_per_sec']:>12,.0f}")
+    print(f"coalescing    {result['coalescing']:>12.1f}x")
+    print(f"binary        {result['binary_bytes_per_sec'] / 1e6:>12.2f} MB/s")
+    for label in ("latency", "flush"):
+        stats = result[label]
+        print(f"{label:<14}p50 {stats['p50_ms']:.2f}ms  p99 {stats['p99_ms']:.2f}ms  max {stats['max_ms']:.2f}ms")
+    print(f"\n{result['stats']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+TradeSense AI Platform - Request Validation Benchmark
+Compares registration body validation with the previous marshmallow schema
+plus service-level re-validation against the precompiled pydantic schema
+
+Usage:
+    pip install marshmallow==3.20.1   # baseline only (requirements/dev.txt)
+    python benchmarks/request_validation.py
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "20000"))
+
+VALID_BODY = json.dumps({
+    "email": "trader@example.com",
+    "username": "trader_one",
+    "password": "s3curepassword",
+    "first_name": "Jane",
+    "last_name": "Doe",
+}).encode()
+
+INVALID_BODY = json.dumps({
+    "email": "not-an-email",
+    "username": "ab",
+    "password": "short",
+    "first_name": "",
+}).encode()
+
+
+def build_baseline():
+    """The previous validation path: marshmallow load, then the service checks"""
+    from marshmallow import Schema, ValidationError, fields, validate
+
+    class RegisterSchema(Schema):
+        email = fields.Email(required=True)
+        username = fields.Str(required=True, validate=validate.Length(min=3, max=80))
+        password = fields.Str(required=True, validate=validate.Length(min=8, max=128))
+        first_name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+        last_name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+
+    schema = RegisterSchema()
+
+    def service_checks(data):
+        errors = {}
+        if "@" not in data["email"] or "." not in data["email"]:
+            errors["email"] = "Invalid email format"
+        username = data["username"].strip()
+        if len(username) < 3 or len(username) > 80:
+            errors["username"] = "Invalid username length"
+        password = data["password"]
+        if not any(c.isalpha() for c in password) or not any(c.isdigit() for c in password):
+            errors["password"] = "Weak password"
+        if not data["first_name"].strip() or not data["last_name"].strip():
+            errors["name"] = "Name is required"
+        return errors
+
+    def validate_body(body: bytes):
+        try:
+            data = schema.load(json.loads(body))
+        except ValidationError as e:
+            return e.messages
+        return service_checks(data)
+
+    return validate_body
+
+
+def build_current():
+    """The current path: one pydantic-core pass over the raw body"""
+    from pydantic import ValidationError
+
+    from app.api.v1.schemas.auth_schemas import RegisterSchema
+    from app.utils.validation import format_errors
+
+    def validate_body(body: bytes):
+        try:
+            return RegisterSchema.model_validate_json(body)
+        except ValidationError as e:
+            return format_errors(e)
+
+    return validate_body
+
+
+def measure(fn, body: bytes, iterations: int) -> float:
+    """Validations per second"""
+    for _ in range(100):
+        fn(body)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(body)
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    current = build_current()
+    try:
+        baseline = build_baseline()
+    except ImportError:
+        baseline = None
+        print("marshmallow not installed - reporting the current path only\n")
+
+    print(f"iterations: {ITERATIONS}")
+    for name, body in (("valid body", VALID_BODY), ("invalid body", INVALID_BODY)):
+        after = measure(current, body, ITERATIONS)
+        if baseline is None:
+            print(f"{name:<14} pydantic: {after:10,.0f}/s")
+            continue
+        before = measure(baseline, body, ITERATIONS)
+        print(
+            f"{name:<14} marshmallow: {before:10,.0f}/s   "
+            f"pydantic: {after:10,.0f}/s   ({after / before:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
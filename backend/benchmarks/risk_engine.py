@@ -0,0 +1,155 @@
+"""
+TradeSense AI Platform - Risk Engine Benchmark
+Per-tick challenge rule enforcement over many accounts
+
+Opens --accounts challenge accounts (mixed types and phases), gives each
+a few positions across --symbols symbols, then replays random-walk price
+updates through RiskEngine.update_prices:
+
+- single:   one symbol per update (a live tick)
+- batch:    --batch symbols per update (a coalesced publish interval)
+- full:     baseline re-marking every position and checking every account
+            per update, i.e. what the engine does without the symbol index
+
+Latency is the time from update_prices() being called to its events being
+delivered to a listener, so it bounds how late a breach is reported.
+
+Usage:
+    python benchmarks/risk_engine.py
+    python benchmarks/risk_engine.py --accounts 100000 --symbols 500 --updates 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+
+
+def percentiles(samples) -> dict:
+    values = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def build(accounts: int, symbols: int, positions: int, seed: int):
+    from app.risk import RiskEngine
+
+    rng = np.random.default_rng(seed)
+    engine = RiskEngine()
+    names = [f"SYM{i:04d}" for i in range(symbols)]
+    prices = rng.uniform(20.0, 500.0, symbols)
+    types, phases = engine.challenge_types, engine.phases
+
+    started = time.perf_counter()
+    for account_id in range(1, accounts + 1):
+        engine.open_account(account_id, types[account_id % len(types)], phases[account_id % len(phases)])
+    opened = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fills = 0
+    now = time.time()
+    for account_id in range(1, accounts + 1):
+        balance = engine.balances[types[account_id % len(types)]]
+        for symbol in rng.choice(symbols, positions, replace=False):
+            # Up to ~40% of the balance per position, long or short
+            quantity = rng.uniform(-0.4, 0.4) * balance / positions / prices[symbol]
+            engine.apply_fill(account_id, names[symbol], quantity, prices[symbol], now)
+            fills += 1
+    filled = time.perf_counter() - started
+    return engine, names, prices, {"open_per_sec": accounts / opened, "fills_per_sec": fills / filled}
+
+
+def replay(engine, names, prices, updates: int, batch: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    delivered = []
+    engine.subscribe(lambda event: delivered.append(time.perf_counter()))
+    latency, events = [], 0
+    now = time.time()
+    for _ in range(updates):
+        chosen = rng.choice(len(names), batch, replace=False)
+        # Volatile walk so limits actually get hit during the run
+        prices[chosen] *= np.exp(rng.normal(0.0, 0.01, batch))
+        started = time.perf_counter()
+        produced = engine.update_prices([names[i] for i in chosen], prices[chosen], now)
+        latency.append((delivered[-1] if produced else time.perf_counter()) - started)
+        events += len(produced)
+    engine._listeners.clear()
+    total = sum(latency)
+    return {
+        "updates_per_sec": updates / total,
+        "ticks_per_sec": updates * batch / total,
+        "events": events,
+        **percentiles(latency),
+    }
+
+
+def replay_full(engine, names, prices, updates: int, seed: int) -> dict:
+    """Baseline: every update re-marks all positions and checks all accounts"""
+    rng = np.random.default_rng(seed)
+    count = engine._slot_count
+    used = engine.position_rows[:count] >= 0
+    rows = engine.position_rows[:count][used]
+    symbols = engine.position_symbols[:count][used]
+    quantity = engine.quantity[:count][used]
+    average = engine.average_price[:count][used]
+    ids = np.array([engine.symbols.ids[name] for name in names])
+    marks = np.empty(len(names))
+    marks[ids] = prices
+    accounts = engine._row_count
+
+    latency = []
+    for _ in range(updates):
+        symbol = rng.integers(len(names))
+        started = time.perf_counter()
+        marks[ids[symbol]] *= 1.001
+        unrealized = np.bincount(rows, weights=quantity * (marks[symbols] - average), minlength=accounts)
+        equity = engine.balance[:accounts] + unrealized
+        np.flatnonzero(equity <= engine.floor[:accounts])
+        latency.append(time.perf_counter() - started)
+    return {"updates_per_sec": updates / sum(latency), **percentiles(latency)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--positions", type=int, default=3, help="Open positions per account")
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=100, help="Symbols per batched update")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    engine, names, prices, setup = build(args.accounts, args.symbols, args.positions, args.seed)
+    print(
+        f"{args.accounts} accounts, {args.symbols} symbols, {len(engine._slots)} positions "
+        f"(~{len(engine._slots) // args.symbols} accounts per symbol)"
+    )
+    print(f"open_account {setup['open_per_sec']:,.0f}/s, apply_fill {setup['fills_per_sec']:,.0f}/s\n")
+
+    print(f"{'run':<14}{'updates/s':>11}{'ticks/s':>12}{'p50':>9}{'p99':>9}{'max':>9}{'events':>8}")
+    for label, batch in (("single", 1), (f"batch {args.batch}", args.batch)):
+        stats = replay(engine, names, prices, args.updates, batch, args.seed)
+        print(
+            f"{label:<14}{stats['updates_per_sec']:>11,.0f}{stats['ticks_per_sec']:>12,.0f}"
+            f"{stats['p50_ms']:>7.2f}ms{stats['p99_ms']:>7.2f}ms{stats['max_ms']:>7.2f}ms{stats['events']:>8}"
+        )
+
+    stats = replay_full(engine, names, prices, min(args.updates, 200), args.seed)
+    print(
+        f"{'full scan':<14}{stats['updates_per_sec']:>11,.0f}{stats['updates_per_sec']:>12,.0f}"
+        f"{stats['p50_ms']:>7.2f}ms{stats['p99_ms']:>7.2f}ms{stats['max_ms']:>7.2f}ms"
+    )
+    print(f"\n{engine.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
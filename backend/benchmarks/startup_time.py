@@ -0,0 +1,109 @@
+"""
+TradeSense AI Platform - Startup Time Benchmark
+Measures worker boot time (imports + create_app) with eager and lazy
+initialization, plus the cost of the first request in lazy mode
+
+Each run is a fresh interpreter so import caches do not carry over. Redis
+points at a closed local port, as on a worker whose Redis is not up yet.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --max-ms 1500   # CI gate on lazy boot
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = int(os.getenv("BENCH_RUNS", "5"))
+
+MODES = {
+    "eager": {"LAZY_EXTENSIONS": "false", "LAZY_BLUEPRINTS": "false"},
+    "lazy": {"LAZY_EXTENSIONS": "true", "LAZY_BLUEPRINTS": "true"},
+}
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app("production")
+created = time.perf_counter()
+response = app.test_client().get("/api/v1/auth/me")
+first_request = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "boot_ms": (created - start) * 1000,
+    "first_request_ms": (first_request - created) * 1000,
+    "first_request_status": response.status_code,
+    "profile": app.extensions["startup_profile"]["phases"],
+}))
+"""
+
+
+def run_once(mode_env: dict) -> dict:
+    env = dict(os.environ)
+    env.update(mode_env)
+    env.update({
+        "SECRET_KEY": "benchmark-secret-key",
+        "JWT_SECRET_KEY": "benchmark-jwt-secret-key",
+        "DATABASE_URL": "sqlite://",
+        "REDIS_URL": "redis://127.0.0.1:1/0",
+        "LOG_LEVEL": "WARNING",
+    })
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument(
+        "--max-ms", type=float, default=None,
+        help="Fail when the median lazy boot time exceeds this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    print(f"Startup time, median of {RUNS} fresh interpreters")
+    print(f"{'mode':<8}{'import':>10}{'create_app':>13}{'boot':>10}{'1st request':>14}")
+
+    medians = {}
+    for mode, mode_env in MODES.items():
+        runs = [run_once(mode_env) for _ in range(RUNS)]
+        median = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ("import_ms", "create_app_ms", "boot_ms", "first_request_ms")
+        }
+        medians[mode] = median
+        print(
+            f"{mode:<8}{median['import_ms']:>8.0f}ms{median['create_app_ms']:>11.0f}ms"
+            f"{median['boot_ms']:>8.0f}ms{median['first_request_ms']:>12.0f}ms"
+        )
+        phases = ", ".join(f"{k}={v:.0f}ms" for k, v in runs[-1]["profile"].items())
+        print(f"        phases: {phases}")
+
+    speedup = medians["eager"]["boot_ms"] / medians["lazy"]["boot_ms"]
+    print(f"\nLazy boot is {speedup:.1f}x faster")
+
+    if args.max_ms is not None and medians["lazy"]["boot_ms"] > args.max_ms:
+        print(
+            f"FAIL: lazy boot {medians['lazy']['boot_ms']:.0f}ms exceeds {args.max_ms:.0f}ms"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
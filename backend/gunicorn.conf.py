@@ -0,0 +1,113 @@
+"""
+TradeSense AI Platform - Gunicorn Configuration
+Preloaded, fork-safe production server settings
+
+The app is created once in the master (preload_app) and workers share its
+memory copy-on-write. Each worker drops the database and Redis connection
+pools it inherited in post_fork and opens its own on first use.
+
+ASYNC_MODE=eventlet switches to cooperative eventlet workers, each serving
+up to GUNICORN_WORKER_CONNECTIONS concurrent requests. Workers monkey patch
+themselves before loading the app (see app.core.concurrency).
+
+Usage:
+    gunicorn --config gunicorn.conf.py wsgi:app
+    ASYNC_MODE=eventlet gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+import gc
+import glob
+import os
+
+# "sync" or "eventlet" (see app.core.concurrency)
+async_mode = os.getenv("ASYNC_MODE", "sync").lower()
+
+# Server socket
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# Workers
+workers = int(os.getenv("WORKERS", "4"))
+worker_class = "eventlet" if async_mode == "eventlet" else "sync"
+# Concurrent requests per eventlet worker (database work is still bounded
+# by the SQLAlchemy pool size)
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers to bound memory growth; cheap with preload since a new
+# worker is a fork of the already initialized master
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Build the app once in the master. Off by default for eventlet: workers
+# must be monkey patched before the app is imported, and patching the
+# master breaks its signal handling.
+preload_app = os.getenv(
+    "GUNICORN_PRELOAD", "false" if async_mode == "eventlet" else "true"
+).lower() == "true"
+
+# Worker heartbeat files in memory instead of on the container's overlay fs
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Logging (application logs go through the app's own pipeline to stdout)
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+
+def on_starting(server):
+    """Remove metrics snapshots left by workers of a previous run"""
+    metrics_dir = os.getenv("METRICS_MULTIPROC_DIR")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "worker-*.json*")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    """Remove the metrics snapshot of a worker that exited"""
+    metrics_dir = os.getenv("METRICS_MULTIPROC_DIR")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, f"worker-{worker.pid}.json*")):
+            try:
+                os.remove(path)
+            except OSError:  # already gone
+                pass
+
+
+def when_ready(server):
+    """Finish fork-safe initialization in the master before forking"""
+    if not server.cfg.preload_app:
+        return
+
+    from app import preload_app as preload
+
+    preload(server.app.wsgi())
+
+    # Move everything allocated so far out of the collector's reach, so
+    # collections in workers do not touch (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Give each worker its own connections"""
+    if not server.cfg.preload_app:
+        return
+
+    from app.core.startup import reset_after_fork
+
+    reset_after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    """Make psycopg2 cooperative in eventlet workers"""
+    if async_mode != "eventlet":
+        return
+
+    try:
+        from eventlet.support import psycopg2_patcher
+
+        psycopg2_patcher.make_psycopg_green()
+    except ImportError:  # psycopg2 not installed (SQLite)
+        pass
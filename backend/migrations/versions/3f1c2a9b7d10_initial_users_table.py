@@ -0,0 +1,63 @@
+"""Initial users table
+
+Matches the schema previously created by db.create_all(). Existing
+databases should be stamped with this revision instead of upgrading it:
+
+    flask db stamp 3f1c2a9b7d10
+
+Revision ID: 3f1c2a9b7d10
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=True),
+        sa.Column('last_name', sa.String(length=100), nullable=True),
+        sa.Column('phone_number', sa.String(length=20), nullable=True),
+        sa.Column(
+            'role',
+            sa.Enum('user', 'admin', 'super_admin', name='user_role'),
+            nullable=False,
+        ),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('is_verified', sa.Boolean(), nullable=False),
+        sa.Column('email_verified', sa.Boolean(), nullable=False),
+        sa.Column('last_login', sa.String(), nullable=True),
+        sa.Column('verified_at', sa.String(), nullable=True),
+        sa.Column('failed_login_attempts', sa.String(), nullable=True),
+        sa.Column('locked_until', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(
+            batch_op.f('ix_users_username'), ['username'], unique=True
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_username'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    sa.Enum(name='user_role').drop(op.get_bind(), checkfirst=True)
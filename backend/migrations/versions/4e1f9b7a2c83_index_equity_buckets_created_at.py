@@ -0,0 +1,30 @@
+"""Index equity_buckets by resolution and created_at
+
+Compaction looks up the 1m buckets written since the last rolled-up hour,
+including minutes flushed late into earlier hours.
+
+Revision ID: 4e1f9b7a2c83
+Revises: 9d3a7c5e2f61
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4e1f9b7a2c83'
+down_revision = '9d3a7c5e2f61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('equity_buckets', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_equity_buckets_resolution_created', ['resolution', 'created_at'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('equity_buckets', schema=None) as batch_op:
+        batch_op.drop_index('ix_equity_buckets_resolution_created')
@@ -0,0 +1,26 @@
+"""Add users.last_seen_at for buffered activity tracking
+
+Revision ID: 5b8f0c3e9d47
+Revises: c7d92e4f1a08
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8f0c3e9d47'
+down_revision = 'c7d92e4f1a08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('last_seen_at')
@@ -0,0 +1,30 @@
+"""Add users.token_version for refresh token revocation
+
+Revision ID: 8a4e6d21c5b3
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-19 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d21c5b3'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'token_version', sa.Integer(), server_default='0', nullable=False
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,47 @@
+"""Add equity_buckets table for account equity curves
+
+Revision ID: 9d3a7c5e2f61
+Revises: e2b6f83a4c15
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3a7c5e2f61'
+down_revision = 'e2b6f83a4c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'equity_buckets',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('resolution', sa.String(length=4), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('open', sa.Numeric(20, 8), nullable=False),
+        sa.Column('high', sa.Numeric(20, 8), nullable=False),
+        sa.Column('low', sa.Numeric(20, 8), nullable=False),
+        sa.Column('close', sa.Numeric(20, 8), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('equity_buckets', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_equity_buckets_account_resolution_start',
+            ['account_id', 'resolution', 'bucket_start'],
+            unique=False,
+        )
+        batch_op.create_index(
+            'ix_equity_buckets_resolution_start', ['resolution', 'bucket_start'], unique=False
+        )
+
+
+def downgrade():
+    op.drop_table('equity_buckets')
@@ -0,0 +1,240 @@
+"""Convert user timestamps and counters to typed columns
+
+Converts users.last_login, verified_at and locked_until (ISO strings) to
+DateTime and failed_login_attempts (string) to Integer without long locks:
+
+1. Add the nullable typed shadow columns that do not exist yet.
+2. Backfill them in keyset-paginated chunks, committing each chunk. Rows
+   already converted are skipped, so an interrupted run resumes where it
+   stopped when the upgrade is re-run.
+3. Re-convert rows the running application modified meanwhile (by
+   updated_at), pass after pass, until a pass finds none.
+4. In one transaction that blocks writes to users, re-convert the rows
+   modified since the last pass and swap the shadow columns in, so no
+   write lands between the last conversion and the drop of the sources.
+5. Build the activity indexes (concurrently on PostgreSQL).
+
+Chunk size is controlled by USER_MIGRATION_BATCH_SIZE (default 5000).
+
+Revision ID: c7d92e4f1a08
+Revises: 8a4e6d21c5b3
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+import os
+from contextlib import nullcontext
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d92e4f1a08'
+down_revision = '8a4e6d21c5b3'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = int(os.getenv('USER_MIGRATION_BATCH_SIZE', '5000'))
+# Under a steady write load passes may never come up empty: the locked
+# final pass converts whatever is left
+MAX_CATCH_UP_PASSES = 10
+
+TIMESTAMP_COLUMNS = ('last_login', 'verified_at', 'locked_until')
+COUNTER_COLUMN = 'failed_login_attempts'
+SHADOW_SUFFIX = '_typed'
+
+ACTIVITY_INDEXES = {
+    'ix_users_last_login': ['last_login'],
+    'ix_users_is_active_last_login': ['is_active', 'last_login'],
+}
+
+
+def _parse_timestamp(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_counter(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _format_timestamp(value):
+    if isinstance(value, str):
+        value = _parse_timestamp(value)
+    return value.isoformat() if value else None
+
+
+def _format_counter(value):
+    return str(value or 0)
+
+
+def _users_table(shadow_type, source_type):
+    columns = [sa.column('id', sa.Integer), sa.column('updated_at', sa.DateTime)]
+    for name in TIMESTAMP_COLUMNS:
+        columns.append(sa.column(name, source_type['timestamp']))
+        columns.append(sa.column(name + SHADOW_SUFFIX, shadow_type['timestamp']))
+    columns.append(sa.column(COUNTER_COLUMN, source_type['counter']))
+    columns.append(sa.column(COUNTER_COLUMN + SHADOW_SUFFIX, shadow_type['counter']))
+    return sa.table('users', *columns)
+
+
+def _convert_rows(connection, users, convert_timestamp, convert_counter, since=None):
+    """Copy source columns into shadow columns in chunks (committed in autocommit mode)"""
+    names = TIMESTAMP_COLUMNS + (COUNTER_COLUMN,)
+    statement = (
+        users.update()
+        .where(users.c.id == sa.bindparam('b_id'))
+        .values({
+            name + SHADOW_SUFFIX: sa.bindparam('b_' + name) for name in names
+        })
+    )
+
+    cursor = 0
+    converted = 0
+    while True:
+        query = (
+            sa.select(users.c.id, *[users.c[name] for name in names])
+            .where(users.c.id > cursor)
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if since is None:
+            # Counter shadow is always set once converted: resume marker
+            query = query.where(users.c[COUNTER_COLUMN + SHADOW_SUFFIX].is_(None))
+        else:
+            query = query.where(users.c.updated_at >= since)
+
+        rows = connection.execute(query).mappings().all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            values = {'b_id': row['id']}
+            for name in TIMESTAMP_COLUMNS:
+                values['b_' + name] = convert_timestamp(row[name])
+            values['b_' + COUNTER_COLUMN] = convert_counter(row[COUNTER_COLUMN])
+            params.append(values)
+
+        connection.execute(statement, params)
+        cursor = rows[-1]['id']
+        converted += len(rows)
+
+    return converted
+
+
+def _block_writes(connection):
+    """Hold off writes to users until the migration transaction ends"""
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        # Reads go on; writes (and other migrations) wait
+        connection.execute(sa.text('LOCK TABLE users IN SHARE ROW EXCLUSIVE MODE'))
+    elif dialect == 'sqlite':
+        # Any write statement takes the database write lock
+        connection.execute(sa.text('UPDATE users SET id = id WHERE 0 = 1'))
+
+
+def _swap_columns(shadow_type, counter_server_default):
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        for name in TIMESTAMP_COLUMNS + (COUNTER_COLUMN,):
+            batch_op.drop_column(name)
+        for name in TIMESTAMP_COLUMNS:
+            batch_op.alter_column(
+                name + SHADOW_SUFFIX,
+                new_column_name=name,
+                existing_type=shadow_type['timestamp'],
+            )
+        batch_op.alter_column(
+            COUNTER_COLUMN + SHADOW_SUFFIX,
+            new_column_name=COUNTER_COLUMN,
+            existing_type=shadow_type['counter'],
+            nullable=counter_server_default is None,
+            server_default=counter_server_default,
+        )
+
+
+def _migrate(shadow_type, source_type, convert_timestamp, convert_counter,
+             counter_server_default):
+    # Shadow columns left by an interrupted run are reused, not re-added
+    with op.get_context().autocommit_block():
+        existing = {
+            column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')
+        }
+    shadows = [
+        (name + SHADOW_SUFFIX, shadow_type['timestamp']) for name in TIMESTAMP_COLUMNS
+    ]
+    shadows.append((COUNTER_COLUMN + SHADOW_SUFFIX, shadow_type['counter']))
+    missing = [(name, type_) for name, type_ in shadows if name not in existing]
+
+    if missing:
+        with op.batch_alter_table('users', schema=None) as batch_op:
+            for name, type_ in missing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+    users = _users_table(shadow_type, source_type)
+    since = datetime.utcnow()
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        _convert_rows(connection, users, convert_timestamp, convert_counter)
+        for _ in range(MAX_CATCH_UP_PASSES):
+            # Rows modified before this pass starts are converted by it
+            pass_started_at = datetime.utcnow()
+            converted = _convert_rows(
+                connection, users, convert_timestamp, convert_counter, since=since
+            )
+            since = pass_started_at
+            if not converted:
+                break
+
+    # Last pass and swap in one transaction (the migration's, where DDL is
+    # transactional), writes blocked
+    connection = op.get_bind()
+    with nullcontext() if connection.in_transaction() else connection.begin():
+        _block_writes(connection)
+        _convert_rows(connection, users, convert_timestamp, convert_counter, since=since)
+        _swap_columns(shadow_type, counter_server_default)
+
+
+def upgrade():
+    _migrate(
+        shadow_type={'timestamp': sa.DateTime(), 'counter': sa.Integer()},
+        source_type={'timestamp': sa.String(), 'counter': sa.String()},
+        convert_timestamp=_parse_timestamp,
+        convert_counter=_parse_counter,
+        counter_server_default='0',
+    )
+
+    with op.get_context().autocommit_block():
+        for index_name, columns in ACTIVITY_INDEXES.items():
+            op.create_index(
+                index_name,
+                'users',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name in ACTIVITY_INDEXES:
+            op.drop_index(
+                index_name, table_name='users', postgresql_concurrently=True
+            )
+
+    _migrate(
+        shadow_type={'timestamp': sa.String(), 'counter': sa.String()},
+        source_type={'timestamp': sa.DateTime(), 'counter': sa.Integer()},
+        convert_timestamp=_format_timestamp,
+        convert_counter=_format_counter,
+        counter_server_default=None,
+    )
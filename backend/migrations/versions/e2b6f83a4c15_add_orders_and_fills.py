@@ -0,0 +1,77 @@
+"""Add orders and fills tables for the paper trading engine
+
+Revision ID: e2b6f83a4c15
+Revises: 5b8f0c3e9d47
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f83a4c15'
+down_revision = '5b8f0c3e9d47'
+branch_labels = None
+depends_on = None
+
+ORDER_SIDE = sa.Enum('buy', 'sell', name='order_side')
+ORDER_TYPE = sa.Enum('market', 'limit', 'ioc', 'stop', name='order_type')
+ORDER_STATUS = sa.Enum(
+    'pending', 'new', 'partially_filled', 'filled', 'cancelled', 'rejected',
+    name='order_status',
+)
+
+
+def upgrade():
+    op.create_table(
+        'orders',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('broker', sa.String(length=32), nullable=False),
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('side', ORDER_SIDE, nullable=False),
+        sa.Column('order_type', ORDER_TYPE, nullable=False),
+        sa.Column('status', ORDER_STATUS, nullable=False),
+        sa.Column('quantity', sa.Numeric(20, 8), nullable=False),
+        sa.Column('filled_quantity', sa.Numeric(20, 8), nullable=False),
+        sa.Column('price', sa.Numeric(20, 8), nullable=True),
+        sa.Column('stop_price', sa.Numeric(20, 8), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_account_id_status', ['account_id', 'status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_symbol'), ['symbol'], unique=False)
+
+    op.create_table(
+        'fills',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('price', sa.Numeric(20, 8), nullable=False),
+        sa.Column('quantity', sa.Numeric(20, 8), nullable=False),
+        sa.Column('buy_order_id', sa.Integer(), nullable=False),
+        sa.Column('sell_order_id', sa.Integer(), nullable=False),
+        sa.Column('buyer_account_id', sa.Integer(), nullable=False),
+        sa.Column('seller_account_id', sa.Integer(), nullable=False),
+        sa.Column('taker_side', sa.String(length=4), nullable=False),
+        sa.Column('executed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('fills', schema=None) as batch_op:
+        for column in (
+            'symbol', 'buy_order_id', 'sell_order_id',
+            'buyer_account_id', 'seller_account_id', 'executed_at',
+        ):
+            batch_op.create_index(batch_op.f(f'ix_fills_{column}'), [column], unique=False)
+
+
+def downgrade():
+    op.drop_table('fills')
+    op.drop_table('orders')
+    bind = op.get_bind()
+    for enum in (ORDER_STATUS, ORDER_TYPE, ORDER_SIDE):
+        enum.drop(bind, checkfirst=True)